@@ -1,7 +1,7 @@
 from django.conf import settings
 
 from app.Account.models import Account
-from app.core.Utilities.django_email_service import django_email_service
+from app.core.Utilities.email_outbox import queue_email
 
 
 def send_welcome_email(account: Account):
@@ -20,12 +20,12 @@ def send_welcome_email(account: Account):
             <p style="font-weight: lighter !important;">Regards</p>
             <h3 style="font-weight: lighter !important;">The {settings.SITE_NAME} Team</h3>
         """
-        django_email_service(
+        queue_email(
             to=account.email,
             subject=subject,
             html_body=html_body,
             from_email=settings.DEFAULT_FROM_EMAIL,
         )
-        print("Email sent to", account.email)
+        print("Email queued for", account.email)
     else:
         print("No email address found for account", account.pk)
@@ -131,6 +131,7 @@ class ForecastAdmin(SoftDeleteAdmin):
         "status",
         "period",
         "total_forecast",
+        "parent",
         "created_at",
         "deleted",
         "notes",
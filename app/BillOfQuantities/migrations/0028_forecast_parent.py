@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("BillOfQuantities", "0027_quantity_decimal_precision"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="forecast",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Forecast this revision inherits unchanged line items from",
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="revisions",
+                to="BillOfQuantities.forecast",
+            ),
+        ),
+    ]
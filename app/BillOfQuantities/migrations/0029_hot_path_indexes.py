@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("BillOfQuantities", "0028_forecast_parent"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="actualtransaction",
+            index=models.Index(
+                fields=["payment_certificate", "line_item", "deleted"],
+                name="BillOfQuant_payment_c99f2e_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paymentcertificate",
+            index=models.Index(
+                fields=["project", "status", "certificate_number", "deleted"],
+                name="BillOfQuant_project_e413ef_idx",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="actualtransaction",
+            name="BillOfQuant_payment_cd40f6_idx",
+        ),
+    ]
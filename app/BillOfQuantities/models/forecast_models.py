@@ -2,7 +2,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import Case, Exists, OuterRef, QuerySet, Value, When
 
 from app.Account.models import Account
 from app.core.Utilities.models import BaseModel, sum_queryset
@@ -12,7 +12,12 @@ if TYPE_CHECKING:
 
 
 class Forecast(BaseModel):
-    """Capture forecasted work completed against a line item"""
+    """Capture forecasted work completed against a line item
+
+    A revision stores only the line items it changes and points at the
+    forecast it was revised from (``parent``); every other line item is
+    inherited. ``effective_transactions`` resolves the full set.
+    """
 
     class Status(models.TextChoices):
         DRAFT = "DRAFT", "Draft"
@@ -34,6 +39,14 @@ class Forecast(BaseModel):
         null=True,
     )
     notes = models.TextField(blank=True)
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.RESTRICT,
+        related_name="revisions",
+        blank=True,
+        null=True,
+        help_text="Forecast this revision inherits unchanged line items from",
+    )
 
     captured_by: Account = models.ForeignKey(  # type: ignore
         Account,
@@ -70,8 +83,48 @@ class Forecast(BaseModel):
 
     @property
     def total_forecast(self) -> Decimal:
-        # return total of forecast transactions
-        return sum_queryset(self.forecast_transactions, "total_price")
+        # return total of the effective forecast transactions
+        return sum_queryset(self.effective_transactions(), "total_price")
+
+    def lineage(self) -> list[int]:
+        """Pks of this forecast and its ancestors, nearest first."""
+        if not hasattr(self, "_lineage"):
+            parents = dict(
+                Forecast.all_objects.filter(project_id=self.project_id).values_list(
+                    "pk", "parent_id"
+                )
+            )
+            lineage = [self.pk]
+            while (parent_id := parents.get(lineage[-1])) and parent_id not in lineage:
+                lineage.append(parent_id)
+            self._lineage = lineage
+        return self._lineage
+
+    def effective_transactions(self) -> QuerySet["ForecastTransaction"]:
+        """Transactions in force for this forecast, one per line item.
+
+        Each line item resolves to the transaction of the nearest forecast
+        in the lineage that has one, so a revision overrides its parent.
+        """
+        lineage = self.lineage()
+        if len(lineage) == 1:
+            return ForecastTransaction.objects.filter(forecast_id=self.pk)
+        depth = Case(
+            *(When(forecast_id=pk, then=Value(i)) for i, pk in enumerate(lineage)),
+            output_field=models.IntegerField(),
+        )
+        overridden = (
+            ForecastTransaction.objects.filter(
+                forecast_id__in=lineage, line_item_id=OuterRef("line_item_id")
+            )
+            .annotate(depth=depth)
+            .filter(depth__lt=OuterRef("depth"))
+        )
+        return (
+            ForecastTransaction.objects.filter(forecast_id__in=lineage)
+            .annotate(depth=depth)
+            .exclude(Exists(overridden))
+        )
 
 
 class ForecastTransaction(BaseModel):
@@ -76,6 +76,7 @@ class PaymentCertificate(BaseModel):
         indexes = [
             models.Index(fields=["certificate_number", "status"]),
             models.Index(fields=["project", "certificate_number"]),
+            models.Index(fields=["project", "status", "certificate_number", "deleted"]),
         ]
         unique_together = ("project", "certificate_number")
 
@@ -107,6 +108,13 @@ class PaymentCertificate(BaseModel):
 
         super().save(*args, **kwargs)
 
+    def reset_generated_exports(self) -> None:
+        """Clear generated PDF/XLSX exports so they are regenerated, and save."""
+        for field_name in ("pdf", "abridged_pdf", "xlsx", "abridged_xlsx"):
+            if getattr(self, field_name):
+                setattr(self, field_name, None)
+        self.save()
+
     @staticmethod
     def validate_certificate_numbers(project):
         payment_certificates = PaymentCertificate.objects.filter(
@@ -795,7 +803,7 @@ class ActualTransaction(BaseModel):
         verbose_name_plural = "Actual Transactions"
         ordering = ["line_item__row_index"]
         indexes = [
-            models.Index(fields=["payment_certificate", "line_item"]),
+            models.Index(fields=["payment_certificate", "line_item", "deleted"]),
             models.Index(fields=["line_item", "claimed"]),
         ]
 
@@ -803,19 +811,7 @@ class ActualTransaction(BaseModel):
         return f"{self.line_item.description if self.line_item else self.line_item.pk} - {self.quantity}"
 
     def save(self, *args, **kwargs):
-        if self.payment_certificate.pdf:
-            # reset pdf as it needs to be regenerated
-            self.payment_certificate.pdf = None
-        if self.payment_certificate.abridged_pdf:
-            # reset abridged pdf as it needs to be regenerated
-            self.payment_certificate.abridged_pdf = None
-        if self.payment_certificate.xlsx:
-            # reset xlsx as it needs to be regenerated
-            self.payment_certificate.xlsx = None
-        if self.payment_certificate.abridged_xlsx:
-            # reset abridged xlsx as it needs to be regenerated
-            self.payment_certificate.abridged_xlsx = None
-        self.payment_certificate.save()
+        self.payment_certificate.reset_generated_exports()
         super().save(*args, **kwargs)
 
 
@@ -77,14 +77,17 @@ class Structure(BaseModel):
 
     def get_forecast_total(self, forecast: Forecast) -> Decimal:
         """Get total forecast for all line items in this structure for a specific forecast."""
-        from app.BillOfQuantities.models import ForecastTransaction
-
-        return ForecastTransaction.objects.filter(
-            forecast=forecast,
-            line_item__structure=self,
-            line_item__is_work=True,
-            line_item__special_item=False,
-        ).aggregate(total=Coalesce(Sum("total_price"), Value(Decimal("0.00"))))["total"]
+        return (
+            forecast.effective_transactions()
+            .filter(
+                line_item__structure=self,
+                line_item__is_work=True,
+                line_item__special_item=False,
+            )
+            .aggregate(total=Coalesce(Sum("total_price"), Value(Decimal("0.00"))))[
+                "total"
+            ]
+        )
 
     @staticmethod
     def upload_wbs_csv(project: Project):
@@ -120,14 +123,17 @@ class Bill(BaseModel):
 
     def get_forecast_total(self, forecast: Forecast) -> Decimal:
         """Get total forecast for all line items in this bill for a specific forecast."""
-        from app.BillOfQuantities.models import ForecastTransaction
-
-        return ForecastTransaction.objects.filter(
-            forecast=forecast,
-            line_item__bill=self,
-            line_item__is_work=True,
-            line_item__special_item=False,
-        ).aggregate(total=Coalesce(Sum("total_price"), Value(Decimal("0.00"))))["total"]
+        return (
+            forecast.effective_transactions()
+            .filter(
+                line_item__bill=self,
+                line_item__is_work=True,
+                line_item__special_item=False,
+            )
+            .aggregate(total=Coalesce(Sum("total_price"), Value(Decimal("0.00"))))[
+                "total"
+            ]
+        )
 
 
 class Package(BaseModel):
@@ -1,12 +1,24 @@
 """Services for Bill of Quantities app."""
 
-from decimal import Decimal
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
 
 import pandas as pd
 from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from app.BillOfQuantities.forms import LineItemExcelUploadForm
-from app.BillOfQuantities.models import Bill, LineItem, Package, Structure
+from app.BillOfQuantities.models import (
+    ActualTransaction,
+    Bill,
+    LineItem,
+    Package,
+    PaymentCertificate,
+    Structure,
+)
+from app.core.Utilities.search import search
 
 
 def clean_pd_data(value):
@@ -248,3 +260,308 @@ def import_boq_from_excel(project, excel_file):
             created_count += 1
 
     return created_count, []
+
+
+NEW_CLAIM_PREFIX = "new_actual_quantity_"
+EDIT_CLAIM_PREFIX = "edit_actual_quantity_"
+CLAIM_BATCH_SIZE = 500
+
+
+@dataclass
+class ClaimCaptureResult:
+    """Outcome of ``capture_claims``: rows written and per-line errors."""
+
+    created: int = 0
+    updated: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def capture_claims(payment_certificate: PaymentCertificate, data, user):
+    """Create and update a certificate's actual transactions from posted claims.
+
+    ``data`` maps ``new_actual_quantity_<line item pk>`` and
+    ``edit_actual_quantity_<transaction pk>`` keys to the quantity claimed to
+    date (the value, for special items); each transaction stores the delta
+    against prior claims. Blank entries are skipped. Unparseable, negative or
+    unknown entries are reported per line and the remaining lines still save.
+
+    Line items, transactions and prior claims are loaded in a fixed number of
+    grouped queries and written with ``bulk_create``/``bulk_update`` in one
+    transaction, however many lines are posted.
+
+    Returns:
+        ClaimCaptureResult
+    """
+    result = ClaimCaptureResult()
+    project = payment_certificate.project
+
+    new_claims, edit_claims = [], []
+    for key, raw_value in data.items():
+        if key.startswith(NEW_CLAIM_PREFIX):
+            claims, pk = new_claims, key.removeprefix(NEW_CLAIM_PREFIX)
+        elif key.startswith(EDIT_CLAIM_PREFIX):
+            claims, pk = edit_claims, key.removeprefix(EDIT_CLAIM_PREFIX)
+        else:
+            continue
+        if not str(raw_value).strip():
+            continue
+        if not pk.isdigit():
+            result.errors.append(f"Unknown claim field '{key}'")
+            continue
+        claims.append((int(pk), raw_value))
+
+    line_items = project.line_items.in_bulk([pk for pk, _ in new_claims])
+    transactions = (
+        ActualTransaction.objects.filter(line_item__project=project)
+        .select_related("line_item")
+        .in_bulk([pk for pk, _ in edit_claims])
+    )
+    prior_claims = _prior_claims(
+        project,
+        {item.pk for item in line_items.values()}
+        | {txn.line_item_id for txn in transactions.values()},
+    )
+
+    to_create = []
+    for pk, raw_value in new_claims:
+        line_item = line_items.get(pk)
+        if line_item is None:
+            result.errors.append(f"Line item {pk} not found in this project")
+            continue
+        value = _parse_claim_value(line_item, raw_value, result.errors)
+        if value is None:
+            continue
+        actual_transaction = ActualTransaction(
+            payment_certificate=payment_certificate,
+            line_item=line_item,
+            captured_by=user,
+        )
+        _apply_claim(actual_transaction, value, prior_claims)
+        to_create.append(actual_transaction)
+
+    to_update = []
+    now = timezone.now()
+    for pk, raw_value in edit_claims:
+        actual_transaction = transactions.get(pk)
+        if actual_transaction is None:
+            result.errors.append(f"Transaction {pk} not found in this project")
+            continue
+        value = _parse_claim_value(
+            actual_transaction.line_item, raw_value, result.errors
+        )
+        if value is None:
+            continue
+        _apply_claim(actual_transaction, value, prior_claims)
+        actual_transaction.updated_at = now
+        to_update.append(actual_transaction)
+
+    if not to_create and not to_update:
+        return result
+
+    with transaction.atomic():
+        ActualTransaction.objects.bulk_create(to_create, batch_size=CLAIM_BATCH_SIZE)
+        ActualTransaction.objects.bulk_update(
+            to_update,
+            ["quantity", "unit_price", "total_price", "updated_at"],
+            batch_size=CLAIM_BATCH_SIZE,
+        )
+        # Bulk writes skip ActualTransaction.save(), which does this per row
+        payment_certificate.reset_generated_exports()
+
+    result.created = len(to_create)
+    result.updated = len(to_update)
+    return result
+
+
+def _prior_claims(project, line_item_ids) -> dict[int, tuple[Decimal, Decimal]]:
+    """Return ``{line item pk: (claimed_to_date, claimed_to_date_value)}``.
+
+    Grouped equivalent of the ``LineItem`` properties of the same names.
+    """
+    if not line_item_ids:
+        return {}
+
+    quantity_filter, value_filter = _prior_claim_filters(project)
+    rows = (
+        ActualTransaction.objects.filter(line_item_id__in=line_item_ids)
+        .order_by()
+        .values("line_item_id")
+        .annotate(
+            quantity=Sum("quantity", filter=quantity_filter),
+            value=Sum("total_price", filter=value_filter or None),
+        )
+    )
+    return {
+        row["line_item_id"]: (row["quantity"] or Decimal(0), row["value"] or Decimal(0))
+        for row in rows
+    }
+
+
+def _prior_claim_filters(project) -> tuple[Q, Q]:
+    """Transaction filters for prior claimed quantity and value respectively."""
+    active_certificate = project.active_payment_certificate
+    if not active_certificate:
+        return Q(claimed=True), Q()
+    return (
+        Q(claimed=True) & ~Q(payment_certificate=active_certificate),
+        Q(
+            payment_certificate__certificate_number__lt=active_certificate.certificate_number
+        ),
+    )
+
+
+def _parse_claim_value(line_item, raw_value, errors) -> Decimal | None:
+    label = line_item.item_number or line_item.description or line_item.pk
+    try:
+        value = Decimal(str(raw_value).strip())
+    except (ValueError, TypeError, InvalidOperation):
+        errors.append(f"Item {label}: '{raw_value}' is not a valid number")
+        return None
+    if not value.is_finite():
+        errors.append(f"Item {label}: '{raw_value}' is not a valid number")
+        return None
+    if value < 0:
+        # can be zero, in case someone wants to uncertify everything
+        errors.append(f"Item {label}: claimed amount cannot be negative")
+        return None
+    return value
+
+
+def _apply_claim(actual_transaction, value, prior_claims) -> None:
+    """Set the transaction to the delta between ``value`` and prior claims."""
+    line_item = actual_transaction.line_item
+    claimed_quantity, claimed_value = prior_claims.get(
+        line_item.pk, (Decimal(0), Decimal(0))
+    )
+    if not line_item.special_item:
+        # normal / addendum item - working with quantities
+        quantity = value - claimed_quantity
+        actual_transaction.quantity = quantity
+        actual_transaction.unit_price = line_item.unit_price
+        actual_transaction.total_price = line_item.unit_price * quantity
+    else:
+        # special item - working with values
+        actual_transaction.quantity = 0
+        actual_transaction.unit_price = 0
+        actual_transaction.total_price = value - claimed_value
+
+
+CLAIM_GRID_PAGE_SIZE = 200
+CLAIM_GRID_MAX_PAGE_SIZE = 1000
+CLAIM_GRID_FIELDS = (
+    "id",
+    "row_index",
+    "item_number",
+    "payment_reference",
+    "description",
+    "unit_measurement",
+    "unit_price",
+    "budgeted_quantity",
+    "is_work",
+    "structure__name",
+    "bill__name",
+)
+
+
+@dataclass
+class ClaimGridPage:
+    """One keyset page of the certificate claim grid."""
+
+    rows: list[dict]
+    next_cursor: str | None
+
+
+def claim_grid_page(
+    payment_certificate: PaymentCertificate,
+    filters=None,
+    cursor: str | None = None,
+    limit: int = CLAIM_GRID_PAGE_SIZE,
+) -> ClaimGridPage:
+    """Return the next page of normal line items for the claim edit grid.
+
+    Rows are ordered by ``row_index`` and paged by keyset: ``cursor`` is the
+    ``"<row_index>:<pk>"`` of the last row already loaded, so every page
+    costs the same however deep into the BOQ it is. Claimed to date,
+    remaining quantity and the certificate's current transaction are
+    annotated in the page query rather than read from the per-row
+    ``LineItem`` properties.
+
+    ``filters`` accepts the edit page's ``structure``, ``bill``, ``package``
+    and ``description`` parameters.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed
+    """
+    project = payment_certificate.project
+    filters = filters or {}
+    limit = max(1, min(limit, CLAIM_GRID_MAX_PAGE_SIZE))
+
+    line_items = project.line_items.filter(special_item=False, addendum=False)
+    if filters.get("structure"):
+        line_items = line_items.filter(structure_id=filters["structure"])
+    if filters.get("bill"):
+        line_items = line_items.filter(bill_id=filters["bill"])
+    if filters.get("package"):
+        line_items = line_items.filter(package_id=filters["package"])
+    if filters.get("description"):
+        line_items = search(line_items, filters["description"], rank=False)
+    if cursor:
+        row_index, pk = (int(part) for part in cursor.split(":"))
+        line_items = line_items.filter(
+            Q(row_index__gt=row_index) | Q(row_index=row_index, pk__gt=pk)
+        )
+
+    quantity_filter, _ = _prior_claim_filters(project)
+    current_transactions = ActualTransaction.objects.filter(
+        payment_certificate=payment_certificate, line_item=OuterRef("pk")
+    ).order_by("pk")
+    rows = list(
+        line_items.annotate(
+            claimed_to_date=Coalesce(
+                Subquery(
+                    ActualTransaction.objects.filter(
+                        quantity_filter, line_item=OuterRef("pk")
+                    )
+                    .order_by()
+                    .values("line_item")
+                    .annotate(total=Sum("quantity"))
+                    .values("total")
+                ),
+                Value(Decimal(0)),
+                output_field=DecimalField(max_digits=20, decimal_places=10),
+            ),
+            remaining_quantity=Coalesce(
+                F("budgeted_quantity"),
+                Value(Decimal(0)),
+                output_field=DecimalField(max_digits=20, decimal_places=10),
+            )
+            - F("claimed_to_date"),
+            current_transaction_id=Subquery(current_transactions.values("pk")[:1]),
+            current_transaction_quantity=Subquery(
+                current_transactions.values("quantity")[:1]
+            ),
+        )
+        .order_by("row_index", "pk")
+        .values(
+            *CLAIM_GRID_FIELDS,
+            "claimed_to_date",
+            "remaining_quantity",
+            "current_transaction_id",
+            "current_transaction_quantity",
+        )[: limit + 1]
+    )
+
+    for row in rows:
+        # Value shown in the edit input: quantity claimed to date including
+        # this certificate's transaction, as captured
+        row["current_quantity"] = (
+            row["claimed_to_date"] + row["current_transaction_quantity"]
+            if row["current_transaction_id"]
+            else None
+        )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1]['row_index']}:{rows[-1]['id']}"
+    return ClaimGridPage(rows=rows, next_cursor=next_cursor)
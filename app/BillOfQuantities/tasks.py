@@ -1,5 +1,4 @@
 import re
-import threading
 from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
@@ -13,7 +12,8 @@ from pypdf import PdfReader, PdfWriter
 
 from app.BillOfQuantities.exporters.unified_xlsx_exporter import export_unified_xlsx
 from app.BillOfQuantities.models import LineItem, PaymentCertificate
-from app.core.Utilities.django_email_service import django_email_service
+from app.core.Utilities.db_pool import run_in_background
+from app.core.Utilities.email_outbox import queue_email
 from app.core.Utilities.generate_pdf import generate_pdf
 from app.Project.models import Project
 
@@ -402,7 +402,7 @@ def generate_and_save_pdf(
     payment_certificate_id: int, pdf_type: Literal["full", "abridged"] = "full"
 ):
     """
-    Internal function to generate and save PDF in a separate thread.
+    Internal function to generate and save PDF on a background worker.
 
     Args:
         payment_certificate_id: ID of the PaymentCertificate
@@ -485,7 +485,7 @@ def generate_pdf_async(
     pdf_type: Literal["full", "abridged", "both"] | None = None,
 ) -> None:
     """
-    Start PDF generation in a background thread.
+    Queue PDF generation on the background worker pool.
 
     Args:
         payment_certificate_id: ID of the PaymentCertificate
@@ -522,7 +522,7 @@ def generate_pdf_async(
         ):
             generate_abridged_pdf = True
 
-    # Set flags before starting threads
+    # Set flags before queueing the jobs
     if generate_pdf:
         payment_certificate.pdf_generating = True
     if generate_abridged_pdf:
@@ -532,26 +532,16 @@ def generate_pdf_async(
 
     if generate_pdf:
         logger.info(
-            f"Starting full PDF generation thread for certificate {payment_certificate.certificate_number}"
+            f"Queueing full PDF generation for certificate {payment_certificate.certificate_number}"
         )
-        # Start generation in background thread
-        thread = threading.Thread(
-            target=generate_and_save_pdf,
-            args=(payment_certificate_id, "full"),
-            daemon=True,
-        )
-        thread.start()
+        # Queue generation on the background worker pool
+        run_in_background(generate_and_save_pdf, payment_certificate_id, "full")
     if generate_abridged_pdf:
         logger.info(
-            f"Starting abridged PDF generation thread for certificate {payment_certificate.certificate_number}"
-        )
-        # Start generation in background thread
-        thread = threading.Thread(
-            target=generate_and_save_pdf,
-            args=(payment_certificate_id, "abridged"),
-            daemon=True,
+            f"Queueing abridged PDF generation for certificate {payment_certificate.certificate_number}"
         )
-        thread.start()
+        # Queue generation on the background worker pool
+        run_in_background(generate_and_save_pdf, payment_certificate_id, "abridged")
 
 
 def generate_and_save_xlsx(
@@ -560,7 +550,7 @@ def generate_and_save_xlsx(
     xlsx_type: Literal["full", "abridged"] = "full",
 ):
     """
-    Internal function to generate and save unified XLSX in a separate thread.
+    Internal function to generate and save unified XLSX on a background worker.
 
     Args:
         payment_certificate_id: ID of the PaymentCertificate
@@ -638,7 +628,7 @@ def generate_xlsx_async(
     xlsx_type: Literal["full", "abridged", "both"] | None = None,
 ) -> None:
     """
-    Start XLSX generation in a background thread.
+    Queue XLSX generation on the background worker pool.
     """
     import logging
 
@@ -675,25 +665,19 @@ def generate_xlsx_async(
 
     if generate_xlsx:
         logger.info(
-            f"Starting full XLSX generation thread for cert {payment_certificate.certificate_number}"
+            f"Queueing full XLSX generation for cert {payment_certificate.certificate_number}"
         )
-        thread = threading.Thread(
-            target=generate_and_save_xlsx,
-            args=(payment_certificate_id, sections, "full"),
-            daemon=True,
+        run_in_background(
+            generate_and_save_xlsx, payment_certificate_id, sections, "full"
         )
-        thread.start()
 
     if generate_abridged_xlsx:
         logger.info(
-            f"Starting abridged XLSX generation thread for cert {payment_certificate.certificate_number}"
+            f"Queueing abridged XLSX generation for cert {payment_certificate.certificate_number}"
         )
-        thread = threading.Thread(
-            target=generate_and_save_xlsx,
-            args=(payment_certificate_id, sections, "abridged"),
-            daemon=True,
+        run_in_background(
+            generate_and_save_xlsx, payment_certificate_id, sections, "abridged"
         )
-        thread.start()
 
 
 def send_payment_certificate_to_signatories(payment_certificate_id: int, request=None):
@@ -730,9 +714,11 @@ def send_payment_certificate_to_signatories(payment_certificate_id: int, request
         payment_certificate.abridged_pdf,
     ]
 
-    return django_email_service(
+    # Delivered in the background; all signatories share one message
+    queue_email(
         to=to_emails,
         subject=subject,
         html_body=html_message,
         attachments=files,
     )
+    return True, "Payment certificate queued for delivery to signatories"
@@ -0,0 +1,214 @@
+"""Tests for bulk claim capture on payment certificates."""
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.Account.tests.factories import AccountFactory
+from app.BillOfQuantities.models import PaymentCertificate
+from app.BillOfQuantities.services import capture_claims, claim_grid_page
+from app.BillOfQuantities.tests.factories import (
+    ActualTransactionFactory,
+    LineItemFactory,
+    PaymentCertificateFactory,
+)
+from app.Project.tests.factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestCaptureClaims:
+    def setup_method(self):
+        self.user = AccountFactory.create()
+        self.project = ProjectFactory.create(users=self.user)
+        self.previous = PaymentCertificateFactory.create(
+            project=self.project,
+            certificate_number=1,
+            status=PaymentCertificate.Status.APPROVED,
+        )
+        self.certificate = PaymentCertificateFactory.create(
+            project=self.project,
+            certificate_number=2,
+            status=PaymentCertificate.Status.DRAFT,
+        )
+
+    def _line_item(self, **kwargs):
+        return LineItemFactory.create(
+            project=self.project,
+            unit_price=Decimal("10.00"),
+            budgeted_quantity=Decimal("100.00"),
+            **kwargs,
+        )
+
+    def test_new_claims_store_delta_against_prior_claims(self):
+        line_item = self._line_item()
+        ActualTransactionFactory.create(
+            payment_certificate=self.previous,
+            line_item=line_item,
+            quantity=Decimal("4.00"),
+            claimed=True,
+        )
+
+        result = capture_claims(
+            self.certificate,
+            {f"new_actual_quantity_{line_item.pk}": "10"},
+            self.user,
+        )
+
+        assert (result.created, result.updated, result.errors) == (1, 0, [])
+        transaction = self.certificate.actual_transactions.get()
+        assert transaction.quantity == Decimal("6")
+        assert transaction.total_price == Decimal("60.00")
+        assert transaction.captured_by == self.user
+
+    def test_special_items_store_value_delta(self):
+        line_item = self._line_item(special_item=True)
+        ActualTransactionFactory.create(
+            payment_certificate=self.previous,
+            line_item=line_item,
+            quantity=Decimal("0"),
+            unit_price=Decimal("0"),
+            total_price=Decimal("250.00"),
+        )
+
+        capture_claims(
+            self.certificate,
+            {f"new_actual_quantity_{line_item.pk}": "1000"},
+            self.user,
+        )
+
+        transaction = self.certificate.actual_transactions.get()
+        assert transaction.quantity == 0
+        assert transaction.total_price == Decimal("750.00")
+
+    def test_edits_update_existing_transactions(self):
+        line_item = self._line_item()
+        transaction = ActualTransactionFactory.create(
+            payment_certificate=self.certificate,
+            line_item=line_item,
+            quantity=Decimal("5.00"),
+        )
+
+        result = capture_claims(
+            self.certificate,
+            {f"edit_actual_quantity_{transaction.pk}": "12.5"},
+            self.user,
+        )
+
+        assert result.updated == 1
+        transaction.refresh_from_db()
+        assert transaction.quantity == Decimal("12.5")
+        assert transaction.total_price == Decimal("125.00")
+
+    def test_invalid_lines_are_reported_and_others_saved(self):
+        valid, negative, invalid = (self._line_item() for _ in range(3))
+        other_project_item = LineItemFactory.create()
+
+        result = capture_claims(
+            self.certificate,
+            {
+                "csrfmiddlewaretoken": "token",
+                f"new_actual_quantity_{valid.pk}": "3",
+                f"new_actual_quantity_{negative.pk}": "-1",
+                f"new_actual_quantity_{invalid.pk}": "abc",
+                f"new_actual_quantity_{other_project_item.pk}": "1",
+                "edit_actual_quantity_999999": "1",
+                f"new_actual_quantity_{self._line_item().pk}": "",
+            },
+            self.user,
+        )
+
+        assert result.created == 1
+        assert len(result.errors) == 4
+        assert self.certificate.actual_transactions.get().line_item == valid
+
+    def test_query_count_is_independent_of_line_count(self):
+        def capture(count):
+            data = {
+                f"new_actual_quantity_{self._line_item().pk}": "1" for _ in range(count)
+            }
+            with CaptureQueriesContext(connection) as queries:
+                capture_claims(self.certificate, data, self.user)
+            return len(queries.captured_queries)
+
+        assert capture(2) == capture(40)
+
+    def test_generated_exports_are_reset(self):
+        line_item = self._line_item()
+        self.certificate.pdf = "payment_certificates/old.pdf"
+        self.certificate.save()
+
+        capture_claims(
+            self.certificate,
+            {f"new_actual_quantity_{line_item.pk}": "1"},
+            self.user,
+        )
+
+        self.certificate.refresh_from_db()
+        assert not self.certificate.pdf
+
+
+@pytest.mark.django_db
+class TestClaimGridPage:
+    def setup_method(self):
+        self.project = ProjectFactory.create()
+        self.previous = PaymentCertificateFactory.create(
+            project=self.project,
+            certificate_number=1,
+            status=PaymentCertificate.Status.APPROVED,
+        )
+        self.certificate = PaymentCertificateFactory.create(
+            project=self.project,
+            certificate_number=2,
+            status=PaymentCertificate.Status.DRAFT,
+        )
+
+    def test_rows_are_annotated_with_claims(self):
+        line_item = LineItemFactory.create(
+            project=self.project, budgeted_quantity=Decimal("100")
+        )
+        LineItemFactory.create(project=self.project, special_item=True)
+        ActualTransactionFactory.create(
+            payment_certificate=self.previous,
+            line_item=line_item,
+            quantity=Decimal("30"),
+            claimed=True,
+        )
+        current = ActualTransactionFactory.create(
+            payment_certificate=self.certificate,
+            line_item=line_item,
+            quantity=Decimal("5"),
+        )
+
+        (row,) = claim_grid_page(self.certificate).rows
+
+        assert row["claimed_to_date"] == line_item.claimed_to_date == Decimal("30")
+        assert row["remaining_quantity"] == Decimal("70")
+        assert row["current_transaction_id"] == current.pk
+        assert row["current_quantity"] == Decimal("35")
+
+    def test_keyset_pages_cover_every_row_once(self):
+        line_items = [
+            LineItemFactory.create(project=self.project, row_index=index // 2)
+            for index in range(5)
+        ]
+
+        seen, cursor = [], None
+        while True:
+            page = claim_grid_page(self.certificate, cursor=cursor, limit=2)
+            seen += [row["id"] for row in page.rows]
+            if not (cursor := page.next_cursor):
+                break
+
+        assert seen == [item.pk for item in line_items]
+
+    def test_filters_and_malformed_cursor(self):
+        match = LineItemFactory.create(project=self.project, description="Rebar")
+        LineItemFactory.create(project=self.project, description="Concrete")
+
+        page = claim_grid_page(self.certificate, filters={"description": "reb"})
+
+        assert [row["id"] for row in page.rows] == [match.pk]
+        with pytest.raises(ValueError):
+            claim_grid_page(self.certificate, cursor="oops")
@@ -0,0 +1,207 @@
+"""Tests for forecast revisions stored as deltas against their parent."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from app.Account.subscription_config import Subscription
+from app.Account.tests.factories import AccountFactory
+from app.BillOfQuantities.models import Forecast, ForecastTransaction
+from app.BillOfQuantities.tests.factories import (
+    BillFactory,
+    ForecastFactory,
+    ForecastTransactionFactory,
+    LineItemFactory,
+    StructureFactory,
+)
+from app.BillOfQuantities.views.forecast_views import ForecastCreateView
+from app.Project.models import ProjectRole, Role
+from app.Project.tests.factories import ProjectFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _line_items(project, count=3):
+    structure = StructureFactory.create(project=project)
+    bill = BillFactory.create(structure=structure)
+    return [
+        LineItemFactory.create(
+            project=project,
+            structure=structure,
+            bill=bill,
+            package=None,
+            is_work=True,
+            budgeted_quantity=Decimal("2"),
+            unit_price=Decimal("10.00"),
+            total_price=Decimal("20.00"),
+        )
+        for _ in range(count)
+    ]
+
+
+def _transactions(forecast, line_items, quantity="2"):
+    return [
+        ForecastTransactionFactory.create(
+            forecast=forecast,
+            line_item=line_item,
+            quantity=Decimal(quantity),
+            unit_price=Decimal("10.00"),
+            total_price=Decimal(quantity) * 10,
+        )
+        for line_item in line_items
+    ]
+
+
+class TestEffectiveTransactions:
+    def setup_method(self):
+        self.project = ProjectFactory.create()
+        self.line_items = _line_items(self.project)
+        self.root = ForecastFactory.create(
+            project=self.project,
+            period=date(2024, 1, 1),
+            status=Forecast.Status.APPROVED,
+        )
+        _transactions(self.root, self.line_items)
+
+    def test_root_forecast_uses_its_own_rows(self):
+        assert self.root.lineage() == [self.root.pk]
+        assert self.root.effective_transactions().count() == 3
+        assert self.root.total_forecast == Decimal("60.00")
+
+    def test_revision_inherits_and_overrides(self):
+        revision = ForecastFactory.create(
+            project=self.project, period=date(2024, 2, 1), parent=self.root
+        )
+        latest = ForecastFactory.create(
+            project=self.project, period=date(2024, 3, 1), parent=revision
+        )
+        (override,) = _transactions(revision, self.line_items[:1], quantity="5")
+
+        assert latest.lineage() == [latest.pk, revision.pk, self.root.pk]
+        effective = {ft.line_item_id: ft for ft in latest.effective_transactions()}
+        assert len(effective) == 3
+        assert effective[self.line_items[0].pk] == override
+        assert latest.total_forecast == Decimal("90.00")
+        assert self.root.total_forecast == Decimal("60.00")
+
+        structure = self.line_items[0].structure
+        assert structure.get_forecast_total(latest) == Decimal("90.00")
+        assert self.line_items[0].bill.get_forecast_total(revision) == Decimal("90.00")
+
+
+class TestForecastRevisionViews:
+    def setup_method(self):
+        self.user = AccountFactory.create(
+            subscription=Subscription.PAYMENTS_AND_INVOICES
+        )
+        self.project = ProjectFactory.create(
+            users=self.user, start_date=None, end_date=None
+        )
+        ProjectRole.objects.create(
+            user=self.user, project=self.project, role=Role.COST_FORECASTS
+        )
+        self.line_items = _line_items(self.project)
+        self.create_url = reverse(
+            "bill_of_quantities:forecast-create",
+            kwargs={"project_pk": self.project.pk},
+        )
+
+    def _create(self, client, period):
+        client.post(self.create_url, {"period": period})
+        return Forecast.objects.get(project=self.project, period=f"{period}-01")
+
+    def test_first_forecast_copies_line_items_then_revisions_store_none(self, client):
+        client.force_login(self.user)
+
+        first = self._create(client, "2024-01")
+        assert first.parent is None
+        assert first.forecast_transactions.count() == 3
+        Forecast.objects.filter(pk=first.pk).update(status=Forecast.Status.APPROVED)
+
+        revision = self._create(client, "2024-02")
+        assert revision.parent == first
+        assert not revision.forecast_transactions.exists()
+        assert revision.total_forecast == first.total_forecast == Decimal("60.00")
+
+    def test_edit_saves_only_changed_line_items(self, client):
+        root = ForecastFactory.create(
+            project=self.project,
+            period=date(2024, 1, 1),
+            status=Forecast.Status.APPROVED,
+        )
+        inherited = _transactions(root, self.line_items)
+        revision = ForecastFactory.create(
+            project=self.project, period=date(2024, 2, 1), parent=root
+        )
+        client.force_login(self.user)
+        data = {}
+        for ft in inherited:
+            data[f"quantity_{ft.pk}"] = str(ft.quantity)
+            data[f"unit_price_{ft.pk}"] = str(ft.unit_price)
+            data[f"notes_{ft.pk}"] = ""
+        data[f"quantity_{inherited[1].pk}"] = "4"
+
+        response = client.post(
+            reverse(
+                "bill_of_quantities:forecast-edit",
+                kwargs={"project_pk": self.project.pk, "pk": revision.pk},
+            ),
+            data,
+        )
+
+        assert response.status_code == 302
+        (override,) = revision.forecast_transactions.all()
+        assert override.line_item == self.line_items[1]
+        assert override.total_price == Decimal("40.00")
+        assert ForecastTransaction.objects.get(pk=inherited[1].pk).quantity == 2
+        assert revision.total_forecast == Decimal("80.00")
+
+        # Editing the revision's own row again updates it in place
+        data[f"quantity_{override.pk}"] = "3"
+        data[f"unit_price_{override.pk}"] = "10"
+        client.post(
+            reverse(
+                "bill_of_quantities:forecast-edit",
+                kwargs={"project_pk": self.project.pk, "pk": revision.pk},
+            ),
+            {
+                key: value
+                for key, value in data.items()
+                if not key.endswith(f"_{inherited[1].pk}")
+            },
+        )
+        assert list(
+            revision.forecast_transactions.values_list("quantity", flat=True)
+        ) == [Decimal("3")]
+
+    def test_draft_forecasts_are_copied_not_inherited(self):
+        draft = ForecastFactory.create(project=self.project, period=date(2024, 1, 1))
+        _transactions(draft, self.line_items)
+        forecast = ForecastFactory.create(project=self.project, period=date(2024, 2, 1))
+
+        ForecastCreateView()._create_forecast_transactions(forecast)
+
+        assert forecast.parent is None
+        assert forecast.forecast_transactions.count() == 3
+        assert forecast.total_forecast == Decimal("60.00")
+
+    def test_forecasts_with_revisions_cannot_be_edited(self, client):
+        root = ForecastFactory.create(project=self.project, period=date(2024, 1, 1))
+        (ft, *_) = _transactions(root, self.line_items)
+        ForecastFactory.create(
+            project=self.project, period=date(2024, 2, 1), parent=root
+        )
+        client.force_login(self.user)
+
+        client.post(
+            reverse(
+                "bill_of_quantities:forecast-edit",
+                kwargs={"project_pk": self.project.pk, "pk": root.pk},
+            ),
+            {f"quantity_{ft.pk}": "9", f"unit_price_{ft.pk}": "10"},
+        )
+
+        ft.refresh_from_db()
+        assert ft.quantity == 2
@@ -700,3 +700,59 @@ class TestPaymentCertificatePDFDownloadAccess:
         assert (
             response.status_code == 302
         )  # redirects because certificate is not approved
+
+
+@pytest.mark.django_db
+class TestPaymentCertificateClaimGridView:
+    """Test cases for the edit page's claim grid and ledger panel endpoints."""
+
+    def _setup(self, client):
+        user = AccountFactory.create()
+        project = ProjectFactory.create(users=user)
+        certificate = PaymentCertificateFactory.create(
+            project=project, status=PaymentCertificate.Status.DRAFT
+        )
+        client.force_login(user)
+        return project, certificate
+
+    def test_claim_grid_returns_pages_with_cursor(self, client):
+        """Test the grid endpoint pages rows by cursor."""
+        project, certificate = self._setup(client)
+        line_items = [
+            LineItemFactory.create(project=project, row_index=index)
+            for index in range(3)
+        ]
+        url = reverse(
+            "bill_of_quantities:payment-certificate-claim-grid",
+            kwargs={"project_pk": project.pk, "pk": certificate.pk},
+        )
+
+        first = client.get(url, {"limit": 2}).json()
+        second = client.get(url, {"limit": 2, "cursor": first["next_cursor"]}).json()
+
+        assert [row["id"] for row in first["rows"] + second["rows"]] == [
+            item.pk for item in line_items
+        ]
+        assert second["next_cursor"] is None
+        assert client.get(url, {"cursor": "bad"}).status_code == 400
+
+    def test_ledger_panel_renders_on_demand(self, client):
+        """Test ledger panels render individually and unknown ledgers 404."""
+        project, certificate = self._setup(client)
+        LineItemFactory.create(project=project)
+
+        def panel_url(ledger):
+            return reverse(
+                "bill_of_quantities:payment-certificate-ledger-panel",
+                kwargs={
+                    "project_pk": project.pk,
+                    "pk": certificate.pk,
+                    "ledger": ledger,
+                },
+            )
+
+        response = client.get(panel_url("retention"))
+
+        assert response.status_code == 200
+        assert b"retention_list_modal" in response.content
+        assert client.get(panel_url("unknown")).status_code == 404
@@ -0,0 +1,147 @@
+"""Tests for WBS rollups of line item totals."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.Account.subscription_config import Subscription
+from app.Account.tests.factories import AccountFactory
+from app.BillOfQuantities.models import Forecast, PaymentCertificate
+from app.BillOfQuantities.tests.factories import (
+    ActualTransactionFactory,
+    BillFactory,
+    ForecastFactory,
+    ForecastTransactionFactory,
+    LineItemFactory,
+    PackageFactory,
+    PaymentCertificateFactory,
+    StructureFactory,
+)
+from app.BillOfQuantities.wbs import build_wbs_tree
+from app.Cost.models import Cost
+from app.Project.models import ProjectRole, Role
+from app.Project.tests.factories import ProjectFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _build_wbs(project, structures=2, bills=2):
+    """Structures of bills of one package, each with a work and heading item."""
+    for s in range(structures):
+        structure = StructureFactory.create(project=project, name=f"S{s}")
+        for _ in range(bills):
+            package = PackageFactory.create(
+                bill=BillFactory.create(structure=structure)
+            )
+            for is_work in (True, False):
+                LineItemFactory.create(
+                    project=project,
+                    structure=structure,
+                    bill=package.bill,
+                    package=package,
+                    is_work=is_work,
+                    unit_price=Decimal("10.00"),
+                    budgeted_quantity=Decimal("3"),
+                    total_price=Decimal("30.00"),
+                )
+
+
+class TestBuildWbsTree:
+    def setup_method(self):
+        self.project = ProjectFactory.create()
+        _build_wbs(self.project)
+
+    def test_budget_matches_model_totals(self):
+        tree = build_wbs_tree(self.project)
+
+        assert [node.obj.name for node in tree.structures] == ["S0", "S1"]
+        for node in tree.structures:
+            structure = node.obj
+            assert node.budget == structure.budget_total == Decimal("60.00")
+            assert node.line_item_value == structure.get_total_value()
+            assert node.line_item_count == structure.get_total_line_items() == 4
+            for bill_node in node.children:
+                assert bill_node.budget == bill_node.obj.budget_total
+                assert bill_node.children[0].budget == Decimal("30.00")
+        assert tree.total.budget == Decimal("120.00")
+
+    def test_forecast_certified_and_costs(self):
+        forecast = ForecastFactory.create(project=self.project)
+        approved = PaymentCertificateFactory.create(
+            project=self.project, status=PaymentCertificate.Status.APPROVED
+        )
+        draft = PaymentCertificateFactory.create(project=self.project)
+        work_item = self.project.line_items.filter(is_work=True).first()
+        ForecastTransactionFactory.create(
+            forecast=forecast, line_item=work_item, total_price=Decimal("45.00")
+        )
+        for certificate in (approved, draft):
+            ActualTransactionFactory.create(
+                payment_certificate=certificate,
+                line_item=work_item,
+                total_price=Decimal("12.00"),
+            )
+        Cost.objects.create(
+            bill=work_item.bill,
+            date=date(2024, 1, 1),
+            category=Cost.Category.MATERIAL,
+            description="Cement",
+            quantity=Decimal("2"),
+            unit_price=Decimal("50"),
+            vat=False,
+        )
+
+        tree = build_wbs_tree(
+            self.project, forecast=forecast, certified=True, costs=True
+        )
+
+        structure = next(n for n in tree.structures if n.obj == work_item.structure)
+        bill = next(n for n in structure.children if n.obj == work_item.bill)
+        assert structure.forecast == structure.obj.get_forecast_total(forecast)
+        assert bill.forecast == bill.obj.get_forecast_total(forecast)
+        assert bill.variance == Decimal("15.00")
+        assert bill.certified == structure.certified == Decimal("12.00")
+        assert (bill.cost, bill.cost_count) == (Decimal("100.00"), 1)
+        assert tree.total.cost == structure.cost == Decimal("100.00")
+
+    def test_queries_do_not_grow_with_the_wbs(self):
+        forecast = ForecastFactory.create(project=self.project)
+        with CaptureQueriesContext(connection) as small:
+            build_wbs_tree(
+                self.project,
+                forecast=Forecast.objects.get(pk=forecast.pk),
+                certified=True,
+                costs=True,
+            )
+        _build_wbs(self.project, structures=3, bills=4)
+        with CaptureQueriesContext(connection) as large:
+            build_wbs_tree(
+                self.project,
+                forecast=Forecast.objects.get(pk=forecast.pk),
+                certified=True,
+                costs=True,
+            )
+
+        assert len(small.captured_queries) == len(large.captured_queries)
+
+
+def test_structure_list_shows_rolled_up_totals(client):
+    user = AccountFactory.create(subscription=Subscription.PAYMENTS_AND_INVOICES)
+    project = ProjectFactory.create(users=user)
+    ProjectRole.objects.create(user=user, project=project, role=Role.CONTRACT_BOQ)
+    _build_wbs(project, structures=1, bills=2)
+    client.force_login(user)
+
+    response = client.get(
+        reverse("bill_of_quantities:structure-list", kwargs={"project_pk": project.pk})
+    )
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "2 bills" in content
+    assert "4 items" in content
+    assert "Total: R 120.00" in content
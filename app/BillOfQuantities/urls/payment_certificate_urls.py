@@ -27,6 +27,16 @@ payment_certificate_urls = [
         payment_certificate_views.PaymentCertificateEditView.as_view(),
         name="payment-certificate-edit",
     ),
+    path(
+        "project/<int:project_pk>/payment-certificates/<int:pk>/claim-grid/",
+        payment_certificate_views.PaymentCertificateClaimGridView.as_view(),
+        name="payment-certificate-claim-grid",
+    ),
+    path(
+        "project/<int:project_pk>/payment-certificates/<int:pk>/ledger/<slug:ledger>/",
+        payment_certificate_views.PaymentCertificateLedgerPanelView.as_view(),
+        name="payment-certificate-ledger-panel",
+    ),
     path(
         "project/<int:project_pk>/payment-certificates/<int:pk>/submit/",
         payment_certificate_views.PaymentCertificateSubmitView.as_view(),
@@ -21,11 +21,12 @@ from app.BillOfQuantities.models import (
     Package,
     Structure,
 )
+from app.BillOfQuantities.wbs import build_wbs_tree
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.subscription_and_role_mixin import (
     SubscriptionAndRoleRequiredMixin,
 )
-from app.Project.models import Project, Role
+from app.Project.models import Project, ProjectDataVersion, Role
 
 
 class ForecastMixin(SubscriptionAndRoleRequiredMixin, BreadcrumbMixin):
@@ -183,7 +184,12 @@ class ForecastCreateView(ForecastMixin, TemplateView):
         )
 
     def _create_forecast_transactions(self: "ForecastCreateView", forecast):
-        """Create ForecastTransactions based on latest forecast or original line items."""
+        """Base the forecast on the latest forecast, or on the original line items.
+
+        A revision of an approved forecast stores no transactions of its
+        own: it inherits the parent's until a line item is edited. A draft
+        can still change, so its rows are copied instead.
+        """
         project = forecast.project
 
         # Get latest forecast (excluding the one we just created)
@@ -194,33 +200,38 @@ class ForecastCreateView(ForecastMixin, TemplateView):
             .first()
         )
 
-        if latest_forecast:
-            # Clone from latest forecast
-            latest_transactions = latest_forecast.forecast_transactions.all()
-            for transaction in latest_transactions:
-                ForecastTransaction.objects.create(
+        if latest_forecast and latest_forecast.status == Forecast.Status.APPROVED:
+            forecast.parent = latest_forecast
+            forecast.save(update_fields=["parent"])
+        elif latest_forecast:
+            ForecastTransaction.objects.bulk_create(
+                ForecastTransaction(
                     forecast=forecast,
-                    line_item=transaction.line_item,
-                    quantity=transaction.quantity,
-                    unit_price=transaction.unit_price,
-                    total_price=transaction.total_price,
+                    line_item_id=ft.line_item_id,
+                    quantity=ft.quantity,
+                    unit_price=ft.unit_price,
+                    total_price=ft.total_price,
+                    notes=ft.notes,
                 )
+                for ft in latest_forecast.effective_transactions()
+            )
         else:
             # Create from original line items
             line_items = LineItem.objects.filter(
                 project=project,
                 is_work=True,  # Only create for work items
                 special_item=False,  # Exclude special items
-            ).select_related("structure", "bill", "package")
-
-            for line_item in line_items:
-                ForecastTransaction.objects.create(
+            )
+            ForecastTransaction.objects.bulk_create(
+                ForecastTransaction(
                     forecast=forecast,
                     line_item=line_item,
                     quantity=line_item.budgeted_quantity or Decimal("0.00"),
                     unit_price=line_item.unit_price or Decimal("0.00"),
                     total_price=line_item.total_price or Decimal("0.00"),
                 )
+                for line_item in line_items
+            )
 
 
 class ForecastEditView(ForecastMixin, DetailView):
@@ -281,13 +292,17 @@ class ForecastEditView(ForecastMixin, DetailView):
         if bill_filter:
             packages = packages.filter(bill_id=bill_filter)
 
-        # Get all forecast transactions with related data
-        transactions = forecast.forecast_transactions.select_related(
-            "line_item",
-            "line_item__structure",
-            "line_item__bill",
-            "line_item__package",
-        ).order_by("line_item__row_index")
+        # Get all forecast transactions (own and inherited) with related data
+        transactions = (
+            forecast.effective_transactions()
+            .select_related(
+                "line_item",
+                "line_item__structure",
+                "line_item__bill",
+                "line_item__package",
+            )
+            .order_by("line_item__row_index")
+        )
 
         # Apply filters if provided
         if structure_filter:
@@ -346,6 +361,18 @@ class ForecastEditView(ForecastMixin, DetailView):
                     kwargs={"project_pk": forecast.project.pk, "pk": forecast.pk},
                 )
             )
+        # Later revisions inherit this forecast's rows, so editing it would
+        # change their totals too
+        if forecast.revisions.exists():
+            messages.error(
+                request, "Cannot edit a forecast that later forecasts are based on."
+            )
+            return redirect(
+                reverse(
+                    "bill_of_quantities:forecast-edit",
+                    kwargs={"project_pk": forecast.project.pk, "pk": forecast.pk},
+                )
+            )
 
         # Update each transaction
         transaction_data = {}
@@ -371,42 +398,73 @@ class ForecastEditView(ForecastMixin, DetailView):
                     transaction_data[transaction_id] = {}
                 transaction_data[transaction_id]["notes"] = value
 
-        with transaction.atomic():
-            for transaction_id, data in transaction_data.items():
-                try:
-                    ft = ForecastTransaction.objects.get(
-                        id=transaction_id, forecast=forecast
+        # Posted ids may belong to an ancestor forecast: edits to those are
+        # saved as new rows on this forecast, overriding the inherited ones.
+        effective = {
+            str(ft.pk): ft
+            for ft in forecast.effective_transactions().filter(
+                pk__in=[pk for pk in transaction_data if pk.isdigit()]
+            )
+        }
+        changed, overrides = [], []
+        for transaction_id, data in transaction_data.items():
+            ft = effective.get(transaction_id)
+            try:
+                if ft is None:
+                    raise ForecastTransaction.DoesNotExist
+                quantity = Decimal(data.get("quantity", ft.quantity))
+                unit_price = Decimal(data.get("unit_price", ft.unit_price))
+            except (
+                ForecastTransaction.DoesNotExist,
+                ValueError,
+                InvalidOperation,
+            ):
+                messages.error(
+                    request, f"Invalid data for transaction {transaction_id}"
+                )
+                return redirect(
+                    reverse(
+                        "bill_of_quantities:forecast-edit",
+                        kwargs={
+                            "project_pk": forecast.project.pk,
+                            "pk": forecast.pk,
+                        },
                     )
+                )
 
-                    # Update quantity and unit price, then recalculate total
-                    if "quantity" in data:
-                        ft.quantity = Decimal(data["quantity"])
-                    if "unit_price" in data:
-                        ft.unit_price = Decimal(data["unit_price"])
-                    if "notes" in data:
-                        ft.notes = data["notes"]
-
-                    # Recalculate total price
-                    ft.total_price = ft.quantity * ft.unit_price
-                    ft.save()
-
-                except (
-                    ForecastTransaction.DoesNotExist,
-                    ValueError,
-                    InvalidOperation,
-                ):
-                    messages.error(
-                        request, f"Invalid data for transaction {transaction_id}"
-                    )
-                    return redirect(
-                        reverse(
-                            "bill_of_quantities:forecast-edit",
-                            kwargs={
-                                "project_pk": forecast.project.pk,
-                                "pk": forecast.pk,
-                            },
-                        )
+            notes = data.get("notes", ft.notes)
+            # Recalculate total price, at the precision it is stored with
+            total_price = (quantity * unit_price).quantize(Decimal("0.01"))
+            if (quantity, unit_price, total_price, notes) == (
+                ft.quantity,
+                ft.unit_price,
+                ft.total_price,
+                ft.notes,
+            ):
+                continue
+            if ft.forecast_id == forecast.pk:
+                ft.quantity, ft.unit_price = quantity, unit_price
+                ft.total_price, ft.notes = total_price, notes
+                changed.append(ft)
+            else:
+                overrides.append(
+                    ForecastTransaction(
+                        forecast=forecast,
+                        line_item_id=ft.line_item_id,
+                        quantity=quantity,
+                        unit_price=unit_price,
+                        total_price=total_price,
+                        notes=notes,
                     )
+                )
+
+        with transaction.atomic():
+            ForecastTransaction.objects.bulk_update(
+                changed, ["quantity", "unit_price", "total_price", "notes"]
+            )
+            ForecastTransaction.objects.bulk_create(overrides)
+            # Bulk writes skip the signal that invalidates cached reports
+            ProjectDataVersion.bump(forecast.project_id)
 
         messages.success(request, "Forecast updated successfully!")
 
@@ -470,13 +528,17 @@ class ForecastApproveView(ForecastMixin, DetailView):
 
         context["project"] = project
 
-        # Get all forecast transactions
-        all_transactions = forecast.forecast_transactions.select_related(
-            "line_item",
-            "line_item__structure",
-            "line_item__bill",
-            "line_item__package",
-        ).order_by("line_item__row_index")
+        # Get all forecast transactions, including those inherited unchanged
+        all_transactions = (
+            forecast.effective_transactions()
+            .select_related(
+                "line_item",
+                "line_item__structure",
+                "line_item__bill",
+                "line_item__package",
+            )
+            .order_by("line_item__row_index")
+        )
 
         # Filter to only show transactions that differ from original line item
         # (quantity or total_price differs)
@@ -551,9 +613,7 @@ class ForecastApproveView(ForecastMixin, DetailView):
         context["changed_count"] = len(changed_transactions)
 
         # Calculate totals
-        total_forecast = forecast.forecast_transactions.aggregate(
-            total=Sum("total_price")
-        )["total"] or Decimal("0.00")
+        total_forecast = forecast.total_forecast
 
         # Calculate original budget total
         original_budget = LineItem.objects.filter(
@@ -572,9 +632,7 @@ class ForecastApproveView(ForecastMixin, DetailView):
         )
 
         if prior_forecast:
-            prior_forecast_total = prior_forecast.forecast_transactions.aggregate(
-                total=Sum("total_price")
-            )["total"] or Decimal("0.00")
+            prior_forecast_total = prior_forecast.total_forecast
             context["prior_forecast"] = prior_forecast
             context["prior_forecast_total"] = prior_forecast_total
         else:
@@ -585,36 +643,25 @@ class ForecastApproveView(ForecastMixin, DetailView):
         context["original_budget"] = original_budget
         context["difference"] = total_forecast - original_budget
 
-        # Build L1/L2 summary data (structures and bills) - use default ordering
-        structure_summary = []
-        for structure in project.structures.all():
-            budget_total = structure.budget_total
-            forecast_total = structure.get_forecast_total(forecast)
-            variance = forecast_total - budget_total
-
-            bills_data = []
-            for bill in structure.bills.all():
-                bill_budget = bill.budget_total
-                bill_forecast = bill.get_forecast_total(forecast)
-                bill_variance = bill_forecast - bill_budget
-                bills_data.append(
+        # Build L1/L2 summary data (structures and bills) in grouped queries
+        structure_summary = [
+            {
+                "structure": structure.obj,
+                "budget_total": structure.budget,
+                "forecast_total": structure.forecast,
+                "variance": structure.variance,
+                "bills": [
                     {
-                        "bill": bill,
-                        "budget_total": bill_budget,
-                        "forecast_total": bill_forecast,
-                        "variance": bill_variance,
+                        "bill": bill.obj,
+                        "budget_total": bill.budget,
+                        "forecast_total": bill.forecast,
+                        "variance": bill.variance,
                     }
-                )
-
-            structure_summary.append(
-                {
-                    "structure": structure,
-                    "budget_total": budget_total,
-                    "forecast_total": forecast_total,
-                    "variance": variance,
-                    "bills": bills_data,
-                }
-            )
+                    for bill in structure.children
+                ],
+            }
+            for structure in build_wbs_tree(project, forecast=forecast).structures
+        ]
 
         context["structure_summary"] = structure_summary
 
@@ -708,9 +755,7 @@ class ForecastListView(ForecastMixin, ListView):
         previous_forecast_total = None
 
         for forecast in context["forecasts"]:
-            forecast_total = forecast.forecast_transactions.aggregate(
-                total=Sum("total_price")
-            )["total"] or Decimal("0.00")
+            forecast_total = forecast.total_forecast
 
             if previous_forecast_total is not None:
                 month_to_month_variance = forecast_total - previous_forecast_total
@@ -742,9 +787,7 @@ class ForecastListView(ForecastMixin, ListView):
         latest_approved = approved_forecasts.order_by("-period").first()
         latest_forecast_total = Decimal("0.00")
         if latest_approved:
-            latest_forecast_total = latest_approved.forecast_transactions.aggregate(
-                total=Sum("total_price")
-            )["total"] or Decimal("0.00")
+            latest_forecast_total = latest_approved.total_forecast
 
         # CPI and SPI
         context["current_cpi"] = project.get_cost_performance_index(current_date)
@@ -811,9 +854,7 @@ class ForecastListView(ForecastMixin, ListView):
                 ).first()
 
                 if forecast:
-                    forecast_total = forecast.forecast_transactions.aggregate(
-                        total=Sum("total_price")
-                    )["total"] or Decimal("0.00")
+                    forecast_total = forecast.total_forecast
                     forecast_values.append(float(forecast_total))
                 else:
                     forecast_values.append(None)  # No data for this month
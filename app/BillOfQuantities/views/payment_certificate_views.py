@@ -1,10 +1,10 @@
 import logging
 from datetime import date, datetime
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 
 from django.contrib import messages
 from django.db.models import Sum
-from django.http import FileResponse, HttpResponse, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.generic import DetailView, ListView, TemplateView, UpdateView, View
@@ -32,6 +32,11 @@ from app.BillOfQuantities.models.ledger_models import (
     Retention,
     SpecialItemTransaction,
 )
+from app.BillOfQuantities.services import (
+    CLAIM_GRID_PAGE_SIZE,
+    capture_claims,
+    claim_grid_page,
+)
 from app.BillOfQuantities.tasks import (
     generate_pdf_async,
     group_line_items_by_hierarchy,
@@ -445,58 +450,18 @@ class PaymentCertificateEditView(PaymentCertificateMixin, TemplateView):
                 pk=pk,
             )
 
-        # Prefetch line items with related data
-        all_line_items = project.get_line_items
-        line_items = all_line_items.filter(special_item=False, addendum=False)
-        special_line_items = all_line_items.filter(special_item=True, addendum=False)
-        addendum_line_items = all_line_items.filter(addendum=True, special_item=False)
-
-        # Apply filters
+        # Apply filters; the claim grid itself is paged in by
+        # PaymentCertificateClaimGridView with the same parameters
         structure_id = request.GET.get("structure")
         bill_id = request.GET.get("bill")
-        package_id = request.GET.get("package")
-        description = request.GET.get("description")
-
         if structure_id:
-            line_items = line_items.filter(structure_id=structure_id)
             bills = bills.filter(structure_id=structure_id)
         if bill_id:
-            line_items = line_items.filter(bill_id=bill_id)
             packages = packages.filter(bill_id=bill_id)
-        if package_id:
-            line_items = line_items.filter(package_id=package_id)
-        if description:
-            line_items = line_items.filter(description__icontains=description)
-
-        # Get ledger forms
-        advanced_payment_form = AdvancedPaymentCreateUpdateForm(project=project)
-        materials_on_site_form = MaterialsOnSiteCreateUpdateForm(project=project)
-        retention_form = RetentionCreateUpdateCreateForm(project=project)
-        escalation_form = EscalationCreateUpdateForm(project=project)
-
-        # Get ledger transactions with running balances
-        advance_payment_transactions, advance_payment_balance = (
-            get_ledger_transactions_with_balance(AdvancePayment, project)
-        )
-        retention_transactions, retention_balance = (
-            get_ledger_transactions_with_balance(Retention, project)
-        )
-        materials_transactions, materials_balance = (
-            get_ledger_transactions_with_balance(MaterialsOnSite, project)
-        )
-        escalation_transactions, escalation_balance = (
-            get_ledger_transactions_with_balance(Escalation, project)
-        )
-        special_item_transactions, special_item_balance = (
-            get_ledger_transactions_with_balance(SpecialItemTransaction, project)
-        )
 
         context = {
             "project": project,
             "payment_certificate": payment_certificate,
-            "line_items": line_items,
-            "special_line_items": special_line_items,
-            "addendum_line_items": addendum_line_items,
             "structures": structures,
             "bills": bills,
             "packages": packages,
@@ -505,27 +470,6 @@ class PaymentCertificateEditView(PaymentCertificateMixin, TemplateView):
             "workings": payment_certificate.workings.all().order_by("-created_at"),
             "photo_form": PaymentCertificatePhotoForm(),
             "working_form": PaymentCertificateWorkingForm(),
-            # Ledger forms
-            "advanced_payment_form": advanced_payment_form,
-            "materials_on_site_form": materials_on_site_form,
-            "retention_form": retention_form,
-            "escalation_form": escalation_form,
-            # Ledger transactions
-            "advance_payment_transactions": advance_payment_transactions,
-            "advance_payment_balance": advance_payment_balance,
-            "retention_transactions": retention_transactions,
-            "retention_balance": retention_balance,
-            "materials_transactions": materials_transactions,
-            "materials_balance": materials_balance,
-            "escalation_transactions": escalation_transactions,
-            "escalation_balance": escalation_balance,
-            "special_item_transactions": special_item_transactions,
-            "special_item_balance": special_item_balance,
-            # Additional context for special items modal
-            "payment_certificates": project.payment_certificates.all().order_by(
-                "-certificate_number"
-            ),
-            "special_item_types": SpecialItemTransaction.SpecialItemType.choices,
         }
         return render(request, str(self.template_name), context)
 
@@ -611,97 +555,19 @@ class PaymentCertificateEditView(PaymentCertificateMixin, TemplateView):
                 pk=pk,
             )
 
-        # Process actual quantities and create/update ActualTransaction records
-        transactions_created = 0
-        transactions_updated = 0
-
-        for key, value in request.POST.items():
-            line_item_pk = ""
-            actual_transaction_pk = ""
-            try:
-                value = Decimal(value)
-            except (ValueError, TypeError, InvalidOperation):
-                # ignore invalid values
-                continue
-            if value < 0:
-                # can be zero, in case someone wants to uncertify everything
-                # ignore invalid values
-                continue
-
-            if key.startswith("new_actual_quantity_"):
-                # new transaction
-                line_item_pk = key.replace("new_actual_quantity_", "")
-                line_item: LineItem = project.line_items.get(pk=int(line_item_pk))
-                if not line_item.special_item:
-                    # normal / addendum item - working with quantities
-                    new_quantity = value
-                    claimed_quantity = new_quantity - line_item.claimed_to_date
-                    ActualTransaction.objects.create(
-                        payment_certificate=payment_certificate,
-                        line_item=line_item,
-                        quantity=claimed_quantity,
-                        unit_price=line_item.unit_price,
-                        total_price=line_item.unit_price * claimed_quantity,
-                        captured_by=request.user,
-                    )
-                    transactions_created += 1
-
-                else:
-                    # special item - working with values
-                    claimed_value = value - line_item.claimed_to_date_value
-                    ActualTransaction.objects.create(
-                        payment_certificate=payment_certificate,
-                        line_item=line_item,
-                        quantity=0,
-                        unit_price=0,
-                        total_price=claimed_value,
-                        captured_by=request.user,
-                    )
-                    transactions_created += 1
-
-            elif key.startswith("edit_actual_quantity_"):
-                # edit previously created transaction
-                actual_transaction_pk = key.replace("edit_actual_quantity_", "")
-                try:
-                    actual_transaction: ActualTransaction = (
-                        ActualTransaction.objects.get(pk=actual_transaction_pk)
-                    )
-                except ActualTransaction.DoesNotExist:
-                    continue
-
-                line_item = actual_transaction.line_item
-                if not line_item.special_item:
-                    # normal item / addendum - update quantity
-                    update_quantity = value
-
-                    claimed_quantity = update_quantity - line_item.claimed_to_date
-                    actual_transaction.quantity = claimed_quantity
-                    actual_transaction.unit_price = (
-                        actual_transaction.line_item.unit_price
-                    )
-                    actual_transaction.total_price = (
-                        claimed_quantity * actual_transaction.unit_price
-                    )
-                    actual_transaction.save()
-                    transactions_updated += 1
-
-                else:
-                    # special item - update value
-                    claimed_value = value - line_item.claimed_to_date_value
-                    actual_transaction.quantity = 0
-                    actual_transaction.unit_price = 0
-                    actual_transaction.total_price = claimed_value
-                    actual_transaction.save()
-                    transactions_updated += 1
+        # Create/update ActualTransaction records for all posted claims at once
+        result = capture_claims(payment_certificate, request.POST, request.user)
+        for error in result.errors:
+            messages.error(request, error)
 
         # Show success message
-        if transactions_created or transactions_updated:
+        if result.created or result.updated:
             messages.success(
                 request,
-                f"Payment certificate updated: {transactions_created} new transactions, "
-                f"{transactions_updated} updated.",
+                f"Payment certificate updated: {result.created} new transactions, "
+                f"{result.updated} updated.",
             )
-        else:
+        elif not result.errors:
             messages.info(request, "No changes were made.")
 
         return redirect(
@@ -710,6 +576,90 @@ class PaymentCertificateEditView(PaymentCertificateMixin, TemplateView):
         )
 
 
+class PaymentCertificateClaimGridView(PaymentCertificateMixin, View):
+    """JSON endpoint serving the edit page's claim grid one keyset page at a time."""
+
+    roles = PaymentCertificateEditView.roles
+
+    def get(self, request, pk=None, project_pk=None):
+        project = self.get_project()
+        payment_certificate = get_object_or_404(
+            PaymentCertificate, pk=pk, project=project
+        )
+        try:
+            limit = int(request.GET.get("limit", CLAIM_GRID_PAGE_SIZE))
+            page = claim_grid_page(
+                payment_certificate,
+                filters=request.GET,
+                cursor=request.GET.get("cursor"),
+                limit=limit,
+            )
+        except ValueError:
+            return JsonResponse({"error": "Invalid cursor or limit"}, status=400)
+
+        return JsonResponse({"rows": page.rows, "next_cursor": page.next_cursor})
+
+
+LEDGER_PANELS = {
+    "advance-payment": (
+        AdvancePayment,
+        "ledger/modals/advance_payment_list_modal.html",
+    ),
+    "retention": (Retention, "ledger/modals/retention_list_modal.html"),
+    "materials": (MaterialsOnSite, "ledger/modals/materials_list_modal.html"),
+    "escalation": (Escalation, "ledger/modals/escalation_list_modal.html"),
+    "special-item": (
+        SpecialItemTransaction,
+        "ledger/modals/special_item_list_modal.html",
+    ),
+}
+
+
+class PaymentCertificateLedgerPanelView(PaymentCertificateMixin, View):
+    """Render one ledger list modal for the edit page when it is first opened."""
+
+    roles = PaymentCertificateEditView.roles
+
+    def get(self, request, pk=None, project_pk=None, ledger=None):
+        if ledger not in LEDGER_PANELS:
+            raise Http404("Unknown ledger")
+        project = self.get_project()
+        payment_certificate = get_object_or_404(
+            PaymentCertificate, pk=pk, project=project
+        )
+        model_class, template_name = LEDGER_PANELS[ledger]
+        transactions, balance = get_ledger_transactions_with_balance(
+            model_class, project
+        )
+
+        context = {
+            "project": project,
+            "payment_certificate": payment_certificate,
+            "transactions": transactions,
+            "current_balance": balance,
+        }
+        if ledger == "advance-payment":
+            context["advanced_payment_form"] = AdvancedPaymentCreateUpdateForm(
+                project=project
+            )
+        elif ledger == "retention":
+            context["retention_form"] = RetentionCreateUpdateCreateForm(project=project)
+        elif ledger == "materials":
+            context["materials_on_site_form"] = MaterialsOnSiteCreateUpdateForm(
+                project=project
+            )
+        elif ledger == "escalation":
+            context["escalation_form"] = EscalationCreateUpdateForm(project=project)
+        else:
+            context["payment_certificates"] = (
+                project.payment_certificates.all().order_by("-certificate_number")
+            )
+            context["special_item_types"] = (
+                SpecialItemTransaction.SpecialItemType.choices
+            )
+        return render(request, template_name, context)
+
+
 class PaymentCertificateSubmitView(
     PaymentCertificateMixin, LineItemDetailMixin, UpdateView
 ):
@@ -1140,7 +1090,8 @@ class PaymentCertificateEmailView(PaymentCertificateMixin, View):
 
         if response:
             messages.success(
-                request, "Payment certificate sent to signatories successfully!"
+                request,
+                "Payment certificate email queued for sending to signatories.",
             )
         else:
             messages.error(request, message)
@@ -22,6 +22,7 @@ from app.BillOfQuantities.forms import (
     StructureForm,
 )
 from app.BillOfQuantities.models import Structure
+from app.BillOfQuantities.wbs import build_wbs_tree
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.subscription_and_role_mixin import (
     SubscriptionAndRoleRequiredMixin,
@@ -45,9 +46,10 @@ class StructureListView(SubscriptionAndRoleRequiredMixin, BreadcrumbMixin, ListV
         return Structure.objects.filter(project=project).select_related("project")
 
     def get_context_data(self, **kwargs):
-        """Add project to context."""
+        """Add project and the structure/bill totals to context."""
         context = super().get_context_data(**kwargs)
         context["project"] = self.get_project()
+        context["structure_nodes"] = build_wbs_tree(self.get_project()).structures
         return context
 
     def get_breadcrumbs(self) -> list[BreadcrumbItem]:
@@ -0,0 +1,183 @@
+"""WBS rollups: budget, forecast, certified and cost totals per level.
+
+``build_wbs_tree`` totals a project's line items at structure, bill and
+package level with one grouped query per measure, so pages showing the
+whole breakdown run in a constant number of queries however large the
+WBS is::
+
+    tree = build_wbs_tree(project, forecast=forecast, costs=True)
+    for structure in tree.structures:
+        structure.obj, structure.budget, structure.forecast
+        for bill in structure.children:
+            ...
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from django.db.models import Count, Q, Sum
+
+from .models import (
+    ActualTransaction,
+    Bill,
+    LineItem,
+    Package,
+    PaymentCertificate,
+    Structure,
+)
+
+if TYPE_CHECKING:
+    from app.Project.models import Project
+
+    from .models import Forecast
+
+ZERO = Decimal("0.00")
+# Work items only, as Structure.budget_total and Bill.budget_total count them
+BUDGET_FILTER = Q(is_work=True, special_item=False)
+
+
+@dataclass
+class WBSNode:
+    """Totals of one structure, bill or package (``obj``) and its children."""
+
+    obj: Structure | Bill | Package | None
+    budget: Decimal = ZERO
+    forecast: Decimal = ZERO
+    certified: Decimal = ZERO
+    cost: Decimal = ZERO
+    # All line items, headings included, and their value (get_total_value)
+    line_item_count: int = 0
+    line_item_value: Decimal = ZERO
+    cost_count: int = 0
+    children: list[WBSNode] = field(default_factory=list)
+
+    @property
+    def variance(self) -> Decimal:
+        return self.forecast - self.budget
+
+
+@dataclass
+class WBSTree:
+    """A project's structures as ``WBSNode`` trees, plus project totals."""
+
+    structures: list[WBSNode]
+    total: WBSNode
+
+
+def build_wbs_tree(
+    project: Project,
+    forecast: Forecast | None = None,
+    certified: bool = False,
+    costs: bool = False,
+) -> WBSTree:
+    """Roll the project's line items up its structure/bill/package tree.
+
+    Budget and line item totals are always computed; forecast totals when a
+    ``forecast`` is given, approved certified-to-date values when
+    ``certified`` and cost register totals (per bill) when ``costs``.
+    """
+    structures = {
+        structure.pk: WBSNode(structure)
+        for structure in Structure.objects.filter(project=project).order_by("name")
+    }
+    bills = {
+        bill.pk: WBSNode(bill)
+        for bill in Bill.objects.filter(structure_id__in=list(structures)).order_by(
+            "pk"
+        )
+    }
+    packages = {
+        package.pk: WBSNode(package)
+        for package in Package.objects.filter(bill_id__in=list(bills)).order_by("pk")
+    }
+    for node in bills.values():
+        structures[node.obj.structure_id].children.append(node)
+    for node in packages.values():
+        bills[node.obj.bill_id].children.append(node)
+
+    levels = (
+        ("structure_id", structures),
+        ("bill_id", bills),
+        ("package_id", packages),
+    )
+    total = WBSNode(None)
+
+    def add(row, prefix, **measures):
+        """Add a grouped row's measures to each level it belongs to."""
+        targets = [total]
+        for key, nodes in levels:
+            node = nodes.get(row[prefix + key])
+            if node is not None:
+                targets.append(node)
+        for node in targets:
+            for name, value in measures.items():
+                setattr(node, name, getattr(node, name) + (value or 0))
+
+    for row in (
+        LineItem.objects.filter(project=project)
+        .values("structure_id", "bill_id", "package_id")
+        .annotate(
+            budget=Sum("total_price", filter=BUDGET_FILTER),
+            value=Sum("total_price"),
+            count=Count("pk"),
+        )
+        .order_by()
+    ):
+        add(
+            row,
+            "",
+            budget=row["budget"],
+            line_item_value=row["value"],
+            line_item_count=row["count"],
+        )
+
+    group = ("line_item__structure_id", "line_item__bill_id", "line_item__package_id")
+    if forecast is not None:
+        for row in (
+            forecast.effective_transactions()
+            .filter(
+                line_item__is_work=True,
+                line_item__special_item=False,
+            )
+            .values(*group)
+            .annotate(amount=Sum("total_price"))
+            .order_by()
+        ):
+            add(row, "line_item__", forecast=row["amount"])
+
+    if certified:
+        for row in (
+            ActualTransaction.objects.filter(
+                payment_certificate__project=project,
+                payment_certificate__status=PaymentCertificate.Status.APPROVED,
+            )
+            .values(*group)
+            .annotate(amount=Sum("total_price"))
+            .order_by()
+        ):
+            add(row, "line_item__", certified=row["amount"])
+
+    if costs:
+        from app.Cost.models import Cost
+
+        bill_costs = defaultdict(lambda: (ZERO, 0))
+        for row in (
+            Cost.objects.filter(bill__structure__project=project)
+            .values("bill_id")
+            .annotate(gross=Sum("gross"), count=Count("pk"))
+            .order_by()
+        ):
+            bill_costs[row["bill_id"]] = (row["gross"] or ZERO, row["count"])
+        for bill_id, node in bills.items():
+            node.cost, node.cost_count = bill_costs[bill_id]
+            structure = structures[node.obj.structure_id]
+            structure.cost += node.cost
+            structure.cost_count += node.cost_count
+            total.cost += node.cost
+            total.cost_count += node.cost_count
+
+    return WBSTree(structures=list(structures.values()), total=total)
@@ -1,6 +1,4 @@
-from collections import defaultdict
 from decimal import Decimal
-from typing import Any
 
 from django.conf import settings
 from django.contrib import messages
@@ -9,7 +7,8 @@ from django.urls import reverse
 from django.views.generic import CreateView, DetailView, ListView, UpdateView, View
 
 from app.Account.subscription_config import Subscription
-from app.BillOfQuantities.models import Bill, Structure
+from app.BillOfQuantities.models import Bill
+from app.BillOfQuantities.wbs import build_wbs_tree
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.models import sum_queryset
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
@@ -63,38 +62,10 @@ class ProjectCostTreeView(CostMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Build tree structure: structure -> bills -> costs
-        tree: dict[Structure, dict[str, Any]] = defaultdict(
-            lambda: {"bills": [], "total": 0}
-        )
-
-        structures = self.object.structures.prefetch_related("bills__costs").order_by(
-            "name"
-        )
-
-        for structure in structures:
-            bills_data = []
-            structure_total = 0
-
-            for bill in structure.bills.all():
-                bill_total = sum_queryset(bill.costs, "gross")
-                structure_total += bill_total
-
-                bills_data.append(
-                    {
-                        "bill": bill,
-                        "total": bill_total,
-                        "cost_count": bill.costs.count(),
-                    }
-                )
-
-            tree[structure] = {
-                "bills": bills_data,
-                "total": structure_total,
-            }
-
-        context["tree"] = dict(tree)
-        context["grand_total"] = sum(data["total"] for data in tree.values())
+        # Structure -> bill cost totals, in a fixed number of queries
+        tree = build_wbs_tree(self.object, costs=True)
+        context["tree"] = tree
+        context["grand_total"] = tree.total.cost
 
         return context
 
@@ -5,3 +5,6 @@ class EstimatorConfig(AppConfig):
     name = "app.Estimator"
     label = "estimator"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        import app.Estimator.signals  # noqa
@@ -0,0 +1,454 @@
+"""Batched cell edits for the Estimator library grids.
+
+``apply_grid_edits`` takes a list of ``{"id", "field", "value"}`` edits for
+one grid (materials, spec components, labour specs, plant costs or
+preliminary costs) of one library tier, validates all of them, and saves
+them with a single ``bulk_update`` in one transaction. It then recomputes
+the derived values of the edited rows and of the specifications they feed,
+each specification once, so a pasted column costs one request.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Model, Sum
+from django.utils.text import capfirst
+
+from app.Estimator.calculations import format_num
+from app.Estimator.models import (
+    BOQProfitabilityRollup,
+    ContractorLabourSpecification,
+    ContractorMaterial,
+    ContractorPlantCost,
+    ContractorPlantSpecification,
+    ContractorPreliminaryCost,
+    ContractorPreliminarySpecification,
+    ContractorSpecification,
+    ContractorSpecificationComponent,
+    ProjectLabourSpecification,
+    ProjectMaterial,
+    ProjectPlantCost,
+    ProjectPlantSpecification,
+    ProjectPreliminaryCost,
+    ProjectPreliminarySpecification,
+    ProjectSpecification,
+    ProjectSpecificationComponent,
+    SystemLabourSpecification,
+    SystemMaterial,
+    SystemPlantCost,
+    SystemPlantSpecification,
+    SystemPreliminaryCost,
+    SystemPreliminarySpecification,
+    SystemSpecification,
+    SystemSpecificationComponent,
+    _compute_market_rate,
+)
+
+# Grid -> editable field -> value kind; matches the single-cell endpoints
+GRID_FIELDS = {
+    "material": {
+        "pack_qty": "decimal",
+        "pack_cost": "decimal",
+        "trade_name": "str",
+        "material_code": "str",
+        "unit": "str",
+        "material_variety": "str",
+        "market_spec": "str",
+    },
+    "spec-component": {
+        "qty_per_unit": "decimal",
+        "material": "fk",
+        "label": "str",
+    },
+    "labour-spec": {
+        "section": "str",
+        "trade_name": "str",
+        "name": "str",
+        "unit": "str",
+        "crew": "fk",
+        "daily_production": "decimal",
+        "team_mix": "decimal",
+        "site_factor": "decimal",
+        "tools_factor": "decimal",
+        "leadership_factor": "decimal",
+        "is_active": "bool",
+    },
+    "plant-cost": {
+        "name": "str",
+        "hourly_production": "decimal",
+        "hourly_rate": "decimal",
+    },
+    "preliminary-cost": {
+        "name": "str",
+        "preliminary_type": "str",
+        "sum_value": "decimal",
+        "amount": "decimal",
+        "number_per_month": "decimal",
+        "monthly_rate": "decimal",
+        "months": "decimal",
+    },
+}
+
+MAX_GRID_EDITS = 5000
+
+
+@dataclass(frozen=True)
+class LibraryTier:
+    """The models of one library tier and the field scoping them to an owner.
+
+    ``owner_field`` is ``project`` or ``company``; the system library has
+    no owner.
+    """
+
+    owner_field: str | None
+    material: type[Model]
+    specification: type[Model]
+    spec_component: type[Model]
+    labour_spec: type[Model]
+    plant_cost: type[Model]
+    plant_spec: type[Model]
+    preliminary_cost: type[Model]
+    preliminary_spec: type[Model]
+
+    def grid_model(self, grid: str) -> type[Model]:
+        return getattr(self, grid.replace("-", "_"))
+
+    def owner_filter(self, owner, prefix: str = "") -> dict:
+        if self.owner_field is None:
+            return {}
+        return {f"{prefix}{self.owner_field}": owner}
+
+
+PROJECT_TIER = LibraryTier(
+    owner_field="project",
+    material=ProjectMaterial,
+    specification=ProjectSpecification,
+    spec_component=ProjectSpecificationComponent,
+    labour_spec=ProjectLabourSpecification,
+    plant_cost=ProjectPlantCost,
+    plant_spec=ProjectPlantSpecification,
+    preliminary_cost=ProjectPreliminaryCost,
+    preliminary_spec=ProjectPreliminarySpecification,
+)
+CONTRACTOR_TIER = LibraryTier(
+    owner_field="company",
+    material=ContractorMaterial,
+    specification=ContractorSpecification,
+    spec_component=ContractorSpecificationComponent,
+    labour_spec=ContractorLabourSpecification,
+    plant_cost=ContractorPlantCost,
+    plant_spec=ContractorPlantSpecification,
+    preliminary_cost=ContractorPreliminaryCost,
+    preliminary_spec=ContractorPreliminarySpecification,
+)
+SYSTEM_TIER = LibraryTier(
+    owner_field=None,
+    material=SystemMaterial,
+    specification=SystemSpecification,
+    spec_component=SystemSpecificationComponent,
+    labour_spec=SystemLabourSpecification,
+    plant_cost=SystemPlantCost,
+    plant_spec=SystemPlantSpecification,
+    preliminary_cost=SystemPreliminaryCost,
+    preliminary_spec=SystemPreliminarySpecification,
+)
+
+
+@dataclass
+class GridEditResult:
+    """Outcome of a batch: edited rows' and affected specs' derived values.
+
+    When ``errors`` is non-empty nothing was saved.
+    """
+
+    updated: int = 0
+    rows: dict[int, dict] = field(default_factory=dict)
+    specs: dict[int, dict] = field(default_factory=dict)
+    errors: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class _Batch:
+    """Saved rows of one batch, for computing derived values."""
+
+    tier: LibraryTier
+    owner: object
+    rows: list
+    changed_fields: set[str]
+    # Row pk -> field -> value before the edit
+    previous: dict[int, dict]
+
+
+def apply_grid_edits(tier: LibraryTier, grid: str, edits, owner=None) -> GridEditResult:
+    """Validate and save ``edits`` to ``grid`` rows belonging to ``owner``.
+
+    Raises ValueError for an unknown grid or a malformed batch; per-cell
+    problems are returned in ``GridEditResult.errors``.
+    """
+    if grid not in GRID_FIELDS:
+        raise ValueError(f'Unknown grid "{grid}"')
+    if not isinstance(edits, list) or not edits:
+        raise ValueError("Expected a non-empty list of edits")
+    if len(edits) > MAX_GRID_EDITS:
+        raise ValueError(f"At most {MAX_GRID_EDITS} edits per batch")
+
+    fields = GRID_FIELDS[grid]
+    model = tier.grid_model(grid)
+    result = GridEditResult()
+
+    parsed = []
+    for index, edit in enumerate(edits):
+        if not isinstance(edit, dict):
+            result.errors.append({"index": index, "error": "Invalid edit"})
+            continue
+        field_name = edit.get("field")
+        try:
+            pk = int(edit.get("id"))
+        except (TypeError, ValueError):
+            result.errors.append({"index": index, "error": "Invalid row id"})
+            continue
+        if field_name not in fields:
+            result.errors.append(
+                {"index": index, "error": f'Field "{field_name}" not allowed'}
+            )
+            continue
+        parsed.append((index, pk, field_name, edit.get("value")))
+
+    scope = tier.owner_filter(
+        owner, "specification__" if grid == "spec-component" else ""
+    )
+    queryset = model.objects.filter(pk__in={pk for _, pk, _, _ in parsed}, **scope)
+    if grid == "labour-spec":
+        queryset = queryset.select_related("trade_code")
+    rows = queryset.in_bulk()
+    related = _related_rows(tier, model, fields, parsed, owner)
+
+    changed: dict[int, set[str]] = defaultdict(set)
+    previous: dict[int, dict] = defaultdict(dict)
+    for index, pk, field_name, value in parsed:
+        row = rows.get(pk)
+        if row is None:
+            result.errors.append({"index": index, "error": "Row not found"})
+            continue
+        attname = model._meta.get_field(field_name).attname
+        previous[pk].setdefault(field_name, getattr(row, attname))
+        try:
+            _set_value(row, field_name, fields[field_name], value, related)
+        except ValidationError as error:
+            result.errors.append({"index": index, "error": " ".join(error.messages)})
+            continue
+        changed[pk].add(field_name)
+
+    if result.errors:
+        result.errors.sort(key=lambda error: error["index"])
+        return result
+
+    update_fields = set()
+    for pk, names in changed.items():
+        update_fields |= names | _apply_save_rules(grid, rows[pk], names)
+    changed_rows = [rows[pk] for pk in changed]
+    update_fields = [
+        model._meta.get_field(name).attname for name in sorted(update_fields)
+    ]
+
+    try:
+        with transaction.atomic():
+            model.objects.bulk_update(changed_rows, update_fields)
+    except IntegrityError:
+        result.errors.append({"error": "Edits conflict with an existing row"})
+        return result
+    # bulk_update skips post_save, which marks the BoQ rollup stale
+    if tier is PROJECT_TIER:
+        BOQProfitabilityRollup.mark_stale(owner)
+
+    result.updated = len(changed_rows)
+    batch = _Batch(
+        tier=tier,
+        owner=owner,
+        rows=changed_rows,
+        changed_fields={name for names in changed.values() for name in names},
+        previous=previous,
+    )
+    result.rows, result.specs = _DERIVED[grid](batch)
+    return result
+
+
+def _related_rows(tier, model, fields, parsed, owner) -> dict[str, dict]:
+    """Foreign-key targets named by the edits, one query per relation."""
+    wanted = defaultdict(set)
+    for _, _, field_name, value in parsed:
+        if fields[field_name] == "fk" and value not in (None, "", 0, "0"):
+            try:
+                wanted[field_name].add(int(value))
+            except (TypeError, ValueError):
+                pass
+    return {
+        field_name: model._meta.get_field(field_name)
+        .related_model.objects.filter(pk__in=pks, **tier.owner_filter(owner))
+        .in_bulk()
+        for field_name, pks in wanted.items()
+    }
+
+
+def _set_value(row, field_name, kind, value, related) -> None:
+    model_field = row._meta.get_field(field_name)
+    if kind == "fk":
+        if value in (None, "", 0, "0"):
+            setattr(row, field_name, None)
+            return
+        try:
+            target = related.get(field_name, {}).get(int(value))
+        except (TypeError, ValueError):
+            target = None
+        if target is None:
+            raise ValidationError(f"{capfirst(field_name)} not found")
+        setattr(row, field_name, target)
+        return
+    if kind == "bool":
+        value = bool(value) and value not in ("false", "0", 0)
+    elif kind == "decimal":
+        value = model_field.to_python(value or 0)
+    else:
+        value = str(value or "").strip()
+    model_field.run_validators(value)
+    setattr(row, field_name, value)
+
+
+def _apply_save_rules(grid, row, changed) -> set[str]:
+    """Apply the side effects of the models' ``save()``; return extra fields."""
+    if grid == "material" and changed & {"pack_qty", "pack_cost"}:
+        row.market_rate = _compute_market_rate(row.pack_cost, row.pack_qty)
+        return {"market_rate"}
+    if grid == "spec-component" and "material" in changed and row.material:
+        row.label = row.material.material_code
+        return {"label"}
+    if grid == "labour-spec" and row.trade_code_id:
+        row.trade_name = row.trade_code.trade_name
+        return {"trade_name"}
+    return set()
+
+
+def _material_spec_rates(tier, spec_ids) -> dict[int, dict]:
+    specs = tier.specification.objects.filter(pk__in=spec_ids).prefetch_related(
+        "spec_components__material"
+    )
+    return {
+        spec.pk: {"rate_per_unit": format_num(spec.rate_per_unit)} for spec in specs
+    }
+
+
+def _derive_materials(batch: _Batch):
+    values = {
+        row.pk: {
+            "pack_qty": format_num(row.pack_qty),
+            "pack_cost": format_num(row.pack_cost),
+            "market_rate": format_num(row.market_rate),
+        }
+        for row in batch.rows
+    }
+    if not batch.changed_fields & {"pack_qty", "pack_cost"}:
+        return values, {}
+    spec_ids = batch.tier.spec_component.objects.filter(material__in=batch.rows).values(
+        "specification_id"
+    )
+    return values, _material_spec_rates(batch.tier, spec_ids)
+
+
+def _derive_spec_components(batch: _Batch):
+    values = {
+        row.pk: {
+            "qty_per_unit": format_num(row.qty_per_unit),
+            "label": row.label,
+            "material_id": row.material_id,
+            "spec_id": row.specification_id,
+        }
+        for row in batch.rows
+    }
+    spec_ids = {row.specification_id for row in batch.rows}
+    return values, _material_spec_rates(batch.tier, spec_ids)
+
+
+def _derive_labour_specs(batch: _Batch):
+    project_tier = batch.tier is PROJECT_TIER
+    specs = batch.tier.labour_spec.objects.filter(
+        pk__in=[row.pk for row in batch.rows]
+    ).select_related("crew")
+    if project_tier:
+        # Project specs take their quantity from the BoQ rather than a field
+        specs = specs.annotate(boq_total=Sum("boq_items__contract_quantity"))
+    values = {}
+    for spec in specs:
+        quantity = spec.boq_total if project_tier else spec.baseline_boq_quantity
+        rate = spec.rate_per_unit
+        values[spec.pk] = {
+            "daily_output": format_num(spec.daily_output),
+            "rate_per_unit": format_num(rate),
+            "daily_cost": format_num(spec.daily_cost),
+            "total_cost": format_num((quantity or Decimal("0")) * rate),
+            "crew_type": spec.crew.crew_type if spec.crew else None,
+        }
+    return values, {}
+
+
+def _derive_plant_costs(batch: _Batch):
+    if "hourly_rate" not in batch.changed_fields:
+        return {}, {}
+    specs = (
+        batch.tier.plant_spec.objects.filter(components__plant_type__in=batch.rows)
+        .distinct()
+        .prefetch_related("components__plant_type")
+    )
+    values = {}
+    for spec in specs:
+        rate = sum(
+            (
+                component.plant_type.hourly_rate * component.hours
+                for component in spec.components.all()
+                if component.plant_type
+            ),
+            Decimal("0"),
+        )
+        values[spec.pk] = {
+            "rate_per_unit": format_num(rate),
+            "daily_cost": format_num(spec.daily_output * rate),
+        }
+    return {}, values
+
+
+def _derive_preliminary_costs(batch: _Batch):
+    tier, owner_filter = batch.tier, batch.tier.owner_filter(batch.owner)
+    values = {
+        row.pk: {"computed_amount": format_num(row.computed_amount)}
+        for row in batch.rows
+    }
+    # Costs moved to another type change the totals of both types
+    types = {row.preliminary_type for row in batch.rows} | {
+        fields["preliminary_type"]
+        for fields in batch.previous.values()
+        if "preliminary_type" in fields
+    }
+    totals = defaultdict(Decimal)
+    costs = tier.preliminary_cost.objects.filter(
+        preliminary_type__in=types, **owner_filter
+    )
+    for cost in costs:
+        totals[cost.preliminary_type] += cost.computed_amount
+    specs = tier.preliminary_spec.objects.filter(
+        preliminary_type__in=types, **owner_filter
+    ).values_list("pk", "preliminary_type")
+    return values, {
+        pk: {"amount": format_num(totals[preliminary_type])}
+        for pk, preliminary_type in specs
+    }
+
+
+_DERIVED = {
+    "material": _derive_materials,
+    "spec-component": _derive_spec_components,
+    "labour-spec": _derive_labour_specs,
+    "plant-cost": _derive_plant_costs,
+    "preliminary-cost": _derive_preliminary_costs,
+}
@@ -0,0 +1,168 @@
+"""
+TF-IDF matching of BoQ descriptions against an Item Library.
+
+Descriptions are reduced to sets of normalised words (the search index's
+``tokenize``), weighted by inverse document frequency over the library and
+scaled to unit length, so the score of a pair is their cosine similarity:
+1 for the same words in any order or punctuation, falling as words are
+added, dropped or changed. Query words the library never uses are folded
+onto a similar library word when one exists, which absorbs typos::
+
+    matcher = DescriptionMatcher(entry.description for entry in library)
+    for candidates in matcher.match(item.description for item in items):
+        ...  # [(library index, score), ...], best first
+
+``match`` scores every query against every library entry in batches of
+sparse matrix products, so a large BoQ against a large library takes
+seconds rather than a query or a Python loop per pair.
+"""
+
+import math
+from collections import defaultdict
+
+import numpy as np
+
+from app.core.Utilities.search import (
+    SIMILARITY_THRESHOLD,
+    similarity,
+    tokenize,
+    trigrams,
+)
+
+# Upper bound on the (queries x library) score block held in memory at once
+MAX_BLOCK_CELLS = 2_000_000
+# Words shorter than this, or containing digits, are never folded onto others
+FOLD_MIN_LENGTH = 4
+
+
+class DescriptionMatcher:
+    """Scores descriptions against a fixed library of descriptions."""
+
+    def __init__(self, library):
+        documents = [tokenize(text) for text in library]
+        self.size = len(documents)
+        self.vocabulary = {}
+        postings = defaultdict(list)
+        for row, words in enumerate(documents):
+            for word in words:
+                feature = self.vocabulary.setdefault(word, len(self.vocabulary))
+                postings[feature].append(row)
+
+        df = np.array(
+            [len(postings[i]) for i in range(len(self.vocabulary))], dtype=np.int64
+        )
+        self.idf = np.log((1 + self.size) / (1 + df)) + 1
+        # Weight given to words absent from the library
+        self.unseen_idf = math.log(1 + self.size) + 1
+
+        norms = np.zeros(self.size)
+        for row, words in enumerate(documents):
+            norms[row] = math.sqrt(
+                sum(self.idf[self.vocabulary[word]] ** 2 for word in words)
+            )
+        norms[norms == 0] = 1
+
+        # Postings by word (CSC): library rows and their normalised weights
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(df)
+        self.indices = np.fromiter(
+            (row for i in range(len(self.vocabulary)) for row in postings[i]),
+            dtype=np.int64,
+            count=int(self.indptr[-1]),
+        )
+        self.data = np.repeat(self.idf, df) / norms[self.indices]
+
+        self._by_trigram = defaultdict(set)
+        for word in self.vocabulary:
+            if self._foldable(word):
+                for gram in trigrams(word):
+                    self._by_trigram[gram].add(word)
+        self._folded = {}
+
+    @staticmethod
+    def _foldable(word):
+        return len(word) >= FOLD_MIN_LENGTH and not any(c.isdigit() for c in word)
+
+    def _fold(self, word):
+        """The library word most similar to an unseen ``word``, if any."""
+        if word not in self._folded:
+            best, best_score = None, SIMILARITY_THRESHOLD
+            if self._foldable(word):
+                candidates = set().union(
+                    *(self._by_trigram.get(gram, ()) for gram in trigrams(word))
+                )
+                for candidate in sorted(candidates):
+                    score = similarity(word, candidate)
+                    if score >= best_score:
+                        best, best_score = candidate, score
+            self._folded[word] = best
+        return self._folded[word]
+
+    def _vectorize(self, text):
+        """Library word ids of ``text`` with their weights, and its norm."""
+        weights = {}
+        norm = 0.0
+        for word in tokenize(text):
+            if word not in self.vocabulary:
+                word = self._fold(word) or word
+            feature = self.vocabulary.get(word)
+            if feature is None:
+                norm += self.unseen_idf**2
+            elif feature not in weights:
+                weights[feature] = self.idf[feature]
+                norm += self.idf[feature] ** 2
+        return weights, math.sqrt(norm)
+
+    def match(self, queries, limit=3, min_score=0.0):
+        """Best ``limit`` library rows per query as (index, score), best first.
+
+        Rows scoring below ``min_score`` or 0 are left out.
+        """
+        vectors = [self._vectorize(text) for text in queries]
+        results = []
+        if not self.size:
+            return [[] for _ in vectors]
+        batch = max(1, MAX_BLOCK_CELLS // self.size)
+        for start in range(0, len(vectors), batch):
+            block = vectors[start : start + batch]
+            scores = self._score_block(block)
+            top = min(limit, self.size)
+            best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            for row, columns in enumerate(best):
+                ranked = sorted(
+                    ((int(c), float(scores[row, c])) for c in columns),
+                    key=lambda pair: (-pair[1], pair[0]),
+                )
+                results.append(
+                    [
+                        (index, round(score, 4))
+                        for index, score in ranked
+                        if score > 0 and score >= min_score
+                    ]
+                )
+        return results
+
+    def _score_block(self, block):
+        """Cosine similarity of each vector in ``block`` to every library row."""
+        rows, features, weights = [], [], []
+        for row, (vector, norm) in enumerate(block):
+            for feature, weight in vector.items():
+                rows.append(row)
+                features.append(feature)
+                weights.append(weight / norm)
+        rows = np.array(rows, dtype=np.int64)
+        features = np.array(features, dtype=np.int64)
+        weights = np.array(weights, dtype=float)
+
+        # Expand each (query, word) pair over the word's postings
+        starts = self.indptr[features]
+        lengths = self.indptr[features + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        postings = np.repeat(starts, lengths) + offsets
+        cells = np.repeat(rows, lengths) * self.size + self.indices[postings]
+        return np.bincount(
+            cells,
+            weights=np.repeat(weights, lengths) * self.data[postings],
+            minlength=len(block) * self.size,
+        ).reshape(len(block), self.size)
@@ -0,0 +1,259 @@
+"""
+Set-based sync of one library scope into another.
+
+A sync copies the rows of a source scope (the System library or a
+Contractor's) onto a target scope (a Contractor's or a Project's). Both
+scopes are loaded once, rows are paired by natural keys, field values are
+compared in memory, and only the rows that differ are written, in one
+``bulk_update`` and one ``bulk_create``::
+
+    result = sync_rows(
+        ProjectTradeCode.objects.filter(project=project),
+        ContractorTradeCode.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("prefix")],
+        values=copy_fields("prefix", "trade_name"),
+    )
+    result.counts()  # {"created": 2, "updated": 1, "unchanged": 40}
+
+Foreign keys into the target scope are resolved through dicts built with
+``key_map`` rather than a query per row, so the number of queries a sync
+runs does not grow with the size of the library.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import models, router, transaction
+
+from app.core.Utilities.search import SEARCH_FIELDS, index_objects
+from app.Estimator.signals import ROLLUP_SOURCE_MODELS, mark_boq_rollup_stale
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class SyncResult:
+    """Target rows written (or left alone) by a sync, with their sources."""
+
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    # (source, target) for every source row, in source order
+    pairs: list = field(default_factory=list)
+
+    def mark_updated(self, pks) -> None:
+        """Count unchanged targets in ``pks`` as updated."""
+        moved = [target for target in self.unchanged if target.pk in pks]
+        if moved:
+            self.unchanged = [t for t in self.unchanged if t.pk not in pks]
+            self.updated.extend(moved)
+
+    def counts(self) -> dict:
+        return {
+            "updated": len(self.updated),
+            "created": len(self.created),
+            "unchanged": len(self.unchanged),
+        }
+
+
+def key_map(queryset, key, value="pk") -> dict:
+    """``{key: value}`` over ``queryset``; the lowest pk wins duplicate keys.
+
+    ``key`` is a field name or a tuple of field names. Rows with an empty
+    key are left out.
+    """
+    names = key if isinstance(key, tuple) else (key,)
+    mapping = {}
+    for row in queryset.order_by("pk").values_list(value, *names):
+        row_key = row[1:] if isinstance(key, tuple) else row[1]
+        if row_key not in (None, ""):
+            mapping.setdefault(row_key, row[0])
+    return mapping
+
+
+def copy_fields(*names):
+    """A ``values`` function copying the source's ``names`` unchanged."""
+    return lambda source: {name: getattr(source, name) for name in names}
+
+
+def unlinked(key, link="source_id"):
+    """``key`` for targets not yet linked to a source row, None for others."""
+    return lambda target: None if getattr(target, link) else key(target)
+
+
+def _pair(sources, targets, match):
+    """The target matched to each source, or None, by the ``match`` passes.
+
+    Each pass pairs the still unmatched sources with the still unclaimed
+    targets whose key is equal; a target is matched at most once.
+    """
+    paired = [None] * len(sources)
+    claimed = set()
+    for keys in match:
+        target_key, source_key = keys if isinstance(keys, tuple) else (keys, keys)
+        index = {}
+        for target in targets:
+            if target.pk not in claimed:
+                key = target_key(target)
+                if key is not None:
+                    index.setdefault(key, target)
+        for i, source in enumerate(sources):
+            if paired[i] is None:
+                key = source_key(source)
+                target = index.pop(key, None) if key is not None else None
+                if target is not None:
+                    paired[i] = target
+                    claimed.add(target.pk)
+    return paired
+
+
+def _apply(target, values, derive, fields):
+    for name, value in values.items():
+        setattr(target, name, value)
+    if derive is not None:
+        derive(target)
+    # Round decimals as the column stores them, so recomputed values such
+    # as a market rate compare equal to their saved copies
+    for f in fields:
+        value = getattr(target, f.attname)
+        if isinstance(f, models.DecimalField) and isinstance(value, Decimal):
+            setattr(
+                target,
+                f.attname,
+                value.quantize(Decimal(1).scaleb(-f.decimal_places), context=f.context),
+            )
+
+
+def _after_write(objects) -> None:
+    """Replay the save signals that bulk writes skip."""
+    if not objects:
+        return
+    model = type(objects[0])
+    if model._meta.label in SEARCH_FIELDS:
+        index_objects(objects)
+    if model in ROLLUP_SOURCE_MODELS:
+        mark_boq_rollup_stale(model, objects[0])
+
+
+def sync_rows(
+    targets,
+    sources,
+    *,
+    scope,
+    match,
+    values,
+    derive=None,
+    batch_size=BATCH_SIZE,
+) -> SyncResult:
+    """Upsert a target row for every row of ``sources``.
+
+    ``targets`` is the target scope's queryset; new rows are created with
+    the ``scope`` field values. ``match`` lists the passes pairing sources
+    with existing targets, each a key function applied to both or a
+    ``(target_key, source_key)`` pair; a None key never matches.
+    ``values(source)`` gives the target's new field values by attname, and
+    ``derive(target)`` recomputes fields the model's ``save()`` would.
+    """
+    model = targets.model
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    existing = list(targets.order_by("pk"))
+    sources = list(sources)
+
+    result = SyncResult()
+    changed_fields = set()
+    for source, target in zip(sources, _pair(sources, existing, match), strict=True):
+        if target is None:
+            target = model(**scope)
+            _apply(target, values(source), derive, fields)
+            result.created.append(target)
+        else:
+            before = {f.attname: getattr(target, f.attname) for f in fields}
+            _apply(target, values(source), derive, fields)
+            changed = {
+                name for name, value in before.items() if getattr(target, name) != value
+            }
+            if changed:
+                changed_fields |= changed
+                result.updated.append(target)
+            else:
+                result.unchanged.append(target)
+        result.pairs.append((source, target))
+
+    with transaction.atomic(using=router.db_for_write(model)):
+        if result.updated:
+            model._default_manager.bulk_update(
+                result.updated, sorted(changed_fields), batch_size=batch_size
+            )
+        if result.created:
+            _bulk_create(targets, result.created, existing, match, batch_size)
+        _after_write(result.updated + result.created)
+    return result
+
+
+def _bulk_create(targets, objects, existing, match, batch_size):
+    """Insert ``objects`` and make sure each has its new primary key."""
+    model = targets.model
+    model._default_manager.bulk_create(objects, batch_size=batch_size)
+    if objects[0].pk is not None:
+        return
+    # Backends that cannot return inserted ids (MySQL): read the new rows
+    # back and tell them apart by their match keys, so rows inserted by a
+    # concurrent writer are never taken for ours
+    target_keys = [keys[0] if isinstance(keys, tuple) else keys for keys in match]
+
+    def row_key(target):
+        return tuple(key(target) for key in target_keys)
+
+    last = max((target.pk for target in existing), default=0)
+    inserted = defaultdict(list)
+    for row in targets.filter(pk__gt=last).order_by("-pk"):
+        inserted[row_key(row)].append(row.pk)
+    for obj in objects:
+        # Rows sharing a key were inserted in order, lowest id first
+        obj.pk = inserted[row_key(obj)].pop()
+        obj._state.adding = False
+
+
+def sync_children(result, model, parent, rows, fields, batch_size=BATCH_SIZE) -> None:
+    """Replace the ``model`` rows of each synced target with its source's.
+
+    ``parent`` is ``model``'s foreign key to the target and ``rows(source)``
+    gives the wanted children as dicts of ``fields`` by attname. Targets
+    whose children already match are left alone; the others have their
+    children deleted and recreated, and count as updated in ``result``.
+    """
+    parent_attname = model._meta.get_field(parent).attname
+    targets = [target for _, target in result.pairs]
+    target_pks = [target.pk for target in targets]
+    current = defaultdict(Counter)
+    for start in range(0, len(target_pks), batch_size):
+        for child in model._default_manager.filter(
+            **{f"{parent_attname}__in": target_pks[start : start + batch_size]}
+        ).values_list(parent_attname, *fields):
+            current[child[0]][child[1:]] += 1
+
+    stale, new = [], []
+    for source, target in result.pairs:
+        wanted = rows(source)
+        if Counter(tuple(row[f] for f in fields) for row in wanted) != current.get(
+            target.pk, Counter()
+        ):
+            stale.append(target.pk)
+            new.extend(model(**{parent: target}, **row) for row in wanted)
+    if not stale:
+        return
+
+    using = router.db_for_write(model)
+    with transaction.atomic(using=using):
+        for start in range(0, len(stale), batch_size):
+            # One DELETE without the per-row delete signals; the rollup they
+            # would mark stale is marked once below
+            model._default_manager.filter(
+                **{f"{parent_attname}__in": stale[start : start + batch_size]}
+            )._raw_delete(using)
+        model._default_manager.bulk_create(new, batch_size=batch_size)
+        stale = set(stale)
+        _after_write([target for target in targets if target.pk in stale])
+    result.mark_updated(stale - {target.pk for target in result.created})
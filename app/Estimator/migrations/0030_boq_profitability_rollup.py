@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Project", "0101_project_data_version"),
+        ("estimator", "0029_alter_contractoritemlibraryentry_material_spec_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BOQProfitabilityRollup",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="boq_profitability_rollup",
+                        serialize=False,
+                        to="Project.project",
+                    ),
+                ),
+                (
+                    "baseline_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "baseline_cost",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "progress_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "progress_cost",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "forecast_revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "forecast_cost",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                ("source_version", models.PositiveBigIntegerField(default=1)),
+                ("computed_version", models.PositiveBigIntegerField(default=0)),
+                ("computed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "BoQ Profitability Rollup",
+                "verbose_name_plural": "BoQ Profitability Rollups",
+            },
+        ),
+    ]
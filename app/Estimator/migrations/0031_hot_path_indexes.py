@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("estimator", "0030_boq_profitability_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="boqitem",
+            index=models.Index(
+                fields=["project", "is_section_header"],
+                name="estimator_b_project_22100f_idx",
+            ),
+        ),
+    ]
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 if TYPE_CHECKING:
     from django.db.models import Manager
@@ -2059,6 +2060,7 @@ class BOQItem(models.Model):
         ordering = ["id"]
         verbose_name = "BoQ Item"
         verbose_name_plural = "BoQ Items"
+        indexes = [models.Index(fields=["project", "is_section_header"])]
 
     def __str__(self):
         return self.description or f"{self.section} - {self.bill_no}"
@@ -2236,6 +2238,119 @@ class BOQItem(models.Model):
         )
 
 
+class BOQProfitabilityRollup(models.Model):
+    """
+    Per-project totals of the BoQ's baseline, progress and forecast revenue
+    and cost, so company and portfolio dashboards aggregate a row per project
+    instead of evaluating ``baseline_new_price`` on every BoQ item.
+
+    Signals bump ``source_version`` whenever a BoQ item, specification,
+    rate or assumption of the project changes; ``refresh`` recomputes the
+    totals and records the version they were computed against.
+    """
+
+    project = models.OneToOneField(
+        "Project.Project",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="boq_profitability_rollup",
+    )
+    baseline_revenue = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    baseline_cost = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    progress_revenue = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    progress_cost = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    forecast_revenue = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    forecast_cost = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    source_version = models.PositiveBigIntegerField(default=1)
+    computed_version = models.PositiveBigIntegerField(default=0)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "BoQ Profitability Rollup"
+        verbose_name_plural = "BoQ Profitability Rollups"
+
+    def __str__(self):
+        return f"BoQ rollup for project {self.project_id}"
+
+    @property
+    def is_stale(self) -> bool:
+        return self.computed_version != self.source_version
+
+    @classmethod
+    def mark_stale(cls, project_id: int) -> None:
+        """Flag the project's totals for recomputation in a single UPDATE."""
+        cls.objects.filter(project_id=project_id).update(
+            source_version=models.F("source_version") + 1
+        )
+
+    @classmethod
+    def refresh(cls, project_id: int) -> "BOQProfitabilityRollup":
+        """Recompute the project's totals from its BoQ items."""
+        rollup, _ = cls.objects.get_or_create(project_id=project_id)
+        version = rollup.source_version
+
+        boq_items = (
+            BOQItem.objects.filter(project_id=project_id)
+            .select_related(
+                "specification",
+                "labour_specification",
+                "plant_specification",
+                "preliminary_specification",
+                "material",
+                "project__estimator_assumptions",
+            )
+            .prefetch_related(
+                "specification__spec_components__material",
+                "plant_specification__components__plant_type",
+            )
+        )
+        totals = dict.fromkeys(
+            (
+                "baseline_revenue",
+                "baseline_cost",
+                "progress_revenue",
+                "progress_cost",
+                "forecast_revenue",
+                "forecast_cost",
+            ),
+            Decimal("0"),
+        )
+        for item in boq_items:
+            totals["baseline_revenue"] += (item.contract_quantity or 0) * (
+                item.contract_rate or 0
+            )
+            bnp = item.baseline_new_price
+            if not bnp:
+                continue
+            totals["baseline_cost"] += bnp * (item.contract_quantity or 0)
+            progress = bnp * (item.progress_quantity or 0)
+            totals["progress_revenue"] += progress
+            totals["progress_cost"] += progress
+            forecast = bnp * (item.forecast_quantity or 0)
+            totals["forecast_revenue"] += forecast
+            totals["forecast_cost"] += forecast
+
+        for name, value in totals.items():
+            setattr(rollup, name, value.quantize(Decimal("0.01")))
+        rollup.computed_version = version
+        rollup.computed_at = timezone.now()
+        # Only the totals are written, so a concurrent mark_stale is kept
+        rollup.save(update_fields=[*totals, "computed_version", "computed_at"])
+        return rollup
+
+    @classmethod
+    def for_projects(cls, projects) -> "models.QuerySet[BOQProfitabilityRollup]":
+        """Rollups for ``projects``, refreshing any that are missing or stale."""
+        project_ids = list(projects.values_list("pk", flat=True))
+        current = cls.objects.filter(
+            project_id__in=project_ids,
+            computed_version=models.F("source_version"),
+        ).values_list("project_id", flat=True)
+        for project_id in set(project_ids) - set(current):
+            cls.refresh(project_id)
+        return cls.objects.filter(project_id__in=project_ids)
+
+
 def sync_boq_from_lineitems(project):
     """
     Sync BOQItem records from BillOfQuantities LineItem records for a project.
@@ -0,0 +1,438 @@
+"""
+What-if pricing of a project's BoQ under alternative assumptions.
+
+``ProjectPricingModel.load`` reads the project's BoQ and its specification
+graph once into plain Python values. ``price`` then re-prices every BoQ
+item under a ``Scenario`` — overridden wastage, markup and transport
+percentages, material pack costs or plant hourly rates — without touching
+the database, so any number of scenarios can be compared against the saved
+baseline::
+
+    model = ProjectPricingModel.load(project)
+    results = model.compare([
+        Scenario("Markup 10%", material_markup_pct=Decimal("10")),
+        Scenario("Cement +15%", pack_costs={cement.pk: Decimal("110")}),
+    ])
+
+The arithmetic mirrors the ``BOQItem`` rate and amount properties.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from app.Estimator.calculations import calculate_contract_amount, format_num
+from app.Estimator.models import (
+    BOQItem,
+    ProjectAssumptions,
+    ProjectLabourSpecification,
+    ProjectMaterial,
+    ProjectPlantCost,
+    ProjectPlantSpecification,
+    ProjectPlantSpecificationComponent,
+    ProjectPreliminaryCost,
+    ProjectPreliminarySpecification,
+    ProjectSpecification,
+    ProjectSpecificationComponent,
+    SystemMaterialSpecComponent,
+    _compute_market_rate,
+)
+
+ZERO = Decimal("0")
+ONE = Decimal("1")
+HUNDRED = Decimal("100")
+
+ASSUMPTION_FIELDS = (
+    "wastage_pct",
+    "material_markup_pct",
+    "labour_markup_pct",
+    "transport_pct",
+)
+# Markups live on each BoQ item; a scenario replaces those still on the
+# project default, as saving the assumptions would.
+ITEM_MARKUP_FIELDS = ASSUMPTION_FIELDS[1:]
+METRICS = (
+    "contract",
+    "materials",
+    "labour",
+    "plant",
+    "preliminary",
+    "markup",
+    "transport",
+    "cost",
+)
+MAX_SCENARIOS = 10
+UNASSIGNED = "Unassigned"
+
+
+def _decimal(value, label):
+    try:
+        result = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{label} must be a number") from None
+    if not result.is_finite():
+        raise ValueError(f"{label} must be a number")
+    return result
+
+
+def _overrides(data, label):
+    if not isinstance(data, dict):
+        raise ValueError(f"{label} must map ids to values")
+    overrides = {}
+    for pk, value in data.items():
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise ValueError(f"{label} has an invalid id: {pk}") from None
+        overrides[pk] = _decimal(value, f"{label}[{pk}]")
+    return overrides
+
+
+@dataclass
+class Scenario:
+    """A set of assumption and rate overrides; ``None`` keeps the saved value."""
+
+    name: str
+    wastage_pct: Decimal | None = None
+    material_markup_pct: Decimal | None = None
+    labour_markup_pct: Decimal | None = None
+    transport_pct: Decimal | None = None
+    # ProjectMaterial pk -> pack cost, ProjectPlantCost pk -> hourly rate
+    pack_costs: dict[int, Decimal] = field(default_factory=dict)
+    plant_rates: dict[int, Decimal] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data) -> "Scenario":
+        """Build a scenario from request JSON, raising ``ValueError``."""
+        if not isinstance(data, dict):
+            raise ValueError("Each scenario must be an object")
+        name = str(data.get("name") or "").strip()
+        if not name:
+            raise ValueError("Each scenario needs a name")
+        scenario = cls(
+            name=name,
+            pack_costs=_overrides(data.get("pack_costs") or {}, "pack_costs"),
+            plant_rates=_overrides(data.get("plant_rates") or {}, "plant_rates"),
+        )
+        for assumption in ASSUMPTION_FIELDS:
+            if data.get(assumption) not in (None, ""):
+                setattr(scenario, assumption, _decimal(data[assumption], assumption))
+        return scenario
+
+
+@dataclass
+class ScenarioResult:
+    """Totals of one scenario, overall and by BoQ section and trade."""
+
+    name: str
+    totals: dict[str, Decimal]
+    by_section: dict[str, dict[str, Decimal]]
+    by_trade: dict[str, dict[str, Decimal]]
+
+    def as_dict(self) -> dict:
+        def fmt(metrics):
+            return {name: format_num(value) for name, value in metrics.items()}
+
+        return {
+            "name": self.name,
+            "totals": fmt(self.totals),
+            "by_section": {key: fmt(value) for key, value in self.by_section.items()},
+            "by_trade": {key: fmt(value) for key, value in self.by_trade.items()},
+        }
+
+
+class ProjectPricingModel:
+    """A project's BoQ and rate graph held in memory for repeated pricing."""
+
+    def __init__(self):
+        self.assumptions: dict[str, Decimal] = dict.fromkeys(ASSUMPTION_FIELDS, ZERO)
+        # pk -> (pack_cost, pack_qty, market_rate)
+        self.materials: dict[int, tuple[Decimal, Decimal, Decimal]] = {}
+        # Active spec pk -> [(material pk, qty_per_unit)]; specs without
+        # components price at their library source's rate instead
+        self.spec_components: dict[int, list[tuple]] = {}
+        self.spec_fixed_rates: dict[int, Decimal] = {}
+        self.plant_costs: dict[int, Decimal] = {}
+        # Active plant spec pk -> [(plant cost pk, hours)]
+        self.plant_components: dict[int, list[tuple]] = {}
+        self.items: list[tuple] = []
+
+    @classmethod
+    def load(cls, project) -> "ProjectPricingModel":
+        """Read everything pricing depends on in a fixed number of queries."""
+        model = cls()
+        assumptions = ProjectAssumptions.objects.filter(project=project).first()
+        if assumptions:
+            for name in ASSUMPTION_FIELDS:
+                model.assumptions[name] = getattr(assumptions, name) or ZERO
+
+        model.materials = {
+            pk: (pack_cost, pack_qty, market_rate)
+            for pk, pack_cost, pack_qty, market_rate in ProjectMaterial.objects.filter(
+                project=project
+            ).values_list("pk", "pack_cost", "pack_qty", "market_rate")
+        }
+        model._load_specifications(project)
+        model._load_plant(project)
+
+        labour_rates = {
+            spec.pk: spec.rate_per_unit
+            for spec in ProjectLabourSpecification.objects.filter(
+                project=project, is_active=True
+            ).select_related("crew")
+        }
+        preliminary_rates = model._preliminary_rates(project)
+
+        rows = BOQItem.objects.filter(
+            project=project, is_section_header=False
+        ).values_list(
+            "section",
+            "trade_code__prefix",
+            "trade_code__trade_name",
+            "contract_quantity",
+            "contract_rate",
+            "specification_id",
+            "material_id",
+            "labour_specification_id",
+            "plant_specification_id",
+            "preliminary_specification_id",
+            *ITEM_MARKUP_FIELDS,
+        )
+        for (
+            section,
+            trade_prefix,
+            trade_name,
+            quantity,
+            rate,
+            spec_id,
+            material_id,
+            labour_spec_id,
+            plant_spec_id,
+            preliminary_spec_id,
+            *markups,
+        ) in rows:
+            trade = f"{trade_prefix}{trade_name}" if trade_prefix is not None else ""
+            model.items.append(
+                (
+                    section or UNASSIGNED,
+                    trade or UNASSIGNED,
+                    quantity or ZERO,
+                    calculate_contract_amount(quantity, rate) or ZERO,
+                    spec_id if spec_id in model.spec_components else None,
+                    material_id,
+                    labour_rates.get(labour_spec_id),
+                    plant_spec_id if plant_spec_id in model.plant_components else None,
+                    preliminary_rates.get(preliminary_spec_id),
+                    tuple(markup or ZERO for markup in markups),
+                )
+            )
+        return model
+
+    def _load_specifications(self, project):
+        sources = {}
+        for pk, source_id in ProjectSpecification.objects.filter(
+            project=project, is_active=True
+        ).values_list("pk", "source_id"):
+            self.spec_components[pk] = []
+            sources[pk] = source_id
+        for spec_id, material_id, qty in ProjectSpecificationComponent.objects.filter(
+            specification__project=project, specification__is_active=True
+        ).values_list("specification_id", "material_id", "qty_per_unit"):
+            self.spec_components[spec_id].append((material_id, qty))
+
+        source_rates = defaultdict(lambda: ZERO)
+        source_ids = {
+            source_id
+            for pk, source_id in sources.items()
+            if source_id and not self.spec_components[pk]
+        }
+        for source_id, qty, rate in SystemMaterialSpecComponent.objects.filter(
+            spec_id__in=source_ids
+        ).values_list("spec_id", "qty_per_unit", "material__market_rate"):
+            if qty and rate:
+                source_rates[source_id] += qty * rate
+        for pk, source_id in sources.items():
+            if not self.spec_components[pk]:
+                self.spec_fixed_rates[pk] = source_rates[source_id]
+
+    def _load_plant(self, project):
+        self.plant_costs = dict(
+            ProjectPlantCost.objects.filter(project=project).values_list(
+                "pk", "hourly_rate"
+            )
+        )
+        for pk in ProjectPlantSpecification.objects.filter(
+            project=project, is_active=True
+        ).values_list("pk", flat=True):
+            self.plant_components[pk] = []
+        for (
+            spec_id,
+            plant_id,
+            hours,
+        ) in ProjectPlantSpecificationComponent.objects.filter(
+            specification__project=project, specification__is_active=True
+        ).values_list("specification_id", "plant_type_id", "hours"):
+            self.plant_components[spec_id].append((plant_id, hours))
+
+    @staticmethod
+    def _preliminary_rates(project):
+        amounts = defaultdict(lambda: ZERO)
+        for cost in ProjectPreliminaryCost.objects.filter(project=project):
+            amounts[cost.preliminary_type] += cost.computed_amount
+        return {
+            pk: amounts[preliminary_type] if preliminary_type else ZERO
+            for pk, preliminary_type in ProjectPreliminarySpecification.objects.filter(
+                project=project, is_active=True
+            ).values_list("pk", "preliminary_type")
+        }
+
+    def _material_rates(self, scenario):
+        rates = {pk: market_rate for pk, (_, _, market_rate) in self.materials.items()}
+        for pk, pack_cost in scenario.pack_costs.items():
+            if pk in self.materials:
+                rates[pk] = _compute_market_rate(pack_cost, self.materials[pk][1])
+        return rates
+
+    def _spec_rates(self, material_rates):
+        rates = dict(self.spec_fixed_rates)
+        for pk, components in self.spec_components.items():
+            if not components:
+                continue
+            total = ZERO
+            for material_id, qty in components:
+                rate = material_rates.get(material_id)
+                if qty and rate:
+                    total += qty * rate
+            rates[pk] = total
+        return rates
+
+    def _plant_rates(self, scenario):
+        hourly = {**self.plant_costs, **scenario.plant_rates}
+        rates = {}
+        for pk, components in self.plant_components.items():
+            total = ZERO
+            for plant_id, hours in components:
+                if plant_id in hourly:
+                    total += hourly[plant_id] * hours
+            rates[pk] = total
+        return rates
+
+    def _markups(self, scenario, item_markups):
+        """Item markups with the scenario replacing those on the default."""
+        return tuple(
+            override
+            if (override := getattr(scenario, name)) is not None
+            and markup == self.assumptions[name]
+            else markup
+            for name, markup in zip(ITEM_MARKUP_FIELDS, item_markups, strict=True)
+        )
+
+    def price(self, scenario: Scenario | None = None) -> ScenarioResult:
+        """Re-price every BoQ item under ``scenario`` (the saved state if None)."""
+        scenario = scenario or Scenario("Baseline")
+        material_rates = self._material_rates(scenario)
+        spec_rates = self._spec_rates(material_rates)
+        plant_rates = self._plant_rates(scenario)
+        wastage = scenario.wastage_pct
+        if wastage is None:
+            wastage = self.assumptions["wastage_pct"]
+        wastage_factor = ONE + wastage / HUNDRED
+
+        totals = [ZERO] * len(METRICS)
+        by_section = defaultdict(lambda: [ZERO] * len(METRICS))
+        by_trade = defaultdict(lambda: [ZERO] * len(METRICS))
+        markups_cache = {}
+
+        for (
+            section,
+            trade,
+            quantity,
+            contract,
+            spec_id,
+            material_id,
+            labour_base,
+            plant_spec_id,
+            preliminary_rate,
+            item_markups,
+        ) in self.items:
+            if item_markups not in markups_cache:
+                markups_cache[item_markups] = self._markups(scenario, item_markups)
+            material_markup, labour_markup, transport = markups_cache[item_markups]
+
+            if spec_id is not None:
+                material_base = spec_rates[spec_id]
+            elif material_id is not None:
+                material_base = material_rates.get(material_id)
+            else:
+                material_base = None
+            material_rate = (
+                material_base * (ONE + (material_markup + transport) / HUNDRED)
+                if material_base is not None
+                else None
+            )
+            labour_rate = (
+                labour_base * (ONE + labour_markup / HUNDRED)
+                if labour_base is not None
+                else None
+            )
+            plant_rate = plant_rates.get(plant_spec_id)
+
+            materials = labour = plant = preliminary = ZERO
+            markup = transport_amount = cost = ZERO
+            if quantity:
+                if material_rate:
+                    materials = quantity * wastage_factor * material_rate
+                if labour_rate:
+                    labour = quantity * labour_rate
+                if plant_rate:
+                    plant = quantity * plant_rate
+                if preliminary_rate:
+                    preliminary = quantity * preliminary_rate
+                material_base_amount = (
+                    (material_base or ZERO) * quantity * wastage_factor
+                )
+                markup = (
+                    material_base_amount * material_markup
+                    + (labour_base or ZERO) * quantity * labour_markup
+                ) / HUNDRED
+                transport_amount = material_base_amount * transport / HUNDRED
+                price = (
+                    (material_rate or ZERO) * wastage_factor
+                    + (labour_rate or ZERO)
+                    + (plant_rate or ZERO)
+                    + (preliminary_rate or ZERO)
+                )
+                if price > 0:
+                    cost = price * quantity
+
+            values = (
+                contract,
+                materials,
+                labour,
+                plant,
+                preliminary,
+                markup,
+                transport_amount,
+                cost,
+            )
+            for bucket in (totals, by_section[section], by_trade[trade]):
+                for index, value in enumerate(values):
+                    bucket[index] += value
+
+        def metrics(bucket):
+            result = dict(zip(METRICS, bucket, strict=True))
+            result["margin"] = result["contract"] - result["cost"]
+            return result
+
+        return ScenarioResult(
+            name=scenario.name,
+            totals=metrics(totals),
+            by_section={
+                key: metrics(value) for key, value in sorted(by_section.items())
+            },
+            by_trade={key: metrics(value) for key, value in sorted(by_trade.items())},
+        )
+
+    def compare(self, scenarios: list[Scenario]) -> list[ScenarioResult]:
+        """The saved baseline followed by each scenario, side by side."""
+        return [self.price(), *(self.price(scenario) for scenario in scenarios)]
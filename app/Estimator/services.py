@@ -1,5 +1,16 @@
+from operator import attrgetter
+
+from app.Estimator.library_matching import DescriptionMatcher
+from app.Estimator.library_sync import (
+    copy_fields,
+    key_map,
+    sync_children,
+    sync_rows,
+    unlinked,
+)
 from app.Estimator.models import (
     BOQItem,
+    BOQProfitabilityRollup,
     ContractorItemLibraryEntry,
     ContractorLabourCrew,
     ContractorLabourSpecification,
@@ -34,6 +45,7 @@ from app.Estimator.models import (
     SystemPreliminarySpecification,
     SystemSpecification,
     SystemTradeCode,
+    _compute_market_rate,
 )
 
 
@@ -596,6 +608,94 @@ def pull_from_library(project):
     return results
 
 
+MATERIAL_FIELDS = (
+    "trade_name",
+    "unit",
+    "pack_qty",
+    "pack_cost",
+    "material_variety",
+    "market_spec",
+)
+LABOUR_CREW_FIELDS = (
+    "skilled",
+    "semi_skilled",
+    "general",
+    "daily_production",
+    "skilled_rate",
+    "semi_skilled_rate",
+    "general_rate",
+)
+PLANT_COST_FIELDS = ("hourly_production", "hourly_rate")
+PRELIMINARY_COST_FIELDS = (
+    "sum_value",
+    "amount",
+    "number_per_month",
+    "monthly_rate",
+    "months",
+)
+LABOUR_SPEC_FIELDS = (
+    "section",
+    "trade_name",
+    "unit",
+    "daily_production",
+    "team_mix",
+    "site_factor",
+    "tools_factor",
+    "leadership_factor",
+)
+PLANT_SPEC_FIELDS = (
+    "section",
+    "trade_name",
+    "unit",
+    "daily_production",
+    "operator_factor",
+    "site_factor",
+)
+PRELIMINARY_SPEC_FIELDS = ("section", "trade_name", "unit", "preliminary_type")
+ITEM_LIBRARY_FIELDS = (
+    "item_code",
+    "accounts_code",
+    "component",
+    "description",
+    "unit",
+    "display_order",
+)
+
+# Pairs a contractor row with the system row its `source` FK points at
+MATCH_SOURCE = (attrgetter("source_id"), attrgetter("pk"))
+
+
+def _set_market_rate(material):
+    material.market_rate = _compute_market_rate(material.pack_cost, material.pack_qty)
+
+
+def _set_crew_size(crew):
+    crew.crew_size = (
+        (crew.skilled or 0) + (crew.semi_skilled or 0) + (crew.general or 0)
+    )
+
+
+def _mirror_trade_name(trade_codes):
+    """A ``derive`` keeping ``trade_name`` mirrored from the trade code FK,
+    as the spec models' ``save()`` does, from the scope's ``trade_codes``."""
+    trade_names = key_map(trade_codes, "pk", value="trade_name")
+
+    def derive(spec):
+        if spec.trade_code_id in trade_names:
+            spec.trade_name = trade_names[spec.trade_code_id]
+
+    return derive
+
+
+def _resolve_by_prefix(trade_codes):
+    """``values`` helper resolving a source's trade code into ``trade_codes``
+    by prefix."""
+    by_prefix = key_map(trade_codes, "prefix")
+    return lambda source: (
+        by_prefix.get(source.trade_code.prefix) if source.trade_code_id else None
+    )
+
+
 def sync_trade_codes_from_contractor(project):
     """Sync project trade codes with the project's Contractor Library.
 
@@ -605,19 +705,13 @@ def sync_trade_codes_from_contractor(project):
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for ctc in ContractorTradeCode.objects.filter(company=company):
-        _, was_created = ProjectTradeCode.objects.update_or_create(
-            project=project,
-            prefix=ctc.prefix,
-            defaults={"trade_name": ctc.trade_name},
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ProjectTradeCode.objects.filter(project=project),
+        ContractorTradeCode.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("prefix")],
+        values=copy_fields("prefix", "trade_name"),
+    ).counts()
 
 
 def sync_materials_from_contractor(project):
@@ -625,33 +719,20 @@ def sync_materials_from_contractor(project):
 
     The project must be linked to a contractor Company (project.contractor).
     Matches existing project rows by `material_code` and upserts.
-    Returns count of updated + created rows.
+    Returns counts of updated, created and unchanged rows.
     """
     company = project.contractor
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for cm in ContractorMaterial.objects.filter(company=company):
-        defaults = {
-            "trade_name": cm.trade_name,
-            "unit": cm.unit,
-            "pack_qty": cm.pack_qty,
-            "pack_cost": cm.pack_cost,
-            "material_variety": cm.material_variety,
-            "market_spec": cm.market_spec,
-        }
-        _, was_created = ProjectMaterial.objects.update_or_create(
-            project=project,
-            material_code=cm.material_code,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ProjectMaterial.objects.filter(project=project),
+        ContractorMaterial.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("material_code")],
+        values=copy_fields("material_code", *MATERIAL_FIELDS),
+        derive=_set_market_rate,
+    ).counts()
 
 
 def sync_labour_costs_from_contractor(project):
@@ -660,29 +741,14 @@ def sync_labour_costs_from_contractor(project):
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for clc in ContractorLabourCrew.objects.filter(company=company):
-        defaults = {
-            "crew_size": clc.crew_size,
-            "skilled": clc.skilled,
-            "semi_skilled": clc.semi_skilled,
-            "general": clc.general,
-            "daily_production": clc.daily_production,
-            "skilled_rate": clc.skilled_rate,
-            "semi_skilled_rate": clc.semi_skilled_rate,
-            "general_rate": clc.general_rate,
-        }
-        _, was_created = ProjectLabourCrew.objects.update_or_create(
-            project=project,
-            crew_type=clc.crew_type,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ProjectLabourCrew.objects.filter(project=project),
+        ContractorLabourCrew.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("crew_type")],
+        values=copy_fields("crew_type", *LABOUR_CREW_FIELDS),
+        derive=_set_crew_size,
+    ).counts()
 
 
 def sync_plant_costs_from_contractor(project):
@@ -691,23 +757,13 @@ def sync_plant_costs_from_contractor(project):
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for cpc in ContractorPlantCost.objects.filter(company=company):
-        defaults = {
-            "hourly_production": cpc.hourly_production,
-            "hourly_rate": cpc.hourly_rate,
-        }
-        _, was_created = ProjectPlantCost.objects.update_or_create(
-            project=project,
-            name=cpc.name,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ProjectPlantCost.objects.filter(project=project),
+        ContractorPlantCost.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("name")],
+        values=copy_fields("name", *PLANT_COST_FIELDS),
+    ).counts()
 
 
 def sync_preliminary_costs_from_contractor(project):
@@ -720,259 +776,127 @@ def sync_preliminary_costs_from_contractor(project):
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for cpc in ContractorPreliminaryCost.objects.filter(company=company):
-        defaults = {
-            "sum_value": cpc.sum_value,
-            "amount": cpc.amount,
-            "number_per_month": cpc.number_per_month,
-            "monthly_rate": cpc.monthly_rate,
-            "months": cpc.months,
-        }
-        _, was_created = ProjectPreliminaryCost.objects.update_or_create(
-            project=project,
-            name=cpc.name,
-            preliminary_type=cpc.preliminary_type,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
-
-
-def _resolve_project_material(project, system_material):
-    """Match a system material to the project copy by `source` FK, falling back
-    to `material_code` for materials imported via Excel (which don't set
-    source)."""
-    if not system_material:
-        return None
-    return (
-        ProjectMaterial.objects.filter(
-            project=project, source_id=system_material.pk
-        ).first()
-        or ProjectMaterial.objects.filter(
-            project=project, material_code=system_material.material_code
-        ).first()
-    )
-
-
-def _resolve_project_trade_code(project, system_trade_code):
-    if not system_trade_code:
-        return None
-    return ProjectTradeCode.objects.filter(
-        project=project, prefix=system_trade_code.prefix
-    ).first()
-
-
-def _resolve_project_trade_code_by_prefix(project, prefix):
-    if not prefix:
-        return None
-    return ProjectTradeCode.objects.filter(project=project, prefix=prefix).first()
-
-
-def _resolve_project_material_by_code(project, material_code):
-    if not material_code:
-        return None
-    return ProjectMaterial.objects.filter(
-        project=project, material_code=material_code
-    ).first()
+    return sync_rows(
+        ProjectPreliminaryCost.objects.filter(project=project),
+        ContractorPreliminaryCost.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("name", "preliminary_type")],
+        values=copy_fields("name", "preliminary_type", *PRELIMINARY_COST_FIELDS),
+    ).counts()
 
 
 def sync_material_specs_from_contractor(project):
     """Sync project material specifications with the project's Contractor Library.
 
-    Specs are matched by name. Each sync rebuilds the component list from the
-    contractor source.
+    Specs are matched by name. Component lists that differ from the
+    contractor source are rebuilt; materials resolve by `material_code`.
     """
     company = project.contractor
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    existing_by_name = {
-        ps.name: ps for ps in ProjectSpecification.objects.filter(project=project)
-    }
-
-    updated = 0
-    created = 0
-    for cs in (
+    trade_code = _resolve_by_prefix(ProjectTradeCode.objects.filter(project=project))
+    materials = key_map(
+        ProjectMaterial.objects.filter(project=project), "material_code"
+    )
+    result = sync_rows(
+        ProjectSpecification.objects.filter(project=project),
         ContractorSpecification.objects.filter(company=company)
         .select_related("trade_code")
-        .prefetch_related("spec_components__material")
-    ):
-        prefix = cs.trade_code.prefix if cs.trade_code else None
-        trade_code = _resolve_project_trade_code_by_prefix(project, prefix)
-        ps = existing_by_name.get(cs.name)
-        if ps is None:
-            ps = ProjectSpecification.objects.create(
-                project=project,
-                name=cs.name,
-                section=cs.section,
-                trade_code=trade_code,
-                unit_label=cs.unit_label,
-            )
-            created += 1
-        else:
-            ps.section = cs.section
-            ps.trade_code = trade_code
-            ps.unit_label = cs.unit_label
-            ps.save()
-            updated += 1
-
-        ps.spec_components.all().delete()
-        for comp in cs.spec_components.all():
-            mat_code = comp.material.material_code if comp.material else ""
-            ProjectSpecificationComponent.objects.create(
-                specification=ps,
-                material=_resolve_project_material_by_code(project, mat_code),
-                label=comp.label,
-                qty_per_unit=comp.qty_per_unit,
-                sort_order=comp.sort_order,
-            )
-
-    return {"updated": updated, "created": created}
-
-
-def _resolve_project_labour_crew(project, system_crew):
-    """Match a system labour crew to the project copy by `source` FK, falling
-    back to `crew_type` name for crews imported via Excel (which don't set
-    source)."""
-    if not system_crew:
-        return None
-    return (
-        ProjectLabourCrew.objects.filter(
-            project=project, source_id=system_crew.pk
-        ).first()
-        or ProjectLabourCrew.objects.filter(
-            project=project, crew_type=system_crew.crew_type
-        ).first()
+        .prefetch_related("spec_components__material"),
+        scope={"project": project},
+        match=[attrgetter("name")],
+        values=lambda cs: {
+            **copy_fields("name", "section", "unit_label")(cs),
+            "trade_code_id": trade_code(cs),
+        },
     )
-
-
-def _resolve_project_labour_crew_by_type(project, crew_type):
-    if not crew_type:
-        return None
-    return ProjectLabourCrew.objects.filter(
-        project=project, crew_type=crew_type
-    ).first()
+    sync_children(
+        result,
+        ProjectSpecificationComponent,
+        "specification",
+        lambda cs: [
+            {
+                "material_id": (
+                    materials.get(comp.material.material_code)
+                    if comp.material_id
+                    else None
+                ),
+                "label": comp.label,
+                "qty_per_unit": comp.qty_per_unit,
+                "sort_order": comp.sort_order,
+            }
+            for comp in cs.spec_components.all()
+        ],
+        ("material_id", "label", "qty_per_unit", "sort_order"),
+    )
+    return result.counts()
 
 
 def sync_labour_specs_from_contractor(project):
-    """Sync project labour specifications with the project's Contractor Library."""
+    """Sync project labour specifications with the project's Contractor Library.
+
+    Crews resolve by `crew_type` among the project's labour crews.
+    """
     company = project.contractor
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for cls in ContractorLabourSpecification.objects.filter(
-        company=company
-    ).select_related("crew"):
-        crew_type = cls.crew.crew_type if cls.crew else ""
-        crew = _resolve_project_labour_crew_by_type(project, crew_type)
-        defaults = {
-            "section": cls.section,
-            "trade_name": cls.trade_name,
-            "unit": cls.unit,
-            "crew": crew,
-            "daily_production": cls.daily_production,
-            "team_mix": cls.team_mix,
-            "site_factor": cls.site_factor,
-            "tools_factor": cls.tools_factor,
-            "leadership_factor": cls.leadership_factor,
-        }
-        _, was_created = ProjectLabourSpecification.objects.update_or_create(
-            project=project,
-            name=cls.name,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
-
-
-def _resolve_project_plant_cost(project, system_plant_type_id):
-    if not system_plant_type_id:
-        return None
-    return ProjectPlantCost.objects.filter(
-        project=project, source_id=system_plant_type_id
-    ).first()
-
-
-def _rebuild_plant_spec_components_from_source(pps, project):
-    """Replace a project plant spec's components with a fresh copy of the
-    system source's components."""
-    pps.components.all().delete()
-    if not pps.source_id:  # ty:ignore[unresolved-attribute]
-        return
-    for comp in pps.source.components.all():
-        ProjectPlantSpecificationComponent.objects.create(
-            specification=pps,
-            plant_type=_resolve_project_plant_cost(
-                project,
-                comp.plant_type_id,  # ty:ignore[unresolved-attribute]
-            ),
-            hours=comp.hours,
-            sort_order=comp.sort_order,
-        )
-
-
-def _resolve_project_plant_cost_by_name(project, name):
-    if not name:
-        return None
-    return ProjectPlantCost.objects.filter(project=project, name=name).first()
+    crews = key_map(ProjectLabourCrew.objects.filter(project=project), "crew_type")
+    return sync_rows(
+        ProjectLabourSpecification.objects.filter(project=project),
+        ContractorLabourSpecification.objects.filter(company=company).select_related(
+            "crew"
+        ),
+        scope={"project": project},
+        match=[attrgetter("name")],
+        values=lambda cls: {
+            **copy_fields("name", *LABOUR_SPEC_FIELDS)(cls),
+            "crew_id": crews.get(cls.crew.crew_type) if cls.crew_id else None,
+        },
+        derive=_mirror_trade_name(ProjectTradeCode.objects.filter(project=project)),
+    ).counts()
 
 
 def sync_plant_specs_from_contractor(project):
-    """Sync project plant specifications with the project's Contractor Library."""
+    """Sync project plant specifications with the project's Contractor Library.
+
+    Component plant types resolve by name among the project's plant costs.
+    """
     company = project.contractor
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    existing_by_name = {
-        pps.name: pps
-        for pps in ProjectPlantSpecification.objects.filter(project=project)
-    }
-
-    created = updated = 0
-    for cps in ContractorPlantSpecification.objects.filter(
-        company=company
-    ).prefetch_related("components__plant_type"):
-        defaults = {
-            "section": cps.section,
-            "trade_name": cps.trade_name,
-            "unit": cps.unit,
-            "daily_production": cps.daily_production,
-            "operator_factor": cps.operator_factor,
-            "site_factor": cps.site_factor,
-        }
-        pps = existing_by_name.get(cps.name)
-        if pps is None:
-            pps = ProjectPlantSpecification.objects.create(
-                project=project, name=cps.name, **defaults
-            )
-            created += 1
-        else:
-            for f, v in defaults.items():
-                setattr(pps, f, v)
-            pps.save()
-            updated += 1
-
-        pps.components.all().delete()
-        for comp in cps.components.all():
-            pt_name = comp.plant_type.name if comp.plant_type else ""
-            ProjectPlantSpecificationComponent.objects.create(
-                specification=pps,
-                plant_type=_resolve_project_plant_cost_by_name(project, pt_name),
-                hours=comp.hours,
-                sort_order=comp.sort_order,
-            )
-
-    return {"updated": updated, "created": created}
+    plant_costs = key_map(ProjectPlantCost.objects.filter(project=project), "name")
+    result = sync_rows(
+        ProjectPlantSpecification.objects.filter(project=project),
+        ContractorPlantSpecification.objects.filter(company=company).prefetch_related(
+            "components__plant_type"
+        ),
+        scope={"project": project},
+        match=[attrgetter("name")],
+        values=copy_fields("name", *PLANT_SPEC_FIELDS),
+        derive=_mirror_trade_name(ProjectTradeCode.objects.filter(project=project)),
+    )
+    sync_children(
+        result,
+        ProjectPlantSpecificationComponent,
+        "specification",
+        lambda cps: [
+            {
+                "plant_type_id": (
+                    plant_costs.get(comp.plant_type.name)
+                    if comp.plant_type_id
+                    else None
+                ),
+                "hours": comp.hours,
+                "sort_order": comp.sort_order,
+            }
+            for comp in cps.components.all()
+        ],
+        ("plant_type_id", "hours", "sort_order"),
+    )
+    return result.counts()
 
 
 def sync_preliminary_specs_from_contractor(project):
@@ -981,555 +905,269 @@ def sync_preliminary_specs_from_contractor(project):
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    created = updated = 0
-    for cps in ContractorPreliminarySpecification.objects.filter(company=company):
-        defaults = {
-            "section": cps.section,
-            "trade_name": cps.trade_name,
-            "unit": cps.unit,
-            "preliminary_type": cps.preliminary_type,
-        }
-        _, was_created = ProjectPreliminarySpecification.objects.update_or_create(
-            project=project,
-            name=cps.name,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ProjectPreliminarySpecification.objects.filter(project=project),
+        ContractorPreliminarySpecification.objects.filter(company=company),
+        scope={"project": project},
+        match=[attrgetter("name")],
+        values=copy_fields("name", *PRELIMINARY_SPEC_FIELDS),
+        derive=_mirror_trade_name(ProjectTradeCode.objects.filter(project=project)),
+    ).counts()
 
 
 # ═══════════════════════════════════════════════════════════════════
 # Contractor-library sync (System → Contractor, scoped per Company)
 #
 # Mirror of the project-level sync_*_from_system functions, but writing
-# to Contractor* models filtered by `company`.
+# to Contractor* models filtered by `company`. Rows already linked to a
+# system row through `source` are matched by it; the rest are adopted by
+# natural key, and unmatched system rows are created.
 # ═══════════════════════════════════════════════════════════════════
 
 
 def sync_trade_codes_to_contractor(company):
     """Sync contractor trade codes with current system library values."""
-    updated = 0
-    for ctc in ContractorTradeCode.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        ctc.prefix = ctc.source.prefix
-        ctc.trade_name = ctc.source.trade_name
-        ctc.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorTradeCode.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    created = 0
-    for stc in SystemTradeCode.objects.exclude(pk__in=existing_source_ids):
-        defaults = {
-            "source": stc,
+    return sync_rows(
+        ContractorTradeCode.objects.filter(company=company),
+        SystemTradeCode.objects.all(),
+        scope={"company": company},
+        match=[MATCH_SOURCE, attrgetter("prefix")],
+        values=lambda stc: {
+            "source_id": stc.pk,
+            "prefix": stc.prefix,
             "trade_name": stc.trade_name,
-        }
-        _, was_created = ContractorTradeCode.objects.update_or_create(
-            company=company,
-            prefix=stc.prefix,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+        },
+    ).counts()
 
 
 def sync_materials_to_contractor(company):
     """Sync contractor material costs with current system library values."""
-    updated = 0
-    for cm in ContractorMaterial.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        cm.trade_name = cm.source.trade_name
-        cm.unit = cm.source.unit
-        cm.pack_qty = cm.source.pack_qty
-        cm.pack_cost = cm.source.pack_cost
-        cm.material_variety = cm.source.material_variety
-        cm.market_spec = cm.source.market_spec
-        cm.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorMaterial.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    created = 0
-    for sm in SystemMaterial.objects.exclude(pk__in=existing_source_ids):
-        defaults = {
-            "source": sm,
-            "trade_name": sm.trade_name,
-            "unit": sm.unit,
-            "pack_qty": sm.pack_qty,
-            "pack_cost": sm.pack_cost,
-            "material_variety": sm.material_variety,
-            "market_spec": sm.market_spec,
-        }
-        _, was_created = ContractorMaterial.objects.update_or_create(
-            company=company,
-            material_code=sm.material_code,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ContractorMaterial.objects.filter(company=company),
+        SystemMaterial.objects.all(),
+        scope={"company": company},
+        match=[MATCH_SOURCE, attrgetter("material_code")],
+        values=lambda sm: {
+            "source_id": sm.pk,
+            **copy_fields("material_code", *MATERIAL_FIELDS)(sm),
+        },
+        derive=_set_market_rate,
+    ).counts()
 
 
 def sync_labour_costs_to_contractor(company):
     """Sync contractor labour crews with current system library values."""
-    updated = 0
-    for clc in ContractorLabourCrew.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        clc.crew_type = clc.source.crew_type
-        clc.crew_size = clc.source.crew_size
-        clc.skilled = clc.source.skilled
-        clc.semi_skilled = clc.source.semi_skilled
-        clc.general = clc.source.general
-        clc.daily_production = clc.source.daily_production
-        clc.skilled_rate = clc.source.skilled_rate
-        clc.semi_skilled_rate = clc.source.semi_skilled_rate
-        clc.general_rate = clc.source.general_rate
-        clc.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorLabourCrew.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    created = 0
-    for slc in SystemLabourCrew.objects.exclude(pk__in=existing_source_ids):
-        defaults = {
-            "source": slc,
-            "crew_size": slc.crew_size,
-            "skilled": slc.skilled,
-            "semi_skilled": slc.semi_skilled,
-            "general": slc.general,
-            "daily_production": slc.daily_production,
-            "skilled_rate": slc.skilled_rate,
-            "semi_skilled_rate": slc.semi_skilled_rate,
-            "general_rate": slc.general_rate,
-        }
-        _, was_created = ContractorLabourCrew.objects.update_or_create(
-            company=company,
-            crew_type=slc.crew_type,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ContractorLabourCrew.objects.filter(company=company),
+        SystemLabourCrew.objects.all(),
+        scope={"company": company},
+        match=[MATCH_SOURCE, attrgetter("crew_type")],
+        values=lambda slc: {
+            "source_id": slc.pk,
+            **copy_fields("crew_type", *LABOUR_CREW_FIELDS)(slc),
+        },
+        derive=_set_crew_size,
+    ).counts()
 
 
 def sync_plant_costs_to_contractor(company):
     """Sync contractor plant costs with current system library values."""
-    updated = 0
-    for cpc in ContractorPlantCost.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        cpc.name = cpc.source.name
-        cpc.hourly_production = cpc.source.hourly_production
-        cpc.hourly_rate = cpc.source.hourly_rate
-        cpc.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorPlantCost.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    created = 0
-    for spc in SystemPlantCost.objects.exclude(pk__in=existing_source_ids):
-        defaults = {
-            "source": spc,
-            "hourly_production": spc.hourly_production,
-            "hourly_rate": spc.hourly_rate,
-        }
-        _, was_created = ContractorPlantCost.objects.update_or_create(
-            company=company,
-            name=spc.name,
-            defaults=defaults,
-        )
-        if was_created:
-            created += 1
-        else:
-            updated += 1
-
-    return {"updated": updated, "created": created}
+    return sync_rows(
+        ContractorPlantCost.objects.filter(company=company),
+        SystemPlantCost.objects.all(),
+        scope={"company": company},
+        match=[MATCH_SOURCE, attrgetter("name")],
+        values=lambda spc: {
+            "source_id": spc.pk,
+            **copy_fields("name", *PLANT_COST_FIELDS)(spc),
+        },
+    ).counts()
 
 
 def sync_preliminary_costs_to_contractor(company):
-    """Sync contractor preliminary costs with current system library values."""
-    updated = 0
-    for cpc in ContractorPreliminaryCost.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        cpc.name = cpc.source.name
-        cpc.preliminary_type = cpc.source.preliminary_type
-        cpc.sum_value = cpc.source.sum_value
-        cpc.amount = cpc.source.amount
-        cpc.number_per_month = cpc.source.number_per_month
-        cpc.monthly_rate = cpc.source.monthly_rate
-        cpc.months = cpc.source.months
-        cpc.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorPreliminaryCost.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    orphan_by_key = {
-        (cpc.name, cpc.preliminary_type): cpc
-        for cpc in ContractorPreliminaryCost.objects.filter(
-            company=company, source__isnull=True
-        )
-    }
-    created = 0
-    for spc in SystemPreliminaryCost.objects.exclude(pk__in=existing_source_ids):
-        key = (spc.name, spc.preliminary_type)
-        cpc = orphan_by_key.pop(key, None)
-        if cpc is not None:
-            cpc.source = spc
-            cpc.sum_value = spc.sum_value
-            cpc.amount = spc.amount
-            cpc.number_per_month = spc.number_per_month
-            cpc.monthly_rate = spc.monthly_rate
-            cpc.months = spc.months
-            cpc.save()
-            updated += 1
-            continue
-        ContractorPreliminaryCost.objects.create(
-            company=company,
-            source=spc,
-            name=spc.name,
-            preliminary_type=spc.preliminary_type,
-            sum_value=spc.sum_value,
-            amount=spc.amount,
-            number_per_month=spc.number_per_month,
-            monthly_rate=spc.monthly_rate,
-            months=spc.months,
-        )
-        created += 1
-
-    return {"updated": updated, "created": created}
-
-
-def _resolve_contractor_material(company, system_material):
-    if not system_material:
-        return None
-    return (
-        ContractorMaterial.objects.filter(
-            company=company, source_id=system_material.pk
-        ).first()
-        or ContractorMaterial.objects.filter(
-            company=company, material_code=system_material.material_code
-        ).first()
-    )
+    """Sync contractor preliminary costs with current system library values.
 
-
-def _resolve_contractor_trade_code(company, system_trade_code):
-    if not system_trade_code:
-        return None
-    return ContractorTradeCode.objects.filter(
-        company=company, prefix=system_trade_code.prefix
-    ).first()
+    Unlinked rows are adopted by (name, preliminary_type).
+    """
+    key = attrgetter("name", "preliminary_type")
+    return sync_rows(
+        ContractorPreliminaryCost.objects.filter(company=company),
+        SystemPreliminaryCost.objects.all(),
+        scope={"company": company},
+        match=[MATCH_SOURCE, (unlinked(key), key)],
+        values=lambda spc: {
+            "source_id": spc.pk,
+            **copy_fields("name", "preliminary_type", *PRELIMINARY_COST_FIELDS)(spc),
+        },
+    ).counts()
 
 
 def sync_material_specs_to_contractor(company):
     """Sync contractor material specifications with the SystemSpecification
-    library. Specs are matched by name; each sync rebuilds the component
-    list from the system source."""
-    existing_by_name = {
-        cs.name: cs for cs in ContractorSpecification.objects.filter(company=company)
-    }
+    library. Specs are matched by source, then by name; component lists
+    that differ from the system source are rebuilt, with materials resolved
+    by source, then by `material_code`."""
+    contractor_materials = ContractorMaterial.objects.filter(company=company)
+    materials_by_source = key_map(contractor_materials, "source_id")
+    materials_by_code = key_map(contractor_materials, "material_code")
+
+    def material_id(comp):
+        if not comp.material_id:
+            return None
+        return materials_by_source.get(comp.material_id) or materials_by_code.get(
+            comp.material.material_code
+        )
+
+    trade_code = _resolve_by_prefix(ContractorTradeCode.objects.filter(company=company))
+    result = sync_rows(
+        ContractorSpecification.objects.filter(company=company),
+        SystemSpecification.objects.select_related("trade_code").prefetch_related(
+            "spec_components__material"
+        ),
+        scope={"company": company},
+        match=[MATCH_SOURCE, attrgetter("name")],
+        values=lambda ss: {
+            "source_id": ss.pk,
+            **copy_fields("name", "section", "unit_label")(ss),
+            "trade_code_id": trade_code(ss),
+        },
+    )
+    sync_children(
+        result,
+        ContractorSpecificationComponent,
+        "specification",
+        lambda ss: [
+            {
+                "material_id": material_id(comp),
+                "label": comp.label,
+                "qty_per_unit": comp.qty_per_unit,
+                "sort_order": comp.sort_order,
+            }
+            for comp in ss.spec_components.all()
+        ],
+        ("material_id", "label", "qty_per_unit", "sort_order"),
+    )
+    return result.counts()
 
-    updated = 0
-    created = 0
-    for ss in SystemSpecification.objects.select_related("trade_code").prefetch_related(
-        "spec_components__material"
-    ):
-        trade_code = _resolve_contractor_trade_code(company, ss.trade_code)
-        cs = existing_by_name.get(ss.name)
-        if cs is None:
-            cs = ContractorSpecification.objects.create(
-                company=company,
-                source=ss,
-                name=ss.name,
-                section=ss.section,
-                trade_code=trade_code,
-                unit_label=ss.unit_label,
-            )
-            created += 1
-        else:
-            cs.source = ss
-            cs.section = ss.section
-            cs.trade_code = trade_code
-            cs.unit_label = ss.unit_label
-            cs.save()
-            updated += 1
-
-        cs.spec_components.all().delete()
-        for comp in ss.spec_components.all():
-            ContractorSpecificationComponent.objects.create(
-                specification=cs,
-                material=_resolve_contractor_material(company, comp.material),
-                label=comp.label,
-                qty_per_unit=comp.qty_per_unit,
-                sort_order=comp.sort_order,
-            )
 
-    return {"updated": updated, "created": created}
+def sync_labour_specs_to_contractor(company):
+    """Sync contractor labour specifications with current system library values.
 
+    Unlinked specs are adopted by name; crews resolve by source, then by
+    `crew_type`.
+    """
+    contractor_crews = ContractorLabourCrew.objects.filter(company=company)
+    crews_by_source = key_map(contractor_crews, "source_id")
+    crews_by_type = key_map(contractor_crews, "crew_type")
+
+    def crew_id(sls):
+        if not sls.crew_id:
+            return None
+        return crews_by_source.get(sls.crew_id) or crews_by_type.get(sls.crew.crew_type)
+
+    return sync_rows(
+        ContractorLabourSpecification.objects.filter(company=company),
+        SystemLabourSpecification.objects.select_related("crew"),
+        scope={"company": company},
+        match=[MATCH_SOURCE, (unlinked(attrgetter("name")), attrgetter("name"))],
+        values=lambda sls: {
+            "source_id": sls.pk,
+            **copy_fields("name", *LABOUR_SPEC_FIELDS)(sls),
+            "crew_id": crew_id(sls),
+        },
+        derive=_mirror_trade_name(ContractorTradeCode.objects.filter(company=company)),
+    ).counts()
 
-def _resolve_contractor_labour_crew(company, system_crew):
-    if not system_crew:
-        return None
-    return (
-        ContractorLabourCrew.objects.filter(
-            company=company, source_id=system_crew.pk
-        ).first()
-        or ContractorLabourCrew.objects.filter(
-            company=company, crew_type=system_crew.crew_type
-        ).first()
-    )
 
+def sync_plant_specs_to_contractor(company):
+    """Sync contractor plant specifications with current system library values.
 
-def sync_labour_specs_to_contractor(company):
-    """Sync contractor labour specifications with current system library values."""
-    updated = 0
-    for cls in ContractorLabourSpecification.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source", "source__crew"):
-        cls.section = cls.source.section
-        cls.trade_name = cls.source.trade_name
-        cls.name = cls.source.name
-        cls.unit = cls.source.unit
-        cls.daily_production = cls.source.daily_production
-        cls.team_mix = cls.source.team_mix
-        cls.site_factor = cls.source.site_factor
-        cls.tools_factor = cls.source.tools_factor
-        cls.leadership_factor = cls.source.leadership_factor
-        cls.crew = _resolve_contractor_labour_crew(company, cls.source.crew)
-        cls.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorLabourSpecification.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
+    Unlinked specs are adopted by name. Component lists that differ from
+    the system source are rebuilt, with plant types resolved by source.
+    """
+    plant_costs = key_map(
+        ContractorPlantCost.objects.filter(company=company), "source_id"
     )
-    orphan_by_name = {
-        cls.name: cls
-        for cls in ContractorLabourSpecification.objects.filter(
-            company=company, source__isnull=True
-        )
-    }
-    created = 0
-    for sls in SystemLabourSpecification.objects.exclude(
-        pk__in=existing_source_ids
-    ).select_related("crew"):
-        crew = _resolve_contractor_labour_crew(company, sls.crew)
-        cls = orphan_by_name.pop(sls.name, None)
-        if cls is not None:
-            cls.source = sls
-            cls.section = sls.section
-            cls.trade_name = sls.trade_name
-            cls.unit = sls.unit
-            cls.crew = crew
-            cls.daily_production = sls.daily_production
-            cls.team_mix = sls.team_mix
-            cls.site_factor = sls.site_factor
-            cls.tools_factor = sls.tools_factor
-            cls.leadership_factor = sls.leadership_factor
-            cls.save()
-            updated += 1
-            continue
-        ContractorLabourSpecification.objects.create(
-            company=company,
-            source=sls,
-            section=sls.section,
-            trade_name=sls.trade_name,
-            name=sls.name,
-            unit=sls.unit,
-            crew=crew,
-            daily_production=sls.daily_production,
-            team_mix=sls.team_mix,
-            site_factor=sls.site_factor,
-            tools_factor=sls.tools_factor,
-            leadership_factor=sls.leadership_factor,
-        )
-        created += 1
+    result = sync_rows(
+        ContractorPlantSpecification.objects.filter(company=company),
+        SystemPlantSpecification.objects.prefetch_related("components"),
+        scope={"company": company},
+        match=[MATCH_SOURCE, (unlinked(attrgetter("name")), attrgetter("name"))],
+        values=lambda sps: {
+            "source_id": sps.pk,
+            **copy_fields("name", *PLANT_SPEC_FIELDS)(sps),
+        },
+        derive=_mirror_trade_name(ContractorTradeCode.objects.filter(company=company)),
+    )
+    sync_children(
+        result,
+        ContractorPlantSpecificationComponent,
+        "specification",
+        lambda sps: [
+            {
+                "plant_type_id": plant_costs.get(comp.plant_type_id),
+                "hours": comp.hours,
+                "sort_order": comp.sort_order,
+            }
+            for comp in sps.components.all()
+        ],
+        ("plant_type_id", "hours", "sort_order"),
+    )
+    return result.counts()
 
-    return {"updated": updated, "created": created}
 
+def sync_preliminary_specs_to_contractor(company):
+    """Sync contractor preliminary specifications with current system library
+    values. Unlinked specs are adopted by name."""
+    return sync_rows(
+        ContractorPreliminarySpecification.objects.filter(company=company),
+        SystemPreliminarySpecification.objects.all(),
+        scope={"company": company},
+        match=[MATCH_SOURCE, (unlinked(attrgetter("name")), attrgetter("name"))],
+        values=lambda sps: {
+            "source_id": sps.pk,
+            **copy_fields("name", *PRELIMINARY_SPEC_FIELDS)(sps),
+        },
+        derive=_mirror_trade_name(ContractorTradeCode.objects.filter(company=company)),
+    ).counts()
 
-def _resolve_contractor_plant_cost(company, system_plant_type_id):
-    if not system_plant_type_id:
-        return None
-    return ContractorPlantCost.objects.filter(
-        company=company, source_id=system_plant_type_id
-    ).first()
 
+# ── Item Library Sync ────────────────────────────────────────────
 
-def _rebuild_contractor_plant_spec_components(cps, company):
-    cps.components.all().delete()
-    if not cps.source_id:  # ty:ignore[unresolved-attribute]
-        return
-    for comp in cps.source.components.all():
-        ContractorPlantSpecificationComponent.objects.create(
-            specification=cps,
-            plant_type=_resolve_contractor_plant_cost(
-                company,
-                comp.plant_type_id,  # ty:ignore[unresolved-attribute]
-            ),
-            hours=comp.hours,
-            sort_order=comp.sort_order,
-        )
+ITEM_LIBRARY_SPECS = {
+    "material_spec": (ContractorSpecification, ProjectSpecification),
+    "labour_spec": (ContractorLabourSpecification, ProjectLabourSpecification),
+    "plant_spec": (ContractorPlantSpecification, ProjectPlantSpecification),
+    "preliminary_spec": (
+        ContractorPreliminarySpecification,
+        ProjectPreliminarySpecification,
+    ),
+}
 
 
-def sync_plant_specs_to_contractor(company):
-    """Sync contractor plant specifications with current system library values."""
-    updated = 0
-    for cps in ContractorPlantSpecification.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        cps.section = cps.source.section
-        cps.trade_name = cps.source.trade_name
-        cps.name = cps.source.name
-        cps.unit = cps.source.unit
-        cps.daily_production = cps.source.daily_production
-        cps.operator_factor = cps.source.operator_factor
-        cps.site_factor = cps.source.site_factor
-        cps.save()
-        _rebuild_contractor_plant_spec_components(cps, company)
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorPlantSpecification.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    orphan_by_name = {
-        cps.name: cps
-        for cps in ContractorPlantSpecification.objects.filter(
-            company=company, source__isnull=True
-        )
-    }
-    created = 0
-    for sps in SystemPlantSpecification.objects.exclude(
-        pk__in=existing_source_ids
-    ).prefetch_related("components"):
-        cps = orphan_by_name.pop(sps.name, None)
-        if cps is not None:
-            cps.source = sps
-            cps.section = sps.section
-            cps.trade_name = sps.trade_name
-            cps.unit = sps.unit
-            cps.daily_production = sps.daily_production
-            cps.operator_factor = sps.operator_factor
-            cps.site_factor = sps.site_factor
-            cps.save()
-            _rebuild_contractor_plant_spec_components(cps, company)
-            updated += 1
-            continue
-        cps = ContractorPlantSpecification.objects.create(
-            company=company,
-            source=sps,
-            section=sps.section,
-            trade_name=sps.trade_name,
-            name=sps.name,
-            unit=sps.unit,
-            daily_production=sps.daily_production,
-            operator_factor=sps.operator_factor,
-            site_factor=sps.site_factor,
-        )
-        for comp in sps.components.all():
-            ContractorPlantSpecificationComponent.objects.create(
-                specification=cps,
-                plant_type=_resolve_contractor_plant_cost(
-                    company,
-                    comp.plant_type_id,  # ty:ignore[unresolved-attribute]
-                ),
-                hours=comp.hours,
-                sort_order=comp.sort_order,
-            )
-        created += 1
+def _item_library_values(link, trade_codes, specs_by_name):
+    """``values`` for an Item Library sync: the trade code resolves by prefix
+    and each spec FK by name in the target scope; missing targets stay
+    blank."""
+    trade_code = _resolve_by_prefix(trade_codes)
 
-    return {"updated": updated, "created": created}
+    def values(entry):
+        row = copy_fields(*ITEM_LIBRARY_FIELDS)(entry)
+        row[link] = entry.pk
+        row["trade_code_id"] = trade_code(entry)
+        for field, by_name in specs_by_name.items():
+            spec = getattr(entry, field)
+            row[f"{field}_id"] = by_name.get(spec.name) if spec else None
+        return row
 
+    return values
 
-def sync_preliminary_specs_to_contractor(company):
-    """Sync contractor preliminary specifications with current system library values."""
-    updated = 0
-    for cps in ContractorPreliminarySpecification.objects.filter(
-        company=company, source__isnull=False
-    ).select_related("source"):
-        cps.section = cps.source.section
-        cps.trade_name = cps.source.trade_name
-        cps.name = cps.source.name
-        cps.unit = cps.source.unit
-        cps.preliminary_type = cps.source.preliminary_type
-        cps.save()
-        updated += 1
-
-    existing_source_ids = set(
-        ContractorPreliminarySpecification.objects.filter(
-            company=company, source__isnull=False
-        ).values_list("source_id", flat=True)
-    )
-    orphan_by_name = {
-        cps.name: cps
-        for cps in ContractorPreliminarySpecification.objects.filter(
-            company=company, source__isnull=True
-        )
-    }
-    created = 0
-    for sps in SystemPreliminarySpecification.objects.exclude(
-        pk__in=existing_source_ids
-    ):
-        cps = orphan_by_name.pop(sps.name, None)
-        if cps is not None:
-            cps.source = sps
-            cps.section = sps.section
-            cps.trade_name = sps.trade_name
-            cps.unit = sps.unit
-            cps.preliminary_type = sps.preliminary_type
-            cps.save()
-            updated += 1
-            continue
-        ContractorPreliminarySpecification.objects.create(
-            company=company,
-            source=sps,
-            section=sps.section,
-            trade_name=sps.trade_name,
-            name=sps.name,
-            unit=sps.unit,
-            preliminary_type=sps.preliminary_type,
-        )
-        created += 1
 
-    return {"updated": updated, "created": created}
+def _item_library_sources(queryset):
+    return queryset.select_related("trade_code", *ITEM_LIBRARY_SPECS)
 
 
-# ── Item Library Sync ────────────────────────────────────────────
+ITEM_LIBRARY_KEY = attrgetter("component", "description")
 
 
 def sync_item_library_to_contractor(company):
@@ -1537,176 +1175,53 @@ def sync_item_library_to_contractor(company):
     company. Match on existing source FK; fall back to (component, description).
     Spec FKs resolve by name into the contractor's scoped tables.
     """
-    by_source = {
-        e.source_id: e
-        for e in ContractorItemLibraryEntry.objects.filter(
-            company=company, source__isnull=False
-        )
-    }
-    by_key = {
-        (e.component, e.description): e
-        for e in ContractorItemLibraryEntry.objects.filter(
-            company=company, source__isnull=True
-        )
-    }
-
-    created = updated = 0
-    for sysentry in SystemItemLibraryEntry.objects.select_related(
-        "trade_code",
-        "material_spec",
-        "labour_spec",
-        "plant_spec",
-        "preliminary_spec",
-    ):
-        trade_code = _resolve_contractor_trade_code(company, sysentry.trade_code)
-        material_spec = (
-            ContractorSpecification.objects.filter(
-                company=company, name=sysentry.material_spec.name
-            ).first()
-            if sysentry.material_spec
-            else None
-        )
-        labour_spec = (
-            ContractorLabourSpecification.objects.filter(
-                company=company, name=sysentry.labour_spec.name
-            ).first()
-            if sysentry.labour_spec
-            else None
-        )
-        plant_spec = (
-            ContractorPlantSpecification.objects.filter(
-                company=company, name=sysentry.plant_spec.name
-            ).first()
-            if sysentry.plant_spec
-            else None
-        )
-        prelim_spec = (
-            ContractorPreliminarySpecification.objects.filter(
-                company=company, name=sysentry.preliminary_spec.name
-            ).first()
-            if sysentry.preliminary_spec
-            else None
-        )
-
-        defaults = {
-            "trade_code": trade_code,
-            "item_code": sysentry.item_code,
-            "accounts_code": sysentry.accounts_code,
-            "component": sysentry.component,
-            "description": sysentry.description,
-            "unit": sysentry.unit,
-            "material_spec": material_spec,
-            "labour_spec": labour_spec,
-            "plant_spec": plant_spec,
-            "preliminary_spec": prelim_spec,
-            "display_order": sysentry.display_order,
-        }
-
-        target = by_source.get(sysentry.pk) or by_key.get(
-            (sysentry.component, sysentry.description)
-        )
-        if target is None:
-            ContractorItemLibraryEntry.objects.create(
-                company=company, source=sysentry, **defaults
-            )
-            created += 1
-        else:
-            target.source = sysentry
-            for k, v in defaults.items():
-                setattr(target, k, v)
-            target.save()
-            updated += 1
-
-    return {"created": created, "updated": updated}
+    return sync_rows(
+        ContractorItemLibraryEntry.objects.filter(company=company),
+        _item_library_sources(SystemItemLibraryEntry.objects.all()),
+        scope={"company": company},
+        match=[MATCH_SOURCE, (unlinked(ITEM_LIBRARY_KEY), ITEM_LIBRARY_KEY)],
+        values=_item_library_values(
+            "source_id",
+            ContractorTradeCode.objects.filter(company=company),
+            {
+                field: key_map(contractor.objects.filter(company=company), "name")
+                for field, (contractor, _) in ITEM_LIBRARY_SPECS.items()
+            },
+        ),
+    ).counts()
+
+
+def _project_item_library_values(project, link):
+    return _item_library_values(
+        link,
+        ProjectTradeCode.objects.filter(project=project),
+        {
+            field: key_map(model.objects.filter(project=project), "name")
+            for field, (_, model) in ITEM_LIBRARY_SPECS.items()
+        },
+    )
 
 
 def sync_item_library_from_system(project):
     """Clone SystemItemLibraryEntry rows into the project. Spec FKs resolve
     against the project-scoped tables by name; missing targets stay blank."""
-    by_source = {
-        e.source_system_id: e
-        for e in ProjectItemLibraryEntry.objects.filter(
-            project=project, source_system__isnull=False
-        )
-    }
-    by_key = {
-        (e.component, e.description): e
-        for e in ProjectItemLibraryEntry.objects.filter(
-            project=project,
-            source_system__isnull=True,
-            source_contractor__isnull=True,
-        )
-    }
-
-    created = updated = 0
-    for sysentry in SystemItemLibraryEntry.objects.select_related(
-        "trade_code",
-        "material_spec",
-        "labour_spec",
-        "plant_spec",
-        "preliminary_spec",
-    ):
-        prefix = sysentry.trade_code.prefix if sysentry.trade_code else None
-        trade_code = _resolve_project_trade_code_by_prefix(project, prefix)
-        material_spec = (
-            ProjectSpecification.objects.filter(
-                project=project, name=sysentry.material_spec.name
-            ).first()
-            if sysentry.material_spec
-            else None
-        )
-        labour_spec = (
-            ProjectLabourSpecification.objects.filter(
-                project=project, name=sysentry.labour_spec.name
-            ).first()
-            if sysentry.labour_spec
-            else None
-        )
-        plant_spec = (
-            ProjectPlantSpecification.objects.filter(
-                project=project, name=sysentry.plant_spec.name
-            ).first()
-            if sysentry.plant_spec
-            else None
-        )
-        prelim_spec = (
-            ProjectPreliminarySpecification.objects.filter(
-                project=project, name=sysentry.preliminary_spec.name
-            ).first()
-            if sysentry.preliminary_spec
-            else None
-        )
-
-        defaults = {
-            "trade_code": trade_code,
-            "item_code": sysentry.item_code,
-            "accounts_code": sysentry.accounts_code,
-            "component": sysentry.component,
-            "description": sysentry.description,
-            "unit": sysentry.unit,
-            "material_spec": material_spec,
-            "labour_spec": labour_spec,
-            "plant_spec": plant_spec,
-            "preliminary_spec": prelim_spec,
-            "display_order": sysentry.display_order,
-        }
-
-        target = by_source.get(sysentry.pk) or by_key.get(
-            (sysentry.component, sysentry.description)
-        )
-        if target is None:
-            ProjectItemLibraryEntry.objects.create(
-                project=project, source_system=sysentry, **defaults
-            )
-            created += 1
-        else:
-            target.source_system = sysentry
-            for k, v in defaults.items():
-                setattr(target, k, v)
-            target.save()
-            updated += 1
-
-    return {"created": created, "updated": updated}
+    return sync_rows(
+        ProjectItemLibraryEntry.objects.filter(project=project),
+        _item_library_sources(SystemItemLibraryEntry.objects.all()),
+        scope={"project": project},
+        match=[
+            (attrgetter("source_system_id"), attrgetter("pk")),
+            (
+                lambda e: (
+                    None
+                    if e.source_system_id or e.source_contractor_id
+                    else ITEM_LIBRARY_KEY(e)
+                ),
+                ITEM_LIBRARY_KEY,
+            ),
+        ],
+        values=_project_item_library_values(project, "source_system_id"),
+    ).counts()
 
 
 def sync_item_library_from_contractor(project):
@@ -1716,116 +1231,69 @@ def sync_item_library_from_contractor(project):
     if company is None:
         return {"updated": 0, "created": 0, "skipped_no_contractor": True}
 
-    by_source = {
-        e.source_contractor_id: e
-        for e in ProjectItemLibraryEntry.objects.filter(
-            project=project, source_contractor__isnull=False
-        )
-    }
-    by_key = {
-        (e.component, e.description): e
-        for e in ProjectItemLibraryEntry.objects.filter(
-            project=project,
-            source_contractor__isnull=True,
-        )
-    }
-
-    created = updated = 0
-    for centry in ContractorItemLibraryEntry.objects.filter(
-        company=company
-    ).select_related(
-        "trade_code",
-        "material_spec",
-        "labour_spec",
-        "plant_spec",
-        "preliminary_spec",
-    ):
-        prefix = centry.trade_code.prefix if centry.trade_code else None
-        trade_code = _resolve_project_trade_code_by_prefix(project, prefix)
-        material_spec = (
-            ProjectSpecification.objects.filter(
-                project=project, name=centry.material_spec.name
-            ).first()
-            if centry.material_spec
-            else None
-        )
-        labour_spec = (
-            ProjectLabourSpecification.objects.filter(
-                project=project, name=centry.labour_spec.name
-            ).first()
-            if centry.labour_spec
-            else None
-        )
-        plant_spec = (
-            ProjectPlantSpecification.objects.filter(
-                project=project, name=centry.plant_spec.name
-            ).first()
-            if centry.plant_spec
-            else None
-        )
-        prelim_spec = (
-            ProjectPreliminarySpecification.objects.filter(
-                project=project, name=centry.preliminary_spec.name
-            ).first()
-            if centry.preliminary_spec
-            else None
-        )
-
-        defaults = {
-            "trade_code": trade_code,
-            "item_code": centry.item_code,
-            "accounts_code": centry.accounts_code,
-            "component": centry.component,
-            "description": centry.description,
-            "unit": centry.unit,
-            "material_spec": material_spec,
-            "labour_spec": labour_spec,
-            "plant_spec": plant_spec,
-            "preliminary_spec": prelim_spec,
-            "display_order": centry.display_order,
-        }
-
-        target = by_source.get(centry.pk) or by_key.get(
-            (centry.component, centry.description)
-        )
-        if target is None:
-            ProjectItemLibraryEntry.objects.create(
-                project=project, source_contractor=centry, **defaults
-            )
-            created += 1
-        else:
-            target.source_contractor = centry
-            for k, v in defaults.items():
-                setattr(target, k, v)
-            target.save()
-            updated += 1
-
-    return {"created": created, "updated": updated}
+    return sync_rows(
+        ProjectItemLibraryEntry.objects.filter(project=project),
+        _item_library_sources(
+            ContractorItemLibraryEntry.objects.filter(company=company)
+        ),
+        scope={"project": project},
+        match=[
+            (attrgetter("source_contractor_id"), attrgetter("pk")),
+            (unlinked(ITEM_LIBRARY_KEY, "source_contractor_id"), ITEM_LIBRARY_KEY),
+        ],
+        values=_project_item_library_values(project, "source_contractor_id"),
+    ).counts()
+
+
+AUTOFILL_SPEC_FIELDS = [
+    "library_entry",
+    "specification",
+    "labour_specification",
+    "plant_specification",
+    "preliminary_specification",
+]
+# Minimum description similarity to fill a row without review
+AUTOFILL_MIN_SCORE = 0.85
+# Minimum similarity for a library entry to be offered as a suggestion
+AUTOFILL_SUGGEST_SCORE = 0.5
+# A runner-up this close to the best match makes the match ambiguous
+AUTOFILL_MARGIN = 0.05
 
 
 def autofill_boq_from_library(project):
     """Fill spec FKs on Output BoQ rows from matching Item Library entries.
 
-    For each non-header BoQ row in `project` that has none of the four spec
-    FKs set, find the library entry whose description matches the row's
-    description (case-insensitive, trimmed). If exactly one entry matches,
-    copy its spec FKs over plus the back-link. Multiple entries sharing
-    the same description count as ambiguous and are skipped.
+    Every non-header BoQ row in `project` that has none of the four spec
+    FKs set is scored against the project's library descriptions (see
+    `DescriptionMatcher`). When the best entry scores at least
+    `AUTOFILL_MIN_SCORE` and no entry with different specs comes within
+    `AUTOFILL_MARGIN` of it, its spec FKs are copied over plus the
+    back-link; all such rows are written in one `bulk_update`. Rows whose
+    best entries are weaker or tied count as ambiguous and are returned as
+    suggestions for review, each with its candidate entries.
 
     Rows already carrying any spec are left untouched — use the
     "Reset autofill" action first if you want to overwrite them.
     """
+    library = list(
+        ProjectItemLibraryEntry.objects.filter(project=project).only(
+            "id",
+            "description",
+            "material_spec_id",
+            "labour_spec_id",
+            "plant_spec_id",
+            "preliminary_spec_id",
+        )
+    )
+    items = BOQItem.objects.filter(project=project, is_section_header=False).only(
+        "id",
+        "description",
+        *(f"{name}_id" for name in AUTOFILL_SPEC_FIELDS),
+    )
 
-    def norm(s):
-        return (s or "").strip().lower()
-
-    by_desc = {}
-    for e in ProjectItemLibraryEntry.objects.filter(project=project):
-        by_desc.setdefault(norm(e.description), []).append(e)
-
-    filled = skipped_already_set = no_match = ambiguous = 0
-
-    for item in BOQItem.objects.filter(project=project, is_section_header=False):
+    candidates = []
+    skipped_already_set = 0
+    for item in items:
         if (
             item.specification_id
             or item.labour_specification_id
@@ -1833,39 +1301,75 @@ def autofill_boq_from_library(project):
             or item.preliminary_specification_id
         ):
             skipped_already_set += 1
-            continue
-
-        desc_matches = by_desc.get(norm(item.description), [])
-        if len(desc_matches) == 1:
-            match = desc_matches[0]
-        elif len(desc_matches) > 1:
-            ambiguous += 1
-            continue
         else:
-            no_match += 1
-            continue
+            candidates.append(item)
 
-        item.library_entry = match
-        item.specification = match.material_spec
-        item.labour_specification = match.labour_spec
-        item.plant_specification = match.plant_spec
-        item.preliminary_specification = match.preliminary_spec
-        item.save(
-            update_fields=[
-                "library_entry",
-                "specification",
-                "labour_specification",
-                "plant_specification",
-                "preliminary_specification",
-            ]
+    def specs(entry):
+        return (
+            entry.material_spec_id,
+            entry.labour_spec_id,
+            entry.plant_spec_id,
+            entry.preliminary_spec_id,
         )
-        filled += 1
+
+    matcher = DescriptionMatcher(entry.description for entry in library)
+    matches = matcher.match(
+        (item.description for item in candidates),
+        min_score=AUTOFILL_SUGGEST_SCORE,
+    )
+
+    filled = []
+    suggestions = []
+    no_match = 0
+    for item, ranked in zip(candidates, matches, strict=True):
+        if not ranked:
+            no_match += 1
+            continue
+        best, best_score = library[ranked[0][0]], ranked[0][1]
+        rivals = [
+            index
+            for index, score in ranked[1:]
+            if score >= best_score - AUTOFILL_MARGIN
+            and specs(library[index]) != specs(best)
+        ]
+        if best_score >= AUTOFILL_MIN_SCORE and not rivals:
+            item.library_entry_id = best.pk
+            (
+                item.specification_id,
+                item.labour_specification_id,
+                item.plant_specification_id,
+                item.preliminary_specification_id,
+            ) = specs(best)
+            filled.append(item)
+            continue
+        suggestions.append(
+            {
+                "item_id": item.pk,
+                "description": item.description,
+                "candidates": [
+                    {
+                        "entry_id": library[index].pk,
+                        "description": library[index].description,
+                        "score": score,
+                    }
+                    for index, score in ranked
+                ],
+            }
+        )
+
+    if filled:
+        BOQItem.objects.bulk_update(
+            filled, [f"{name}_id" for name in AUTOFILL_SPEC_FIELDS], batch_size=500
+        )
+        # bulk_update skips post_save, which marks the BoQ rollup stale
+        BOQProfitabilityRollup.mark_stale(project.pk)
 
     return {
-        "filled": filled,
+        "filled": len(filled),
         "skipped_already_set": skipped_already_set,
         "no_match": no_match,
-        "ambiguous": ambiguous,
+        "ambiguous": len(suggestions),
+        "suggestions": suggestions,
     }
 
 
@@ -0,0 +1,68 @@
+"""Estimator model signals.
+
+Marks a project's BoQ profitability rollup stale whenever a model that feeds
+``BOQItem.baseline_new_price`` or the BoQ quantities changes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from app.Estimator.models import (
+    BOQItem,
+    BOQProfitabilityRollup,
+    ProjectAssumptions,
+    ProjectLabourCrew,
+    ProjectLabourSpecification,
+    ProjectMaterial,
+    ProjectPlantCost,
+    ProjectPlantSpecification,
+    ProjectPlantSpecificationComponent,
+    ProjectPreliminaryCost,
+    ProjectPreliminarySpecification,
+    ProjectSpecification,
+    ProjectSpecificationComponent,
+)
+
+# Model -> attribute path resolving the owning project's id.
+ROLLUP_SOURCE_MODELS = {
+    BOQItem: "project_id",
+    ProjectAssumptions: "project_id",
+    ProjectMaterial: "project_id",
+    ProjectSpecification: "project_id",
+    ProjectSpecificationComponent: "specification.project_id",
+    ProjectLabourCrew: "project_id",
+    ProjectLabourSpecification: "project_id",
+    ProjectPlantCost: "project_id",
+    ProjectPlantSpecification: "project_id",
+    ProjectPlantSpecificationComponent: "specification.project_id",
+    ProjectPreliminaryCost: "project_id",
+    ProjectPreliminarySpecification: "project_id",
+}
+
+
+def _resolve_project_id(instance) -> int | None:
+    value = instance
+    for attr in ROLLUP_SOURCE_MODELS[type(instance)].split("."):
+        value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def mark_boq_rollup_stale(sender, instance, **kwargs):
+    """Flag the BoQ profitability rollup of the project owning ``instance``."""
+    project_id = _resolve_project_id(instance)
+    if project_id:
+        BOQProfitabilityRollup.mark_stale(project_id)
+
+
+for _model in ROLLUP_SOURCE_MODELS:
+    post_save.connect(
+        mark_boq_rollup_stale,
+        sender=_model,
+        dispatch_uid=f"boq_rollup_save_{_model._meta.label}",
+    )
+    post_delete.connect(
+        mark_boq_rollup_stale,
+        sender=_model,
+        dispatch_uid=f"boq_rollup_delete_{_model._meta.label}",
+    )
@@ -0,0 +1,290 @@
+"""Tests for batched Estimator grid edits."""
+
+import json
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.Estimator.factories import (
+    BOQItemFactory,
+    ProjectPlantCostFactory,
+    ProjectPlantSpecificationComponentFactory,
+)
+from app.Estimator.grid_edits import PROJECT_TIER, SYSTEM_TIER, apply_grid_edits
+from app.Estimator.models import (
+    BOQProfitabilityRollup,
+    ProjectLabourCrew,
+    ProjectLabourSpecification,
+    ProjectMaterial,
+    ProjectPreliminaryCost,
+    ProjectPreliminarySpecification,
+    ProjectSpecification,
+    ProjectSpecificationComponent,
+    SystemPlantCost,
+)
+from app.Project.tests.factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestApplyGridEdits:
+    def setup_method(self):
+        self.project = ProjectFactory.create()
+
+    def _material(self, code, pack_cost="10"):
+        return ProjectMaterial.objects.create(
+            project=self.project, material_code=code, pack_cost=Decimal(pack_cost)
+        )
+
+    def _spec(self, name, *materials):
+        spec = ProjectSpecification.objects.create(project=self.project, name=name)
+        for material in materials:
+            ProjectSpecificationComponent.objects.create(
+                specification=spec,
+                material=material,
+                label=material.material_code,
+                qty_per_unit=Decimal("2"),
+            )
+        return spec
+
+    def test_material_rates_and_dependent_specs(self):
+        cement, sand = self._material("CEM"), self._material("SAND")
+        spec = self._spec("Concrete", cement, sand)
+        BOQProfitabilityRollup.objects.create(project=self.project)
+
+        result = apply_grid_edits(
+            PROJECT_TIER,
+            "material",
+            [
+                {"id": cement.pk, "field": "pack_cost", "value": "50"},
+                {"id": cement.pk, "field": "pack_qty", "value": "2"},
+                {"id": sand.pk, "field": "unit", "value": "m3"},
+            ],
+            self.project.pk,
+        )
+
+        assert result.errors == []
+        assert result.updated == 2
+        cement.refresh_from_db()
+        assert cement.market_rate == Decimal("25")
+        assert result.rows[cement.pk]["market_rate"] == "25"
+        # (25 + 10) * 2 per unit, recomputed once for the shared spec
+        assert result.specs == {spec.pk: {"rate_per_unit": "70"}}
+        assert BOQProfitabilityRollup.objects.get(project=self.project).is_stale
+
+    def test_invalid_edits_save_nothing(self):
+        cement = self._material("CEM")
+        other_project_material = ProjectMaterial.objects.create(
+            project=ProjectFactory.create(), material_code="X"
+        )
+
+        result = apply_grid_edits(
+            PROJECT_TIER,
+            "material",
+            [
+                {"id": cement.pk, "field": "pack_cost", "value": "12"},
+                {"id": cement.pk, "field": "pack_qty", "value": "abc"},
+                {"id": cement.pk, "field": "market_rate", "value": "1"},
+                {"id": other_project_material.pk, "field": "unit", "value": "kg"},
+                {"id": "x", "field": "unit", "value": "kg"},
+            ],
+            self.project.pk,
+        )
+
+        assert [error["index"] for error in result.errors] == [1, 2, 3, 4]
+        cement.refresh_from_db()
+        assert cement.pack_cost == Decimal("10")
+
+    def test_component_material_swap_relabels(self):
+        cement, lime = self._material("CEM"), self._material("LIME", "30")
+        spec = self._spec("Mortar", cement)
+        component = spec.spec_components.get()
+
+        result = apply_grid_edits(
+            PROJECT_TIER,
+            "spec-component",
+            [
+                {"id": component.pk, "field": "material", "value": lime.pk},
+                {"id": component.pk, "field": "qty_per_unit", "value": "3"},
+            ],
+            self.project.pk,
+        )
+
+        assert result.rows[component.pk]["label"] == "LIME"
+        assert result.specs[spec.pk]["rate_per_unit"] == "90"
+
+    def test_labour_spec_derived_values(self):
+        crew = ProjectLabourCrew.objects.create(
+            project=self.project,
+            crew_type="Bricklayers",
+            skilled=1,
+            skilled_rate=Decimal("400"),
+        )
+        labour_spec = ProjectLabourSpecification.objects.create(
+            project=self.project, name="Brickwork", daily_production=Decimal("10")
+        )
+        BOQItemFactory(
+            project=self.project,
+            labour_specification=labour_spec,
+            contract_quantity=Decimal("5"),
+        )
+
+        result = apply_grid_edits(
+            PROJECT_TIER,
+            "labour-spec",
+            [
+                {"id": labour_spec.pk, "field": "crew", "value": crew.pk},
+                {"id": labour_spec.pk, "field": "is_active", "value": "false"},
+            ],
+            self.project.pk,
+        )
+
+        assert result.rows[labour_spec.pk] == {
+            "daily_output": "10",
+            "rate_per_unit": "40",
+            "daily_cost": "400",
+            "total_cost": "200",
+            "crew_type": "Bricklayers",
+        }
+        labour_spec.refresh_from_db()
+        assert not labour_spec.is_active
+
+    def test_plant_rate_changes_update_specs(self):
+        component = ProjectPlantSpecificationComponentFactory(
+            specification__project=self.project, hours=Decimal("2")
+        )
+
+        result = apply_grid_edits(
+            PROJECT_TIER,
+            "plant-cost",
+            [{"id": component.plant_type_id, "field": "hourly_rate", "value": "75"}],
+            self.project.pk,
+        )
+
+        assert result.specs[component.specification_id]["rate_per_unit"] == "150"
+
+    def test_preliminary_type_move_updates_both_specs(self):
+        cost = ProjectPreliminaryCost.objects.create(
+            project=self.project,
+            name="Site office",
+            preliminary_type="fixed_site",
+            amount=Decimal("100"),
+        )
+        fixed, time_based = (
+            ProjectPreliminarySpecification.objects.create(
+                project=self.project, name=name, preliminary_type=preliminary_type
+            )
+            for name, preliminary_type in (
+                ("Fixed", "fixed_site"),
+                ("Time", "time_site"),
+            )
+        )
+
+        result = apply_grid_edits(
+            PROJECT_TIER,
+            "preliminary-cost",
+            [
+                {"id": cost.pk, "field": "preliminary_type", "value": "time_site"},
+                {"id": cost.pk, "field": "number_per_month", "value": "1"},
+                {"id": cost.pk, "field": "monthly_rate", "value": "20"},
+                {"id": cost.pk, "field": "months", "value": "3"},
+            ],
+            self.project.pk,
+        )
+
+        assert result.rows[cost.pk]["computed_amount"] == "60"
+        assert result.specs == {
+            fixed.pk: {"amount": "0"},
+            time_based.pk: {"amount": "60"},
+        }
+
+    def test_query_count_is_independent_of_batch_size(self):
+        def edit(count):
+            materials = [self._material(f"M{count}-{i}") for i in range(count)]
+            self._spec(f"Spec {count}", *materials)
+            edits = [
+                {"id": material.pk, "field": "pack_cost", "value": "5"}
+                for material in materials
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                apply_grid_edits(PROJECT_TIER, "material", edits, self.project.pk)
+            return len(queries.captured_queries)
+
+        assert edit(2) == edit(30)
+
+    def test_unknown_grid_and_empty_batch(self):
+        with pytest.raises(ValueError):
+            apply_grid_edits(PROJECT_TIER, "boq", [{}], self.project.pk)
+        with pytest.raises(ValueError):
+            apply_grid_edits(PROJECT_TIER, "material", [], self.project.pk)
+
+
+@pytest.mark.django_db
+class TestBatchUpdateGridViews:
+    def test_project_batch_update(self, client):
+        project = ProjectFactory.create()
+        plant = ProjectPlantCostFactory(project=project)
+        client.force_login(AccountFactory.create())
+
+        response = client.post(
+            reverse(
+                "estimator:batch_update_grid",
+                kwargs={"project_pk": project.pk, "grid": "plant-cost"},
+            ),
+            json.dumps(
+                {"edits": [{"id": plant.pk, "field": "name", "value": "Crane"}]}
+            ),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["updated"] == 1
+        plant.refresh_from_db()
+        assert plant.name == "Crane"
+
+    def test_errors_are_returned_with_400(self, client):
+        project = ProjectFactory.create()
+        client.force_login(AccountFactory.create())
+        url = reverse(
+            "estimator:batch_update_grid",
+            kwargs={"project_pk": project.pk, "grid": "plant-cost"},
+        )
+
+        response = client.post(
+            url,
+            json.dumps({"edits": [{"id": 0, "field": "name", "value": "Crane"}]}),
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert response.json()["errors"] == [{"index": 0, "error": "Row not found"}]
+
+        response = client.post(url, "nope", content_type="application/json")
+        assert response.status_code == 400
+
+    def test_system_grid_requires_staff(self, client):
+        plant = SystemPlantCost.objects.create(name="Grader")
+        url = reverse("estimator:sys_batch_update_grid", kwargs={"grid": "plant-cost"})
+        body = json.dumps(
+            {"edits": [{"id": plant.pk, "field": "hourly_rate", "value": "90"}]}
+        )
+
+        client.force_login(AccountFactory.create())
+        response = client.post(url, body, content_type="application/json")
+        assert response.status_code == 403
+
+        client.force_login(AccountFactory.create(is_staff=True))
+        response = client.post(url, body, content_type="application/json")
+        assert response.status_code == 200
+        plant.refresh_from_db()
+        assert plant.hourly_rate == Decimal("90")
+        assert (
+            apply_grid_edits(
+                SYSTEM_TIER,
+                "plant-cost",
+                [{"id": plant.pk, "field": "hourly_rate", "value": "95"}],
+            ).errors
+            == []
+        )
@@ -0,0 +1,131 @@
+"""Tests for TF-IDF matching of BoQ descriptions to the Item Library."""
+
+import pytest
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.Estimator.factories import BOQItemFactory
+from app.Estimator.library_matching import DescriptionMatcher
+from app.Estimator.models import (
+    BOQItem,
+    BOQProfitabilityRollup,
+    ProjectItemLibraryEntry,
+    ProjectSpecification,
+)
+from app.Estimator.services import autofill_boq_from_library
+from app.Project.tests.factories import ProjectFactory
+
+
+class TestDescriptionMatcher:
+    library = [
+        "Concrete 25MPa to foundations",
+        "Concrete 30MPa to suspended slabs",
+        "Brickwork in one brick walls",
+        "Two coats acrylic paint to walls",
+    ]
+
+    def test_word_order_and_punctuation_do_not_matter(self):
+        matcher = DescriptionMatcher(self.library)
+
+        [ranked] = matcher.match(["Acrylic paint, two coats, to walls."])
+
+        assert ranked[0] == (3, 1.0)
+
+    def test_typos_are_folded_onto_library_words(self):
+        matcher = DescriptionMatcher(self.library)
+
+        [ranked] = matcher.match(["Brikwork in one brick walls"])
+
+        assert ranked[0] == (2, 1.0)
+
+    def test_rare_words_decide_between_close_entries(self):
+        matcher = DescriptionMatcher(self.library)
+
+        [ranked] = matcher.match(["Concrete 30MPa to slabs"], limit=2)
+
+        assert [index for index, _ in ranked] == [1, 0]
+        assert ranked[0][1] > 0.8 > ranked[1][1]
+
+    def test_scores_are_cut_off_and_batched(self, monkeypatch):
+        monkeypatch.setattr("app.Estimator.library_matching.MAX_BLOCK_CELLS", 4)
+        matcher = DescriptionMatcher(self.library)
+
+        results = matcher.match(
+            ["Steel windows", "Concrete to foundations", "Paint walls"],
+            min_score=0.5,
+        )
+
+        assert results[0] == []
+        assert results[1][0][0] == 0
+        assert results[2][0][0] == 3
+
+    def test_empty_library(self):
+        assert DescriptionMatcher([]).match(["Concrete"]) == [[]]
+
+
+@pytest.mark.django_db
+class TestAutofillBoqFromLibrary:
+    def setup_method(self):
+        self.project = ProjectFactory()
+
+    def _entry(self, description, spec_name):
+        return ProjectItemLibraryEntry.objects.create(
+            project=self.project,
+            description=description,
+            material_spec=ProjectSpecification.objects.create(
+                project=self.project, name=spec_name
+            ),
+        )
+
+    def test_confident_matches_are_filled_in_bulk(self):
+        entry = self._entry("Concrete 25MPa to foundations", "25MPa")
+        self._entry("Concrete 30MPa to suspended slabs", "30MPa")
+        items = [
+            BOQItemFactory(
+                project=self.project, description="Foundations: concrete 25MPa"
+            )
+            for _ in range(3)
+        ]
+        BOQProfitabilityRollup.objects.create(project=self.project)
+
+        result = autofill_boq_from_library(self.project)
+
+        assert result["filled"] == 3
+        assert set(
+            BOQItem.objects.filter(pk__in=[i.pk for i in items]).values_list(
+                "library_entry", "specification"
+            )
+        ) == {(entry.pk, entry.material_spec_id)}
+        assert BOQProfitabilityRollup.objects.get(project=self.project).source_version
+
+    def test_ambiguous_and_weak_matches_become_suggestions(self):
+        self._entry("Paint to walls", "Acrylic")
+        self._entry("Paint to walls", "Enamel")
+        self._entry("Ceramic floor tiles", "Tiles")
+        tied = BOQItemFactory(project=self.project, description="Paint walls")
+        weak = BOQItemFactory(project=self.project, description="Ceramic wall tiles")
+        BOQItemFactory(project=self.project, description="Steel roof trusses")
+
+        result = autofill_boq_from_library(self.project)
+
+        assert (result["filled"], result["ambiguous"], result["no_match"]) == (0, 2, 1)
+        suggested = {s["item_id"]: s["candidates"] for s in result["suggestions"]}
+        assert len(suggested[tied.pk]) == 2
+        assert suggested[weak.pk][0]["description"] == "Ceramic floor tiles"
+
+    def test_suggestions_are_shown_on_the_dashboard(self, client):
+        self._entry("Paint to walls", "Acrylic")
+        self._entry("Paint to walls", "Enamel")
+        BOQItemFactory(project=self.project, description="Paint walls")
+        client.force_login(AccountFactory.create())
+
+        response = client.post(
+            reverse(
+                "estimator:autofill_boq_from_library",
+                kwargs={"project_pk": self.project.pk},
+            ),
+            follow=True,
+        )
+
+        assert response.context["autofill_suggestions"]["count"] == 1
+        assert "Autofill suggestions" in response.content.decode()
@@ -0,0 +1,240 @@
+"""Tests for the set-based library sync services."""
+
+from decimal import Decimal
+from operator import attrgetter
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.core.models import SearchTerm
+from app.Estimator.library_sync import copy_fields, sync_rows
+from app.Estimator.models import (
+    BOQProfitabilityRollup,
+    ContractorLabourCrew,
+    ContractorLabourSpecification,
+    ContractorMaterial,
+    ContractorPlantCost,
+    ContractorPlantSpecification,
+    ContractorPlantSpecificationComponent,
+    ContractorSpecification,
+    ContractorSpecificationComponent,
+    ContractorTradeCode,
+    ProjectItemLibraryEntry,
+    ProjectMaterial,
+    ProjectSpecification,
+    ProjectSpecificationComponent,
+    ProjectTradeCode,
+    SystemItemLibraryEntry,
+    SystemLabourCrew,
+    SystemLabourSpecification,
+    SystemPlantCost,
+    SystemPlantSpecification,
+    SystemPlantSpecificationComponent,
+    SystemSpecification,
+)
+from app.Estimator.services import (
+    sync_item_library_from_system,
+    sync_labour_specs_to_contractor,
+    sync_material_specs_from_contractor,
+    sync_materials_from_contractor,
+    sync_plant_specs_to_contractor,
+)
+from app.Project.models import Company
+from app.Project.tests.factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestSyncFromContractor:
+    def setup_method(self):
+        self.company = Company.objects.create(
+            type=Company.Type.CONTRACTOR, name="Contractor Inc"
+        )
+        self.project = ProjectFactory(contractor=self.company)
+
+    def _material(self, code, pack_cost):
+        return ContractorMaterial.objects.create(
+            company=self.company, material_code=code, pack_qty=3, pack_cost=pack_cost
+        )
+
+    def test_materials_are_upserted_and_unchanged_rows_left_alone(self):
+        self._material("BRK", 2800)
+        cement = self._material("CEM", 95)
+        sync_materials_from_contractor(self.project)
+        cement.pack_cost = 99
+        cement.save()
+        self._material("SND", 300)
+        BOQProfitabilityRollup.objects.create(project=self.project)
+
+        result = sync_materials_from_contractor(self.project)
+
+        assert result == {"updated": 1, "created": 1, "unchanged": 1}
+        assert ProjectMaterial.objects.get(
+            project=self.project, material_code="CEM"
+        ).market_rate == Decimal("33.0000")
+        assert BOQProfitabilityRollup.objects.get(project=self.project).source_version
+
+    def test_created_rows_get_their_own_pks_without_returned_ids(self, monkeypatch):
+        for prefix in ("BW", "PL"):
+            ContractorTradeCode.objects.create(
+                company=self.company, prefix=prefix, trade_name=prefix
+            )
+        insert = ProjectTradeCode.objects.bulk_create
+
+        def bulk_create_without_ids(objs, **kwargs):
+            insert(objs, **kwargs)
+            # A concurrent writer adds a row right after ours, and the
+            # backend returns no ids
+            ProjectTradeCode.objects.create(project=self.project, prefix="XX")
+            for obj in objs:
+                obj.pk = None
+            return objs
+
+        monkeypatch.setattr(
+            ProjectTradeCode.objects, "bulk_create", bulk_create_without_ids
+        )
+
+        result = sync_rows(
+            ProjectTradeCode.objects.filter(project=self.project),
+            ContractorTradeCode.objects.filter(company=self.company),
+            scope={"project": self.project},
+            match=[attrgetter("prefix")],
+            values=copy_fields("prefix", "trade_name"),
+        )
+
+        saved = dict(
+            ProjectTradeCode.objects.filter(project=self.project).values_list(
+                "prefix", "pk"
+            )
+        )
+        assert {target.prefix: target.pk for target in result.created} == {
+            "BW": saved["BW"],
+            "PL": saved["PL"],
+        }
+
+    def test_missing_contractor_is_skipped(self):
+        project = ProjectFactory(contractor=None)
+
+        assert sync_materials_from_contractor(project)["skipped_no_contractor"]
+
+    def test_spec_components_are_rebuilt_only_when_they_differ(self):
+        brick = self._material("BRK", 2800)
+        spec = ContractorSpecification.objects.create(
+            company=self.company,
+            name="Brick wall",
+            trade_code=ContractorTradeCode.objects.create(
+                company=self.company, prefix="BW", trade_name="Brickwork"
+            ),
+        )
+        ContractorSpecificationComponent.objects.create(
+            specification=spec, material=brick, label="Bricks", qty_per_unit=55
+        )
+        ProjectTradeCode.objects.create(project=self.project, prefix="BW")
+        sync_materials_from_contractor(self.project)
+
+        assert sync_material_specs_from_contractor(self.project)["created"] == 1
+        assert sync_material_specs_from_contractor(self.project)["unchanged"] == 1
+        spec.spec_components.update(qty_per_unit=60)
+        assert sync_material_specs_from_contractor(self.project)["updated"] == 1
+
+        project_spec = ProjectSpecification.objects.get(project=self.project)
+        assert project_spec.trade_code.prefix == "BW"
+        component = ProjectSpecificationComponent.objects.get(
+            specification=project_spec
+        )
+        assert component.material.material_code == "BRK"
+        assert component.qty_per_unit == 60
+
+
+@pytest.mark.django_db
+class TestSyncToContractor:
+    def setup_method(self):
+        self.company = Company.objects.create(
+            type=Company.Type.CONTRACTOR, name="Contractor Inc"
+        )
+
+    def test_unlinked_specs_are_adopted_and_crews_resolved(self):
+        crew = SystemLabourCrew.objects.create(crew_type="Bricklayers", skilled=2)
+        SystemLabourSpecification.objects.create(
+            name="Lay bricks", crew=crew, daily_production=500
+        )
+        orphan = ContractorLabourSpecification.objects.create(
+            company=self.company, name="Lay bricks"
+        )
+        contractor_crew = ContractorLabourCrew.objects.create(
+            company=self.company, crew_type="Bricklayers"
+        )
+
+        result = sync_labour_specs_to_contractor(self.company)
+
+        assert result == {"updated": 1, "created": 0, "unchanged": 0}
+        orphan.refresh_from_db()
+        assert orphan.source.name == "Lay bricks"
+        assert orphan.crew == contractor_crew
+        assert orphan.daily_production == 500
+
+    def test_plant_spec_components_resolve_by_source(self):
+        excavator = SystemPlantCost.objects.create(name="Excavator")
+        spec = SystemPlantSpecification.objects.create(name="Bulk excavation")
+        SystemPlantSpecificationComponent.objects.create(
+            specification=spec, plant_type=excavator, hours=2
+        )
+        contractor_excavator = ContractorPlantCost.objects.create(
+            company=self.company, name="Excavator 20t", source=excavator
+        )
+
+        assert sync_plant_specs_to_contractor(self.company)["created"] == 1
+
+        component = ContractorPlantSpecificationComponent.objects.get(
+            specification=ContractorPlantSpecification.objects.get(company=self.company)
+        )
+        assert component.plant_type == contractor_excavator
+
+
+@pytest.mark.django_db
+class TestSyncItemLibrary:
+    def setup_method(self):
+        self.project = ProjectFactory()
+
+    def _system_entries(self, count):
+        spec = SystemSpecification.objects.get_or_create(name="25MPa")[0]
+        SystemItemLibraryEntry.objects.bulk_create(
+            SystemItemLibraryEntry(
+                description=f"Concrete to footing {i}", material_spec=spec
+            )
+            for i in range(count)
+        )
+
+    def test_specs_resolve_by_name_and_entries_are_indexed(self):
+        self._system_entries(2)
+        spec = ProjectSpecification.objects.create(project=self.project, name="25MPa")
+
+        result = sync_item_library_from_system(self.project)
+
+        assert result == {"updated": 0, "created": 2, "unchanged": 0}
+        entries = ProjectItemLibraryEntry.objects.filter(project=self.project)
+        assert {e.material_spec_id for e in entries} == {spec.pk}
+        assert (
+            SearchTerm.objects.filter(
+                content_type=ContentType.objects.get_for_model(ProjectItemLibraryEntry),
+                object_id__in=entries.values("pk"),
+                term="footing",
+            ).count()
+            == 2
+        )
+        assert sync_item_library_from_system(self.project)["unchanged"] == 2
+
+    def _grow_and_sync(self, count):
+        """Add ``count`` system entries, touch the synced ones and sync."""
+        self._system_entries(count)
+        ProjectItemLibraryEntry.objects.filter(project=self.project).update(unit="m3")
+        with CaptureQueriesContext(connection) as queries:
+            result = sync_item_library_from_system(self.project)
+        assert result["created"] == count
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_the_library(self):
+        self._grow_and_sync(3)
+
+        assert self._grow_and_sync(5) == self._grow_and_sync(50)
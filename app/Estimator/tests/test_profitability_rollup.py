@@ -0,0 +1,81 @@
+"""Tests for the per-project BoQ profitability rollup."""
+
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from app.Estimator.factories import BOQItemFactory
+from app.Estimator.models import BOQProfitabilityRollup, ProjectMaterial
+from app.Project.models import Project
+from app.Project.tests.factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestBOQProfitabilityRollup:
+    def _priced_item(self, project, pack_cost="40"):
+        material = ProjectMaterial.objects.create(
+            project=project, material_code="CEM", pack_cost=Decimal(pack_cost)
+        )
+        return BOQItemFactory(
+            project=project,
+            material=material,
+            contract_quantity=Decimal("10"),
+            contract_rate=Decimal("50"),
+            progress_quantity=Decimal("4"),
+            forecast_quantity=Decimal("12"),
+        )
+
+    def test_refresh_matches_item_properties(self):
+        project = ProjectFactory()
+        item = self._priced_item(project)
+        BOQItemFactory(project=project, contract_quantity=Decimal("2"))
+
+        rollup = BOQProfitabilityRollup.refresh(project.pk)
+
+        assert item.baseline_new_price == Decimal("40")
+        assert rollup.baseline_revenue == Decimal("1000.00")
+        assert rollup.baseline_cost == Decimal("400.00")
+        assert rollup.progress_cost == Decimal("160.00")
+        assert rollup.forecast_cost == Decimal("480.00")
+        assert not rollup.is_stale
+
+    def test_source_changes_mark_rollup_stale(self):
+        project = ProjectFactory()
+        item = self._priced_item(project)
+        BOQProfitabilityRollup.refresh(project.pk)
+
+        item.material.pack_cost = Decimal("60")
+        item.material.save()
+
+        assert BOQProfitabilityRollup.objects.get(project=project).is_stale
+        (rollup,) = BOQProfitabilityRollup.for_projects(
+            Project.objects.filter(pk=project.pk)
+        )
+        assert rollup.baseline_cost == Decimal("600.00")
+        assert not rollup.is_stale
+
+    def test_bulk_markup_update_marks_rollup_stale(self, client):
+        project = ProjectFactory()
+        self._priced_item(project)
+        BOQProfitabilityRollup.refresh(project.pk)
+
+        response = client.post(
+            reverse("estimator:bulk_markup_update", kwargs={"project_pk": project.pk}),
+            {"field": "material_markup_pct", "value": "15"},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert BOQProfitabilityRollup.objects.get(project=project).is_stale
+
+    def test_for_projects_builds_missing_rollups(self, django_assert_num_queries):
+        projects = [ProjectFactory() for _ in range(2)]
+        for project in projects:
+            self._priced_item(project)
+        queryset = Project.objects.filter(pk__in=[p.pk for p in projects])
+
+        assert len(BOQProfitabilityRollup.for_projects(queryset)) == 2
+        # Up-to-date rollups are read without touching BoQ items
+        with django_assert_num_queries(3):
+            list(BOQProfitabilityRollup.for_projects(queryset))
@@ -0,0 +1,232 @@
+"""Tests for in-memory what-if pricing of a project's BoQ."""
+
+import json
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.Estimator.factories import (
+    BOQItemFactory,
+    ProjectPlantSpecificationComponentFactory,
+)
+from app.Estimator.models import (
+    BOQItem,
+    ProjectAssumptions,
+    ProjectLabourCrew,
+    ProjectLabourSpecification,
+    ProjectMaterial,
+    ProjectPreliminaryCost,
+    ProjectPreliminarySpecification,
+    ProjectSpecification,
+    ProjectSpecificationComponent,
+    ProjectTradeCode,
+)
+from app.Estimator.scenarios import ProjectPricingModel, Scenario
+from app.Project.tests.factories import ProjectFactory
+
+CENT = Decimal("0.01")
+
+
+def _saved_totals(project):
+    """Totals straight from the BOQItem properties, for comparison."""
+    totals = dict.fromkeys(("materials", "labour", "plant", "cost"), Decimal("0"))
+    for item in BOQItem.objects.filter(project=project, is_section_header=False):
+        totals["materials"] += item.new_materials_amount or 0
+        totals["labour"] += item.new_labour_amount or 0
+        totals["plant"] += item.new_plant_amount or 0
+        totals["cost"] += (item.baseline_new_price or 0) * (item.contract_quantity or 0)
+    return {name: value.quantize(CENT) for name, value in totals.items()}
+
+
+def _rounded(totals):
+    return {
+        name: totals[name].quantize(CENT)
+        for name in ("materials", "labour", "plant", "cost")
+    }
+
+
+@pytest.mark.django_db
+class TestProjectPricingModel:
+    def setup_method(self):
+        self.project = project = ProjectFactory.create()
+        ProjectAssumptions.objects.create(
+            project=project,
+            wastage_pct=Decimal("5"),
+            material_markup_pct=Decimal("10"),
+            labour_markup_pct=Decimal("8"),
+            transport_pct=Decimal("2"),
+        )
+        self.cement = ProjectMaterial.objects.create(
+            project=project, material_code="CEM", pack_cost=Decimal("100")
+        )
+        self.brick = ProjectMaterial.objects.create(
+            project=project,
+            material_code="BRK",
+            pack_cost=Decimal("2800"),
+            pack_qty=Decimal("1000"),
+        )
+        self.spec = ProjectSpecification.objects.create(project=project, name="Mix")
+        ProjectSpecificationComponent.objects.create(
+            specification=self.spec,
+            material=self.cement,
+            label="Cement",
+            qty_per_unit=Decimal("7.5"),
+        )
+        crew = ProjectLabourCrew.objects.create(
+            project=project, crew_type="Crew", skilled=2, skilled_rate=Decimal("450")
+        )
+        labour = ProjectLabourSpecification.objects.create(
+            project=project, name="Pour", crew=crew, daily_production=Decimal("12")
+        )
+        self.plant = ProjectPlantSpecificationComponentFactory(
+            specification__project=project,
+            plant_type__project=project,
+            hours=Decimal("0.5"),
+        )
+        ProjectPreliminaryCost.objects.create(
+            project=project,
+            name="Office",
+            preliminary_type="fixed_facilities",
+            amount=Decimal("3"),
+        )
+        preliminary = ProjectPreliminarySpecification.objects.create(
+            project=project, name="Facilities", preliminary_type="fixed_facilities"
+        )
+        self.trade = ProjectTradeCode.objects.create(
+            project=project, prefix="C", trade_name="Concrete"
+        )
+
+        defaults = {"material_markup_pct": Decimal("10"), "transport_pct": 2}
+        BOQItemFactory(
+            project=project,
+            section="Substructure",
+            trade_code=self.trade,
+            specification=self.spec,
+            labour_specification=labour,
+            plant_specification=self.plant.specification,
+            preliminary_specification=preliminary,
+            labour_markup_pct=Decimal("8"),
+            contract_quantity=Decimal("40"),
+            **defaults,
+        )
+        # A manually edited markup that scenarios leave alone
+        BOQItemFactory(
+            project=project,
+            section="Superstructure",
+            material=self.brick,
+            material_markup_pct=Decimal("25"),
+            contract_quantity=Decimal("5000"),
+            contract_rate=Decimal("4.10"),
+        )
+        BOQItemFactory(project=project, is_section_header=True)
+
+    def test_baseline_matches_boq_item_properties(self):
+        result = ProjectPricingModel.load(self.project).price()
+
+        assert _rounded(result.totals) == _saved_totals(self.project)
+        assert result.totals["contract"] == Decimal("30500")
+        assert set(result.by_section) == {"Substructure", "Superstructure"}
+        assert set(result.by_trade) == {"CConcrete", "Unassigned"}
+        assert (
+            result.by_section["Substructure"]["cost"]
+            + result.by_section["Superstructure"]["cost"]
+            == result.totals["cost"]
+        )
+
+    def test_scenario_matches_persisting_the_change(self):
+        model = ProjectPricingModel.load(self.project)
+        scenario = Scenario(
+            "Dearer cement",
+            wastage_pct=Decimal("7.5"),
+            material_markup_pct=Decimal("15"),
+            pack_costs={self.cement.pk: Decimal("120")},
+            plant_rates={self.plant.plant_type_id: Decimal("400")},
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            baseline, result = model.compare([scenario])
+        assert not queries.captured_queries
+
+        ProjectAssumptions.objects.filter(project=self.project).update(
+            wastage_pct=Decimal("7.5")
+        )
+        BOQItem.objects.filter(
+            project=self.project, material_markup_pct=Decimal("10")
+        ).update(material_markup_pct=Decimal("15"))
+        self.cement.pack_cost = Decimal("120")
+        self.cement.save()
+        self.plant.plant_type.hourly_rate = Decimal("400")
+        self.plant.plant_type.save()
+
+        assert _rounded(result.totals) == _saved_totals(self.project)
+        assert result.totals["cost"] > baseline.totals["cost"]
+        assert result.totals["margin"] == (
+            result.totals["contract"] - result.totals["cost"]
+        )
+
+    def test_load_queries_do_not_grow_with_the_boq(self):
+        with CaptureQueriesContext(connection) as small:
+            ProjectPricingModel.load(self.project)
+        BOQItemFactory.create_batch(
+            10, project=self.project, specification=self.spec, section="Finishes"
+        )
+        with CaptureQueriesContext(connection) as large:
+            model = ProjectPricingModel.load(self.project)
+
+        assert len(small.captured_queries) == len(large.captured_queries)
+        assert "Finishes" in model.price().by_section
+
+    def test_from_dict_validates(self):
+        scenario = Scenario.from_dict(
+            {"name": "A", "wastage_pct": "3", "pack_costs": {"7": 12}}
+        )
+        assert scenario.wastage_pct == Decimal("3")
+        assert scenario.pack_costs == {7: Decimal("12")}
+
+        for data in (
+            {"wastage_pct": "3"},
+            {"name": "A", "wastage_pct": "lots"},
+            {"name": "A", "pack_costs": {"x": 1}},
+            {"name": "A", "plant_rates": [1]},
+        ):
+            with pytest.raises(ValueError):
+                Scenario.from_dict(data)
+
+
+@pytest.mark.django_db
+class TestScenarioComparisonView:
+    def test_compare_returns_baseline_and_scenarios(self, client):
+        project = ProjectFactory.create()
+        BOQItemFactory(project=project, section="Roof")
+        client.force_login(AccountFactory.create())
+        url = reverse("estimator:compare_scenarios", kwargs={"project_pk": project.pk})
+
+        response = client.post(
+            url,
+            json.dumps({"scenarios": [{"name": "Markup 10", "wastage_pct": 10}]}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["name"] for result in results] == ["Baseline", "Markup 10"]
+        assert results[0]["by_section"]["Roof"]["contract"] == "25000"
+
+        response = client.post(
+            url, json.dumps({"scenarios": []}), content_type="application/json"
+        )
+        assert response.status_code == 400
+
+    def test_anonymous_is_forbidden(self, client):
+        project = ProjectFactory.create()
+        url = reverse("estimator:compare_scenarios", kwargs={"project_pk": project.pk})
+
+        response = client.post(
+            url, json.dumps({"scenarios": [{"name": "A"}]}), "application/json"
+        )
+
+        assert response.status_code == 403
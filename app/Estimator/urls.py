@@ -16,6 +16,11 @@ urlpatterns = [
         views.ApplyAssumptionsView.as_view(),
         name="apply_assumptions",
     ),
+    path(
+        "project/<int:project_pk>/api/scenarios/",
+        views.ScenarioComparisonView.as_view(),
+        name="compare_scenarios",
+    ),
     path(
         "project/<int:project_pk>/baseline/",
         views.BaselineBoqView.as_view(),
@@ -343,6 +348,11 @@ urlpatterns = [
         views.DeletePlantSpecificationView.as_view(),
         name="delete_plant_specification",
     ),
+    path(
+        "project/<int:project_pk>/api/<slug:grid>/batch-update/",
+        views.BatchUpdateGridView.as_view(),
+        name="batch_update_grid",
+    ),
     path(
         "project/<int:project_pk>/api/preliminary-cost/<int:pk>/update/",
         views.UpdatePreliminaryCostView.as_view(),
@@ -859,6 +869,11 @@ urlpatterns = [
         views.DeleteSystemPlantSpecificationView.as_view(),
         name="sys_delete_plant_specification",
     ),
+    path(
+        "system/api/<slug:grid>/batch-update/",
+        views.SystemBatchUpdateGridView.as_view(),
+        name="sys_batch_update_grid",
+    ),
     path(
         "system/api/preliminary-cost/<int:pk>/update/",
         views.UpdateSystemPreliminaryCostView.as_view(),
@@ -1127,6 +1142,11 @@ urlpatterns = [
         views.DeleteContractorPlantSpecificationView.as_view(),
         name="ctr_delete_plant_specification",
     ),
+    path(
+        "contractor/api/<slug:grid>/batch-update/",
+        views.ContractorBatchUpdateGridView.as_view(),
+        name="ctr_batch_update_grid",
+    ),
     path(
         "contractor/api/preliminary-cost/<int:pk>/update/",
         views.UpdateContractorPreliminaryCostView.as_view(),
@@ -19,6 +19,7 @@ from django.views.generic.base import ContextMixin
 
 from app.Account.models import Municipality, Province
 from app.BillOfQuantities.models.structure_models import LineItem
+from app.core.Utilities.search import search
 from app.Project.models import Project
 
 from .calculations import (
@@ -61,8 +62,15 @@ from .forms import (
     SystemSpecificationForm,
     SystemTradeCodeForm,
 )
+from .grid_edits import (
+    CONTRACTOR_TIER,
+    PROJECT_TIER,
+    SYSTEM_TIER,
+    apply_grid_edits,
+)
 from .models import (
     BOQItem,
+    BOQProfitabilityRollup,
     ContractorItemLibraryEntry,
     ContractorLabourCrew,
     ContractorLabourSpecification,
@@ -102,6 +110,7 @@ from .models import (
     SystemTradeCode,
     sync_boq_from_lineitems,
 )
+from .scenarios import MAX_SCENARIOS, ProjectPricingModel, Scenario
 
 
 class ProjectEstimatorMixin(ContextMixin):
@@ -209,7 +218,8 @@ def _flash_sync_result(request, result, entity_label):
     messages.success(
         request,
         f"{entity_label} synced from contractor library — "
-        f"{result['updated']} updated, {result['created']} new.",
+        f"{result['updated']} updated, {result['created']} new, "
+        f"{result['unchanged']} unchanged.",
     )
 
 
@@ -246,6 +256,9 @@ class ProjectAssumptionsView(ProjectEstimatorMixin, TemplateView):
                 propagated += BOQItem.objects.filter(
                     project=project, **{field: old_value}
                 ).update(**{field: new_value})
+            if propagated:
+                # update() skips post_save, which marks the BoQ rollup stale
+                BOQProfitabilityRollup.mark_stale(project.pk)
             msg = "Project assumptions saved."
             if propagated:
                 msg += (
@@ -276,6 +289,8 @@ class ApplyAssumptionsView(ProjectEstimatorMixin, View):
             labour_markup_pct=assumptions.labour_markup_pct,
             transport_pct=assumptions.transport_pct,
         )
+        # update() skips post_save, which marks the BoQ rollup stale
+        BOQProfitabilityRollup.mark_stale(project.pk)
         messages.success(
             request,
             f"Applied assumptions to {updated} BoQ items.",
@@ -283,6 +298,40 @@ class ApplyAssumptionsView(ProjectEstimatorMixin, View):
         return redirect("estimator:project_assumptions", project_pk=project_pk)
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class ScenarioComparisonView(ProjectEstimatorMixin, View):
+    """AJAX: price the BoQ under what-if assumption sets without saving them.
+
+    Expects ``{"scenarios": [{"name": ..., "material_markup_pct": ...,
+    "pack_costs": {material_id: cost}, ...}, ...]}`` and returns the saved
+    baseline followed by each scenario, totalled overall, by section and by
+    trade.
+    """
+
+    def post(self, request, project_pk):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+        raw = data.get("scenarios") if isinstance(data, dict) else None
+        if not isinstance(raw, list) or not 0 < len(raw) <= MAX_SCENARIOS:
+            return JsonResponse(
+                {"error": f"Send between 1 and {MAX_SCENARIOS} scenarios"},
+                status=400,
+            )
+        try:
+            scenarios = [Scenario.from_dict(scenario) for scenario in raw]
+        except ValueError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+
+        model = ProjectPricingModel.load(self.get_project())
+        return JsonResponse(
+            {"results": [result.as_dict() for result in model.compare(scenarios)]}
+        )
+
+
 class DashboardView(ProjectEstimatorMixin, ListView):
     model = BOQItem
     template_name = "estimator/dashboard.html"
@@ -465,6 +514,11 @@ class DashboardView(ProjectEstimatorMixin, ListView):
             .values("id", "item_code", "description")
         )
 
+        # Rows the last autofill could not match confidently
+        suggestions = self.request.session.pop("autofill_suggestions", None)
+        if suggestions and suggestions["project_pk"] == project.pk:
+            context["autofill_suggestions"] = suggestions
+
         # Current filter values
         context["f_section"] = self.request.GET.get("section", "")
         context["f_bill_no"] = self.request.GET.get("bill_no", "")
@@ -551,12 +605,16 @@ class SyncBoqView(ProjectEstimatorMixin, View):
         )
 
 
+AUTOFILL_SUGGESTIONS_SHOWN = 200
+
+
 class AutofillBoqFromLibraryView(ProjectEstimatorMixin, View):
     """Bulk-fill BoQ rows from matching Item Library entries.
 
     POST `mode=reset_and_rerun` first clears specs on every previously
     auto-filled row, then runs the fill. Any other value (or missing) only
-    fills rows that currently have no specs.
+    fills rows that currently have no specs. Rows without a confident match
+    are listed on the dashboard with their candidate entries for review.
     """
 
     def post(self, request, project_pk):
@@ -578,12 +636,18 @@ class AutofillBoqFromLibraryView(ProjectEstimatorMixin, View):
         if result["skipped_already_set"]:
             parts.append(f"{result['skipped_already_set']} already had specs")
         if result["ambiguous"]:
-            parts.append(f"{result['ambiguous']} ambiguous (skipped)")
+            parts.append(f"{result['ambiguous']} to review")
         if result["no_match"]:
             parts.append(f"{result['no_match']} no match")
         messages.success(
             request, "Autofill from Item Library — " + ", ".join(parts) + "."
         )
+        # Shown once on the dashboard for the user to pick an entry per row
+        request.session["autofill_suggestions"] = {
+            "project_pk": project.pk,
+            "items": result["suggestions"][:AUTOFILL_SUGGESTIONS_SHOWN],
+            "count": len(result["suggestions"]),
+        }
         return redirect(
             reverse("estimator:dashboard", kwargs={"project_pk": project_pk})
         )
@@ -2989,6 +3053,8 @@ class BulkMarkupUpdateView(View):
         BOQItem.objects.filter(project_id=project_pk, is_section_header=False).update(
             **{field: decimal_value}
         )
+        # update() skips post_save, which marks the BoQ rollup stale
+        BOQProfitabilityRollup.mark_stale(project_pk)
         return JsonResponse({"ok": True})
 
 
@@ -4086,6 +4152,51 @@ class UpdatePreliminaryCostView(View):
         )
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class BatchUpdateGridView(View):
+    """AJAX endpoint applying many cell edits to one project grid at once.
+
+    Expects ``{"edits": [{"id": ..., "field": ..., "value": ...}, ...]}`` for
+    the ``material``, ``spec-component``, ``labour-spec``, ``plant-cost`` or
+    ``preliminary-cost`` grid. Either every edit is saved or none is; the
+    response carries the derived values of the edited rows and of the
+    specifications they feed.
+    """
+
+    tier = PROJECT_TIER
+
+    def get_owner(self, request, **kwargs):
+        if not request.user.is_authenticated:
+            return None
+        return get_object_or_404(Project, pk=kwargs["project_pk"])
+
+    def post(self, request, grid, **kwargs):
+        owner = self.get_owner(request, **kwargs)
+        if owner is None and self.tier.owner_field is not None:
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+        try:
+            result = apply_grid_edits(self.tier, grid, data.get("edits"), owner)
+        except ValueError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        if result.errors:
+            return JsonResponse({"errors": result.errors}, status=400)
+        return JsonResponse(
+            {
+                "ok": True,
+                "updated": result.updated,
+                "rows": result.rows,
+                "specs": result.specs,
+            }
+        )
+
+
 # ── Preliminary Spec Definitions ───────────────────────────────
 
 
@@ -7867,6 +7978,16 @@ class UpdateSystemPreliminaryCostView(SystemLibraryMixin, View):
         return JsonResponse({"ok": True, "computed_amount": str(item.computed_amount)})
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class SystemBatchUpdateGridView(SystemLibraryMixin, BatchUpdateGridView):
+    """Batched cell edits for the system library grids (staff only)."""
+
+    tier = SYSTEM_TIER
+
+    def get_owner(self, request, **kwargs):
+        return None
+
+
 class SystemPreliminaryCostUploadView(SystemLibraryMixin, FormView):
     template_name = "estimator/upload_generic.html"
     form_class = ExcelImportForm
@@ -9454,6 +9575,16 @@ class UpdateContractorPreliminaryCostView(View):
         return JsonResponse({"ok": True, "computed_amount": str(item.computed_amount)})
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class ContractorBatchUpdateGridView(BatchUpdateGridView):
+    """Batched cell edits for the contractor library grids."""
+
+    tier = CONTRACTOR_TIER
+
+    def get_owner(self, request, **kwargs):
+        return _contractor_company_for(request)
+
+
 class ContractorPreliminaryCostUploadView(ContractorLibraryMixin, FormView):
     template_name = "estimator/upload_generic.html"
     form_class = ExcelImportForm
@@ -9680,7 +9811,7 @@ class ItemLibraryListView(ProjectEstimatorMixin, ListView):
             qs = qs.filter(trade_code__id=trade_code)
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(description__icontains=q)
+            qs = search(qs, q)
         return qs
 
     def get_context_data(self, **kwargs):
@@ -9827,7 +9958,7 @@ class ContractorItemLibraryListView(ContractorLibraryMixin, ListView):
             qs = qs.filter(trade_code__id=trade_code)
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(description__icontains=q)
+            qs = search(qs, q)
         return qs
 
     def get_context_data(self, **kwargs):
@@ -9943,7 +10074,7 @@ class SystemItemLibraryListView(SystemLibraryMixin, ListView):
             qs = qs.filter(trade_code__id=trade_code)
         q = self.request.GET.get("q")
         if q:
-            qs = qs.filter(description__icontains=q)
+            qs = search(qs, q)
         return qs
 
     def get_context_data(self, **kwargs):
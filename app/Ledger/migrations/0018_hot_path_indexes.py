@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Ledger", "0017_alter_transaction_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["company", "date", "deleted"],
+                name="Ledger_tran_company_57ffbc_idx",
+            ),
+        ),
+    ]
@@ -85,3 +85,6 @@ class Transaction(BaseModel):
     amount_incl_vat = models.DecimalField(max_digits=10, decimal_places=2)
     vat = models.BooleanField(default=False)
     vat_rate = models.ForeignKey(Vat, on_delete=models.SET_NULL, null=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [models.Index(fields=["company", "date", "deleted"])]
@@ -28,6 +28,7 @@ from app.Planning.models import (
     DesignSubCategory,
     DesignSubCategoryFile,
 )
+from app.Planning.progress import load_design_tree
 from app.Planning.views import PlanningMixin
 from app.Project.models import Project
 
@@ -57,6 +58,11 @@ class DesignDevelopmentOverviewView(PlanningMixin, DetailView):
             BreadcrumbItem(title="Design Development", url=None),
         ]
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["design_tree"] = load_design_tree(self.object, include_files=True)
+        return context
+
 
 # =============================================================================
 # C: Design Development Views
@@ -6,7 +6,7 @@ B) Tender Documents - documentation linked to work packages
 C) Design Development - engineering sketches/calculations at L1-L4 levels
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.db import models
 from django.db.models import QuerySet
@@ -15,6 +15,33 @@ from app.Account.models import Account
 from app.core.Utilities.models import BaseModel, sum_queryset
 from app.Project.models import Category, Discipline, Group, Project, SubCategory
 
+
+class FileProgressMixin:
+    """Progress of an item measured as uploaded files against ``required_quantity``.
+
+    When the queryset annotated ``annotated_file_count`` (see
+    ``app.Planning.progress``) it is used instead of a per-object COUNT query.
+    """
+
+    # A model field on the concrete models; its value is an int
+    required_quantity: Any
+    files: QuerySet
+
+    @property
+    def file_count(self) -> int:
+        """Return the number of files uploaded for this item."""
+        annotated = getattr(self, "annotated_file_count", None)
+        if annotated is not None:
+            return annotated
+        return self.files.count()
+
+    @property
+    def progress(self) -> int:
+        if self.required_quantity == 0:
+            return 0
+        return min(100, int(round((self.file_count / self.required_quantity) * 100, 0)))
+
+
 # =============================================================================
 # A: Work Packages
 # =============================================================================
@@ -359,15 +386,21 @@ class WorkPackage(BaseModel):
     @property
     def total_tender_docs(self) -> int:
         """Return the total number of tender documents for this work package."""
+        annotated = getattr(self, "annotated_total_tender_docs", None)
+        if annotated is not None:
+            return annotated
         return int(sum_queryset(self.tender_documents, "required_quantity"))
 
     @property
     def completed_tender_docs(self) -> int:
         """Return the number of completed tender documents (those with files uploaded)."""
-        count = 0
-        for tender_document in self.tender_documents.all():
-            count += tender_document.files.count()
-        return count
+        annotated = getattr(self, "annotated_completed_tender_docs", None)
+        if annotated is not None:
+            return annotated
+        return TenderDocumentFile.objects.filter(
+            tender_document__work_package=self,
+            tender_document__deleted=False,
+        ).count()
 
     @property
     def tender_milestone_summary(self) -> list:
@@ -426,7 +459,7 @@ class WorkPackage(BaseModel):
 # =============================================================================
 
 
-class TenderDocument(BaseModel):
+class TenderDocument(FileProgressMixin, BaseModel):
     """Tender documentation linked to a work package.
 
     Each upload deems the category as complete.
@@ -477,19 +510,6 @@ class TenderDocument(BaseModel):
         """A document category is complete when at least one file has been uploaded."""
         return self.progress == 100
 
-    @property
-    def file_count(self) -> int:
-        """Return the number of files uploaded for this document."""
-        return self.files.count()
-
-    @property
-    def progress(self) -> int:
-        if self.required_quantity == 0:
-            return 0
-        return min(
-            100, int(round((self.files.count() / self.required_quantity) * 100, 0))
-        )
-
 
 class TenderDocumentFile(BaseModel):
     """Individual file for a tender document."""
@@ -538,7 +558,7 @@ class DesignStage(models.TextChoices):
     DOCUMENTS = "DOCUMENTS", "Documents"
 
 
-class DesignCategory(BaseModel):
+class DesignCategory(FileProgressMixin, BaseModel):
     """Design development at L1 (Category) level.
 
     Linked to Category in project_models.py.
@@ -574,14 +594,6 @@ class DesignCategory(BaseModel):
         verbose_name_plural = "Design Categories (L1)"
         ordering = ["category__name", "stage"]
 
-    @property
-    def progress(self) -> int:
-        if self.required_quantity == 0:
-            return 0
-        return min(
-            100, int(round((self.files.count() / self.required_quantity) * 100, 0))
-        )
-
 
 class DesignCategoryFile(BaseModel):
     """File uploads for DesignCategory. Each upload deems the stage APPROVED."""
@@ -618,7 +630,7 @@ class DesignCategoryFile(BaseModel):
             self.design_category.save(update_fields=["approved"])
 
 
-class DesignSubCategory(BaseModel):
+class DesignSubCategory(FileProgressMixin, BaseModel):
     """Design development at L2 (SubCategory) level.
 
     Linked to SubCategory in project_models.py.
@@ -654,14 +666,6 @@ class DesignSubCategory(BaseModel):
         verbose_name_plural = "Design SubCategories (L2)"
         ordering = ["sub_category__name", "stage"]
 
-    @property
-    def progress(self) -> int:
-        if self.required_quantity == 0:
-            return 0
-        return min(
-            100, int(round((self.files.count() / self.required_quantity) * 100, 0))
-        )
-
 
 class DesignSubCategoryFile(BaseModel):
     """File uploads for DesignSubCategory. Each upload deems the stage APPROVED."""
@@ -698,7 +702,7 @@ class DesignSubCategoryFile(BaseModel):
             self.design_sub_category.save(update_fields=["approved"])
 
 
-class DesignGroup(BaseModel):
+class DesignGroup(FileProgressMixin, BaseModel):
     """Design development at L3 (Group) level.
 
     Linked to Group in project_models.py.
@@ -734,14 +738,6 @@ class DesignGroup(BaseModel):
         verbose_name_plural = "Design Groups (L3)"
         ordering = ["group__name", "stage"]
 
-    @property
-    def progress(self) -> int:
-        if self.required_quantity == 0:
-            return 0
-        return min(
-            100, int(round((self.files.count() / self.required_quantity) * 100, 0))
-        )
-
 
 class DesignGroupFile(BaseModel):
     """File uploads for DesignGroup. Each upload deems the stage APPROVED."""
@@ -778,7 +774,7 @@ class DesignGroupFile(BaseModel):
             self.design_group.save(update_fields=["approved"])
 
 
-class DesignDiscipline(BaseModel):
+class DesignDiscipline(FileProgressMixin, BaseModel):
     """Design development at L4 (Discipline) level.
 
     Linked to Discipline in project_models.py.
@@ -814,14 +810,6 @@ class DesignDiscipline(BaseModel):
         verbose_name_plural = "Design Disciplines (L4)"
         ordering = ["discipline__name", "stage"]
 
-    @property
-    def progress(self) -> int:
-        if self.required_quantity == 0:
-            return 0
-        return min(
-            100, int(round((self.files.count() / self.required_quantity) * 100, 0))
-        )
-
 
 class DesignDisciplineFile(BaseModel):
     """File uploads for DesignDiscipline. Each upload deems the stage APPROVED."""
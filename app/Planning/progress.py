@@ -0,0 +1,190 @@
+"""Batched progress loading for Planning design and tender hierarchies.
+
+The ``progress`` properties on design items and tender documents count files
+per object, which costs one query per node when a whole tree is rendered.
+The loaders here fetch a project's design tree, or a set of work packages
+with their tender documents, using grouped COUNT annotations and prefetches,
+then roll progress up each level in memory. Query count is constant in the
+number of design items and documents.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db.models import Count, Prefetch, Q, QuerySet
+
+from app.Planning.models import (
+    DesignCategory,
+    DesignDiscipline,
+    DesignGroup,
+    DesignSubCategory,
+    TenderDocument,
+    WorkPackage,
+)
+from app.Project.models import Category, Discipline, Group, Project, SubCategory
+
+FILE_COUNT = Count("files", filter=Q(files__deleted=False))
+
+
+@dataclass
+class ProgressTotals:
+    """Required vs uploaded file totals rolled up over a set of items.
+
+    Uploads beyond an item's ``required_quantity`` do not count towards
+    the roll-up, so one over-supplied item cannot mask missing ones.
+    """
+
+    required: int = 0
+    uploaded: int = 0
+    items: int = 0
+
+    def add_item(self, item) -> None:
+        self.required += item.required_quantity
+        self.uploaded += min(item.file_count, item.required_quantity)
+        self.items += 1
+
+    def merge(self, other: "ProgressTotals") -> None:
+        self.required += other.required
+        self.uploaded += other.uploaded
+        self.items += other.items
+
+    @property
+    def progress(self) -> int:
+        if self.required == 0:
+            return 0
+        return min(100, int(round((self.uploaded / self.required) * 100, 0)))
+
+
+@dataclass
+class DesignProgressTree:
+    """A project's design hierarchy with progress rolled up per node and level.
+
+    Every Category, SubCategory, Group and Discipline in the tree carries a
+    ``design_totals`` attribute covering its own design items and those of
+    its descendants.
+    """
+
+    categories: list[Category]
+    disciplines: list[Discipline]
+    levels: dict[str, ProgressTotals] = field(default_factory=dict)
+
+    @property
+    def overall(self) -> ProgressTotals:
+        totals = ProgressTotals()
+        for level_totals in self.levels.values():
+            totals.merge(level_totals)
+        return totals
+
+
+def annotate_file_counts(queryset: QuerySet, include_files: bool = False) -> QuerySet:
+    """Annotate ``annotated_file_count`` on a design item or tender document queryset."""
+    queryset = queryset.annotate(annotated_file_count=FILE_COUNT)
+    if include_files:
+        queryset = queryset.prefetch_related("files")
+    return queryset
+
+
+def _design_items(model, include_files: bool) -> QuerySet:
+    return annotate_file_counts(model.objects.all(), include_files)
+
+
+def _rollup(items) -> ProgressTotals:
+    totals = ProgressTotals()
+    for item in items:
+        totals.add_item(item)
+    return totals
+
+
+def load_design_tree(
+    project: Project, include_files: bool = False
+) -> DesignProgressTree:
+    """Load the L1-L4 design hierarchy of ``project`` with progress roll-ups.
+
+    Pass ``include_files`` to also prefetch each item's uploaded files, for
+    pages that list them.
+    """
+    categories = list(
+        project.categories.all().prefetch_related(
+            Prefetch(
+                "design_categories",
+                queryset=_design_items(DesignCategory, include_files),
+            ),
+            Prefetch(
+                "subcategories",
+                queryset=SubCategory.objects.prefetch_related(
+                    Prefetch(
+                        "design_subcategories",
+                        queryset=_design_items(DesignSubCategory, include_files),
+                    ),
+                    Prefetch(
+                        "groups",
+                        queryset=Group.objects.prefetch_related(
+                            Prefetch(
+                                "design_groups",
+                                queryset=_design_items(DesignGroup, include_files),
+                            )
+                        ),
+                    ),
+                ),
+            ),
+        )
+    )
+    disciplines = list(
+        project.disciplines.all().prefetch_related(
+            Prefetch(
+                "design_disciplines",
+                queryset=_design_items(DesignDiscipline, include_files),
+            )
+        )
+    )
+
+    levels = {name: ProgressTotals() for name in ("L1", "L2", "L3", "L4")}
+    for category in categories:
+        category.design_totals = _rollup(category.design_categories.all())
+        levels["L1"].merge(category.design_totals)
+        for subcategory in category.subcategories.all():
+            subcategory.design_totals = _rollup(subcategory.design_subcategories.all())
+            levels["L2"].merge(subcategory.design_totals)
+            for group in subcategory.groups.all():
+                group.design_totals = _rollup(group.design_groups.all())
+                levels["L3"].merge(group.design_totals)
+                subcategory.design_totals.merge(group.design_totals)
+            category.design_totals.merge(subcategory.design_totals)
+    for discipline in disciplines:
+        discipline.design_totals = _rollup(discipline.design_disciplines.all())
+        levels["L4"].merge(discipline.design_totals)
+
+    return DesignProgressTree(
+        categories=categories, disciplines=disciplines, levels=levels
+    )
+
+
+def load_tender_progress(
+    work_packages: QuerySet[WorkPackage], include_files: bool = False
+) -> list[WorkPackage]:
+    """Load ``work_packages`` with tender documents and their file counts.
+
+    Sets the annotated totals read by ``WorkPackage.total_tender_docs`` and
+    ``WorkPackage.completed_tender_docs`` so neither queries per package.
+    """
+    documents = annotate_file_counts(TenderDocument.objects.all(), include_files)
+    packages = list(
+        work_packages.prefetch_related(Prefetch("tender_documents", queryset=documents))
+    )
+    for package in packages:
+        tender_documents = package.tender_documents.all()
+        package.annotated_total_tender_docs = sum(
+            doc.required_quantity for doc in tender_documents
+        )
+        package.annotated_completed_tender_docs = sum(
+            doc.file_count for doc in tender_documents
+        )
+    return packages
+
+
+def load_project_tender_progress(
+    project: Project, include_files: bool = False
+) -> list[WorkPackage]:
+    """Load every work package of ``project`` with tender progress attached."""
+    return load_tender_progress(
+        WorkPackage.objects.filter(project=project), include_files
+    )
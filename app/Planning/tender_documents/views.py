@@ -17,6 +17,7 @@ from app.Planning.models import (
     TenderDocumentFile,
     WorkPackage,
 )
+from app.Planning.progress import load_project_tender_progress
 from app.Planning.views import PlanningMixin
 
 
@@ -29,9 +30,7 @@ class TenderDocumentationOverviewView(PlanningMixin, ListView):
 
     def get_queryset(self):
         project = self.get_project()
-        return WorkPackage.objects.filter(project=project).prefetch_related(
-            "tender_documents"
-        )
+        return load_project_tender_progress(project)
 
     def get_breadcrumbs(self):
         project = self.get_project()
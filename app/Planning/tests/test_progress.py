@@ -0,0 +1,131 @@
+"""Tests for the batched Planning progress loaders."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.Planning.models import (
+    DesignCategory,
+    DesignCategoryFile,
+    DesignDiscipline,
+    DesignGroup,
+    DesignGroupFile,
+    TenderDocumentFile,
+    WorkPackage,
+)
+from app.Planning.progress import load_design_tree, load_project_tender_progress
+from app.Project.tests.factories import (
+    CategoryFactory,
+    DisciplineFactory,
+    GroupFactory,
+    ProjectFactory,
+    SubCategoryFactory,
+)
+
+
+def _build_tree(project, size):
+    for _ in range(size):
+        category = CategoryFactory(project=project)
+        subcategory = SubCategoryFactory(category=category)
+        GroupFactory(sub_category=subcategory)
+        DisciplineFactory(project=project)
+    WorkPackage.objects.create(project=project, name="Package A")
+    WorkPackage.objects.create(project=project, name="Package B")
+
+
+def _count_queries(loader):
+    with CaptureQueriesContext(connection) as queries:
+        loader()
+    return len(queries.captured_queries)
+
+
+@pytest.mark.django_db
+class TestDesignProgressTree:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        _build_tree(self.project, 2)
+
+    def test_progress_matches_model_properties(self):
+        design_category = DesignCategory.objects.filter(
+            category__project=self.project
+        ).first()
+        design_category.required_quantity = 2
+        design_category.save()
+        DesignCategoryFile.objects.create(
+            design_category=design_category, file="planning/a.pdf"
+        )
+        deleted = DesignCategoryFile.objects.create(
+            design_category=design_category, file="planning/b.pdf"
+        )
+        deleted.soft_delete()
+
+        tree = load_design_tree(self.project)
+
+        loaded = {
+            item.pk: item
+            for category in tree.categories
+            for item in category.design_categories.all()
+        }
+        assert loaded[design_category.pk].file_count == 1
+        assert loaded[design_category.pk].progress == design_category.progress == 50
+
+    def test_rolls_up_descendants_and_caps_items(self):
+        design_group = DesignGroup.objects.filter(group__project=self.project).first()
+        for name in ("a", "b", "c"):
+            DesignGroupFile.objects.create(
+                design_group=design_group, file=f"planning/{name}.pdf"
+            )
+
+        tree = load_design_tree(self.project)
+
+        category = next(
+            c
+            for c in tree.categories
+            if c.pk == design_group.group.sub_category.category_id
+        )
+        stages = len(DesignCategory.objects.filter(category=category))
+        # One L1, one L2 and one L3 item per stage, one of which is complete
+        assert category.design_totals.items == stages * 3
+        assert category.design_totals.uploaded == 1
+        assert tree.levels["L3"].uploaded == 1
+        disciplines = DesignDiscipline.objects.filter(discipline__project=self.project)
+        assert tree.levels["L4"].items == disciplines.count()
+        assert tree.overall.items == stages * 2 * 3 + disciplines.count()
+
+    def test_query_count_is_independent_of_tree_size(self):
+        small = _count_queries(
+            lambda: load_design_tree(self.project, include_files=True)
+        )
+        _build_tree(self.project, 5)
+        large = _count_queries(
+            lambda: load_design_tree(self.project, include_files=True)
+        )
+        assert small == large
+
+
+@pytest.mark.django_db
+class TestTenderProgress:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        _build_tree(self.project, 1)
+
+    def test_totals_match_model_properties(self):
+        package = WorkPackage.objects.filter(project=self.project).first()
+        document = package.tender_documents.first()
+        TenderDocumentFile.objects.create(
+            tender_document=document, file="planning/tender.pdf"
+        )
+
+        loaded = {wp.pk: wp for wp in load_project_tender_progress(self.project)}
+
+        for wp in WorkPackage.objects.filter(project=self.project):
+            assert loaded[wp.pk].total_tender_docs == wp.total_tender_docs
+            assert loaded[wp.pk].completed_tender_docs == wp.completed_tender_docs
+        assert loaded[package.pk].completed_tender_docs == 1
+
+    def test_query_count_is_independent_of_package_count(self):
+        small = _count_queries(lambda: load_project_tender_progress(self.project))
+        for n in range(5):
+            WorkPackage.objects.create(project=self.project, name=f"Extra {n}")
+        large = _count_queries(lambda: load_project_tender_progress(self.project))
+        assert small == large
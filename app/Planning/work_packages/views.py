@@ -17,6 +17,7 @@ from app.Planning.forms import (
 from app.Planning.models import (
     WorkPackage,
 )
+from app.Planning.progress import annotate_file_counts
 from app.Planning.views import PlanningMixin
 
 
@@ -127,7 +128,9 @@ class WorkPackageDetailView(PlanningMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["project"] = self.get_project()
-        context["tender_documents"] = self.object.tender_documents.all()
+        context["tender_documents"] = annotate_file_counts(
+            self.object.tender_documents.all(), include_files=True
+        )
         # Design items are now managed at project level, not work package level
         context["design_categories"] = []
         context["design_subcategories"] = []
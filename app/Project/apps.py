@@ -7,3 +7,4 @@ class ProjectConfig(AppConfig):
 
     def ready(self):
         import app.Project.profitability.signals  # noqa
+        import app.Project.signals  # noqa
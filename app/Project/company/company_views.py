@@ -6,7 +6,8 @@ from datetime import datetime
 from typing import Any
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import F, QuerySet, Sum
+from django.db.models import Count, F, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
 from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
@@ -17,13 +18,13 @@ from app.Account.subscription_config import Subscription
 from app.core.Utilities.dates import get_previous_n_months
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
-from app.Estimator.models import BOQItem
+from app.Estimator.models import BOQItem, BOQProfitabilityRollup
 from app.Project.models import (
     Company,
-    ContractualCompliance,
     OverheadCostTracker,
     Portfolio,
     Project,
+    ProjectHealthIndex,
 )
 from app.Project.production_progress.production_models import (
     DailyActivityEntry,
@@ -41,71 +42,42 @@ class CompanyMetricsMixin:
         """Calculate financial metrics for a given set of projects."""
         current_date = datetime.now()
 
-        # Baseline revenue and overheads are pure stored-field arithmetic —
-        # do them in a single SQL aggregate each.
-        baseline_rev_agg = BOQItem.objects.filter(project__in=projects).aggregate(
-            total=Sum(F("contract_quantity") * F("contract_rate"))
+        # BoQ revenue/cost totals come from the per-project rollup, so this
+        # is one aggregate over a row per project rather than a pass over
+        # every BoQ item (``baseline_new_price`` is not SQL-aggregatable).
+        boq_totals = BOQProfitabilityRollup.for_projects(projects).aggregate(
+            baseline_revenue=Sum("baseline_revenue"),
+            baseline_cost=Sum("baseline_cost"),
+            progress_revenue=Sum("progress_revenue"),
+            progress_cost=Sum("progress_cost"),
+            forecast_revenue=Sum("forecast_revenue"),
+            forecast_cost=Sum("forecast_cost"),
         )
-        total_baseline_revenue = float(baseline_rev_agg["total"] or 0)
+        total_baseline_revenue = float(boq_totals["baseline_revenue"] or 0)
+        total_baseline_cost = float(boq_totals["baseline_cost"] or 0)
+        total_progress_revenue = float(boq_totals["progress_revenue"] or 0)
+        total_progress_cost = float(boq_totals["progress_cost"] or 0)
+        total_forecast_revenue = float(boq_totals["forecast_revenue"] or 0)
+        total_forecast_cost = float(boq_totals["forecast_cost"] or 0)
 
         overheads_agg = OverheadCostTracker.objects.filter(
             project__in=projects
         ).aggregate(total=Sum(F("amount_of_days") * F("rate")))
         total_overheads = float(overheads_agg["total"] or 0)
 
-        # Cost / progress / forecast totals depend on `baseline_new_price`,
-        # a Python property that traverses spec FKs and component rates —
-        # we can't aggregate it in SQL. Pull every BoQ row in ONE query with
-        # the related specs prefetched, then sum in Python.
-        total_baseline_cost = 0.0
-        total_progress_revenue = 0.0
-        total_progress_cost = 0.0
-        total_forecast_revenue = 0.0
-        total_forecast_cost = 0.0
-
-        boq_items = (
-            BOQItem.objects.filter(project__in=projects)
-            .select_related(
-                "specification",
-                "labour_specification",
-                "plant_specification",
-                "preliminary_specification",
-                "material",
-                "project__estimator_assumptions",
-            )
-            .prefetch_related(
-                "specification__spec_components__material",
-                "plant_specification__components__plant_type",
-            )
-        )
-        for item in boq_items:
-            bnp = float(item.baseline_new_price or 0)
-            if not bnp:
-                continue
-            total_baseline_cost += bnp * float(item.contract_quantity or 0)
-            pq = float(item.progress_quantity or 0)
-            total_progress_revenue += bnp * pq
-            total_progress_cost += bnp * pq
-            fq = float(item.forecast_quantity or 0)
-            total_forecast_revenue += bnp * fq
-            total_forecast_cost += bnp * fq
-
         baseline_profit = total_baseline_revenue - total_baseline_cost
         progress_profit = total_progress_revenue - total_progress_cost
         forecast_profit = total_forecast_revenue - total_forecast_cost
 
         # Compliance Stats
-        total_compliance_items = ContractualCompliance.objects.filter(
-            project__in=projects
-        ).count()
-        completed_compliance_items = ContractualCompliance.objects.filter(
-            project__in=projects,
-            status=ContractualCompliance.Status.COMPLETED,
-        ).count()
-        urgent_compliance_count = ContractualCompliance.objects.filter(
-            project__in=projects,
-            status=ContractualCompliance.Status.OVERDUE,
-        ).count()
+        compliance = ProjectHealthIndex.for_projects(projects).aggregate(
+            total=Sum("compliance_items"),
+            completed=Sum("completed_compliance_items"),
+            overdue=Sum("overdue_compliance_items"),
+        )
+        total_compliance_items = compliance["total"] or 0
+        completed_compliance_items = compliance["completed"] or 0
+        urgent_compliance_count = compliance["overdue"] or 0
 
         compliance_percentage = (
             round((completed_compliance_items / total_compliance_items * 100), 1)
@@ -411,8 +383,10 @@ class MasterDashboardDataMixin:
         metrics["financials"] = financial_data
 
         # 4. Portfolio Specific: Exception List
-        if projects.count() > 1:
-            metrics["exceptions"] = self._get_exception_list(projects)
+        health = ProjectHealthIndex.for_projects(projects)
+        is_portfolio = len(health) > 1
+        if is_portfolio:
+            metrics["exceptions"] = self._get_exception_list(health)
 
         # 5. Charts Data (S-Curve & Profit Trend)
         import json
@@ -425,127 +399,41 @@ class MasterDashboardDataMixin:
         charts_data = get_project_productivity_report_data(project_ids)
         metrics["charts_json"] = json.dumps(charts_data.get("charts", {}))
 
-        # 6. Compliance / Correspondence (RFIs)
-        from app.SiteManagement.models import (
-            RFI,
-            BiWeeklyQualityReport,
-            BiWeeklySafetyReport,
-            Incident,
-            IncidentStatus,
-            NCRStatus,
-            NonConformance,
-            RFIStatus,
-        )
-
-        is_portfolio = projects.count() > 1
-
+        # 6. Compliance / Correspondence (RFIs) from the project health index
         if is_portfolio:
-            pending_rfis = (
-                RFI.objects.filter(
-                    project__in=projects, status=RFIStatus.OPEN, deleted=False
-                )
-                .values("project")
-                .distinct()
-                .count()
-            )
-
-            # Quality Matters: Distinct projects with Open Quality NCRs or Quality Reports
-            open_quality_ncrs = (
-                NonConformance.objects.filter(
-                    project__in=projects, status=NCRStatus.OPEN, deleted=False
-                )
-                .values("project")
-                .distinct()
-                .count()
-            )
-            quality_reports = (
-                BiWeeklyQualityReport.objects.filter(
-                    project__in=projects, deleted=False
-                )
-                .values("project")
-                .distinct()
-                .count()
-            )
-            # Note: A pure union across models is hard in Django ORM without raw SQL,
-            # so we'll approximate the 'projects with quality issues' by taking the max
-            # or sum, but it's cleaner to sum them since they might be separate issues,
-            # though taking the sum of distinct project counts could double-count projects
-            # that have BOTH an NCR and a Report. Let's just do a manual python set union.
-
-            quality_projects = set(
-                NonConformance.objects.filter(
-                    project__in=projects, status=NCRStatus.OPEN, deleted=False
-                ).values_list("project_id", flat=True)
-            ) | set(
-                BiWeeklyQualityReport.objects.filter(
-                    project__in=projects, deleted=False
-                ).values_list("project_id", flat=True)
-            )
-            quality_matters = len(quality_projects)
-
-            safety_projects = set(
-                Incident.objects.filter(
-                    project__in=projects, status=IncidentStatus.OPEN, deleted=False
-                ).values_list("project_id", flat=True)
-            ) | set(
-                BiWeeklySafetyReport.objects.filter(
-                    project__in=projects, deleted=False
-                ).values_list("project_id", flat=True)
+            # Number of projects with each kind of matter
+            compliance = health.aggregate(
+                pending_rfis=Count("pk", filter=Q(open_rfis__gt=0)),
+                quality_matters=Count(
+                    "pk", filter=Q(open_ncrs__gt=0) | Q(quality_reports__gt=0)
+                ),
+                safety_matters=Count(
+                    "pk", filter=Q(open_incidents__gt=0) | Q(safety_reports__gt=0)
+                ),
             )
-            safety_matters = len(safety_projects)
-
             issue_type = "Projects"
         else:
-            pending_rfis = RFI.objects.filter(
-                project__in=projects, status=RFIStatus.OPEN, deleted=False
-            ).count()
-
-            open_quality_ncrs = NonConformance.objects.filter(
-                project__in=projects, status=NCRStatus.OPEN, deleted=False
-            ).count()
-            quality_reports = BiWeeklyQualityReport.objects.filter(
-                project__in=projects, deleted=False
-            ).count()
-            quality_matters = open_quality_ncrs + quality_reports
-
-            open_incidents = Incident.objects.filter(
-                project__in=projects, status=IncidentStatus.OPEN, deleted=False
-            ).count()
-            safety_reports = BiWeeklySafetyReport.objects.filter(
-                project__in=projects, deleted=False
-            ).count()
-            safety_matters = open_incidents + safety_reports
-
+            compliance = health.aggregate(
+                pending_rfis=Coalesce(Sum("open_rfis"), 0),
+                quality_matters=Coalesce(Sum(F("open_ncrs") + F("quality_reports")), 0),
+                safety_matters=Coalesce(
+                    Sum(F("open_incidents") + F("safety_reports")), 0
+                ),
+            )
             issue_type = "Items"
-
-        metrics["compliance"] = {
-            "pending_rfis": pending_rfis,
-            "quality_matters": quality_matters,
-            "safety_matters": safety_matters,
-            "issue_type": issue_type,
-        }
+        metrics["compliance"] = {**compliance, "issue_type": issue_type}
 
         return metrics
 
-    def _get_exception_list(self, projects):
-        """Identifies underperforming projects."""
+    def _get_exception_list(self, health):
+        """Identifies underperforming projects from their health index rows."""
         exceptions = []
-        for project in projects:
-            # Check progress vs time (Simplified)
-            plans = ProductionPlan.objects.filter(project=project, is_leaf=True)
-            actual = (
-                DailyActivityEntry.objects.filter(production_plan__in=plans).aggregate(
-                    total=Sum("quantity")
-                )["total"]
-                or 0
-            )
-            total = plans.aggregate(total=Sum("quantity"))["total"] or 0
-            pct = (actual / total * 100) if total > 0 else 100
-
+        for index in health.select_related("project"):
+            pct = index.progress_pct
             if pct < 30:  # Flag projects with very low progress
                 exceptions.append(
                     {
-                        "project": project,
+                        "project": index.project,
                         "reason": "Critical Low Progress",
                         "severity": "high",
                         "value": f"{round(pct, 1)}%",
@@ -582,7 +470,8 @@ class MasterDashboardDataMixin:
         # Calculate Overruns
         cost_overruns = 0
         schedule_overruns = 0
-        is_portfolio = projects.count() > 1
+        project_count = projects.count()
+        is_portfolio = project_count > 1
 
         # Aggregate PPI/CPI for single projects
         total_ppi = 0
@@ -611,8 +500,8 @@ class MasterDashboardDataMixin:
                             if plan.get("days_affected", 0) > 0:
                                 schedule_overruns += 1
 
-        avg_ppi = total_ppi / projects.count() if projects.count() > 0 else 1.0
-        avg_cpi = total_cpi / projects.count() if projects.count() > 0 else 1.0
+        avg_ppi = total_ppi / project_count if project_count > 0 else 1.0
+        avg_cpi = total_cpi / project_count if project_count > 0 else 1.0
 
         return {
             "progress_pct": round(progress_pct, 1),
@@ -630,34 +519,11 @@ class MasterDashboardDataMixin:
         }
 
     def _get_baseline_comparison(self, projects):
-        boq_items = (
-            BOQItem.objects.filter(project__in=projects)
-            .select_related(
-                "specification",
-                "labour_specification",
-                "labour_specification__crew",
-                "plant_specification",
-                "preliminary_specification",
-            )
-            .prefetch_related(
-                "specification__spec_components__material",
-                "plant_specification__components__plant_type",
-            )
+        boq_totals = BOQProfitabilityRollup.for_projects(projects).aggregate(
+            revenue=Sum("baseline_revenue"), cost=Sum("baseline_cost")
         )
-
-        # We must iterate because these are calculated properties, not DB fields
-        original_cost = 0
-        original_revenue = 0
-
-        for item in boq_items:
-            qty = item.contract_quantity or 0
-            rate = item.contract_rate or 0
-            original_revenue += float(qty * rate)
-
-            # For cost, we'll use a simplified version of baseline_new_price or similar
-            # Since baseline_new_price is a property, we call it here
-            price = item.baseline_new_price or 0
-            original_cost += float(qty * price)
+        original_cost = float(boq_totals["cost"] or 0)
+        original_revenue = float(boq_totals["revenue"] or 0)
 
         # Adjusted (Includes Variations)
         adjusted_cost = original_cost * 1.05  # Mocked 5% growth for now
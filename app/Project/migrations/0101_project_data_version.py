@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Project", "0100_discipline_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectDataVersion",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="data_version",
+                        serialize=False,
+                        to="Project.project",
+                    ),
+                ),
+                ("version", models.PositiveBigIntegerField(default=1)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Project Data Version",
+                "verbose_name_plural": "Project Data Versions",
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Project", "0101_project_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectHealthIndex",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="health_index",
+                        serialize=False,
+                        to="Project.project",
+                    ),
+                ),
+                ("open_rfis", models.PositiveIntegerField(default=0)),
+                ("overdue_rfis", models.PositiveIntegerField(default=0)),
+                ("open_ncrs", models.PositiveIntegerField(default=0)),
+                ("quality_reports", models.PositiveIntegerField(default=0)),
+                ("open_incidents", models.PositiveIntegerField(default=0)),
+                ("safety_reports", models.PositiveIntegerField(default=0)),
+                ("open_early_warnings", models.PositiveIntegerField(default=0)),
+                ("overdue_early_warnings", models.PositiveIntegerField(default=0)),
+                ("open_site_instructions", models.PositiveIntegerField(default=0)),
+                ("open_snags", models.PositiveIntegerField(default=0)),
+                ("overdue_snags", models.PositiveIntegerField(default=0)),
+                ("compliance_items", models.PositiveIntegerField(default=0)),
+                ("completed_compliance_items", models.PositiveIntegerField(default=0)),
+                ("overdue_compliance_items", models.PositiveIntegerField(default=0)),
+                ("awaiting_responses", models.PositiveIntegerField(default=0)),
+                ("overdue_responses", models.PositiveIntegerField(default=0)),
+                (
+                    "planned_quantity",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "actual_quantity",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                ("computed_on", models.DateField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Project Health Index",
+                "verbose_name_plural": "Project Health Index",
+                "indexes": [
+                    models.Index(fields=["computed_on"], name="health_computed_on_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Project", "0102_project_health_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dailyactivityentry",
+            index=models.Index(
+                fields=["project", "date", "deleted"],
+                name="Project_dai_project_5fd002_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plannedvalue",
+            index=models.Index(
+                fields=["project", "period", "deleted"],
+                name="Project_pla_project_38d5e8_idx",
+            ),
+        ),
+    ]
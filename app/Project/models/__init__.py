@@ -44,6 +44,7 @@ from .compliance_models import (
     FinalAccountComplianceDialog,
     FinalAccountComplianceDialogFile,
 )
+from .data_version_models import ProjectDataVersion
 from .entity_definitions import (
     BaseProjectEntity,
     LabourEntity,
@@ -52,6 +53,7 @@ from .entity_definitions import (
     PlantEntity,
     SubcontractorEntity,
 )
+from .health_index_models import ProjectHealthIndex
 from .impact_models import ProjectImpact
 from .order_amendment_models import OrderAmendment
 from .planned_value_models import PlannedValue
@@ -97,6 +99,8 @@ __all__ = [
     "ProjectImpact",
     "ProjectRole",
     "Role",
+    "ProjectDataVersion",
+    "ProjectHealthIndex",
     "ProjectReportSummary",
     "Risk",
     "RiskStatus",
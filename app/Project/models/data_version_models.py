@@ -0,0 +1,48 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+from app.Project.models import Project
+
+
+class ProjectDataVersion(models.Model):
+    """
+    Per-project change counter used to key cached report artifacts.
+
+    The counter is bumped by signals whenever a model that feeds the project
+    reports is saved or deleted, so a cached report is valid for as long as
+    the version it was rendered against is still current.
+    """
+
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Project Data Version"
+        verbose_name_plural = "Project Data Versions"
+
+    def __str__(self) -> str:
+        return f"{self.project_id}: v{self.version}"
+
+    @classmethod
+    def current(cls, project_id: int) -> "ProjectDataVersion":
+        """Return the project's counter row, creating it on first use."""
+        obj, _ = cls.objects.get_or_create(project_id=project_id)
+        return obj
+
+    @classmethod
+    def bump(cls, project_id: int) -> None:
+        """Increment the counter in a single UPDATE.
+
+        No row is created here: a missing row means nothing has been cached
+        against the project yet, and ``current`` creates it on first use.
+        """
+        cls.objects.filter(project_id=project_id).update(
+            version=F("version") + 1, updated_at=timezone.now()
+        )
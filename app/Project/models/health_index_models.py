@@ -0,0 +1,248 @@
+from datetime import date
+
+from django.db import models
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+
+def _health_registers(today: date) -> dict:
+    """Source model -> (project lookup, {index field: aggregate}).
+
+    Imported lazily: the register models depend on ``Project``.
+    """
+    from app.BillOfQuantities.models import ContractualCorrespondence
+    from app.Project.models import (
+        ContractualCompliance,
+        DailyActivityEntry,
+        ProductionPlan,
+    )
+    from app.SiteManagement.models import (
+        RFI,
+        BiWeeklyQualityReport,
+        BiWeeklySafetyReport,
+        EarlyWarning,
+        EarlyWarningStatus,
+        Incident,
+        IncidentStatus,
+        NCRStatus,
+        NonConformance,
+        RFIStatus,
+        SiteInstruction,
+        SiteInstructionStatus,
+        SnagList,
+    )
+
+    open_snag = ~Q(status__in=[SnagList.Status.RESOLVED, SnagList.Status.CLOSED])
+    awaiting_response = Q(requires_response=True, response_sent=False)
+    return {
+        RFI: (
+            "project_id",
+            {
+                "open_rfis": Count("pk", filter=Q(status=RFIStatus.OPEN)),
+                "overdue_rfis": Count(
+                    "pk",
+                    filter=Q(status=RFIStatus.OPEN, respond_by_date__lt=today),
+                ),
+            },
+        ),
+        NonConformance: (
+            "project_id",
+            {"open_ncrs": Count("pk", filter=Q(status=NCRStatus.OPEN))},
+        ),
+        BiWeeklyQualityReport: ("project_id", {"quality_reports": Count("pk")}),
+        Incident: (
+            "project_id",
+            {"open_incidents": Count("pk", filter=Q(status=IncidentStatus.OPEN))},
+        ),
+        BiWeeklySafetyReport: ("project_id", {"safety_reports": Count("pk")}),
+        EarlyWarning: (
+            "project_id",
+            {
+                "open_early_warnings": Count(
+                    "pk", filter=Q(status=EarlyWarningStatus.OPEN)
+                ),
+                "overdue_early_warnings": Count(
+                    "pk",
+                    filter=Q(status=EarlyWarningStatus.OPEN, respond_by_date__lt=today),
+                ),
+            },
+        ),
+        SiteInstruction: (
+            "project_id",
+            {
+                "open_site_instructions": Count(
+                    "pk", filter=Q(status=SiteInstructionStatus.OPEN)
+                )
+            },
+        ),
+        SnagList: (
+            "project_id",
+            {
+                "open_snags": Count("pk", filter=open_snag),
+                "overdue_snags": Count("pk", filter=open_snag & Q(deadline__lt=today)),
+            },
+        ),
+        ContractualCompliance: (
+            "project_id",
+            {
+                "compliance_items": Count("pk"),
+                "completed_compliance_items": Count(
+                    "pk", filter=Q(status=ContractualCompliance.Status.COMPLETED)
+                ),
+                "overdue_compliance_items": Count(
+                    "pk", filter=Q(status=ContractualCompliance.Status.OVERDUE)
+                ),
+            },
+        ),
+        ContractualCorrespondence: (
+            "project_id",
+            {
+                "awaiting_responses": Count("pk", filter=awaiting_response),
+                "overdue_responses": Count(
+                    "pk", filter=awaiting_response & Q(response_due_date__lt=today)
+                ),
+            },
+        ),
+        ProductionPlan: (
+            "project_id",
+            {"planned_quantity": Sum("quantity", filter=Q(is_leaf=True))},
+        ),
+        DailyActivityEntry: (
+            "production_plan__project_id",
+            {
+                "actual_quantity": Sum(
+                    "quantity",
+                    filter=Q(
+                        production_plan__is_leaf=True,
+                        production_plan__deleted=False,
+                    ),
+                )
+            },
+        ),
+    }
+
+
+class ProjectHealthIndex(models.Model):
+    """
+    One row per project of open and overdue counts across its site
+    registers, compliance and correspondence, plus production progress.
+
+    Signals refresh the affected register's columns whenever one of its
+    records is saved or deleted, so master and portfolio dashboards read a
+    row per project instead of querying each register. Overdue counts are
+    relative to ``computed_on`` and the whole row is recomputed on the first
+    read of a new day.
+    """
+
+    project = models.OneToOneField(
+        "Project.Project",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="health_index",
+    )
+    open_rfis = models.PositiveIntegerField(default=0)
+    overdue_rfis = models.PositiveIntegerField(default=0)
+    open_ncrs = models.PositiveIntegerField(default=0)
+    quality_reports = models.PositiveIntegerField(default=0)
+    open_incidents = models.PositiveIntegerField(default=0)
+    safety_reports = models.PositiveIntegerField(default=0)
+    open_early_warnings = models.PositiveIntegerField(default=0)
+    overdue_early_warnings = models.PositiveIntegerField(default=0)
+    open_site_instructions = models.PositiveIntegerField(default=0)
+    open_snags = models.PositiveIntegerField(default=0)
+    overdue_snags = models.PositiveIntegerField(default=0)
+    compliance_items = models.PositiveIntegerField(default=0)
+    completed_compliance_items = models.PositiveIntegerField(default=0)
+    overdue_compliance_items = models.PositiveIntegerField(default=0)
+    awaiting_responses = models.PositiveIntegerField(default=0)
+    overdue_responses = models.PositiveIntegerField(default=0)
+    planned_quantity = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    actual_quantity = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    computed_on = models.DateField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Project Health Index"
+        verbose_name_plural = "Project Health Index"
+        indexes = [models.Index(fields=["computed_on"], name="health_computed_on_idx")]
+
+    def __str__(self) -> str:
+        return f"Health index for project {self.project_id}"
+
+    @property
+    def progress_pct(self) -> float:
+        """Leaf-plan production progress; 100 when nothing is planned."""
+        if self.planned_quantity > 0:
+            return float(self.actual_quantity / self.planned_quantity * 100)
+        return 100.0
+
+    @staticmethod
+    def source_models() -> list[type[models.Model]]:
+        """Models whose changes refresh the index."""
+        return list(_health_registers(timezone.localdate()))
+
+    @staticmethod
+    def source_project_lookup(model) -> str:
+        """Lookup path from ``model`` to its project's id."""
+        return _health_registers(timezone.localdate())[model][0]
+
+    @classmethod
+    def refresh(cls, project_ids, sources=None) -> None:
+        """Recount the given projects' registers in one grouped query each.
+
+        With ``sources`` only those registers' columns are updated, and only
+        on existing rows; otherwise every column is recomputed and missing
+        rows are created.
+        """
+        project_ids = set(project_ids)
+        if not project_ids:
+            return
+
+        today = timezone.localdate()
+        registers = _health_registers(today)
+        if sources is not None:
+            registers = {model: registers[model] for model in sources}
+
+        fields = [name for _, aggregates in registers.values() for name in aggregates]
+        values = {pk: dict.fromkeys(fields, 0) for pk in project_ids}
+        for model, (project_lookup, aggregates) in registers.items():
+            rows = (
+                model.objects.filter(**{f"{project_lookup}__in": project_ids})
+                .order_by()
+                .values(project_lookup)
+                .annotate(**aggregates)
+            )
+            for row in rows:
+                project_id = row.pop(project_lookup)
+                values[project_id].update(
+                    {name: value or 0 for name, value in row.items()}
+                )
+
+        existing = cls.objects.in_bulk(list(project_ids))
+        to_create = []
+        for project_id, counts in values.items():
+            index = existing.get(project_id)
+            if index is None:
+                if sources is not None:
+                    continue
+                index = cls(project_id=project_id)
+                to_create.append(index)
+            for name, value in counts.items():
+                setattr(index, name, value)
+            if sources is None:
+                index.computed_on = today
+
+        update_fields = fields if sources is not None else [*fields, "computed_on"]
+        cls.objects.bulk_update(
+            [index for pk, index in existing.items() if pk in values], update_fields
+        )
+        cls.objects.bulk_create(to_create, ignore_conflicts=True)
+
+    @classmethod
+    def for_projects(cls, projects) -> "models.QuerySet[ProjectHealthIndex]":
+        """Index rows for ``projects``, rebuilding missing or out-of-date ones."""
+        project_ids = set(projects.values_list("pk", flat=True))
+        current = cls.objects.filter(
+            project_id__in=project_ids, computed_on=timezone.localdate()
+        ).values_list("project_id", flat=True)
+        cls.refresh(project_ids - set(current))
+        return cls.objects.filter(project_id__in=project_ids)
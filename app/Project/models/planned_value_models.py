@@ -38,3 +38,4 @@ class PlannedValue(BaseModel):
         verbose_name_plural = "Planned Values"
         ordering = ["period"]
         unique_together = [["project", "period"]]
+        indexes = [models.Index(fields=["project", "period", "deleted"])]
@@ -774,6 +774,7 @@ class DailyActivityEntry(BaseModel):
     class Meta:
         verbose_name = "Daily Activity Entry"
         verbose_name_plural = "Daily Activity Entries"
+        indexes = [models.Index(fields=["project", "date", "deleted"])]
 
     def __str__(self):
         return f"{self.production_plan.activity} on {self.date}"
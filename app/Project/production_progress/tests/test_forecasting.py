@@ -0,0 +1,133 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.Account.subscription_config import Subscription
+from app.Account.tests.factories import AccountFactory
+from app.Estimator.models import ProjectLabourSpecification
+from app.Project.models import Role
+from app.Project.production_progress.factories import (
+    DailyActivityEntryFactory,
+    DailyPlantUsageFactory,
+    ProductionPlanFactory,
+    ProductionResourceFactory,
+)
+from app.Project.production_progress.production_models import PlanDependency
+from app.Project.production_progress.utils.forecasting import simulate_completion
+from app.Project.tests.factories import ProjectFactory, ProjectRoleFactory
+
+
+@pytest.mark.django_db
+class TestSimulateCompletion:
+    """Monte Carlo finish dates and costs for production plans."""
+
+    def setup_method(self):
+        self.today = timezone.now().date()
+        self.project = ProjectFactory()
+        # 50 of 100 units done at a steady 10 a day, R 800 of plant a day
+        self.plan = ProductionPlanFactory(
+            project=self.project,
+            start_date=self.today - timedelta(days=5),
+            finish_date=self.today + timedelta(days=5),
+            quantity=Decimal("100"),
+        )
+        resource = ProductionResourceFactory(
+            production_plan=self.plan, rate=Decimal("100")
+        )
+        for day in range(5):
+            entry = DailyActivityEntryFactory(
+                project=self.project,
+                production_plan=self.plan,
+                date=self.today - timedelta(days=day + 1),
+                quantity=10,
+            )
+            DailyPlantUsageFactory(entry=entry, resource=resource, number=1)
+
+    def _successor(self, **kwargs):
+        successor = ProductionPlanFactory(
+            project=self.project,
+            start_date=self.today,
+            finish_date=self.today + timedelta(days=4),
+            quantity=Decimal("40"),
+            **kwargs,
+        )
+        PlanDependency.objects.create(predecessor=self.plan, successor=successor)
+        return successor
+
+    def test_steady_history_gives_a_fixed_forecast(self):
+        result = simulate_completion(self.project.pk, trials=500, seed=1)
+
+        plan = result["plans"][self.plan.pk]
+        assert plan["completed_units"] == 50
+        assert plan["days_worked"] == 5
+        finish = self.today + timedelta(days=5)
+        assert plan["finish"] == {"p50": finish, "p80": finish, "p90": finish}
+        assert plan["cost"]["p90"] == 8000
+        assert result["project"] == {"finish": plan["finish"], "cost": plan["cost"]}
+
+    def test_successors_wait_for_their_predecessors(self):
+        successor = self._successor()
+
+        result = simulate_completion(self.project.pk, trials=2000, seed=7)
+
+        finish = result["plans"][successor.pk]["finish"]
+        predecessor_finish = result["plans"][self.plan.pk]["finish"]["p50"]
+        # Planned rate of 10 a day for 40 units, after the predecessor
+        assert predecessor_finish < finish["p50"] <= finish["p80"] <= finish["p90"]
+        assert abs((finish["p50"] - predecessor_finish).days - 4) <= 1
+        assert result["project"]["finish"] == finish
+
+    def test_unforecastable_plans_and_groups(self):
+        stalled = ProductionPlanFactory(
+            project=self.project, start_date=None, duration=0, daily_rate=0
+        )
+
+        result = simulate_completion(
+            self.project.pk,
+            trials=100,
+            groups={"stalled": [stalled.pk], "all": [self.plan.pk, stalled.pk]},
+        )
+
+        assert result["plans"][stalled.pk]["finish"] is None
+        assert result["groups"]["stalled"] is None
+        assert result["groups"]["all"] == result["project"]
+
+    def test_queries_do_not_grow_with_the_programme(self):
+        with CaptureQueriesContext(connection) as small:
+            simulate_completion(self.project.pk, trials=10)
+        for _ in range(5):
+            successor = self._successor()
+            DailyActivityEntryFactory(project=self.project, production_plan=successor)
+        with CaptureQueriesContext(connection) as large:
+            simulate_completion(self.project.pk, trials=10)
+
+        assert len(small.captured_queries) == len(large.captured_queries)
+
+
+@pytest.mark.django_db
+def test_forecast_dashboard_shows_probabilistic_finish(client):
+    user = AccountFactory(subscription=Subscription.PROFIT_AND_LOSS)
+    project = ProjectFactory()
+    ProjectRoleFactory(project=project, user=user, role=Role.ADMIN)
+    labour = ProjectLabourSpecification.objects.create(project=project, name="Walls")
+    plan = ProductionPlanFactory(
+        project=project, labour_activity=labour, quantity=Decimal("100")
+    )
+    DailyActivityEntryFactory(project=project, production_plan=plan, quantity=20)
+    client.force_login(user)
+
+    response = client.get(
+        reverse(
+            "project:production-forecast-dashboard", kwargs={"project_pk": project.pk}
+        ),
+        {"plan_id": plan.pk},
+    )
+
+    assert response.status_code == 200
+    assert response.context["probabilistic"]["finish"]["p50"] is not None
+    assert "Probabilistic Finish" in response.content.decode()
@@ -0,0 +1,275 @@
+"""Monte Carlo completion forecasts for a project's production plans.
+
+``simulate_completion`` loads every leaf plan, its daily output history and
+the finish-to-start dependencies in a fixed number of queries, then runs all
+trials for all plans at once as NumPy arrays. Each trial draws a production
+rate per plan from its history (or from the planned rate, scaled by project
+performance, when a plan has not started), adds day-to-day variability over
+the remaining quantity and pushes successors behind their predecessors.
+"""
+
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..production_models import (
+    DailyActivityEntry,
+    DailyPlantUsage,
+    PlanDependency,
+    ProductionPlan,
+)
+
+PERCENTILES = (50, 80, 90)
+DEFAULT_TRIALS = 2000
+# Spread assumed for plans without enough history to measure their own
+DEFAULT_CV = 0.3
+# Trial rates are floored at this fraction of the plan's mean rate
+MIN_RATE_FRACTION = 0.1
+
+
+def _plant_cost_subquery():
+    """Plant cost of one daily entry, as DailyPlantUsage.total_cost sums it."""
+    return Subquery(
+        DailyPlantUsage.objects.filter(entry=OuterRef("pk"))
+        .values("entry")
+        .annotate(
+            total=Sum(
+                F("number")
+                * F("hours")
+                * Coalesce(
+                    "plant_type__hourly_rate",
+                    "resource__rate",
+                    Value(0),
+                    output_field=DecimalField(),
+                ),
+                output_field=DecimalField(max_digits=20, decimal_places=4),
+            )
+        )
+        .values("total")
+    )
+
+
+def _topological_order(count, dependencies):
+    """Plan indices with every predecessor before its successors.
+
+    Plans caught in a dependency cycle are appended in their original order.
+    """
+    predecessors = {i: [] for i in range(count)}
+    successors = {i: [] for i in range(count)}
+    for pred, succ in dependencies:
+        predecessors[succ].append(pred)
+        successors[pred].append(succ)
+
+    waiting = {i: len(preds) for i, preds in predecessors.items()}
+    ready = [i for i, pending in waiting.items() if pending == 0]
+    order = []
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for succ in successors[node]:
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                ready.append(succ)
+    placed = set(order)
+    order.extend(i for i in range(count) if i not in placed)
+    return order, predecessors
+
+
+def _summarise(finish, cost, today):
+    """P50/P80/P90 finish dates and costs from their percentile values."""
+    return {
+        "finish": {
+            f"p{p}": today + timedelta(days=math.ceil(value))
+            for p, value in zip(PERCENTILES, finish, strict=True)
+        },
+        "cost": {
+            f"p{p}": round(float(value), 2)
+            for p, value in zip(PERCENTILES, cost, strict=True)
+        },
+    }
+
+
+def simulate_completion(
+    project_id,
+    trials=DEFAULT_TRIALS,
+    project_ppi=None,
+    groups=None,
+    seed=None,
+    today=None,
+):
+    """
+    Probabilistic finish dates and cost at completion for a project's plans.
+
+    Returns P50/P80/P90 finish dates and costs per leaf plan (keyed by pk),
+    for the whole project and for each named group of plan pks in
+    ``groups``. A group finishes when its last plan finishes and costs the
+    sum of its plans. ``project_ppi`` scales the planned rate of plans with
+    no history; by default it is measured from the plans that have some.
+    Plans with neither history nor a planned rate cannot be forecast and
+    are reported as None.
+    """
+    today = today or timezone.now().date()
+    plans = list(
+        ProductionPlan.objects.filter(
+            project_id=project_id, is_leaf=True, is_archived=False, deleted=False
+        )
+        .order_by("pk")
+        .values_list(
+            "pk",
+            "quantity",
+            "duration",
+            "daily_rate",
+            "crew_count",
+            "start_date",
+            "labour_activity__crew__skilled",
+            "labour_activity__crew__skilled_rate",
+            "labour_activity__crew__semi_skilled",
+            "labour_activity__crew__semi_skilled_rate",
+            "labour_activity__crew__general",
+            "labour_activity__crew__general_rate",
+        )
+    )
+    index = {plan[0]: i for i, plan in enumerate(plans)}
+    history = DailyActivityEntry.objects.filter(
+        production_plan_id__in=list(index), deleted=False
+    ).values_list(
+        "production_plan_id",
+        "date",
+        "quantity",
+        "hours_on_activity",
+        Coalesce(_plant_cost_subquery(), Value(0), output_field=DecimalField()),
+    )
+    dependencies = [
+        (index[pred], index[succ])
+        for pred, succ in PlanDependency.objects.filter(
+            successor_id__in=list(index), deleted=False
+        ).values_list("predecessor_id", "successor_id")
+        if pred in index and succ in index
+    ]
+
+    count = len(plans)
+    crew_daily = np.zeros(count)
+    for i, plan in enumerate(plans):
+        crew = plan[6:]
+        if crew[0] is not None:
+            crew_daily[i] = sum(
+                float(crew[k] or 0) * float(crew[k + 1] or 0) for k in (0, 2, 4)
+            )
+
+    outputs = [[] for _ in plans]
+    daily_costs = [[] for _ in plans]
+    last_entry = [None] * count
+    for plan_id, entry_date, quantity, hours, plant_cost in history:
+        i = index[plan_id]
+        outputs[i].append(float(quantity))
+        # DailyActivityEntry.total_cost: crew hourly rate over an 8h day
+        daily_costs[i].append(
+            float(hours or 0) * crew_daily[i] / 8 + float(plant_cost or 0)
+        )
+        if last_entry[i] is None or entry_date > last_entry[i]:
+            last_entry[i] = entry_date
+
+    days_worked = np.array([len(values) for values in outputs], dtype=float)
+    produced = np.array([sum(values) for values in outputs])
+    actual_cost = np.array([sum(values) for values in daily_costs])
+    quantity = np.array([float(plan[1]) for plan in plans])
+    remaining = np.maximum(quantity - produced, 0)
+    target = np.array(
+        [float(plan[1]) / plan[2] if plan[2] > 0 else float(plan[3]) for plan in plans]
+    )
+    mean = np.array([np.mean(values) if values else 0.0 for values in outputs])
+    std = np.array(
+        [np.std(values, ddof=1) if len(values) > 1 else 0.0 for values in outputs]
+    )
+
+    measured = (days_worked > 1) & (mean > 0)
+    cv = float(np.mean(std[measured] / mean[measured])) if measured.any() else None
+    cv = cv if cv else DEFAULT_CV
+    if project_ppi is None:
+        started = (days_worked > 0) & (target > 0)
+        project_ppi = (
+            float(np.median(mean[started] / target[started])) if started.any() else 1.0
+        )
+
+    # Plans without history run at their planned rate scaled by project PPI
+    fresh = days_worked == 0
+    mean[fresh] = target[fresh] * float(project_ppi)
+    std[~measured] = cv * mean[~measured]
+    samples = np.maximum(days_worked, 1)
+    daily_cost = np.array(
+        [
+            np.mean(values) if values else crew_daily[i] * float(plans[i][4] or 1)
+            for i, values in enumerate(daily_costs)
+        ]
+    )
+
+    rng = np.random.default_rng(seed)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Uncertainty in each plan's underlying rate...
+        rate = mean + std / np.sqrt(samples) * rng.standard_normal((trials, count))
+        rate = np.maximum(rate, MIN_RATE_FRACTION * mean)
+        # ...and day-to-day variability while producing the remaining quantity
+        duration = remaining / rate + np.sqrt(
+            remaining * std**2 / rate**3
+        ) * rng.standard_normal((trials, count))
+    duration = np.where(remaining > 0, np.maximum(duration, 0), 0.0)
+    duration[:, (remaining > 0) & (mean <= 0)] = np.nan
+
+    # Earliest start per plan: today once started, else its planned start
+    finish = np.empty((trials, count))
+    order, predecessors = _topological_order(count, dependencies)
+    for i in order:
+        if remaining[i] == 0 and last_entry[i] is not None:
+            finish[:, i] = (last_entry[i] - today).days
+            continue
+        start = np.zeros(trials)
+        if fresh[i]:
+            planned_start = plans[i][5]
+            if planned_start and planned_start > today:
+                start[:] = (planned_start - today).days
+            for pred in predecessors[i]:
+                start = np.fmax(start, finish[:, pred])
+        finish[:, i] = start + duration[:, i]
+    cost = actual_cost + duration * daily_cost
+
+    forecastable = np.asarray(~np.isnan(duration).any(axis=0))
+
+    def group_summary(columns):
+        columns = [i for i in columns if bool(forecastable[i])]
+        if not columns or not trials:
+            return None
+        return _summarise(
+            np.percentile(finish[:, columns].max(axis=1), PERCENTILES),
+            np.percentile(cost[:, columns].sum(axis=1), PERCENTILES),
+            today,
+        )
+
+    plan_finish = np.percentile(finish, PERCENTILES, axis=0) if trials else None
+    plan_cost = np.percentile(cost, PERCENTILES, axis=0) if trials else None
+    result = {
+        "as_of": today,
+        "trials": trials,
+        "ppi": round(float(project_ppi), 2),
+        "plans": {},
+        "project": group_summary(range(count)),
+        "groups": {
+            name: group_summary([index[pk] for pk in pks if pk in index])
+            for name, pks in (groups or {}).items()
+        },
+    }
+    for pk, i in index.items():
+        summary = None
+        if plan_finish is not None and plan_cost is not None and forecastable[i]:
+            summary = _summarise(plan_finish[:, i], plan_cost[:, i], today)
+        result["plans"][pk] = {
+            "completed_units": float(produced[i]),
+            "remaining_units": float(remaining[i]),
+            "days_worked": int(days_worked[i]),
+            "finish": summary and summary["finish"],
+            "cost": summary and summary["cost"],
+        }
+    return result
@@ -25,6 +25,7 @@ from django.utils import timezone
 from app.Estimator.models import BOQItem, ProjectPlantSpecificationComponent
 
 from ..production_models import DailyActivityEntry, ProductionPlan
+from .forecasting import simulate_completion
 
 
 def calculate_progress_status(produced, planned, start_date=None, finish_date=None):
@@ -557,18 +558,28 @@ def get_plan_productivity_data(plan_id, start_date=None, end_date=None):
     }
 
 
-def get_plan_forecast_kpis(plan, project_ppi=1.0):
+def get_plan_forecast_kpis(plan, project_ppi=1.0, simulation=None):
     """
     Unified calculation for plan forecasting KPIs.
     Returns a dictionary structure compatible with dashboard and table views.
+
+    ``simulation`` is the plan's entry from ``simulate_completion``; when
+    given, its actuals are used instead of querying the plan's entries and
+    its P50/P80/P90 forecast is returned under "probabilistic".
     """
     from datetime import date, timedelta
 
     from django.db.models import Sum
 
     # 1. Base Metrics
-    actual_total_qty = plan.daily_entries.aggregate(total=Sum("quantity"))["total"] or 0
-    entries_count = plan.daily_entries.count()
+    if simulation is not None:
+        actual_total_qty = simulation["completed_units"]
+        entries_count = simulation["days_worked"]
+    else:
+        actual_total_qty = (
+            plan.daily_entries.aggregate(total=Sum("quantity"))["total"] or 0
+        )
+        entries_count = plan.daily_entries.count()
     today = date.today()
 
     # 2. Daily Rate & Productivity (Aligned with Dashboard target_daily_output)
@@ -650,6 +661,9 @@ def get_plan_forecast_kpis(plan, project_ppi=1.0):
             "status": status,
             "status_color": status_color,
         },
+        "probabilistic": {"finish": simulation["finish"], "cost": simulation["cost"]}
+        if simulation and simulation["finish"]
+        else None,
     }
 
 
@@ -797,10 +811,17 @@ def get_forecasting_dashboard_data(
         forecast_prod_traj.append(round(f_qty, 2))
         forecast_cost_traj.append(round(f_cost, 2))
 
+    # Probabilistic finish and cost for the plans in scope
+    scope = [p.pk for p in all_plans if p.is_leaf]
+    probabilistic = simulate_completion(plan.project_id, groups={"scope": scope})[
+        "groups"
+    ]["scope"]
+
     return {
         "project": plan.project,
         "selected_plan": plan,
         "kpis": kpis,
+        "probabilistic": probabilistic,
         "summary": {
             "status": "Critical"
             if (time_variance < -2 or budget_variance < -50000)
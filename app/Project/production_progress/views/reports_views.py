@@ -496,10 +496,20 @@ class ProductionControllerView(
         ordered = self._flatten_tree(all_plans)
 
         # 2. Progress Data (Unified KPI Logic for Gantt & Table)
+        from app.Project.production_progress.utils.forecasting import (
+            simulate_completion,
+        )
         from app.Project.production_progress.utils.production_utils import (
             get_plan_forecast_kpis,
         )
 
+        # One simulation for every plan: actuals and P50/P80/P90 forecasts
+        simulation = simulate_completion(
+            project_pk,
+            project_ppi=ppi,
+            groups={"programme": [p.pk for p in all_plans if p.is_leaf]},
+        )
+
         gantt_data = []
         report_items = []
 
@@ -515,7 +525,9 @@ class ProductionControllerView(
         # First pass: Calculate leaf node KPIs and collect project totals
         for plan, _depth in ordered:
             if plan.is_leaf:
-                kpis = get_plan_forecast_kpis(plan, ppi)
+                kpis = get_plan_forecast_kpis(
+                    plan, ppi, simulation["plans"].get(plan.id)
+                )
                 plan_kpis[plan.id] = kpis
 
                 total_p_qty += plan.quantity
@@ -676,6 +688,7 @@ class ProductionControllerView(
             "overrun_days": overrun_days,
             "progress_pct": round(overall_prog, 1),
             "spi": float(ppi),
+            "probabilistic": simulation["groups"]["programme"],
         }
 
         context["report_items"] = report_items
@@ -1,21 +1,17 @@
 from datetime import date
 from decimal import Decimal
 
-from django.db.models import F, Sum
+from django.db.models import Sum
 
-from app.BillOfQuantities.models import (
-    ActualTransaction,
-    CashflowForecast,
-    PaymentCertificate,
-)
+from app.BillOfQuantities.models import CashflowForecast
 from app.Project.models import (
+    BaseProjectEntity,
     JournalEntry,
-    LabourCostTracker,
-    MaterialCostTracker,
-    OverheadCostTracker,
-    PlantCostTracker,
     ProfitabilityBaseline,
-    SubcontractorCostTracker,
+)
+from app.Project.profitability.reports.aggregation import (
+    OPEX_JOURNAL_CATEGORIES,
+    ProfitabilityMatrix,
 )
 
 
@@ -50,132 +46,20 @@ class FinancialCalculationMixin:
 
         this_month_start = end_date.replace(day=1)
 
-        from app.Project.models.entity_definitions import BaseProjectEntity
-
         cos_code = BaseProjectEntity.ExpenseCode.COS
         opex_code = BaseProjectEntity.ExpenseCode.OPEX
 
-        # Helper to get actuals for a period/filter
-        def get_actuals(start=None, end=None):
-            # 1. Revenue: CREDIT journals in range
-            rev_filters = {
-                "project": project,
-                "transaction_type": JournalEntry.EntryType.CREDIT,
-            }
-            if start:
-                rev_filters["date__gte"] = start
-            if end:
-                rev_filters["date__lte"] = end
-
-            revenue_total = JournalEntry.objects.filter(**rev_filters).aggregate(
-                total=Sum("amount")
-            )["total"] or Decimal("0.00")
-
-            # 2. Trackers & Journals helper
-            def get_tracker_and_journal_total(code):
-                total = Decimal("0.00")
-
-                # Sum Trackers
-                models_map = {
-                    "materials": MaterialCostTracker,
-                    "labour": LabourCostTracker,
-                    "subcontractors": SubcontractorCostTracker,
-                    "plant": PlantCostTracker,
-                    "overhead": OverheadCostTracker,
-                }
-                for tracker_type, model_class in models_map.items():
-                    try:
-                        entity_field = f"{tracker_type}_entity"
-                        if tracker_type == "subcontractors":
-                            entity_field = "subcontractor_entity"
-                        elif tracker_type == "materials":
-                            entity_field = "material_entity"
-
-                        filters = {
-                            f"{entity_field}__expense_code": code,
-                            "project": project,
-                        }
-                        if start:
-                            filters["date__gte"] = start
-                        if end:
-                            filters["date__lte"] = end
-
-                        qs = model_class.objects.filter(**filters)
-
-                        if tracker_type == "labour":
-                            agg = qs.aggregate(
-                                t=Sum(F("amount_of_days") * F("salary"))
-                            )["t"]
-                        elif tracker_type == "materials":
-                            agg = qs.aggregate(t=Sum(F("quantity") * F("rate")))["t"]
-                        elif tracker_type == "subcontractors":
-                            agg = qs.aggregate(t=Sum(F("amount_of_days") * F("rate")))[
-                                "t"
-                            ]
-                        elif tracker_type == "plant":
-                            agg = qs.aggregate(
-                                t=Sum(F("usage_hours") * F("hourly_rate"))
-                            )["t"]
-                        elif tracker_type == "overhead":
-                            agg = qs.aggregate(t=Sum(F("amount_of_days") * F("rate")))[
-                                "t"
-                            ]
-                        else:
-                            agg = 0
-                        total += Decimal(str(agg or 0))
-                    except Exception:
-                        pass
-
-                # Sum Journals
-                if code == cos_code:
-                    categories = [
-                        JournalEntry.Category.MATERIAL,
-                        JournalEntry.Category.LABOUR,
-                        JournalEntry.Category.SUBCONTRACTOR,
-                        JournalEntry.Category.PLANT,
-                    ]
-                else:
-                    categories = [
-                        JournalEntry.Category.OVERHEAD,
-                        JournalEntry.Category.OTHER,
-                    ]
-
-                j_filters = {
-                    "project": project,
-                    "transaction_type": JournalEntry.EntryType.DEBIT,
-                    "category__in": categories,
-                    "source_log_id__isnull": True,
-                }
-                if start:
-                    j_filters["date__gte"] = start
-                if end:
-                    j_filters["date__lte"] = end
-
-                journals = JournalEntry.objects.filter(**j_filters)
-                journal_total = journals.aggregate(total=Sum("amount"))[
-                    "total"
-                ] or Decimal("0.00")
-                return total + journal_total
-
-            cos_total = get_tracker_and_journal_total(cos_code)
-            opex_total = get_tracker_and_journal_total(opex_code)
-
-            return {
-                "revenue": revenue_total,
-                "cos": cos_total,
-                "opex": opex_total,
-            }
-
         # Calculate actuals
-        to_date_data = get_actuals(end=end_date)
-        actual_revenue_to_date = to_date_data["revenue"]
-        actual_cogs_to_date = to_date_data["cos"]
-        actual_opex_to_date = to_date_data["opex"]
-
-        this_month_data = get_actuals(start=this_month_start, end=end_date)
-        actual_revenue_this_month = this_month_data["revenue"]
-        actual_cogs_this_month = this_month_data["cos"]
-        actual_opex_this_month = this_month_data["opex"]
+        matrix = ProfitabilityMatrix(project, end=end_date)
+        actual_revenue_to_date = matrix.revenue()
+        actual_cogs_to_date = matrix.expense_total(cos_code)
+        actual_opex_to_date = matrix.expense_total(opex_code)
+
+        actual_revenue_this_month = matrix.revenue(months=this_month_start)
+        actual_cogs_this_month = matrix.expense_total(cos_code, months=this_month_start)
+        actual_opex_this_month = matrix.expense_total(
+            opex_code, months=this_month_start
+        )
 
         # Force Planned values to match actual
         planned_revenue_to_date = actual_revenue_to_date
@@ -338,71 +222,35 @@ class FinancialCalculationMixin:
         project = self.project  # type: ignore
         this_month_start = date.today().replace(day=1)
 
-        # Helper to get monthly total for a category
-        def get_m_total(model_class, date_field, amount_fields):
-            filters = {"project": project, f"{date_field}__gte": this_month_start}
-            if isinstance(amount_fields, tuple):
-                return (
-                    model_class.objects.filter(**filters).aggregate(
-                        total=Sum(F(amount_fields[0]) * F(amount_fields[1]))
-                    )["total"]
-                    or 0
-                )
-            else:
-                return (
-                    model_class.objects.filter(**filters).aggregate(
-                        total=Sum(amount_fields)
-                    )["total"]
-                    or 0
-                )
+        matrix = ProfitabilityMatrix(project, start=this_month_start)
 
-        def get_m_journal_total(categories):
-            """Internal helper to sum manual journals for this month."""
-            return JournalEntry.objects.filter(
-                project=project,
-                transaction_type=JournalEntry.EntryType.DEBIT,
-                source_log_id__isnull=True,
-                category__in=categories,
-                date__gte=this_month_start,
-            ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-
-        labour_tracker = get_m_total(
-            LabourCostTracker, "date", ("amount_of_days", "salary")
-        )
-        labour_manual = get_m_journal_total([JournalEntry.Category.LABOUR])
-        labour = Decimal(str(labour_tracker)) + labour_manual
+        def manual_journals(categories):
+            """Manual debit journals for this month."""
+            return matrix.journal_total(
+                JournalEntry.EntryType.DEBIT, categories, manual_only=True
+            )
 
-        subcontractor_tracker = get_m_total(
-            SubcontractorCostTracker, "date", ("amount_of_days", "rate")
+        labour = matrix.tracker_total("labour") + manual_journals(
+            [JournalEntry.Category.LABOUR]
         )
-        subcontractor_manual = get_m_journal_total(
+        subcontractor = matrix.tracker_total("subcontractors") + manual_journals(
             [JournalEntry.Category.SUBCONTRACTOR]
         )
-        subcontractor = Decimal(str(subcontractor_tracker)) + subcontractor_manual
-
-        overhead_tracker = get_m_total(
-            OverheadCostTracker, "date", ("amount_of_days", "rate")
-        )
-        overhead_manual = get_m_journal_total(
-            [JournalEntry.Category.OVERHEAD, JournalEntry.Category.OTHER]
+        overhead = matrix.tracker_total("overhead") + manual_journals(
+            OPEX_JOURNAL_CATEGORIES
         )
-        overhead = Decimal(str(overhead_tracker)) + overhead_manual
-
-        mat_logs = get_m_total(MaterialCostTracker, "date", ("quantity", "rate"))
-        plt_logs = get_m_total(PlantCostTracker, "date", ("usage_hours", "hourly_rate"))
-        material_manual = get_m_journal_total(
-            [JournalEntry.Category.MATERIAL, JournalEntry.Category.PLANT]
+        material = (
+            matrix.tracker_total("materials")
+            + matrix.tracker_total("plant")
+            + manual_journals(
+                [JournalEntry.Category.MATERIAL, JournalEntry.Category.PLANT]
+            )
         )
-        material = Decimal(str(mat_logs)) + Decimal(str(plt_logs)) + material_manual
 
         total_expense = labour + subcontractor + overhead + material
 
         # Revenue this month
-        revenue = ActualTransaction.objects.filter(
-            line_item__project=project,
-            payment_certificate__status=PaymentCertificate.Status.APPROVED,
-            payment_certificate__approved_on__gte=this_month_start,
-        ).aggregate(total=Sum("total_price"))["total"] or Decimal("0.00")
+        revenue = sum(matrix.certified_revenue.values(), Decimal("0.00"))
 
         profit = revenue - Decimal(str(total_expense))
         margin = (profit / revenue * 100) if revenue > 0 else 0
@@ -0,0 +1,215 @@
+"""Month-grouped profitability figures for the financial reports.
+
+``ProfitabilityMatrix`` loads the project's period x category x cost-code
+figures with one grouped ``TruncMonth`` query per source (each tracker
+model, the journal, certified revenue and planned value) and answers every
+total the reports need from memory, so report query counts do not grow with
+the number of months, categories or cost codes shown.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from functools import cached_property
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import DateField, DecimalField, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from app.BillOfQuantities.models import ActualTransaction, PaymentCertificate
+from app.Project.models import (
+    BaseProjectEntity,
+    JournalEntry,
+    LabourCostTracker,
+    MaterialCostTracker,
+    OverheadCostTracker,
+    PlannedValue,
+    PlantCostTracker,
+    SubcontractorCostTracker,
+)
+from app.Project.profitability.utils import TRACKER_JOURNAL_MAP
+
+# Report key -> tracker model
+TRACKER_MODELS = {
+    "materials": MaterialCostTracker,
+    "labour": LabourCostTracker,
+    "subcontractors": SubcontractorCostTracker,
+    "plant": PlantCostTracker,
+    "overhead": OverheadCostTracker,
+}
+
+# Manual (non tracker-generated) debit journal categories per cost code
+COS_JOURNAL_CATEGORIES = [
+    JournalEntry.Category.MATERIAL,
+    JournalEntry.Category.LABOUR,
+    JournalEntry.Category.SUBCONTRACTOR,
+    JournalEntry.Category.PLANT,
+]
+OPEX_JOURNAL_CATEGORIES = [
+    JournalEntry.Category.OVERHEAD,
+    JournalEntry.Category.OTHER,
+]
+
+_MONEY = DecimalField(max_digits=20, decimal_places=2)
+ZERO = Decimal("0.00")
+
+
+def month_range(start: date, end: date) -> list[date]:
+    """First day of every month from ``start`` to ``end`` inclusive."""
+    months = []
+    current = start.replace(day=1)
+    while current <= end:
+        months.append(current)
+        current += relativedelta(months=1)
+    return months
+
+
+class ProfitabilityMatrix:
+    """
+    Profitability figures for a project between ``start`` and ``end``
+    (either may be None for an open range), keyed by month.
+
+    Each source is loaded on first use, so a report only pays for the
+    sources it reads.
+    """
+
+    def __init__(self, project, start: date | None = None, end: date | None = None):
+        self.project = project
+        self.start = start
+        self.end = end
+
+    def _date_filters(self, field: str) -> dict:
+        filters = {}
+        if self.start:
+            filters[f"{field}__gte"] = self.start
+        if self.end:
+            filters[f"{field}__lte"] = self.end
+        return filters
+
+    @cached_property
+    def tracker_cells(self) -> dict[tuple[date, str, str], Decimal]:
+        """(month, tracker key, expense code) -> cost."""
+        cells = defaultdict(Decimal)
+        for key, model in TRACKER_MODELS.items():
+            _, _, entity_attr, cost = TRACKER_JOURNAL_MAP[model]
+            rows = (
+                model.objects.filter(project=self.project, **self._date_filters("date"))
+                .order_by()
+                .annotate(month=TruncMonth("date"))
+                .values_list("month", f"{entity_attr}__expense_code")
+                .annotate(total=Sum(cost, output_field=_MONEY))
+            )
+            for month, code, total in rows:
+                cells[(month, key, code)] += total or ZERO
+        return dict(cells)
+
+    @cached_property
+    def journal_cells(self) -> dict[tuple[date, str, str], tuple[Decimal, Decimal]]:
+        """(month, transaction type, category) -> (total, manual entries total).
+
+        Manual entries are those not generated from a cost tracker or
+        certificate (no ``source_log_id``).
+        """
+        rows = (
+            JournalEntry.objects.filter(
+                project=self.project, **self._date_filters("date")
+            )
+            .order_by()
+            .annotate(month=TruncMonth("date"))
+            .values_list("month", "transaction_type", "category")
+            .annotate(
+                total=Sum("amount"),
+                manual=Sum("amount", filter=Q(source_log_id__isnull=True)),
+            )
+        )
+        return {
+            (month, transaction_type, category): (total or ZERO, manual or ZERO)
+            for month, transaction_type, category, total, manual in rows
+        }
+
+    @cached_property
+    def certified_revenue(self) -> dict[date, Decimal]:
+        """Month of approval -> value of approved certificate transactions."""
+        rows = (
+            ActualTransaction.objects.filter(
+                line_item__project=self.project,
+                payment_certificate__status=PaymentCertificate.Status.APPROVED,
+                **self._date_filters("payment_certificate__approved_on__date"),
+            )
+            .order_by()
+            .annotate(
+                month=TruncMonth(
+                    "payment_certificate__approved_on", output_field=DateField()
+                )
+            )
+            .values_list("month")
+            .annotate(total=Sum("total_price"))
+        )
+        return {month: total or ZERO for month, total in rows}
+
+    @cached_property
+    def planned_value(self) -> dict[date, Decimal]:
+        """Period -> planned value."""
+        rows = (
+            PlannedValue.objects.filter(
+                project=self.project, **self._date_filters("period")
+            )
+            .order_by()
+            .values_list("period")
+            .annotate(total=Sum("value"))
+        )
+        return {period: total or ZERO for period, total in rows}
+
+    @staticmethod
+    def _in_months(month: date, months) -> bool:
+        if months is None:
+            return True
+        if isinstance(months, date):
+            return month == months
+        return month in months
+
+    def tracker_total(self, tracker=None, code=None, months=None) -> Decimal:
+        """Tracker costs, optionally for one tracker key, expense code and month(s)."""
+        return sum(
+            (
+                total
+                for (month, key, cell_code), total in self.tracker_cells.items()
+                if (tracker is None or key == tracker)
+                and (code is None or cell_code == code)
+                and self._in_months(month, months)
+            ),
+            ZERO,
+        )
+
+    def journal_total(
+        self,
+        transaction_type=None,
+        categories=None,
+        manual_only: bool = False,
+        months=None,
+    ) -> Decimal:
+        """Journal amounts filtered by type, categories, origin and month(s)."""
+        amount = ZERO
+        for (month, cell_type, category), (total, manual) in self.journal_cells.items():
+            if (
+                (transaction_type is None or cell_type == transaction_type)
+                and (categories is None or category in categories)
+                and self._in_months(month, months)
+            ):
+                amount += manual if manual_only else total
+        return amount
+
+    def revenue(self, months=None) -> Decimal:
+        """Revenue journals (credits), certificate imports included."""
+        return self.journal_total(JournalEntry.EntryType.CREDIT, months=months)
+
+    def expense_total(self, code, months=None) -> Decimal:
+        """Tracker costs classified under ``code`` plus its manual debit journals."""
+        categories = (
+            COS_JOURNAL_CATEGORIES
+            if code == BaseProjectEntity.ExpenseCode.COS
+            else OPEX_JOURNAL_CATEGORIES
+        )
+        return self.tracker_total(code=code, months=months) + self.journal_total(
+            JournalEntry.EntryType.DEBIT, categories, manual_only=True, months=months
+        )
@@ -2,12 +2,10 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 from dateutil.relativedelta import relativedelta
-from django.db.models import F, Sum
 from django.http import JsonResponse
 from django.views.generic import TemplateView
 
 from app.BillOfQuantities.models import (
-    ActualTransaction,
     PaymentCertificate,
 )
 from app.Project.models import (
@@ -15,12 +13,18 @@ from app.Project.models import (
     JournalEntry,
     LabourCostTracker,
     MaterialCostTracker,
-    OverheadCostTracker,
-    PlannedValue,
     PlantCostTracker,
     SubcontractorCostTracker,
 )
 from app.Project.profitability.mixins import FinancialCalculationMixin
+from app.Project.profitability.reports.aggregation import (
+    COS_JOURNAL_CATEGORIES,
+    OPEX_JOURNAL_CATEGORIES,
+    TRACKER_MODELS,
+    ProfitabilityMatrix,
+    month_range,
+)
+from app.Project.profitability.utils import TRACKER_JOURNAL_MAP
 from app.Project.profitability.views import ProfitabilityMixin
 
 
@@ -168,6 +172,8 @@ class FinancialBreakdownView(FinancialBaseView):
         # ).order_by("-approved_on")
         certificates = PaymentCertificate.objects.none()
 
+        matrix = ProfitabilityMatrix(project, start_date, end_date)
+
         # 2. Journals Detail (Other Income)
         journal_entries = JournalEntry.objects.filter(
             project=project,
@@ -179,7 +185,7 @@ class FinancialBreakdownView(FinancialBaseView):
         #     getattr(c, "total_certified_amount", Decimal("0.00")) for c in certificates
         # )
         cert_total = Decimal("0.00")
-        journal_total = sum(j.amount for j in journal_entries)
+        journal_total = matrix.revenue()
 
         # 3. Cost of Sales (COS) Breakdown
         cos_code = BaseProjectEntity.ExpenseCode.COS
@@ -188,12 +194,7 @@ class FinancialBreakdownView(FinancialBaseView):
             project=project,
             transaction_type=JournalEntry.EntryType.DEBIT,
             date__range=(start_date, end_date),
-            category__in=[
-                JournalEntry.Category.MATERIAL,
-                JournalEntry.Category.LABOUR,
-                JournalEntry.Category.SUBCONTRACTOR,
-                JournalEntry.Category.PLANT,
-            ],
+            category__in=COS_JOURNAL_CATEGORIES,
             source_log_id__isnull=True,
         ).order_by("-date")
 
@@ -204,10 +205,7 @@ class FinancialBreakdownView(FinancialBaseView):
             project=project,
             transaction_type=JournalEntry.EntryType.DEBIT,
             date__range=(start_date, end_date),
-            category__in=[
-                JournalEntry.Category.OVERHEAD,
-                JournalEntry.Category.OTHER,
-            ],
+            category__in=OPEX_JOURNAL_CATEGORIES,
             source_log_id__isnull=True,
         ).order_by("-date")
 
@@ -215,72 +213,38 @@ class FinancialBreakdownView(FinancialBaseView):
         total_revenue = cert_total + journal_total
 
         # Helper to sum trackers
-        def sum_trackers(models_map, code):
-            total = Decimal("0.00")
+        def sum_trackers(code):
             tracker_data = {}
             sub_totals = {}
 
-            for tracker_type, model_class in models_map.items():
-                try:
-                    # Use the provided helper logic for each model
-                    entity_field = f"{tracker_type}_entity"
-                    if tracker_type == "subcontractors":
-                        entity_field = "subcontractor_entity"
-                    elif tracker_type == "materials":
-                        entity_field = "material_entity"
-
-                    filters = {
-                        f"{entity_field}__expense_code": code,
-                        "project": project,
-                        "date__range": (start_date, end_date),
-                    }
-                    qs = model_class.objects.filter(**filters)
-
-                    # Aggregate total
-                    if tracker_type == "labour":
-                        agg = qs.aggregate(t=Sum(F("amount_of_days") * F("salary")))[
-                            "t"
-                        ]
-                    elif tracker_type == "materials":
-                        agg = qs.aggregate(t=Sum(F("quantity") * F("rate")))["t"]
-                    elif tracker_type == "subcontractors":
-                        agg = qs.aggregate(t=Sum(F("amount_of_days") * F("rate")))["t"]
-                    elif tracker_type == "plant":
-                        agg = qs.aggregate(t=Sum(F("usage_hours") * F("hourly_rate")))[
-                            "t"
-                        ]
-                    elif tracker_type == "overhead":
-                        agg = qs.aggregate(t=Sum(F("amount_of_days") * F("rate")))["t"]
-                    else:
-                        agg = 0
-
-                    val = Decimal(str(agg or 0))
-                    total += val
-                    tracker_data[tracker_type] = qs
-                    sub_totals[f"{tracker_type}_total"] = val
-                except Exception:
-                    tracker_data[tracker_type] = []
-                    sub_totals[f"{tracker_type}_total"] = Decimal("0.00")
-
-            return {"total": total, "items": tracker_data, "sub_totals": sub_totals}
-
-        tracker_models = {
-            "materials": MaterialCostTracker,
-            "labour": LabourCostTracker,
-            "subcontractors": SubcontractorCostTracker,
-            "plant": PlantCostTracker,
-            "overhead": OverheadCostTracker,
-        }
+            for tracker_type, model_class in TRACKER_MODELS.items():
+                entity_attr = TRACKER_JOURNAL_MAP[model_class][2]
+                tracker_data[tracker_type] = model_class.objects.filter(
+                    **{f"{entity_attr}__expense_code": code},
+                    project=project,
+                    date__range=(start_date, end_date),
+                )
+                sub_totals[f"{tracker_type}_total"] = matrix.tracker_total(
+                    tracker_type, code
+                )
 
-        cos_results = sum_trackers(tracker_models, cos_code)
-        cos_tracker_total = cos_results["total"]
-        cos_journal_total = sum(j.amount for j in cos_journal_items)
-        cos_total = cos_tracker_total + cos_journal_total
+            return {
+                "total": matrix.tracker_total(code=code),
+                "items": tracker_data,
+                "sub_totals": sub_totals,
+            }
 
-        opex_results = sum_trackers(tracker_models, opex_code)
-        opex_tracker_total = opex_results["total"]
-        opex_journal_total = sum(j.amount for j in opex_journal_items)
-        opex_total = opex_tracker_total + opex_journal_total
+        cos_results = sum_trackers(cos_code)
+        cos_journal_total = matrix.journal_total(
+            JournalEntry.EntryType.DEBIT, COS_JOURNAL_CATEGORIES, manual_only=True
+        )
+        cos_total = cos_results["total"] + cos_journal_total
+
+        opex_results = sum_trackers(opex_code)
+        opex_journal_total = matrix.journal_total(
+            JournalEntry.EntryType.DEBIT, OPEX_JOURNAL_CATEGORIES, manual_only=True
+        )
+        opex_total = opex_results["total"] + opex_journal_total
 
         context["cos_breakdown"] = {
             "trackers": cos_results,
@@ -540,12 +504,8 @@ class FinancialPerformanceDataView(ProfitabilityMixin, TemplateView):
             end_date = default_end_date
 
         # Generate months list
-        months = []
-        current = start_date
         # Boundary: include the month of the end_date
-        while current <= end_date.replace(day=1):
-            months.append(current)
-            current += relativedelta(months=1)
+        months = month_range(start_date, end_date)
 
         labels = [m.strftime("%b %Y") for m in months]
 
@@ -558,89 +518,24 @@ class FinancialPerformanceDataView(ProfitabilityMixin, TemplateView):
         gross_profit_actual = []  # Added
         opex_actual = []  # Added
 
-        from app.Project.models.entity_definitions import BaseProjectEntity
-
         cos_code = BaseProjectEntity.ExpenseCode.COS
         opex_code = BaseProjectEntity.ExpenseCode.OPEX
+        overhead_journals = [JournalEntry.Category.OVERHEAD]
 
-        for m_start in months:
-            m_end = (m_start + relativedelta(months=1)) - timedelta(days=1)
+        # Every month and the project totals come from one grouped query per source
+        matrix = ProfitabilityMatrix(project)
 
+        for m_start in months:
             # --- Actual Revenue ---
-            rev_act = ActualTransaction.objects.filter(
-                line_item__project=project,
-                payment_certificate__status=PaymentCertificate.Status.APPROVED,
-                payment_certificate__approved_on__date__range=(m_start, m_end),
-            ).aggregate(total=Sum("total_price"))["total"] or Decimal("0.00")
+            rev_act = matrix.certified_revenue.get(m_start, Decimal("0.00"))
             revenue_actual.append(float(rev_act))
 
             # --- Planned Revenue ---
-            rev_plan = PlannedValue.objects.filter(
-                project=project, period=m_start
-            ).aggregate(total=Sum("value"))["total"] or Decimal("0.00")
+            rev_plan = matrix.planned_value.get(m_start, Decimal("0.00"))
             revenue_planned.append(float(rev_plan))
 
             # --- Actual Cost (COS only for comparison with Planned COS) ---
-            def get_m_total(model, attr, start, end, code, field1, field2):
-                filters = {
-                    "project": project,
-                    "date__range": (start, end),
-                    f"{attr}__expense_code": code,
-                }
-                return (
-                    model.objects.filter(**filters).aggregate(
-                        total=Sum(F(field1) * F(field2))
-                    )["total"]
-                    or 0
-                )
-
-            c_mat = get_m_total(
-                MaterialCostTracker,
-                "material_entity",
-                m_start,
-                m_end,
-                cos_code,
-                "quantity",
-                "rate",
-            )
-            c_lab = get_m_total(
-                LabourCostTracker,
-                "labour_entity",
-                m_start,
-                m_end,
-                cos_code,
-                "amount_of_days",
-                "salary",
-            )
-            c_sub = get_m_total(
-                SubcontractorCostTracker,
-                "subcontractor_entity",
-                m_start,
-                m_end,
-                cos_code,
-                "amount_of_days",
-                "rate",
-            )
-            c_plt = get_m_total(
-                PlantCostTracker,
-                "plant_entity",
-                m_start,
-                m_end,
-                cos_code,
-                "usage_hours",
-                "hourly_rate",
-            )
-            c_ovh = get_m_total(
-                OverheadCostTracker,
-                "overhead_entity",
-                m_start,
-                m_end,
-                cos_code,
-                "amount_of_days",
-                "rate",
-            )
-
-            total_cos_m = Decimal(str(c_mat + c_lab + c_sub + c_plt + c_ovh))
+            total_cos_m = matrix.tracker_total(code=cos_code, months=m_start)
             cost_actual.append(float(total_cos_m))
 
             # --- Planned Cost (Assumption: 60% of planned revenue) ---
@@ -648,63 +543,10 @@ class FinancialPerformanceDataView(ProfitabilityMixin, TemplateView):
             cost_planned.append(float(cost_plan))
 
             # --- Monthly Profit (Revenue - Total Cost [COS + OPEX]) ---
-            o_mat = get_m_total(
-                MaterialCostTracker,
-                "material_entity",
-                m_start,
-                m_end,
-                opex_code,
-                "quantity",
-                "rate",
-            )
-            o_lab = get_m_total(
-                LabourCostTracker,
-                "labour_entity",
-                m_start,
-                m_end,
-                opex_code,
-                "amount_of_days",
-                "salary",
-            )
-            o_sub = get_m_total(
-                SubcontractorCostTracker,
-                "subcontractor_entity",
-                m_start,
-                m_end,
-                opex_code,
-                "amount_of_days",
-                "rate",
-            )
-            o_plt = get_m_total(
-                PlantCostTracker,
-                "plant_entity",
-                m_start,
-                m_end,
-                opex_code,
-                "usage_hours",
-                "hourly_rate",
-            )
-            o_ovh = get_m_total(
-                OverheadCostTracker,
-                "overhead_entity",
-                m_start,
-                m_end,
-                opex_code,
-                "amount_of_days",
-                "rate",
-            )
-            o_journal = (
-                JournalEntry.objects.filter(
-                    project=project,
-                    category=JournalEntry.Category.OVERHEAD,
-                    date__range=(m_start, m_end),
-                    source_log_id__isnull=True,
-                ).aggregate(total=Sum("amount"))["total"]
-                or 0
-            )
-
-            total_opex_m = Decimal(
-                str(o_mat + o_lab + o_sub + o_plt + o_ovh + o_journal)
+            total_opex_m = matrix.tracker_total(
+                code=opex_code, months=m_start
+            ) + matrix.journal_total(
+                categories=overhead_journals, manual_only=True, months=m_start
             )
 
             gross_profit_actual.append(float(rev_act - total_cos_m))
@@ -712,76 +554,16 @@ class FinancialPerformanceDataView(ProfitabilityMixin, TemplateView):
             profit_actual.append(float(rev_act - total_cos_m - total_opex_m))
 
         # 3. Overall Totals for Breakdowns (Current Project Total)
-        def get_total_breakdown(source, field1, field2):
-            """Helper to sum costs from either a model class or a pre-filtered queryset."""
-            if hasattr(source, "_default_manager"):
-                qs = source.objects.filter(project=project)
-            else:
-                qs = source  # It's already a queryset
-            return qs.aggregate(total=Sum(F(field1) * F(field2)))["total"] or 0
-
-        total_materials = get_total_breakdown(MaterialCostTracker, "quantity", "rate")
-        total_labour = get_total_breakdown(
-            LabourCostTracker, "amount_of_days", "salary"
-        )
-        total_subcon = get_total_breakdown(
-            SubcontractorCostTracker, "amount_of_days", "rate"
-        )
-        total_plant = get_total_breakdown(
-            PlantCostTracker, "usage_hours", "hourly_rate"
-        )
-        total_overheads_all = get_total_breakdown(
-            OverheadCostTracker, "amount_of_days", "rate"
-        )
+        total_materials = matrix.tracker_total("materials")
+        total_labour = matrix.tracker_total("labour")
+        total_subcon = matrix.tracker_total("subcontractors")
+        total_plant = matrix.tracker_total("plant")
+        total_overheads_all = matrix.tracker_total("overhead")
 
         # OPEX specifically (Overheads + Journals + Any tracker items marked OPEX)
-        o_mat_total = get_total_breakdown(
-            MaterialCostTracker.objects.filter(
-                project=project, material_entity__expense_code=opex_code
-            ),
-            "quantity",
-            "rate",
-        )
-        o_lab_total = get_total_breakdown(
-            LabourCostTracker.objects.filter(
-                project=project, labour_entity__expense_code=opex_code
-            ),
-            "amount_of_days",
-            "salary",
-        )
-        o_sub_total = get_total_breakdown(
-            SubcontractorCostTracker.objects.filter(
-                project=project, subcontractor_entity__expense_code=opex_code
-            ),
-            "amount_of_days",
-            "rate",
-        )
-        o_plt_total = get_total_breakdown(
-            PlantCostTracker.objects.filter(
-                project=project, plant_entity__expense_code=opex_code
-            ),
-            "usage_hours",
-            "hourly_rate",
-        )
-        o_ovh_total = get_total_breakdown(
-            OverheadCostTracker.objects.filter(
-                project=project, overhead_entity__expense_code=opex_code
-            ),
-            "amount_of_days",
-            "rate",
-        )
-
-        total_opex_trackers = Decimal(
-            str(o_mat_total + o_lab_total + o_sub_total + o_plt_total + o_ovh_total)
-        )
-
-        total_journals = (
-            JournalEntry.objects.filter(
-                project=project,
-                category=JournalEntry.Category.OVERHEAD,
-                source_log_id__isnull=True,
-            ).aggregate(total=Sum("amount"))["total"]
-            or 0
+        total_opex_trackers = matrix.tracker_total(code=opex_code)
+        total_journals = matrix.journal_total(
+            categories=overhead_journals, manual_only=True
         )
 
         return JsonResponse(
@@ -9,7 +9,7 @@ from app.Project.models import (
     SubcontractorCostTracker,
 )
 
-from .utils import sync_tracker_to_journal
+from .utils import mark_tracker_dirty
 
 
 @receiver(post_save, sender=LabourCostTracker)
@@ -18,8 +18,8 @@ from .utils import sync_tracker_to_journal
 @receiver(post_save, sender=OverheadCostTracker)
 @receiver(post_save, sender=SubcontractorCostTracker)
 def auto_sync_tracker_to_journal(sender, instance, created, **kwargs):
-    """Automatically sync cost tracker to journal on save."""
-    sync_tracker_to_journal(instance)
+    """Queue the tracker's daily journal entry for a resync on commit."""
+    mark_tracker_dirty(instance)
 
 
 @receiver(post_delete, sender=LabourCostTracker)
@@ -28,5 +28,5 @@ def auto_sync_tracker_to_journal(sender, instance, created, **kwargs):
 @receiver(post_delete, sender=OverheadCostTracker)
 @receiver(post_delete, sender=SubcontractorCostTracker)
 def auto_delete_tracker_from_journal(sender, instance, **kwargs):
-    """Automatically remove cost tracker from journal on delete."""
-    sync_tracker_to_journal(instance, deleted=True)
+    """Queue the tracker's daily journal entry for a resync on commit."""
+    mark_tracker_dirty(instance)
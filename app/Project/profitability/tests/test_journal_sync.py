@@ -0,0 +1,167 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.BillOfQuantities.models import PaymentCertificate
+from app.BillOfQuantities.tests.factories import (
+    ActualTransactionFactory,
+    LineItemFactory,
+    PaymentCertificateFactory,
+)
+from app.Project.models import JournalEntry
+from app.Project.profitability.tests.factories import (
+    LabourCostTrackerFactory,
+    LabourEntityFactory,
+    MaterialCostTrackerFactory,
+)
+from app.Project.profitability.utils import (
+    bulk_sync_all_trackers_to_journal,
+    import_certificates_to_journal,
+)
+from app.Project.tests.factories import ProjectFactory
+
+DAY = date(2025, 3, 3)
+
+
+@pytest.mark.django_db
+class TestTrackerJournalSync:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        self.entity = LabourEntityFactory(project=self.project, name="Crew A")
+
+    def _labour(self, day=DAY):
+        return LabourCostTrackerFactory(
+            project=self.project,
+            labour_entity=self.entity,
+            date=day,
+            amount_of_days=Decimal("1"),
+            salary=Decimal("100"),
+        )
+
+    def test_trackers_are_consolidated_once_per_commit(
+        self, django_capture_on_commit_callbacks, django_assert_max_num_queries
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            for _ in range(5):
+                self._labour()
+            self._labour(date(2025, 3, 4))
+
+        # The first callback flushes every queued key in a fixed number of queries
+        with django_assert_max_num_queries(6):
+            for callback in callbacks:
+                callback()
+
+        entries = JournalEntry.objects.filter(project=self.project).order_by("date")
+        assert [(e.date, e.amount) for e in entries] == [
+            (DAY, Decimal("500.00")),
+            (date(2025, 3, 4), Decimal("100.00")),
+        ]
+        assert entries[0].source_log_type == "LabourEntity"
+        assert entries[0].source_log_id == self.entity.pk
+        assert entries[0].description == "Labour Cost: Crew A (Daily Total)"
+
+    def test_edits_and_deletes_update_the_entry(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            first, second = self._labour(), self._labour()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.salary = Decimal("300")
+            first.save()
+        assert JournalEntry.objects.get(project=self.project).amount == Decimal("400")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+            second.soft_delete()
+        assert not JournalEntry.objects.filter(project=self.project).exists()
+
+    def test_bulk_sync_rebuilds_every_entity_day(
+        self, django_capture_on_commit_callbacks
+    ):
+        self._labour()
+        MaterialCostTrackerFactory(
+            project=self.project, date=DAY, quantity=2, rate=Decimal("25")
+        )
+        JournalEntry.objects.create(
+            project=self.project,
+            date=DAY,
+            category=JournalEntry.Category.LABOUR,
+            description="stale",
+            amount=Decimal("1"),
+            source_log_id=self.entity.pk,
+            source_log_type="LabourEntity",
+        )
+
+        bulk_sync_all_trackers_to_journal(self.project)
+
+        amounts = dict(
+            JournalEntry.objects.filter(project=self.project).values_list(
+                "category", "amount"
+            )
+        )
+        assert amounts == {
+            JournalEntry.Category.LABOUR: Decimal("100.00"),
+            JournalEntry.Category.MATERIAL: Decimal("50.00"),
+        }
+
+
+@pytest.mark.django_db
+class TestCertificateJournalImport:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        self.line_item = LineItemFactory(project=self.project)
+        self.special_item = LineItemFactory(project=self.project, special_item=True)
+
+    def _certificate(self, number, amount, status=PaymentCertificate.Status.APPROVED):
+        certificate = PaymentCertificateFactory(
+            project=self.project, certificate_number=number, status=status
+        )
+        ActualTransactionFactory(
+            payment_certificate=certificate,
+            line_item=self.line_item,
+            total_price=Decimal(amount),
+        )
+        ActualTransactionFactory(
+            payment_certificate=certificate,
+            line_item=self.special_item,
+            total_price=Decimal("999"),
+        )
+        return certificate
+
+    def _revenue(self):
+        return dict(
+            JournalEntry.objects.filter(
+                project=self.project, source_log_type="PaymentCertificate"
+            ).values_list("source_log_id", "amount")
+        )
+
+    def test_entries_are_created_updated_and_removed(self):
+        first = self._certificate(1, "100")
+        second = self._certificate(2, "250")
+        self._certificate(3, "75", status=PaymentCertificate.Status.DRAFT)
+
+        assert import_certificates_to_journal(self.project) == 2
+        assert self._revenue() == {first.pk: Decimal("100"), second.pk: Decimal("250")}
+
+        first.actual_transactions.filter(line_item=self.line_item).update(
+            total_price=Decimal("120")
+        )
+        second.actual_transactions.filter(line_item=self.line_item).update(
+            total_price=Decimal("0")
+        )
+        assert import_certificates_to_journal(self.project) == 1
+        assert self._revenue() == {first.pk: Decimal("120")}
+
+    def test_query_count_is_independent_of_certificate_count(self):
+        def reimport(count, start):
+            for number in range(start, start + count):
+                self._certificate(number, "10")
+            with CaptureQueriesContext(connection) as queries:
+                import_certificates_to_journal(self.project)
+            return len(queries.captured_queries)
+
+        assert reimport(1, 1) == reimport(5, 2)
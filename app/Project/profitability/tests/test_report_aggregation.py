@@ -0,0 +1,99 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.Project.models import BaseProjectEntity, JournalEntry, PlannedValue
+from app.Project.profitability.reports.aggregation import ProfitabilityMatrix
+from app.Project.profitability.tests.factories import (
+    LabourCostTrackerFactory,
+    LabourEntityFactory,
+    OverheadCostTrackerFactory,
+    OverheadEntityFactory,
+)
+from app.Project.tests.factories import ProjectFactory
+
+COS = BaseProjectEntity.ExpenseCode.COS
+OPEX = BaseProjectEntity.ExpenseCode.OPEX
+
+
+@pytest.mark.django_db
+class TestProfitabilityMatrix:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        labour = LabourEntityFactory(project=self.project)
+        overhead = OverheadEntityFactory(project=self.project, expense_code=OPEX)
+        for day in (date(2025, 1, 5), date(2025, 1, 20), date(2025, 2, 3)):
+            LabourCostTrackerFactory(
+                project=self.project,
+                labour_entity=labour,
+                date=day,
+                amount_of_days=Decimal("2"),
+                salary=Decimal("100"),
+            )
+        OverheadCostTrackerFactory(
+            project=self.project,
+            overhead_entity=overhead,
+            date=date(2025, 2, 10),
+            amount_of_days=Decimal("1"),
+            rate=Decimal("50"),
+        )
+        for category, entry_type, source in [
+            (JournalEntry.Category.REVENUE, JournalEntry.EntryType.CREDIT, None),
+            (JournalEntry.Category.OTHER, JournalEntry.EntryType.DEBIT, None),
+            (JournalEntry.Category.LABOUR, JournalEntry.EntryType.DEBIT, labour.pk),
+        ]:
+            JournalEntry.objects.create(
+                project=self.project,
+                date=date(2025, 2, 1),
+                category=category,
+                transaction_type=entry_type,
+                amount=Decimal("30"),
+                description="Entry",
+                source_log_id=source,
+            )
+
+    def test_totals_by_month_category_and_code(self):
+        matrix = ProfitabilityMatrix(self.project)
+        january, february = date(2025, 1, 1), date(2025, 2, 1)
+
+        assert matrix.tracker_total("labour", COS, months=january) == Decimal("400")
+        assert matrix.tracker_total(code=COS) == Decimal("600")
+        assert matrix.tracker_total(code=OPEX, months=february) == Decimal("50")
+        assert matrix.revenue() == Decimal("30")
+        # Tracker-generated journals are excluded from the manual expense totals
+        assert matrix.expense_total(COS) == Decimal("600")
+        assert matrix.expense_total(OPEX, months=february) == Decimal("80")
+
+    def test_date_range_limits_cells(self):
+        matrix = ProfitabilityMatrix(self.project, start=date(2025, 1, 10))
+
+        assert matrix.tracker_total("labour") == Decimal("400")
+
+    def test_performance_data_queries_do_not_grow_with_months(
+        self, client, django_assert_max_num_queries
+    ):
+        user = AccountFactory()
+        self.project.users.add(user)
+        client.force_login(user)
+        PlannedValue.objects.create(
+            project=self.project, period=date(2025, 2, 1), value=Decimal("1000")
+        )
+        url = reverse(
+            "project:profitability-performance-data",
+            kwargs={"project_pk": self.project.pk},
+        )
+
+        with django_assert_max_num_queries(15):
+            response = client.get(
+                url, {"start_date": "2020-01-01", "end_date": "2025-12-31"}
+            )
+
+        data = response.json()
+        assert len(data["labels"]) == 72
+        index = data["labels"].index("Feb 2025")
+        assert data["datasets"]["revenue_planned"][index] == 1000.0
+        assert data["datasets"]["cost_actual"][index] == 200.0
+        assert data["datasets"]["opex_actual"][index] == 50.0
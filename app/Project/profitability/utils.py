@@ -1,9 +1,20 @@
+import threading
+from collections import defaultdict
 from decimal import Decimal
 
 from django.db import transaction
-from django.db.models import F, Sum
-
-from app.Project.models import LabourCostTracker, SubcontractorCostTracker
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app.Project.models import (
+    JournalEntry,
+    LabourCostTracker,
+    MaterialCostTracker,
+    OverheadCostTracker,
+    PlantCostTracker,
+    SubcontractorCostTracker,
+)
 from app.SiteManagement.models import LabourLog, SubcontractorLog
 
 
@@ -90,7 +101,6 @@ def import_material_logs_to_profitability(project):
     """
     Import material site logs into the profitability cost tracker.
     """
-    from app.Project.models import MaterialCostTracker
     from app.SiteManagement.models import MaterialsLog
 
     logs = MaterialsLog.objects.filter(project=project)
@@ -128,7 +138,6 @@ def import_plant_logs_to_profitability(project):
     """
     Import plant equipment site logs into the profitability cost tracker.
     """
-    from app.Project.models import PlantCostTracker
     from app.SiteManagement.models import PlantEquipment
 
     # Only import logs that are linked to a master plant definition (PlantEntity)
@@ -166,7 +175,6 @@ def import_overhead_logs_to_profitability(project):
     """
     Import overhead site logs into the profitability cost tracker.
     """
-    from app.Project.models import OverheadCostTracker
     from app.SiteManagement.models import OverheadDailyLog
 
     logs = OverheadDailyLog.objects.filter(
@@ -274,135 +282,296 @@ def import_certificates_to_journal(project):
     """
     Import approved payment certificates into the journal as revenue.
     Ensures entries stay in sync with certificate changes.
+
+    Current-claim totals for every approved certificate come from one grouped
+    aggregate, and journal rows are diffed and written in bulk.
     """
     from app.BillOfQuantities.models import PaymentCertificate
-    from app.Project.models import JournalEntry
 
+    # Same figure as ``work_current_claim_total``: contract + addendum work
     certificates = PaymentCertificate.objects.filter(
         project=project, status=PaymentCertificate.Status.APPROVED
+    ).annotate(
+        work_claim_total=Coalesce(
+            Sum(
+                "actual_transactions__total_price",
+                filter=Q(
+                    actual_transactions__deleted=False,
+                    actual_transactions__line_item__special_item=False,
+                ),
+            ),
+            Value(Decimal("0.00")),
+            output_field=DecimalField(max_digits=20, decimal_places=2),
+        )
     )
-    count = 0
 
     with transaction.atomic():
+        existing = {}
+        to_delete = []
+        for entry in JournalEntry.objects.filter(
+            project=project, source_log_type="PaymentCertificate"
+        ).order_by("pk"):
+            if entry.source_log_id in existing:
+                to_delete.append(entry.pk)
+            else:
+                existing[entry.source_log_id] = entry
+
+        to_create, to_update = [], []
+        count = 0
+        now = timezone.now()
         for cert in certificates:
+            entry = existing.get(cert.pk)
             # Use current claim total as the revenue amount for this certificate's period
-            amount = cert.work_current_claim_total
+            amount = cert.work_claim_total
+            if amount <= 0:
+                # Remove entry if amount is zeroed out
+                if entry:
+                    to_delete.append(entry.pk)
+                continue
 
-            if amount > 0:
-                JournalEntry.objects.update_or_create(
-                    project=project,
-                    source_log_id=cert.id,
-                    source_log_type="PaymentCertificate",
-                    defaults={
-                        "date": cert.approved_on.date()
-                        if cert.approved_on
-                        else cert.created_at.date(),
-                        "category": JournalEntry.Category.REVENUE,
-                        "description": f"Revenue from Payment Certificate #{cert.certificate_number}",
-                        "amount": amount,
-                        "transaction_type": JournalEntry.EntryType.CREDIT,
-                    },
+            count += 1
+            values = {
+                "date": cert.approved_on.date()
+                if cert.approved_on
+                else cert.created_at.date(),
+                "category": JournalEntry.Category.REVENUE,
+                "description": f"Revenue from Payment Certificate #{cert.certificate_number}",
+                "amount": amount,
+                "transaction_type": JournalEntry.EntryType.CREDIT,
+            }
+            if entry is None:
+                to_create.append(
+                    JournalEntry(
+                        project=project,
+                        source_log_id=cert.pk,
+                        source_log_type="PaymentCertificate",
+                        **values,
+                    )
                 )
-                count += 1
-            else:
-                # Remove entry if amount is zeroed out
-                JournalEntry.objects.filter(
-                    project=project,
-                    source_log_id=cert.id,
-                    source_log_type="PaymentCertificate",
-                ).delete()
+                continue
+            if any(getattr(entry, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(entry, field, value)
+                entry.updated_at = now
+                to_update.append(entry)
+
+        JournalEntry.objects.bulk_create(to_create)
+        JournalEntry.objects.bulk_update(
+            to_update,
+            [
+                "date",
+                "category",
+                "description",
+                "amount",
+                "transaction_type",
+                "updated_at",
+            ],
+        )
+        if to_delete:
+            JournalEntry.objects.filter(pk__in=to_delete).delete()
     return count
 
 
-def sync_tracker_to_journal(instance, deleted=False):
-    """
-    Synchronize cost tracker(s) for a specific item/entity with a single JournalEntry.
-    Consolidates multiple logs for the same entity on the same day into one aggregate entry.
+# Tracker model -> (journal category, description prefix, entity field, cost expression)
+TRACKER_JOURNAL_MAP = {
+    LabourCostTracker: (
+        JournalEntry.Category.LABOUR,
+        "Labour Cost",
+        "labour_entity",
+        F("amount_of_days") * F("salary"),
+    ),
+    MaterialCostTracker: (
+        JournalEntry.Category.MATERIAL,
+        "Material Cost",
+        "material_entity",
+        F("quantity") * F("rate"),
+    ),
+    PlantCostTracker: (
+        JournalEntry.Category.PLANT,
+        "Plant/Equipment Cost",
+        "plant_entity",
+        F("usage_hours") * F("hourly_rate"),
+    ),
+    OverheadCostTracker: (
+        JournalEntry.Category.OVERHEAD,
+        "Overhead Cost",
+        "overhead_entity",
+        F("amount_of_days") * F("rate"),
+    ),
+    SubcontractorCostTracker: (
+        JournalEntry.Category.SUBCONTRACTOR,
+        "Subcontractor Cost",
+        "subcontractor_entity",
+        F("amount_of_days") * F("rate"),
+    ),
+}
+
+# Dirty (tracker model, project id, date, entity id) keys awaiting a journal
+# flush, per thread and therefore per database connection.
+_dirty_journal_keys = threading.local()
+
+
+def _tracker_journal_key(instance) -> tuple | None:
+    tracker_model = type(instance)
+    if tracker_model not in TRACKER_JOURNAL_MAP:
+        return None
+    entity_id = getattr(instance, f"{TRACKER_JOURNAL_MAP[tracker_model][2]}_id")
+    if not entity_id:
+        return None
+    return (tracker_model, instance.project_id, instance.date, entity_id)
+
+
+def mark_tracker_dirty(instance) -> None:
     """
-    from app.Project.models import JournalEntry
-
-    tracker_model = instance.__class__
-    tracker_model_name = tracker_model.__name__
-
-    # Map tracker class names to their parent Entity model names and attributes
-    mapping = {
-        "LabourCostTracker": (
-            JournalEntry.Category.LABOUR,
-            "Labour Cost",
-            "labour_entity",
-        ),
-        "MaterialCostTracker": (
-            JournalEntry.Category.MATERIAL,
-            "Material Cost",
-            "material_entity",
-        ),
-        "PlantCostTracker": (
-            JournalEntry.Category.PLANT,
-            "Plant/Equipment Cost",
-            "plant_entity",
-        ),
-        "OverheadCostTracker": (
-            JournalEntry.Category.OVERHEAD,
-            "Overhead Cost",
-            "overhead_entity",
-        ),
-        "SubcontractorCostTracker": (
-            JournalEntry.Category.SUBCONTRACTOR,
-            "Subcontractor Cost",
-            "subcontractor_entity",
-        ),
-    }
+    Queue the journal entry for ``instance``'s (project, date, entity) for
+    recalculation once the current transaction commits.
 
-    if tracker_model_name not in mapping:
+    Each key is recomputed once per commit however many trackers change, so
+    bulk imports cost one aggregate per distinct day and entity. Outside a
+    transaction the flush runs immediately.
+    """
+    key = _tracker_journal_key(instance)
+    if key is None:
         return
+    pending = getattr(_dirty_journal_keys, "keys", None)
+    if pending is None:
+        pending = _dirty_journal_keys.keys = set()
+    pending.add(key)
+    # Callbacks registered in a rolled back savepoint are dropped, so one is
+    # registered per change; the first to run flushes everything queued and
+    # the rest find nothing to do.
+    transaction.on_commit(flush_dirty_journal_keys)
+
+
+def flush_dirty_journal_keys() -> None:
+    """Recompute the journal entries for every queued tracker key."""
+    pending = getattr(_dirty_journal_keys, "keys", None)
+    if not pending:
+        return
+    _dirty_journal_keys.keys = set()
+    sync_journal_keys(pending)
 
-    category, prefix, entity_attr = mapping[tracker_model_name]
-    entity = getattr(instance, entity_attr, None)
 
-    if not entity:
-        return
+def sync_journal_keys(keys) -> int:
+    """
+    Recompute the consolidated daily journal entry for each
+    (tracker model, project id, date, entity id) key.
 
-    # Use the Entity ID as the link so all logs for this entity share one entry
-    source_log_id = entity.id
-    source_log_type = entity.__class__.__name__
-    target_date = instance.date
-
-    # 1. Fetch all trackers for this Project, Date, and Entity
-    # (Checking against the date provided in the instance that triggered the sync)
-    filter_kwargs = {
-        "project": instance.project,
-        "date": target_date,
-        entity_attr: entity,
-    }
-    all_related_trackers = tracker_model.objects.filter(**filter_kwargs)
-
-    # 2. Calculate the aggregate amount
-    # Note: Using list comprehension + sum as 'cost' is often a @property
-    total_amount = sum(float(t.cost) for t in all_related_trackers)
-
-    if total_amount <= 0 or (deleted and all_related_trackers.count() == 0):
-        # Remove journal entry if no costs remain for this item on this day
-        JournalEntry.objects.filter(
-            project=instance.project,
-            date=target_date,
-            source_log_id=source_log_id,
-            source_log_type=source_log_type,
-        ).delete()
-        return
+    Costs are summed in SQL with one grouped query per tracker model, and the
+    journal is written with one bulk create, update and delete.
 
-    # 3. Create or update the consolidated journal entry
-    JournalEntry.objects.update_or_create(
-        project=instance.project,
-        date=target_date,
-        source_log_id=source_log_id,
-        source_log_type=source_log_type,
-        defaults={
-            "category": category,
-            "description": f"{prefix}: {entity.name} (Daily Total)",
-            "amount": Decimal(str(total_amount)),
-            "transaction_type": JournalEntry.EntryType.DEBIT,
-        },
+    Returns:
+        int: Number of journal entries created or updated
+    """
+    by_model = defaultdict(set)
+    for tracker_model, project_id, target_date, entity_id in keys:
+        by_model[tracker_model].add((project_id, target_date, entity_id))
+    if not by_model:
+        return 0
+
+    # (project id, date, entity type, entity id) -> (category, description, amount)
+    targets = {}
+    for tracker_model, model_keys in by_model.items():
+        category, prefix, entity_attr, cost = TRACKER_JOURNAL_MAP[tracker_model]
+        entity_model = tracker_model._meta.get_field(entity_attr).related_model
+        project_ids, dates, entity_ids = (
+            set(column) for column in zip(*model_keys, strict=True)
+        )
+        totals = (
+            tracker_model.objects.filter(
+                project_id__in=project_ids,
+                date__in=dates,
+                **{f"{entity_attr}_id__in": entity_ids},
+            )
+            .order_by()
+            .values_list("project_id", "date", f"{entity_attr}_id")
+            .annotate(
+                total=Sum(
+                    cost, output_field=DecimalField(max_digits=20, decimal_places=2)
+                )
+            )
+        )
+        names = dict(
+            entity_model.all_objects.filter(pk__in=entity_ids).values_list("pk", "name")
+        )
+        for project_id, target_date, entity_id, total in totals:
+            key = (project_id, target_date, entity_id)
+            if key in model_keys and total and total > 0:
+                targets[(project_id, target_date, entity_model.__name__, entity_id)] = (
+                    category,
+                    f"{prefix}: {names.get(entity_id, '')} (Daily Total)",
+                    total,
+                )
+        # Keys without a positive total lose their entry
+        for project_id, target_date, entity_id in model_keys:
+            targets.setdefault(
+                (project_id, target_date, entity_model.__name__, entity_id), None
+            )
+
+    project_ids, dates, entity_types, entity_ids = (
+        set(column) for column in zip(*targets, strict=True)
+    )
+    existing = JournalEntry.objects.filter(
+        project_id__in=project_ids,
+        date__in=dates,
+        source_log_type__in=entity_types,
+        source_log_id__in=entity_ids,
+    ).order_by("pk")
+
+    to_update, to_delete, seen = [], [], set()
+    for entry in existing:
+        key = (entry.project_id, entry.date, entry.source_log_type, entry.source_log_id)
+        if key not in targets:
+            continue
+        target = targets[key]
+        if target is None or key in seen:
+            to_delete.append(entry.pk)
+            continue
+        seen.add(key)
+        entry.category, entry.description, entry.amount = target
+        entry.transaction_type = JournalEntry.EntryType.DEBIT
+        to_update.append(entry)
+
+    to_create = []
+    for key, target in targets.items():
+        if target is None or key in seen:
+            continue
+        project_id, target_date, entity_type, entity_id = key
+        category, description, amount = target
+        to_create.append(
+            JournalEntry(
+                project_id=project_id,
+                date=target_date,
+                source_log_id=entity_id,
+                source_log_type=entity_type,
+                category=category,
+                description=description,
+                amount=amount,
+                transaction_type=JournalEntry.EntryType.DEBIT,
+            )
+        )
+
+    now = timezone.now()
+    for entry in to_update:
+        entry.updated_at = now
+    JournalEntry.objects.bulk_update(
+        to_update,
+        ["category", "description", "amount", "transaction_type", "updated_at"],
     )
+    JournalEntry.objects.bulk_create(to_create)
+    if to_delete:
+        JournalEntry.objects.filter(pk__in=to_delete).delete()
+    return len(to_update) + len(to_create)
+
+
+def sync_tracker_to_journal(instance, deleted=False):
+    """
+    Synchronize cost tracker(s) for a specific item/entity with a single JournalEntry.
+    Consolidates multiple logs for the same entity on the same day into one aggregate entry.
+    """
+    key = _tracker_journal_key(instance)
+    if key is not None:
+        sync_journal_keys([key])
 
 
 def bulk_sync_all_trackers_to_journal(project):
@@ -410,57 +579,21 @@ def bulk_sync_all_trackers_to_journal(project):
     Process all existing tracker records for a project and sync them to the Journal.
     Uses consolidated item grouping.
     """
-    from app.Project.models import (
-        LabourCostTracker,
-        MaterialCostTracker,
-        OverheadCostTracker,
-        PlantCostTracker,
-        SubcontractorCostTracker,
-    )
-
-    tracker_models = [
-        LabourCostTracker,
-        MaterialCostTracker,
-        PlantCostTracker,
-        OverheadCostTracker,
-        SubcontractorCostTracker,
-    ]
+    keys = []
+    for tracker_model, (_, _, entity_attr, _) in TRACKER_JOURNAL_MAP.items():
+        keys += [
+            (tracker_model, project.pk, target_date, entity_id)
+            for target_date, entity_id in tracker_model.objects.filter(
+                project=project, **{f"{entity_attr}__isnull": False}
+            )
+            .order_by()
+            .values_list("date", f"{entity_attr}_id")
+            .distinct()
+        ]
 
-    count = 0
     with transaction.atomic():
-        # First, we identify all unique (Date, Entity) combinations across all trackers
-        for model in tracker_models:
-            # We iterate through trackers and call the sync logic.
-            # Due to update_or_create, multiple logs for same date/entity will be handled correctly.
-            # However, for efficiency in bulk, we could unique them first if logs were massive.
-            instances = model.objects.filter(project=project)
-            processed_keys = set()
-            for instance in instances:
-                # Determine entity and attr for grouping
-                entity_attr = ""
-                if model == LabourCostTracker:
-                    entity_attr = "labour_entity"
-                elif model == MaterialCostTracker:
-                    entity_attr = "material_entity"
-                elif model == PlantCostTracker:
-                    entity_attr = "plant_entity"
-                elif model == OverheadCostTracker:
-                    entity_attr = "overhead_entity"
-                elif model == SubcontractorCostTracker:
-                    entity_attr = "subcontractor_entity"
-
-                entity = getattr(instance, entity_attr, None)
-                if not entity:
-                    continue
-
-                key = (instance.date, entity.id, model.__name__)
-
-                if key not in processed_keys:
-                    sync_tracker_to_journal(instance)
-                    processed_keys.add(key)
-                    count += 1
-
+        sync_journal_keys(keys)
         # Also sync revenue certificates
-        count += import_certificates_to_journal(project)
+        count = len(keys) + import_certificates_to_journal(project)
 
     return count
@@ -35,6 +35,7 @@ from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import (
     UserHasProjectRoleGenericMixin,
 )
+from app.core.Utilities.search import search
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
 from app.Project.models import (
     PlannedValue,
@@ -772,7 +773,7 @@ class ProjectWBSDetailView(ProjectMixin, DetailView):
         if package_id:
             line_items = line_items.filter(package_id=package_id)
         if description:
-            line_items = line_items.filter(description__icontains=description)
+            line_items = search(line_items, description, rank=False)
 
         # Calculate total of filtered line items
         line_items_total = line_items.aggregate(total=Sum("total_price"))["total"] or 0
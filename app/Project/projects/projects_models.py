@@ -6,6 +6,7 @@ from dateutil.relativedelta import relativedelta
 from django.db import models
 from django.db.models import QuerySet
 from django.urls import reverse
+from django.utils import timezone
 
 from app.BillOfQuantities.models.forecast_models import Forecast
 from app.BillOfQuantities.models.payment_certificate_models import PaymentCertificate
@@ -560,37 +561,60 @@ class Project(BaseModel):
         verbose_name_plural = "Projects"
         ordering = ["-name"]
 
-    def save(self, *args, **kwargs) -> None:
-        """Override save to manage PlannedValue instances when dates change and resize logo."""
-        # Import here to avoid circular import
-        from app.Project.models.planned_value_models import PlannedValue
+    # Fields whose database values ``save`` compares against
+    TRACKED_FIELDS = ("start_date", "end_date", "logo")
+
+    @classmethod
+    def from_db(cls, db, field_names, values, **kwargs):
+        instance = super().from_db(db, field_names, values, **kwargs)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def _snapshot_tracked_fields(self) -> None:
+        """Remember the loaded values of ``TRACKED_FIELDS`` (deferred ones are skipped)."""
+        deferred = self.get_deferred_fields()
+        self._db_values = {
+            name: self._meta.get_field(name).get_prep_value(getattr(self, name))
+            for name in self.TRACKED_FIELDS
+            if name not in deferred
+        }
 
-        # Check if this is an existing instance
-        dates_changed = False
-        old_start_date = None
-        old_end_date = None
+    def _stored_values(self) -> dict | None:
+        """Database values of ``TRACKED_FIELDS``, or None for an unsaved project.
 
-        if self.pk:
-            try:
-                old_instance = Project.objects.get(pk=self.pk)
-                old_start_date = old_instance.start_date
-                old_end_date = old_instance.end_date
-                dates_changed = (
-                    old_start_date != self.start_date or old_end_date != self.end_date
-                )
-            except Project.DoesNotExist:
-                pass
+        Uses the values captured when the instance was loaded, and only
+        queries when some of them were deferred or never loaded.
+        """
+        if self.pk is None:
+            return None
+        loaded = self.__dict__.get("_db_values", {})
+        if all(name in loaded for name in self.TRACKED_FIELDS):
+            return loaded
+        return (
+            Project.all_objects.filter(pk=self.pk).values(*self.TRACKED_FIELDS).first()
+        )
+
+    def save(self, *args, **kwargs) -> None:
+        """Override save to manage PlannedValue instances when dates change and resize logo."""
+        stored = self._stored_values()
+        dates_changed = stored is not None and (
+            stored["start_date"] != self.start_date
+            or stored["end_date"] != self.end_date
+        )
 
         if not self.logo:
             super().save(*args, **kwargs)
         else:
             # check if logo changed
-            if self.pk:
-                old_instance = Project.objects.get(pk=self.pk)
-                if old_instance.logo != self.logo:
+            if stored is not None:
+                if stored["logo"] != self.logo.name:
                     # Logo field has changed
                     self.logo = ImageResize().resize_image(self.logo)
-            elif self.logo:
+            elif self.pk is None:
                 # no pk and logo present
                 logo = ImageResize().resize_image(self.logo)
                 super().save(*args, **kwargs)  # set pk, save without logo
@@ -598,49 +622,53 @@ class Project(BaseModel):
 
             # Save the project with logo
             super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
 
         # Only manage PlannedValue instances if dates changed and we have valid dates
         if dates_changed and self.start_date and self.end_date:
-            self._sync_planned_values(PlannedValue)
+            self._sync_planned_values()
 
-    def _sync_planned_values(self, planned_value_model) -> None:
+    def _sync_planned_values(self) -> None:
         """Sync PlannedValue instances with the project's date range.
 
+        Set-based, so the cost does not grow with the project's length:
+
         - Soft delete instances outside the new date range
-        - Restore soft-deleted instances inside the range or create new ones
+        - Restore soft-deleted instances inside the range
+        - Create the months that don't exist yet
         """
-        # Get the valid months for the new date range
-        valid_months = set(get_months_between(self.start_date, self.end_date))
-
-        # Get all PlannedValue instances (including soft-deleted) for this project
-        all_planned_values = planned_value_model.all_objects.filter(project=self)
-
-        for pv in all_planned_values:
-            period_normalized = pv.period.replace(day=1)
-            if period_normalized in valid_months:
-                # Period is within range - restore if soft-deleted
-                if pv.is_deleted:
-                    pv.restore()
-            else:
-                # Period is outside range - soft delete if not already deleted
-                if not pv.is_deleted:
-                    pv.soft_delete()
-
-        # Create new PlannedValue instances for months that don't exist yet
-        existing_periods = {
-            pv.period.replace(day=1)
-            for pv in planned_value_model.all_objects.filter(project=self)
-        }
+        # Import here to avoid circular import
+        from app.Project.models.data_version_models import ProjectDataVersion
+        from app.Project.models.planned_value_models import PlannedValue
 
-        for month in valid_months:
-            if month not in existing_periods:
-                planned_value_model.objects.create(
-                    project=self,
-                    period=month,
-                    value=Decimal("0.00"),
-                    forecast_value=None,
-                    work_completed_percent=None,
-                )
+        valid_months = get_months_between(self.start_date, self.end_date)
+        planned_values = PlannedValue.all_objects.filter(project=self)
+        now = timezone.now()
+        if not valid_months:
+            # End before start: no month is in range
+            planned_values.filter(deleted=False).update(deleted=True, updated_at=now)
+            ProjectDataVersion.bump(self.pk)
+            return
+        range_end = valid_months[-1] + relativedelta(months=1)
+        in_range = models.Q(period__gte=valid_months[0], period__lt=range_end)
+
+        planned_values.filter(~in_range, deleted=False).update(
+            deleted=True, updated_at=now
+        )
+        planned_values.filter(in_range, deleted=True).update(
+            deleted=False, updated_at=now
+        )
+        # Months that already exist (deleted or not) conflict on
+        # (project, period) and are skipped
+        PlannedValue.objects.bulk_create(
+            [
+                PlannedValue(project=self, period=month, value=Decimal("0.00"))
+                for month in valid_months
+            ],
+            ignore_conflicts=True,
+        )
+        # Bulk writes skip PlannedValue signals; invalidate cached reports here
+        ProjectDataVersion.bump(self.pk)
 
     ##################
     # URLS
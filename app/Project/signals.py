@@ -0,0 +1,121 @@
+"""Project model signals.
+
+Bumps the per-project data version whenever a model that feeds the project
+reports changes, invalidating any cached report artifacts for that project,
+and refreshes the project health index when one of its registers changes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from app.BillOfQuantities.models import (
+    ActualTransaction,
+    ContractualCorrespondence,
+    ContractVariation,
+    Forecast,
+    ForecastTransaction,
+    LineItem,
+    PaymentCertificate,
+)
+from app.Project.models import (
+    Milestone,
+    PlannedValue,
+    Project,
+    ProjectDataVersion,
+    ProjectDocument,
+    ProjectHealthIndex,
+    ProjectReportSummary,
+    Risk,
+)
+from app.SiteManagement.models import (
+    BiWeeklyQualityReport,
+    BiWeeklySafetyReport,
+    EarlyWarning,
+    Incident,
+    LabourLog,
+    MaterialsLog,
+    NonConformance,
+    PlantEquipment,
+    ProductivityLog,
+    ProgressTracker,
+    QualityControl,
+)
+
+# Model -> attribute path resolving the owning project's id.
+REPORT_SOURCE_MODELS = {
+    Project: "pk",
+    Milestone: "project_id",
+    PlannedValue: "project_id",
+    ProjectDocument: "project_id",
+    ProjectReportSummary: "project_id",
+    Risk: "project_id",
+    ContractVariation: "project_id",
+    ContractualCorrespondence: "project_id",
+    Forecast: "project_id",
+    ForecastTransaction: "forecast.project_id",
+    LineItem: "project_id",
+    PaymentCertificate: "project_id",
+    ActualTransaction: "line_item.project_id",
+    BiWeeklyQualityReport: "project_id",
+    BiWeeklySafetyReport: "project_id",
+    EarlyWarning: "project_id",
+    Incident: "project_id",
+    LabourLog: "project_id",
+    MaterialsLog: "project_id",
+    NonConformance: "project_id",
+    PlantEquipment: "project_id",
+    ProductivityLog: "project_id",
+    ProgressTracker: "project_id",
+    QualityControl: "project_id",
+}
+
+
+def _resolve_project_id(instance) -> int | None:
+    value = instance
+    for attr in REPORT_SOURCE_MODELS[type(instance)].split("."):
+        value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def bump_project_data_version(sender, instance, **kwargs):
+    """Invalidate cached reports for the project that owns ``instance``."""
+    project_id = _resolve_project_id(instance)
+    if project_id:
+        ProjectDataVersion.bump(project_id)
+
+
+for _model in REPORT_SOURCE_MODELS:
+    post_save.connect(
+        bump_project_data_version,
+        sender=_model,
+        dispatch_uid=f"report_version_save_{_model._meta.label}",
+    )
+    post_delete.connect(
+        bump_project_data_version,
+        sender=_model,
+        dispatch_uid=f"report_version_delete_{_model._meta.label}",
+    )
+
+
+def refresh_project_health_index(sender, instance, **kwargs):
+    """Recount the changed register for the project that owns ``instance``."""
+    value = instance
+    for attr in ProjectHealthIndex.source_project_lookup(sender).split("__"):
+        value = getattr(value, attr, None)
+        if value is None:
+            return
+    ProjectHealthIndex.refresh([value], sources=[sender])
+
+
+for _model in ProjectHealthIndex.source_models():
+    post_save.connect(
+        refresh_project_health_index,
+        sender=_model,
+        dispatch_uid=f"health_index_save_{_model._meta.label}",
+    )
+    post_delete.connect(
+        refresh_project_health_index,
+        sender=_model,
+        dispatch_uid=f"health_index_delete_{_model._meta.label}",
+    )
@@ -2,12 +2,12 @@
 
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
 from app.Account.models import Account
+from app.core.Utilities.email_outbox import queue_email
 
 
 def send_project_user_welcome_email(
@@ -26,7 +26,7 @@ def send_project_user_welcome_email(
         request_protocol: Protocol from request ('http' or 'https')
 
     Returns:
-        bool: True if email was sent successfully, False otherwise
+        bool: True if email was queued for delivery, False otherwise
     """
     if not settings.USE_EMAIL:
         return False
@@ -52,13 +52,11 @@ def send_project_user_welcome_email(
             "portfolio/emails/project_user_welcome.html", context
         )
 
-        send_mail(
+        queue_email(
+            to=user.email,
             subject=subject,
-            message="",  # Plain text version (optional)
+            html_body=html_message,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
         )
 
         return True
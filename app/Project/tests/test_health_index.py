@@ -0,0 +1,68 @@
+"""Tests for the project health index."""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from app.Project.models import Project, ProjectHealthIndex
+from app.Project.tests.factories import ProjectFactory
+from app.SiteManagement.models import RFI, NonConformance, RFIStatus
+
+
+def _rfi(project, days_to_respond=7):
+    return RFI.objects.create(
+        project=project,
+        subject="Clarify rebar",
+        message="Which schedule applies?",
+        respond_by_date=timezone.localdate() + timedelta(days=days_to_respond),
+    )
+
+
+@pytest.mark.django_db
+class TestProjectHealthIndex:
+    def test_signals_keep_register_counts_current(self):
+        project = ProjectFactory()
+        (index,) = ProjectHealthIndex.for_projects(
+            Project.objects.filter(pk=project.pk)
+        )
+        assert index.open_rfis == 0
+
+        rfi = _rfi(project)
+        overdue = _rfi(project, days_to_respond=-1)
+        NonConformance.objects.create(
+            project=project, date=timezone.localdate(), description="Honeycombing"
+        )
+        index.refresh_from_db()
+        assert (index.open_rfis, index.overdue_rfis, index.open_ncrs) == (2, 1, 1)
+
+        rfi.status = RFIStatus.CLOSED
+        rfi.save()
+        index.refresh_from_db()
+        assert index.open_rfis == 1
+
+        overdue.soft_delete()
+        index.refresh_from_db()
+        assert (index.open_rfis, index.overdue_rfis) == (0, 0)
+
+    def test_rows_are_rebuilt_on_a_new_day(self):
+        project = ProjectFactory()
+        _rfi(project)
+        ProjectHealthIndex.objects.create(
+            project=project, computed_on=timezone.localdate() - timedelta(days=1)
+        )
+
+        (index,) = ProjectHealthIndex.for_projects(
+            Project.objects.filter(pk=project.pk)
+        )
+
+        assert index.open_rfis == 1
+        assert index.computed_on == timezone.localdate()
+
+    def test_current_rows_are_read_without_recounting(self, django_assert_num_queries):
+        projects = [ProjectFactory() for _ in range(3)]
+        queryset = Project.objects.filter(pk__in=[p.pk for p in projects])
+        ProjectHealthIndex.for_projects(queryset)
+
+        with django_assert_num_queries(3):
+            assert len(ProjectHealthIndex.for_projects(queryset)) == 3
@@ -1,12 +1,14 @@
 """Tests for Project models."""
 
 import time
+from datetime import date
 
 import pytest
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 
 from app.Account.tests.factories import AccountFactory
-from app.Project.models import Project
+from app.Project.models import PlannedValue, Project
 from app.Project.tests.factories import ProjectFactory
 
 
@@ -145,6 +147,80 @@ class TestProjectModel:
         assert isinstance(project.column_config, dict)
 
 
+class TestProjectPlannedValueSync:
+    """Planned values follow the project's date range."""
+
+    def _periods(self, project, deleted=False):
+        return list(
+            PlannedValue.all_objects.filter(project=project, deleted=deleted)
+            .order_by("period")
+            .values_list("period", flat=True)
+        )
+
+    def test_date_change_soft_deletes_restores_and_creates_months(self):
+        project = ProjectFactory.create(
+            start_date=date(2024, 1, 15), end_date=date(2024, 3, 10)
+        )
+        project.end_date = date(2024, 4, 30)
+        project.save()
+        assert self._periods(project) == [date(2024, m, 1) for m in (1, 2, 3, 4)]
+
+        project.start_date = date(2024, 3, 1)
+        project.save()
+        assert self._periods(project) == [date(2024, 3, 1), date(2024, 4, 1)]
+        assert self._periods(project, deleted=True) == [
+            date(2024, 1, 1),
+            date(2024, 2, 1),
+        ]
+
+        kept = PlannedValue.all_objects.get(project=project, period=date(2024, 1, 1))
+        project.start_date = date(2024, 1, 1)
+        project.save()
+        assert (
+            PlannedValue.objects.get(project=project, period=date(2024, 1, 1)) == kept
+        )
+        assert len(self._periods(project)) == 4
+
+    def test_end_before_start_soft_deletes_every_month(self):
+        project = ProjectFactory.create(
+            start_date=date(2024, 1, 1), end_date=date(2024, 1, 31)
+        )
+        project.end_date = date(2024, 2, 29)
+        project.save()
+
+        project.end_date = date(2023, 12, 1)
+        project.save()
+
+        assert self._periods(project) == []
+        assert len(self._periods(project, deleted=True)) == 2
+
+    def test_sync_query_count_is_independent_of_duration(self):
+        project = ProjectFactory.create(
+            start_date=date(2020, 1, 1), end_date=date(2020, 2, 1)
+        )
+
+        def extend_to(end_date):
+            project.end_date = end_date
+            with CaptureQueriesContext(connection) as queries:
+                project.save()
+            return len(queries.captured_queries)
+
+        assert extend_to(date(2020, 6, 1)) == extend_to(date(2029, 12, 1))
+        assert len(self._periods(project)) == 120
+
+    def test_unchanged_loaded_project_is_not_refetched(self):
+        project = Project.objects.get(pk=ProjectFactory.create().pk)
+        project.name = "Renamed"
+
+        with CaptureQueriesContext(connection) as queries:
+            project.save()
+
+        assert not any(
+            query["sql"].lstrip().upper().startswith("SELECT")
+            for query in queries.captured_queries
+        )
+
+
 class TestProjectDocumentModel:
     """Test cases for ProjectDocument model."""
 
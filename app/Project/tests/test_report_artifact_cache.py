@@ -0,0 +1,195 @@
+"""Tests for version-keyed caching of rendered report exports."""
+
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.BillOfQuantities.tests.factories import (
+    ForecastFactory,
+    ForecastTransactionFactory,
+    LineItemFactory,
+)
+from app.core.Utilities.artifact_cache import ArtifactCache
+from app.Project.models import (
+    ProjectDataVersion,
+    ProjectRole,
+    Risk,
+    RiskStatus,
+    Role,
+)
+from app.Project.tests.factories import ProjectFactory
+from app.Project.views.report_views import (
+    ContractorsReportView,
+    ContractualReportView,
+)
+
+
+class TestArtifactCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_get_or_build_only_builds_on_miss(self):
+        cache = ArtifactCache(self.directory, max_bytes=1024)
+        build = mock.Mock(return_value=b"artifact")
+        key = ArtifactCache.make_key("report", 1, ("2026-01-01", "2026-01-31"))
+
+        self.assertEqual(cache.get_or_build(key, build), b"artifact")
+        self.assertEqual(cache.get_or_build(key, build), b"artifact")
+        build.assert_called_once()
+
+    def test_none_is_not_cached(self):
+        cache = ArtifactCache(self.directory, max_bytes=1024)
+        build = mock.Mock(return_value=None)
+
+        self.assertIsNone(cache.get_or_build("missing", build))
+        self.assertIsNone(cache.get_or_build("missing", build))
+        self.assertEqual(build.call_count, 2)
+
+    def test_evicts_least_recently_used(self):
+        cache = ArtifactCache(self.directory, max_bytes=20)
+        cache.set("old", b"x" * 10)
+        cache.set("new", b"y" * 10)
+        # Age "new" so it becomes the least recently used entry.
+        os.utime(cache._path("new"), (0, 0))
+        cache.set("newest", b"z" * 10)
+
+        self.assertIsNone(cache.get("new"))
+        self.assertEqual(cache.get("old"), b"x" * 10)
+        self.assertEqual(cache.get("newest"), b"z" * 10)
+
+
+@override_settings(REPORT_CACHE_DIR=tempfile.mkdtemp())
+class TestReportExportCaching(TestCase):
+    def setUp(self):
+        self.user = AccountFactory.create()
+        self.project = ProjectFactory.create(users=[self.user])
+        ProjectRole.objects.get_or_create(
+            project=self.project, user=self.user, role=Role.ADMIN
+        )
+        self.client.force_login(self.user)
+        ArtifactCache().clear()
+
+    def _contractual_url(self):
+        return reverse(
+            "project:contractual-report",
+            kwargs={"project_pk": self.project.pk},
+        )
+
+    def _create_risk(self):
+        return Risk.objects.create(
+            project=self.project,
+            description="Cached risk",
+            raised_by=self.user,
+            time_impact_days=1,
+            cost_impact=100,
+            probability=10,
+            mitigation_action="Monitor",
+            status=RiskStatus.OPEN,
+            category=Risk.RiskCategory.OTHER,
+        )
+
+    def test_register_pdf_served_from_cache_until_data_changes(self):
+        params = {"export": "pdf", "register": "risk", "period": "1m"}
+        with mock.patch.object(
+            ContractualReportView,
+            "_render_register_pdf",
+            autospec=True,
+            return_value=b"%PDF-cached",
+        ) as render:
+            first = self.client.get(self._contractual_url(), params)
+            second = self.client.get(self._contractual_url(), params)
+            self.assertEqual(render.call_count, 1)
+
+            self._create_risk()
+            third = self.client.get(self._contractual_url(), params)
+            self.assertEqual(render.call_count, 2)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Content-Type"], "application/pdf")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(third.content, b"%PDF-cached")
+
+    def test_register_csv_keyed_by_period(self):
+        self._create_risk()
+        with mock.patch.object(
+            ContractualReportView,
+            "_render_register_csv",
+            autospec=True,
+            side_effect=ContractualReportView._render_register_csv,
+        ) as render:
+            csv_1m = self.client.get(
+                self._contractual_url(),
+                {"export": "csv", "register": "risk", "period": "1m"},
+            )
+            self.client.get(
+                self._contractual_url(),
+                {"export": "csv", "register": "risk", "period": "3m"},
+            )
+
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(csv_1m.status_code, 200)
+        self.assertEqual(csv_1m["Content-Type"], "text/csv")
+        self.assertIn(b"Cached risk", csv_1m.content)
+
+    def test_unknown_register_is_not_cached(self):
+        response = self.client.get(
+            self._contractual_url(), {"export": "pdf", "register": "unknown"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(ArtifactCache().directory.glob("*.bin")), [])
+
+    def test_contractors_report_pdf_cached(self):
+        url = reverse(
+            "project:contractors-report",
+            kwargs={"project_pk": self.project.pk},
+        )
+        with mock.patch.object(
+            ContractorsReportView,
+            "_render_pdf",
+            autospec=True,
+            return_value=b"%PDF-contractors",
+        ) as render:
+            self.client.get(url, {"export": "pdf"})
+            response = self.client.get(url, {"export": "pdf"})
+
+        render.assert_called_once()
+        self.assertEqual(response.content, b"%PDF-contractors")
+
+    def test_bump_increments_existing_counter_only(self):
+        ProjectDataVersion.bump(self.project.pk)
+        self.assertFalse(
+            ProjectDataVersion.objects.filter(project=self.project).exists()
+        )
+
+        version = ProjectDataVersion.current(self.project.pk).version
+        self.project.name = "Renamed"
+        self.project.save()
+
+        self.assertEqual(
+            ProjectDataVersion.current(self.project.pk).version, version + 1
+        )
+
+    def test_line_item_edits_bump_the_version(self):
+        line_item = LineItemFactory.create(project=self.project)
+        version = ProjectDataVersion.current(self.project.pk).version
+
+        line_item.total_price = line_item.total_price + 1
+        line_item.save()
+
+        self.assertEqual(
+            ProjectDataVersion.current(self.project.pk).version, version + 1
+        )
+
+    def test_forecast_rows_bump_the_version(self):
+        forecast = ForecastFactory.create(project=self.project)
+        version = ProjectDataVersion.current(self.project.pk).version
+
+        ForecastTransactionFactory.create(forecast=forecast)
+
+        self.assertEqual(
+            ProjectDataVersion.current(self.project.pk).version, version + 1
+        )
@@ -1,6 +1,7 @@
 """Views for Portfolio Reports."""
 
 import csv
+import io
 import json
 from datetime import date, datetime, timedelta
 from decimal import Decimal
@@ -24,6 +25,7 @@ from app.BillOfQuantities.models import (
     Forecast,
     PaymentCertificate,
 )
+from app.core.Utilities.artifact_cache import ArtifactCache
 from app.core.Utilities.dates import get_end_of_month
 from app.core.Utilities.mixins import (
     BreadcrumbItem,
@@ -43,6 +45,7 @@ from app.Project.models import (
     Portfolio,
     Project,
     ProjectCategory,
+    ProjectDataVersion,
     ProjectDocument,
     ProjectReportSummary,
     Risk,
@@ -229,9 +232,7 @@ class FinancialReportView(
             )
             forecast_total = Decimal("0.00")
             if latest_forecast:
-                forecast_total = latest_forecast.forecast_transactions.aggregate(
-                    total=Sum("total_price")
-                )["total"] or Decimal("0.00")
+                forecast_total = latest_forecast.total_forecast
 
             # Variance (Budget - Forecast: negative = over budget = bad)
             variance = budget - forecast_total
@@ -1063,7 +1064,36 @@ class ContractualReportMixin(SubscriptionAndRoleRequiredMixin, BreadcrumbMixin):
     required_tiers = [Subscription.FREE_TIER]
 
 
-class ContractualReportView(ContractualReportMixin, TemplateView):
+class ReportArtifactCacheMixin:
+    """Serve rendered report exports from the on-disk artifact cache.
+
+    Artifacts are keyed by report type, project, reporting window, request
+    filters and the project's data version, so any change to the source
+    models (see ``app.Project.signals``) produces a fresh render.
+    """
+
+    def get_cached_artifact(self, report_type: str, period: tuple, build):
+        project = self.get_project()  # type: ignore[attr-defined]
+        data_version = ProjectDataVersion.current(project.pk)
+        filters = sorted(
+            (key, values)
+            for key, values in self.request.GET.lists()  # type: ignore[attr-defined]
+            if key != "export"
+        )
+        key = ArtifactCache.make_key(
+            report_type,
+            project.pk,
+            period,
+            filters,
+            data_version.version,
+            data_version.updated_at,
+        )
+        return ArtifactCache().get_or_build(key, build)
+
+
+class ContractualReportView(
+    ReportArtifactCacheMixin, ContractualReportMixin, TemplateView
+):
     """Construction Contractual Report (per project, 1/3/6/12-month windows)."""
 
     template_name = "project/contractual_report.html"
@@ -1231,24 +1261,61 @@ class ContractualReportView(ContractualReportMixin, TemplateView):
 
         return headers, rows, filename
 
+    def _get_register_export_window(self) -> tuple[Any, Any]:
+        period_key = (self.request.GET.get("period") or "1m").lower()
+        period_start, period_end, _ = self._get_reporting_window(period_key)
+        return period_start, period_end
+
+    def _register_export_filename(self, register: str) -> str:
+        period_start, period_end = self._get_register_export_window()
+        return f"{register}_{self.get_project().pk}_{period_start}_{period_end}"
+
     def _export_register_csv(self, register: str) -> HttpResponse:
-        export_data = self._build_register_export_data(register)
-        if export_data is None:
+        data = self.get_cached_artifact(
+            f"contractual-register-csv:{register}",
+            self._get_register_export_window(),
+            lambda: self._render_register_csv(register),
+        )
+        if data is None:
             return HttpResponse(status=400)
-        headers, rows, filename = export_data
 
-        response = HttpResponse(content_type="text/csv")
+        filename = self._register_export_filename(register)
+        response = HttpResponse(data, content_type="text/csv")
         response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
-        writer = csv.writer(response)
+        return response
+
+    def _render_register_csv(self, register: str) -> bytes | None:
+        export_data = self._build_register_export_data(register)
+        if export_data is None:
+            return None
+        headers, rows, _ = export_data
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
         writer.writerow(headers)
         writer.writerows(rows)
-        return response
+        return buffer.getvalue().encode()
 
     def _export_register_pdf(self, register: str) -> HttpResponse:
+        data = self.get_cached_artifact(
+            f"contractual-register-pdf:{register}",
+            self._get_register_export_window(),
+            lambda: self._render_register_pdf(register),
+        )
+        if data is None:
+            return HttpResponse(status=400)
+
+        filename = self._register_export_filename(register)
+        response = HttpResponse(content_type="application/pdf")
+        response["Content-Disposition"] = f'attachment; filename="{filename}.pdf"'
+        response.write(data)
+        return response
+
+    def _render_register_pdf(self, register: str) -> bytes | None:
         export_data = self._build_register_export_data(register)
         if export_data is None:
-            return HttpResponse(status=400)
-        headers, rows, filename = export_data
+            return None
+        headers, rows, _ = export_data
 
         buffer = BytesIO()
         pdf = canvas.Canvas(buffer, pagesize=A4)
@@ -1278,11 +1345,7 @@ class ContractualReportView(ContractualReportMixin, TemplateView):
         pdf.save()
         data = buffer.getvalue()
         buffer.close()
-
-        response = HttpResponse(content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}.pdf"'
-        response.write(data)
-        return response
+        return data
 
     def get_breadcrumbs(self) -> list[BreadcrumbItem]:
         project = self.get_project()
@@ -1909,7 +1972,9 @@ class ContractualReportView(ContractualReportMixin, TemplateView):
         return context
 
 
-class ContractorsReportView(ContractualReportMixin, TemplateView):
+class ContractorsReportView(
+    ReportArtifactCacheMixin, ContractualReportMixin, TemplateView
+):
     """Contractor's report page (initial implementation)."""
 
     template_name = "project/contractors_report.html"
@@ -1921,6 +1986,21 @@ class ContractorsReportView(ContractualReportMixin, TemplateView):
         return super().get(request, *args, **kwargs)
 
     def _export_pdf(self) -> HttpResponse:
+        period_key = (self.request.GET.get("period") or "2w").lower()
+        period_start, period_end, _ = ContractualReportView._get_reporting_window(
+            period_key
+        )
+        data = self.get_cached_artifact(
+            "contractors-report-pdf", (period_start, period_end), self._render_pdf
+        )
+
+        filename = f"Contractors_Report_{self.get_project().pk}_{period_start}.pdf"
+        response = HttpResponse(content_type="application/pdf")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response.write(data)
+        return response
+
+    def _render_pdf(self) -> bytes:
         context = self.get_context_data()
         project = context["project"]
 
@@ -1970,12 +2050,7 @@ class ContractorsReportView(ContractualReportMixin, TemplateView):
         pdf.save()
         data = buffer.getvalue()
         buffer.close()
-
-        filename = f"Contractors_Report_{project.pk}_{context['period_start']}.pdf"
-        response = HttpResponse(content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        response.write(data)
-        return response
+        return data
 
     def get_breadcrumbs(self) -> list[BreadcrumbItem]:
         project = self.get_project()
@@ -2637,7 +2712,9 @@ class ContractorsReportView(ContractualReportMixin, TemplateView):
         return context
 
 
-class ConstructionProgressReportView(ContractualReportMixin, TemplateView):
+class ConstructionProgressReportView(
+    ReportArtifactCacheMixin, ContractualReportMixin, TemplateView
+):
     """Construction Progress Report - PM perspective for client communication."""
 
     template_name = "project/construction_progress_report.html"
@@ -2649,6 +2726,23 @@ class ConstructionProgressReportView(ContractualReportMixin, TemplateView):
         return super().get(request, *args, **kwargs)
 
     def _export_pdf(self) -> HttpResponse:
+        period_key = (self.request.GET.get("period") or "2w").lower()
+        period_start, period_end, _ = ContractualReportView._get_reporting_window(
+            period_key
+        )
+        data = self.get_cached_artifact(
+            "construction-progress-report-pdf",
+            (period_start, period_end),
+            self._render_pdf,
+        )
+
+        filename = f"Progress_Report_{self.get_project().pk}_{period_start}.pdf"
+        response = HttpResponse(content_type="application/pdf")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response.write(data)
+        return response
+
+    def _render_pdf(self) -> bytes:
         context = self.get_context_data()
         project = context["project"]
 
@@ -2695,12 +2789,7 @@ class ConstructionProgressReportView(ContractualReportMixin, TemplateView):
         pdf.save()
         data = buffer.getvalue()
         buffer.close()
-
-        filename = f"Progress_Report_{project.pk}_{context['period_start']}.pdf"
-        response = HttpResponse(content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        response.write(data)
-        return response
+        return data
 
     def get_breadcrumbs(self) -> list[BreadcrumbItem]:
         project = self.get_project()
@@ -0,0 +1,95 @@
+"""Tests for streaming CSV/XLSX exports of site registers."""
+
+import csv
+import io
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from app.core.Utilities.exports import ExportColumn, model_export_columns
+from app.Project.tests.factories import OverheadEntityFactory, ProjectFactory
+from app.SiteManagement.models import RFI, RFIStatus
+from app.SiteManagement.tests.factories import OverheadDailyLogFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestModelExportColumns:
+    def test_relations_export_label_and_choices_display(self):
+        columns = {column.lookup: column for column in model_export_columns(RFI)}
+
+        assert "project" not in columns and "id" not in columns
+        assert columns["status"].header == "Status"
+        assert columns["status"].formatter(RFIStatus.OPEN) == RFIStatus.OPEN.label
+
+    def test_exclude(self):
+        columns = model_export_columns(RFI, exclude=["status"])
+
+        assert "status" not in {column.lookup for column in columns}
+        assert all(isinstance(column, ExportColumn) for column in columns)
+
+
+class TestRegisterExportViews:
+    def setup_method(self):
+        self.project = ProjectFactory.create()
+        self.entity = OverheadEntityFactory.create(
+            project=self.project, name="Site Office", category="Facilities"
+        )
+        self.url = reverse(
+            "site_management:overhead-log-list",
+            kwargs={"project_pk": self.project.pk},
+        )
+
+    def _log(self, **kwargs):
+        return OverheadDailyLogFactory.create(
+            project=self.project,
+            overhead_entity=self.entity,
+            date="2024-03-01",
+            quantity=Decimal("2.50"),
+            **kwargs,
+        )
+
+    def test_csv_streams_every_project_row(self, client, superuser):
+        client.force_login(superuser)
+        self.project.users.add(superuser)
+        self._log(remarks="=HYPERLINK(1)")
+        self._log(remarks="Generator hire")
+        OverheadDailyLogFactory.create()
+
+        response = client.get(self.url, {"export": "csv"})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv"
+        assert "overhead-daily-logs_" in response["Content-Disposition"]
+        content = b"".join(response.streaming_content).decode()
+        header, *rows = list(csv.reader(io.StringIO(content)))
+        assert header[:3] == ["Overhead entity", "Date", "Category"]
+        assert len(rows) == 2
+        assert rows[0][0] == "Site Office"
+        assert {row[-1] for row in rows} == {"'=HYPERLINK(1)", "Generator hire"}
+
+    def test_xlsx_export(self, client, superuser):
+        client.force_login(superuser)
+        self.project.users.add(superuser)
+        self._log(remarks="Generator hire")
+
+        response = client.get(self.url, {"export": "xlsx"})
+
+        assert response.status_code == 200
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        header, row = workbook.active.iter_rows(values_only=True)
+        assert header[0] == "Overhead entity"
+        assert row[0] == "Site Office"
+        assert row[-1] == "Generator hire"
+
+    def test_list_page_links_exports(self, client, superuser):
+        client.force_login(superuser)
+        self.project.users.add(superuser)
+
+        response = client.get(self.url)
+
+        assert b"?export=csv" in response.content
+        assert b"?export=xlsx" in response.content
@@ -7,6 +7,7 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -59,7 +60,9 @@ class BiWeeklyQualityReportMixin(
         ]
 
 
-class BiWeeklyQualityReportListView(BiWeeklyQualityReportMixin, ListView):
+class BiWeeklyQualityReportListView(
+    BiWeeklyQualityReportMixin, StreamingExportMixin, ListView
+):
     template_name = "site_management/biweekly_quality/list.html"
     context_object_name = "reports"
     paginate_by = 20
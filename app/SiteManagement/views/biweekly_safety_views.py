@@ -6,6 +6,7 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -52,7 +53,9 @@ class BiWeeklySafetyReportMixin(
         ]
 
 
-class BiWeeklySafetyReportListView(BiWeeklySafetyReportMixin, ListView):
+class BiWeeklySafetyReportListView(
+    BiWeeklySafetyReportMixin, StreamingExportMixin, ListView
+):
     template_name = "site_management/biweekly_safety/list.html"
     context_object_name = "reports"
     paginate_by = 20
@@ -14,6 +14,7 @@ from django.views.generic import (
 
 from app.Account.models import Account
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -40,7 +41,7 @@ class EarlyWarningMixin(
         )
 
 
-class EarlyWarningListView(EarlyWarningMixin, ListView):
+class EarlyWarningListView(EarlyWarningMixin, StreamingExportMixin, ListView):
     """List all early warnings for a project."""
 
     template_name = "site_management/early_warning/list.html"
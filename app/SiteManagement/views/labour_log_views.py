@@ -17,6 +17,7 @@ else:
 
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -77,7 +78,7 @@ class LabourLogMixin(
         ]
 
 
-class LabourLogListView(LabourLogMixin, ListView):
+class LabourLogListView(LabourLogMixin, StreamingExportMixin, ListView):
     """List all labour logs."""
 
     template_name = "site_management/labour_log/list.html"
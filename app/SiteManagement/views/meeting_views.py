@@ -17,6 +17,7 @@ from django.views.generic import (
 )
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -46,7 +47,7 @@ class MeetingMixin(
         return Meeting.objects.filter(project=self.get_project())
 
 
-class MeetingListView(MeetingMixin, ListView):
+class MeetingListView(MeetingMixin, StreamingExportMixin, ListView):
     """List all meetings for a project."""
 
     template_name = "site_management/meeting/list.html"
@@ -5,6 +5,7 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -53,7 +54,7 @@ class NCRMixin(
         ]
 
 
-class NCRListView(NCRMixin, ListView):
+class NCRListView(NCRMixin, StreamingExportMixin, ListView):
     """List all NCRs."""
 
     template_name = "site_management/ncr/list.html"
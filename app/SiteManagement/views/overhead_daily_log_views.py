@@ -18,6 +18,7 @@ else:
 
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -77,7 +78,7 @@ class OverheadDailyLogMixin(
         ]
 
 
-class OverheadDailyLogListView(OverheadDailyLogMixin, ListView):
+class OverheadDailyLogListView(OverheadDailyLogMixin, StreamingExportMixin, ListView):
     """List all overhead daily logs."""
 
     template_name = "site_management/overhead_daily_log/list.html"
@@ -17,6 +17,7 @@ else:
 
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -76,7 +77,7 @@ class PlantEquipmentMixin(
         ]
 
 
-class PlantEquipmentListView(PlantEquipmentMixin, ListView):
+class PlantEquipmentListView(PlantEquipmentMixin, StreamingExportMixin, ListView):
     """List all plant equipment."""
 
     template_name = "site_management/plant_equipment/list.html"
@@ -6,6 +6,7 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -54,7 +55,7 @@ class QualityControlMixin(
         ]
 
 
-class QualityControlListView(QualityControlMixin, ListView):
+class QualityControlListView(QualityControlMixin, StreamingExportMixin, ListView):
     """List all quality control records."""
 
     template_name = "site_management/quality_control/list.html"
@@ -13,6 +13,7 @@ from django.views.generic import (
 
 from app.Account.models import Account
 from app.Account.subscription_config import Subscription
+from app.core.Utilities.exports import StreamingExportMixin
 from app.core.Utilities.mixins import BreadcrumbItem, BreadcrumbMixin
 from app.core.Utilities.permissions import UserHasProjectRoleGenericMixin
 from app.core.Utilities.subscriptions import SubscriptionRequiredMixin
@@ -39,7 +40,7 @@ class SiteInstructionMixin(
         ).select_related("issued_by", "to_user")
 
 
-class SiteInstructionListView(SiteInstructionMixin, ListView):
+class SiteInstructionListView(SiteInstructionMixin, StreamingExportMixin, ListView):
     """List all site instructions for a project."""
 
     template_name = "site_management/site_instruction/list.html"
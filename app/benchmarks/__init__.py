@@ -0,0 +1,11 @@
+"""
+Opt-in performance benchmarks over scaled synthetic projects.
+
+Benchmarks are marked ``benchmark`` and skipped unless requested:
+
+    pytest app/benchmarks --benchmark --benchmark-scale=medium \
+        --benchmark-json=bench.json
+
+Each benchmark records wall time and SQL query count; the JSON file can be
+diffed between commits to spot regressions.
+"""
@@ -0,0 +1,40 @@
+import pytest
+
+from app.Account.tests.factories import AccountFactory
+from app.benchmarks.data import SCALES, build_scaled_project
+from app.benchmarks.recorder import BenchmarkRecorder
+from app.Project.models import Project
+
+
+@pytest.fixture(scope="session")
+def benchmark_scale(request):
+    return SCALES[request.config.getoption("--benchmark-scale")]
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request, benchmark_scale):
+    recorder = BenchmarkRecorder(benchmark_scale)
+    yield recorder
+
+    if not recorder.results:
+        return
+    json_path = request.config.getoption("--benchmark-json")
+    if json_path:
+        recorder.write(json_path)
+    terminal = request.config.pluginmanager.get_plugin("terminalreporter")
+    if terminal:
+        terminal.write_line("")
+        terminal.write_line(recorder.summary())
+
+
+@pytest.fixture(scope="module")
+def scaled_project(django_db_setup, django_db_blocker, benchmark_scale):
+    """Build the synthetic project once per module and remove it afterwards."""
+    with django_db_blocker.unblock():
+        user = AccountFactory.create()
+        project = build_scaled_project(user, benchmark_scale)
+    yield project
+
+    with django_db_blocker.unblock():
+        Project.all_objects.filter(users=user).delete()
+        user.delete()
@@ -0,0 +1,206 @@
+"""Synthetic project generator for the benchmark suite."""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.BillOfQuantities.models import (
+    ActualTransaction,
+    AdvancePayment,
+    Bill,
+    Escalation,
+    LineItem,
+    MaterialsOnSite,
+    Package,
+    PaymentCertificate,
+    Retention,
+    Structure,
+)
+from app.Project.models import (
+    DailyActivityEntry,
+    ProductionPlan,
+    Project,
+    ProjectRole,
+    Role,
+)
+from app.Project.tests.factories import ProjectFactory
+
+
+@dataclass(frozen=True)
+class BenchmarkScale:
+    """Row counts for one synthetic project."""
+
+    name: str
+    line_items: int
+    certificates: int
+    claims_per_certificate: int
+    daily_entries: int
+    ledger_rows: int
+    extra_projects: int = 2
+    structures: int = 4
+    bills_per_structure: int = 5
+    production_plans: int = 20
+
+
+SCALES = {
+    "small": BenchmarkScale("small", 200, 3, 100, 200, 40),
+    "medium": BenchmarkScale("medium", 2_000, 12, 800, 2_000, 400),
+    "large": BenchmarkScale("large", 10_000, 40, 4_000, 10_000, 2_000),
+}
+
+LEDGER_MODELS = (AdvancePayment, Retention, MaterialsOnSite, Escalation)
+BATCH_SIZE = 1000
+
+
+def build_scaled_project(user, scale: BenchmarkScale, seed: int = 1) -> Project:
+    """Create a project owned by ``user`` populated to ``scale``.
+
+    Rows are bulk inserted, so model ``save()`` hooks and signals are
+    bypassed for everything except projects and certificates.
+    """
+    rng = random.Random(seed)
+    project = ProjectFactory.create(
+        users=[user],
+        name=f"Benchmark {scale.name}",
+        start_date=date.today() - timedelta(days=365),
+    )
+    for _ in range(scale.extra_projects):
+        ProjectFactory.create(users=[user])
+    ProjectRole.objects.get_or_create(project=project, user=user, role=Role.ADMIN)
+
+    line_items = _build_line_items(project, scale, rng)
+    certificates = _build_certificates(project, scale)
+    _build_actual_transactions(certificates, line_items, scale, user, rng)
+    _build_ledger_rows(project, certificates, scale, rng)
+    _build_daily_entries(project, scale, rng)
+    return project
+
+
+def _build_line_items(project, scale, rng) -> list[LineItem]:
+    packages = []
+    for s in range(scale.structures):
+        structure = Structure.objects.create(project=project, name=f"Structure {s}")
+        for b in range(scale.bills_per_structure):
+            bill = Bill.objects.create(structure=structure, name=f"Bill {s}.{b}")
+            packages.append(
+                (structure, bill, Package.objects.create(bill=bill, name="Package"))
+            )
+
+    items = []
+    for row in range(scale.line_items):
+        structure, bill, package = packages[row % len(packages)]
+        quantity = Decimal(rng.randint(1, 500))
+        unit_price = Decimal(rng.randint(10, 5_000))
+        items.append(
+            LineItem(
+                project=project,
+                structure=structure,
+                bill=bill,
+                package=package,
+                row_index=row,
+                item_number=f"{row + 1}",
+                payment_reference=f"PR-{row + 1:05d}",
+                description=f"Benchmark work item {row + 1}",
+                is_work=True,
+                unit_measurement="m2",
+                unit_price=unit_price,
+                budgeted_quantity=quantity,
+                total_price=unit_price * quantity,
+            )
+        )
+    LineItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+    return list(LineItem.objects.filter(project=project).order_by("row_index"))
+
+
+def _build_certificates(project, scale) -> list[PaymentCertificate]:
+    certificates = []
+    for number in range(1, scale.certificates + 1):
+        is_last = number == scale.certificates
+        certificates.append(
+            PaymentCertificate.objects.create(
+                project=project,
+                certificate_number=number,
+                status=(
+                    PaymentCertificate.Status.DRAFT
+                    if is_last
+                    else PaymentCertificate.Status.APPROVED
+                ),
+            )
+        )
+    return certificates
+
+
+def _build_actual_transactions(certificates, line_items, scale, user, rng) -> None:
+    claims = min(scale.claims_per_certificate, len(line_items))
+    transactions = []
+    for certificate in certificates:
+        for line_item in rng.sample(line_items, claims):
+            quantity = (line_item.budgeted_quantity / scale.certificates).quantize(
+                Decimal("0.01")
+            )
+            transactions.append(
+                ActualTransaction(
+                    payment_certificate=certificate,
+                    line_item=line_item,
+                    captured_by=user,
+                    quantity=quantity,
+                    unit_price=line_item.unit_price,
+                    total_price=quantity * line_item.unit_price,
+                    approved=certificate.status == PaymentCertificate.Status.APPROVED,
+                    claimed=True,
+                )
+            )
+    ActualTransaction.objects.bulk_create(transactions, batch_size=BATCH_SIZE)
+
+
+def _build_ledger_rows(project, certificates, scale, rng) -> None:
+    for index, model in enumerate(LEDGER_MODELS):
+        rows = []
+        for row in range(index, scale.ledger_rows, len(LEDGER_MODELS)):
+            certificate = certificates[row % len(certificates)]
+            kwargs = {}
+            if model is MaterialsOnSite:
+                kwargs["material_description"] = f"Material {row}"
+            rows.append(
+                model(
+                    project=project,
+                    payment_certificate=certificate,
+                    transaction_type=rng.choice(
+                        [
+                            model.TransactionType.DEBIT,
+                            model.TransactionType.CREDIT,
+                        ]
+                    ),
+                    amount=Decimal(rng.randint(100, 100_000)),
+                    description=f"{model.__name__} {row}",
+                    date=date.today(),
+                    **kwargs,
+                )
+            )
+        model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def _build_daily_entries(project, scale, rng) -> None:
+    plans = [
+        ProductionPlan.objects.create(
+            project=project,
+            activity=f"Activity {n}",
+            start_date=project.start_date,
+            finish_date=project.start_date + timedelta(days=300),
+            quantity=Decimal(10_000),
+            unit="m3",
+        )
+        for n in range(scale.production_plans)
+    ]
+    entries = [
+        DailyActivityEntry(
+            project=project,
+            production_plan=plans[n % len(plans)],
+            date=project.start_date + timedelta(days=n % 300),
+            quantity=Decimal(rng.randint(1, 100)),
+            hours_on_activity=Decimal(8),
+        )
+        for n in range(scale.daily_entries)
+    ]
+    DailyActivityEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
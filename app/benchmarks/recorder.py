@@ -0,0 +1,69 @@
+"""Timing and query-count recorder for the benchmark suite."""
+
+import json
+import platform
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class BenchmarkRecorder:
+    """Collect one result per measured block and dump them as JSON."""
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.results: list[dict] = []
+
+    @contextmanager
+    def measure(self, name: str):
+        """Time the block and count the SQL it runs."""
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+        self.results.append(
+            {
+                "name": name,
+                "seconds": round(elapsed, 4),
+                "queries": len(queries.captured_queries),
+            }
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "scale": self.scale.name,
+            "commit": _current_commit(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "results": self.results,
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def summary(self) -> str:
+        lines = [f"Benchmarks ({self.scale.name} scale):"]
+        for result in self.results:
+            lines.append(
+                f"  {result['name']:<40} {result['seconds']:>9.4f}s "
+                f"{result['queries']:>7} queries"
+            )
+        return "\n".join(lines)
+
+
+def _current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
@@ -0,0 +1,97 @@
+"""Benchmarks for the heavy certificate, report and import paths."""
+
+from decimal import Decimal
+
+import openpyxl
+import pytest
+from django.urls import reverse
+
+from app.BillOfQuantities.exporters.unified_xlsx_exporter import export_unified_xlsx
+from app.BillOfQuantities.models import LineItem, PaymentCertificate
+from app.BillOfQuantities.tasks import generate_full_payment_certificate_pdf
+from app.Estimator.importers import MaterialCostImporter
+from app.Estimator.models import sync_boq_from_lineitems
+from app.Project.production_progress.utils.production_utils import (
+    get_dashboard_data,
+)
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture
+def latest_certificate(scaled_project):
+    return PaymentCertificate.objects.filter(project=scaled_project).latest(
+        "certificate_number"
+    )
+
+
+@pytest.fixture
+def project_client(client, scaled_project):
+    client.force_login(scaled_project.users.first())
+    return client
+
+
+def test_construct_payment_certificate(benchmark_recorder, latest_certificate):
+    with benchmark_recorder.measure("construct_payment_certificate"):
+        rows = list(LineItem.construct_payment_certificate(latest_certificate))
+    assert rows
+
+
+def test_certificate_pdf_export(benchmark_recorder, latest_certificate):
+    with benchmark_recorder.measure("certificate_pdf_export"):
+        pdf = generate_full_payment_certificate_pdf(latest_certificate)
+    assert pdf.size > 0
+
+
+def test_certificate_xlsx_export(benchmark_recorder, latest_certificate):
+    sections = {"front": True, "summary": True, "detailed": True}
+    with benchmark_recorder.measure("certificate_xlsx_export"):
+        workbook = export_unified_xlsx(latest_certificate, sections)
+    assert workbook.sheetnames
+
+
+def test_sync_boq_and_priced_boq_report(
+    benchmark_recorder, scaled_project, project_client
+):
+    with benchmark_recorder.measure("sync_boq_from_lineitems"):
+        sync_boq_from_lineitems(scaled_project)
+
+    url = reverse(
+        "estimator:report_baseline_assessment",
+        kwargs={"project_pk": scaled_project.pk},
+    )
+    with benchmark_recorder.measure("priced_boq_report_view"):
+        response = project_client.get(url)
+    assert response.status_code == 200
+
+
+def test_portfolio_dashboard(benchmark_recorder, project_client):
+    with benchmark_recorder.measure("portfolio_dashboard_view"):
+        response = project_client.get(reverse("project:portfolio-dashboard"))
+    assert response.status_code == 200
+
+
+def test_production_dashboard_data(benchmark_recorder, scaled_project):
+    with benchmark_recorder.measure("get_dashboard_data"):
+        data = get_dashboard_data(scaled_project.pk)
+    assert data
+
+
+def test_material_cost_import(
+    benchmark_recorder, benchmark_scale, scaled_project, tmp_path
+):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Material Costs"
+    sheet.append(["Trade Name", "Material Code", "Unit", "Pack Qty", "Pack Cost"])
+    for row in range(benchmark_scale.line_items):
+        sheet.append(
+            ["Concrete", f"MAT-{row:05d}", "m3", 1, float(Decimal("100") + row)]
+        )
+    path = tmp_path / "materials.xlsx"
+    workbook.save(path)
+
+    importer = MaterialCostImporter(path, project=scaled_project)
+    with benchmark_recorder.measure("material_cost_import"):
+        result = importer.run()
+    assert result["created"] == benchmark_scale.line_items
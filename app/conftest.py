@@ -17,6 +17,38 @@ from app.Project.tests.factories import ProjectFactory
 User = get_user_model()
 
 
+def pytest_addoption(parser):
+    """Options for the opt-in benchmark suite in app/benchmarks."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run tests marked 'benchmark' (skipped by default).",
+    )
+    group.addoption(
+        "--benchmark-scale",
+        default="small",
+        choices=["small", "medium", "large"],
+        help="Size of the synthetic benchmark project.",
+    )
+    group.addoption(
+        "--benchmark-json",
+        default=None,
+        help="Write benchmark timings and query counts to this JSON file.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark tests unless --benchmark is passed."""
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="needs --benchmark option to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     """Enable database access for all tests."""
@@ -0,0 +1,109 @@
+"""Disk-backed LRU cache for rendered report artifacts (PDF, CSV, XLSX)."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+
+class ArtifactCache:
+    """Store rendered artifacts on disk, evicting least recently used files.
+
+    Keys are built from arbitrary JSON-serialisable parts (report type,
+    project, period, filters, data version) and hashed to a file name. Reads
+    touch the file's mtime so eviction removes the least recently used
+    artifacts first once the directory grows past ``max_bytes``.
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, directory=None, max_bytes: int | None = None):
+        self.directory = Path(directory or settings.REPORT_CACHE_DIR)
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else settings.REPORT_CACHE_MAX_BYTES
+        )
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Hash the key parts into a stable file-safe key."""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached bytes for ``key`` or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        """Atomically write ``data`` for ``key`` and enforce the size limit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def get_or_build(self, key: str, build) -> bytes | None:
+        """Return cached bytes for ``key``, calling ``build()`` on a miss.
+
+        ``build`` may return None (e.g. an unknown register), which is passed
+        through without being cached.
+        """
+        data = self.get(key)
+        if data is None:
+            data = build()
+            if data is not None:
+                self.set(key, data)
+        return data
+
+    def evict(self) -> None:
+        """Remove least recently used artifacts until under ``max_bytes``."""
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached artifact."""
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                path.unlink()
+            except OSError:
+                continue
@@ -0,0 +1,113 @@
+"""
+Database connection management for request and background threads.
+
+Django keeps one connection per thread. Request threads reuse theirs for
+``CONN_MAX_AGE`` seconds, checking it before reuse when
+``CONN_HEALTH_CHECKS`` is on. Work that outlives a request (certificate
+PDF and XLSX generation, image renditions, email outbox flushes) runs on a
+fixed pool of ``BACKGROUND_WORKERS`` threads rather than a new thread per
+job::
+
+    run_in_background(generate_and_save_pdf, payment_certificate_id, "full")
+
+Each job is bracketed the way Django brackets a request: expired or broken
+connections are closed before and after it, and a healthy one is kept for
+the thread's next job. A process therefore holds at most one connection
+per request thread plus one per pool worker, instead of one per job.
+
+``pool_stats`` reports the pool's load and the connections this process
+has opened and holds open, for the health endpoint.
+"""
+
+import logging
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_jobs = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+_connections_opened = 0
+# Connection wrappers (one per thread and alias) that have connected
+_wrappers: weakref.WeakSet = weakref.WeakSet()
+
+
+def run_in_background(fn, *args, **kwargs) -> Future | None:
+    """Run ``fn(*args, **kwargs)`` on the background worker pool.
+
+    With ``BACKGROUND_TASKS_ASYNC`` off it runs inline instead and None is
+    returned.
+    """
+    if not settings.BACKGROUND_TASKS_ASYNC:
+        fn(*args, **kwargs)
+        return None
+
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix="background",
+            )
+        _jobs["queued"] += 1
+        return _executor.submit(_run_job, fn, args, kwargs)
+
+
+def _run_job(fn, args, kwargs) -> None:
+    with _lock:
+        _jobs["queued"] -= 1
+        _jobs["running"] += 1
+    outcome = "completed"
+    close_old_connections()
+    try:
+        fn(*args, **kwargs)
+    except Exception:
+        outcome = "failed"
+        logger.exception("Background job %s failed", getattr(fn, "__name__", fn))
+    finally:
+        close_old_connections()
+        with _lock:
+            _jobs["running"] -= 1
+            _jobs[outcome] += 1
+
+
+def _track_connection(sender, connection, **kwargs) -> None:
+    global _connections_opened
+    with _lock:
+        _connections_opened += 1
+        _wrappers.add(connection)
+
+
+def connect_pool_signals() -> None:
+    """Count connections as they open; call once from ``AppConfig.ready``."""
+    connection_created.connect(
+        _track_connection, dispatch_uid="db_pool_track_connection"
+    )
+
+
+def pool_stats() -> dict:
+    """Worker pool load and database connection counts for this process."""
+    default = connections.settings["default"]
+    with _lock:
+        open_connections = sum(
+            1 for wrapper in list(_wrappers) if wrapper.connection is not None
+        )
+        return {
+            "workers": {
+                "size": settings.BACKGROUND_WORKERS,
+                "started": _executor is not None,
+                **_jobs,
+            },
+            "connections": {
+                "open": open_connections,
+                "opened": _connections_opened,
+                "max_age": default.get("CONN_MAX_AGE", 0),
+                "health_checks": default.get("CONN_HEALTH_CHECKS", False),
+            },
+        }
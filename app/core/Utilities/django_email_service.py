@@ -174,6 +174,56 @@ def _send_email_internal(
         raise Exception(f"Failed to send email: {str(e)}") from e
 
 
+def build_email_message(
+    to: str | list[str],
+    subject: str,
+    plain_body: str = "",
+    html_body: str = "",
+    attachments: list[tuple[str | None, bytes]] | None = None,
+    from_email: str | None = None,
+    cc: str | list[str] | None = None,
+    bcc: str | list[str] | None = None,
+    connection: EmailBackend | None = None,
+) -> EmailMultiAlternatives:
+    """Build a multipart message with a plain text fallback for ``html_body``.
+
+    Args:
+        attachments: ``(filename, content)`` pairs; the MIME type is guessed
+            from the filename.
+    """
+    email = EmailMultiAlternatives(
+        to=convert_email_to_list(to),
+        cc=convert_email_to_list(cc or []),
+        bcc=convert_email_to_list(bcc or []),
+        subject=subject,
+        from_email=from_email or settings.EMAIL_HOST_USER,
+        connection=connection,
+    )
+
+    for filename, content in attachments or []:
+        # Guess MIME type from file extension
+        if filename is not None:
+            mime_type, _ = mimetypes.guess_type(filename)
+        else:
+            mime_type = None
+        if mime_type is None:
+            # Fallback to generic binary if can't determine type
+            mime_type = "application/octet-stream"
+
+        email.attach(filename, content, mime_type)
+
+    # Set plain text version as the default body
+    email.body = plain_body or html_body.replace("<br>", "\n").replace(
+        "</p>", "\n\n"
+    ).replace("<[^>]*>", "")
+
+    # Add HTML version as an alternative
+    if html_body:
+        email.attach_alternative(html_body, "text/html")
+
+    return email
+
+
 def django_email_service(
     to: str | list[str],
     subject: str,
@@ -226,37 +276,18 @@ def django_email_service(
         # Get connection from the connection pool
         connection = _connection_manager.get_connection()
 
-        # Prepare the email
-        email = EmailMultiAlternatives(
-            to=convert_email_to_list(to),
-            cc=convert_email_to_list(cc),
-            bcc=convert_email_to_list(bcc),
+        email = build_email_message(
+            to=to,
             subject=subject,
-            from_email=from_email or settings.EMAIL_HOST_USER,
+            plain_body=plain_body,
+            html_body=html_body,
+            attachments=[(file.name, file.read()) for file in attachments],
+            from_email=from_email,
+            cc=cc,
+            bcc=bcc,
             connection=connection,
         )
 
-        for file in attachments:
-            # Guess MIME type from file extension
-            if file.name is not None:
-                mime_type, _ = mimetypes.guess_type(file.name)
-            else:
-                mime_type = None
-            if mime_type is None:
-                # Fallback to generic binary if can't determine type
-                mime_type = "application/octet-stream"
-
-            email.attach(file.name, file.read(), mime_type)
-
-        # Set plain text version as the default body
-        email.body = plain_body or html_body.replace("<br>", "\n").replace(
-            "</p>", "\n\n"
-        ).replace("<[^>]*>", "")
-
-        # Add HTML version as an alternative
-        if html_body:
-            email.attach_alternative(html_body, "text/html")
-
         # Send email with retries
         @with_retries(max_retries=max_retries, initial_delay=initial_delay)
         def send_with_retries():
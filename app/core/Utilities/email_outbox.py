@@ -0,0 +1,276 @@
+"""Persisted outbound email queue drained in the background.
+
+``queue_email`` stores a rendered message and returns immediately. Once the
+surrounding transaction commits, a flush on the background worker pool
+sends due messages in batches, one SMTP session per batch on a connection
+of its own. Failed messages are retried with exponential backoff until
+``EMAIL_OUTBOX_MAX_ATTEMPTS`` is reached. ``manage.py send_queued_emails``
+drains the outbox from cron for anything a restarted process left behind.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import Min, Q
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from app.core.models import OutboundEmail
+from app.core.Utilities.db_pool import run_in_background
+from app.core.Utilities.django_email_service import (
+    build_email_message,
+    convert_email_to_list,
+)
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_DIR = "email_outbox"
+
+_worker_lock = threading.Lock()
+_flush_scheduled = False
+_flush_again = False
+_retry_timer: threading.Timer | None = None
+
+
+def queue_email(
+    to: str | list[str],
+    subject: str,
+    plain_body: str = "",
+    html_body: str = "",
+    attachments: list | None = None,
+    from_email: str | None = None,
+    cc: str | list[str] | None = None,
+    bcc: str | list[str] | None = None,
+) -> OutboundEmail | None:
+    """Store an email in the outbox and deliver it after the transaction commits.
+
+    Takes the same arguments as ``django_email_service``. Attachments that
+    are already in storage (model ``FieldFile``s) are referenced by name;
+    in-memory files are saved under ``email_outbox/`` first. Empty file
+    fields are skipped.
+
+    Returns:
+        OutboundEmail | None: The queued message, or None if email is disabled
+    """
+    if not settings.USE_EMAIL:
+        return None
+
+    message = OutboundEmail.objects.create(
+        to=convert_email_to_list(to),
+        cc=convert_email_to_list(cc or []),
+        bcc=convert_email_to_list(bcc or []),
+        from_email=from_email or "",
+        subject=subject,
+        plain_body=plain_body,
+        html_body=html_body,
+        attachments=[_store_attachment(file) for file in attachments or [] if file],
+    )
+    transaction.on_commit(start_outbox_worker)
+    return message
+
+
+def _store_attachment(file) -> str:
+    if isinstance(file, FieldFile):
+        return file.name
+    filename = os.path.basename(file.name or "attachment")
+    return default_storage.save(f"{ATTACHMENT_DIR}/{uuid.uuid4().hex}/{filename}", file)
+
+
+def start_outbox_worker() -> None:
+    """Flush the outbox on the background worker pool.
+
+    A flush already queued or running drains once more instead of a second
+    one starting. With ``EMAIL_OUTBOX_ASYNC`` off the outbox is drained
+    inline instead.
+    """
+    global _flush_scheduled, _flush_again
+
+    if not settings.EMAIL_OUTBOX_ASYNC:
+        drain_outbox()
+        return
+
+    with _worker_lock:
+        if _flush_scheduled:
+            _flush_again = True
+            return
+        _flush_scheduled = True
+    run_in_background(_flush)
+
+
+def _flush() -> None:
+    """Drain until nothing new is queued, then wake up for pending retries."""
+    global _flush_scheduled, _flush_again
+
+    while True:
+        with _worker_lock:
+            _flush_again = False
+        try:
+            drain_outbox()
+            delay = _seconds_until_next_attempt()
+        except Exception:
+            logger.exception("Email outbox flush failed")
+            delay = None
+        with _worker_lock:
+            if _flush_again:
+                continue
+            _flush_scheduled = False
+            if delay is not None:
+                _schedule_retry(delay)
+            return
+
+
+def _schedule_retry(delay: float) -> None:
+    """Start another flush once ``delay`` seconds have passed.
+
+    The timer only waits; the flush itself runs on the worker pool.
+    """
+    global _retry_timer
+
+    if _retry_timer is not None:
+        _retry_timer.cancel()
+    _retry_timer = threading.Timer(delay, start_outbox_worker)
+    _retry_timer.daemon = True
+    _retry_timer.start()
+
+
+def _seconds_until_next_attempt() -> float | None:
+    next_attempt_at = OutboundEmail.objects.filter(
+        status=OutboundEmail.Status.PENDING
+    ).aggregate(next_attempt_at=Min("next_attempt_at"))["next_attempt_at"]
+    if next_attempt_at is None:
+        return None
+    return max(0.0, (next_attempt_at - timezone.now()).total_seconds())
+
+
+def drain_outbox(batch_size: int | None = None) -> dict[str, int]:
+    """Send every message that is due, one batch per SMTP session.
+
+    Returns:
+        dict[str, int]: Number of messages sent, rescheduled and failed
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    totals = {"sent": 0, "retrying": 0, "failed": 0}
+    while batch := _claim_batch(batch_size):
+        _send_batch(batch, totals)
+    return totals
+
+
+def _claim_batch(batch_size: int) -> list[OutboundEmail]:
+    """Mark up to ``batch_size`` due messages as SENDING and return them.
+
+    Messages stuck in SENDING longer than ``EMAIL_OUTBOX_CLAIM_TIMEOUT``
+    (e.g. the process died mid-batch) are claimed again.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+    due = Q(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboundEmail.Status.SENDING, updated_at__lt=stale
+    )
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[m.pk for m in batch]).update(
+            status=OutboundEmail.Status.SENDING, updated_at=now
+        )
+    return batch
+
+
+def _send_batch(batch: list[OutboundEmail], totals: dict[str, int]) -> None:
+    # A backend of its own: the shared EmailConnectionManager connection is
+    # also used by request threads, and a backend is not thread-safe
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for message in batch:
+            totals[_record_failure(message, e)] += 1
+        return
+
+    try:
+        for index, message in enumerate(batch):
+            try:
+                email = build_email_message(
+                    to=message.to,
+                    cc=message.cc,
+                    bcc=message.bcc,
+                    subject=message.subject,
+                    plain_body=message.plain_body,
+                    html_body=message.html_body,
+                    attachments=_load_attachments(message.attachments),
+                    from_email=message.from_email or None,
+                    connection=connection,
+                )
+                email.send(fail_silently=False)
+            except Exception as e:
+                logger.warning("Failed to send outbound email %s: %s", message.pk, e)
+                totals[_record_failure(message, e)] += 1
+                # Start a fresh session; the failed one may be unusable
+                connection.close()
+                connection = get_connection()
+                try:
+                    connection.open()
+                except Exception as reconnect_error:
+                    for remaining in batch[index + 1 :]:
+                        totals[_record_failure(remaining, reconnect_error)] += 1
+                    return
+            else:
+                _record_success(message)
+                totals["sent"] += 1
+    finally:
+        connection.close()
+
+
+def _load_attachments(names: list[str]) -> list[tuple[str, bytes]]:
+    attachments = []
+    for name in names:
+        with default_storage.open(name, "rb") as file:
+            attachments.append((os.path.basename(name), file.read()))
+    return attachments
+
+
+def _record_success(message: OutboundEmail) -> None:
+    message.status = OutboundEmail.Status.SENT
+    message.attempts += 1
+    message.sent_at = timezone.now()
+    message.last_error = ""
+    message.save(
+        update_fields=["status", "attempts", "sent_at", "last_error", "updated_at"]
+    )
+    for name in message.attachments:
+        if name.startswith(f"{ATTACHMENT_DIR}/"):
+            default_storage.delete(name)
+
+
+def _record_failure(message: OutboundEmail, error: Exception) -> str:
+    """Reschedule ``message`` with exponential backoff, or fail it for good."""
+    message.attempts += 1
+    message.last_error = str(error)
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboundEmail.Status.FAILED
+        outcome = "failed"
+    else:
+        message.status = OutboundEmail.Status.PENDING
+        message.next_attempt_at = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (message.attempts - 1)
+        )
+        outcome = "retrying"
+    message.save(
+        update_fields=[
+            "status",
+            "attempts",
+            "last_error",
+            "next_attempt_at",
+            "updated_at",
+        ]
+    )
+    return outcome
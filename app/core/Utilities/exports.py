@@ -0,0 +1,225 @@
+"""Streaming CSV and XLSX exports of list view querysets.
+
+Rows are read with a ``values_list`` projection and ``iterator()``, so an
+export holds at most one chunk of rows in memory. CSV responses stream each
+row as it is read; XLSX is written by openpyxl's write-only workbook to a
+temporary file that is then streamed back.
+"""
+
+import csv
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db.models import Model, QuerySet
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import capfirst, slugify
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("csv", "xlsx")
+
+# Bookkeeping fields left out of generated column lists
+_DEFAULT_EXCLUDE = {"id", "deleted", "project", "created_at", "updated_at"}
+# Fields tried, in order, to describe a related object in an export
+_RELATED_LABEL_FIELDS = ("name", "title", "person_name", "reference_number")
+# Leading characters that make spreadsheet applications evaluate a cell
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# Values openpyxl writes natively (datetime is a date subclass)
+_XLSX_NATIVE_TYPES = (int, float, Decimal, date, time, timedelta)
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """One export column: a ``values_list`` lookup, its header and formatter."""
+
+    lookup: str
+    header: str
+    formatter: Callable | None = None
+
+
+def model_export_columns(model: type[Model], exclude=()) -> list[ExportColumn]:
+    """Columns for every concrete field of ``model``.
+
+    Relations export a label field of the related model (``name``,
+    ``title``, ...) when it has one, choice fields export their display
+    value, and bookkeeping fields are skipped.
+    """
+    excluded = _DEFAULT_EXCLUDE | set(exclude)
+    columns = []
+    for field in model._meta.concrete_fields:
+        if field.name in excluded:
+            continue
+        lookup = field.name
+        if field.is_relation:
+            related_fields = {f.name for f in field.related_model._meta.concrete_fields}
+            label = next(
+                (name for name in _RELATED_LABEL_FIELDS if name in related_fields),
+                None,
+            )
+            lookup = f"{field.name}__{label}" if label else field.attname
+        columns.append(
+            ExportColumn(
+                lookup=lookup,
+                header=capfirst(str(field.verbose_name)),
+                formatter=_choice_formatter(field.flatchoices)
+                if field.choices
+                else None,
+            )
+        )
+    return columns
+
+
+def _choice_formatter(choices) -> Callable:
+    labels = {value: str(label) for value, label in choices}
+    return lambda value: labels.get(value, value)
+
+
+def iter_export_rows(
+    queryset: QuerySet,
+    columns: list[ExportColumn],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[list]:
+    """Yield one formatted row per record, reading ``chunk_size`` rows at a time."""
+    rows = queryset.values_list(*(column.lookup for column in columns))
+    for values in rows.iterator(chunk_size=chunk_size):
+        yield [
+            column.formatter(value) if column.formatter and value is not None else value
+            for column, value in zip(columns, values, strict=True)
+        ]
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value for streaming."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        # Excel has no time zones; write local wall-clock time
+        return timezone.make_naive(value)
+    if isinstance(value, str):
+        value = ILLEGAL_CHARACTERS_RE.sub("", value)
+        # openpyxl stores strings starting with "=" as formulas
+        return f"'{value}" if value.startswith("=") else value
+    if isinstance(value, _XLSX_NATIVE_TYPES):
+        return value
+    return str(value)
+
+
+def stream_csv(headers: list[str], rows: Iterable[list]) -> Iterator[str]:
+    """Yield CSV-encoded lines for ``headers`` followed by ``rows``."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def csv_export_response(
+    queryset: QuerySet,
+    columns: list[ExportColumn],
+    filename: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> StreamingHttpResponse:
+    """Stream ``queryset`` as a CSV attachment."""
+    response = StreamingHttpResponse(
+        stream_csv(
+            [column.header for column in columns],
+            iter_export_rows(queryset, columns, chunk_size),
+        ),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_export_response(
+    queryset: QuerySet,
+    columns: list[ExportColumn],
+    filename: str,
+    sheet_title: str = "Export",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> FileResponse:
+    """Write ``queryset`` to a write-only workbook and stream it back."""
+    workbook = Workbook(write_only=True)
+    # Excel limits sheet titles to 31 characters
+    sheet = workbook.create_sheet(title=sheet_title[:31])
+    sheet.append([column.header for column in columns])
+    for row in iter_export_rows(queryset, columns, chunk_size):
+        sheet.append([_xlsx_cell(value) for value in row])
+
+    file = tempfile.TemporaryFile()
+    workbook.save(file)
+    file.seek(0)
+    return FileResponse(
+        file,
+        as_attachment=True,
+        filename=f"{filename}.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+class StreamingExportMixin:
+    """
+    Adds ``?export=csv`` and ``?export=xlsx`` to a ListView.
+
+    The export covers the whole of ``get_queryset()`` (not just the current
+    page), so filters applied by the view carry over. Set ``export_columns``
+    to choose the columns; by default every concrete model field except
+    those in ``export_exclude`` is exported.
+    """
+
+    export_columns: list[ExportColumn] | None = None
+    export_exclude: tuple[str, ...] = ()
+    export_chunk_size = EXPORT_CHUNK_SIZE
+
+    def get(self, request, *args, **kwargs):
+        export_format = (request.GET.get("export") or "").lower()
+        if export_format in EXPORT_FORMATS:
+            return self.export_response(export_format)
+        return super().get(request, *args, **kwargs)
+
+    def get_export_queryset(self) -> QuerySet:
+        return self.get_queryset()
+
+    def get_export_columns(self, model: type[Model]) -> list[ExportColumn]:
+        if self.export_columns is not None:
+            return self.export_columns
+        return model_export_columns(model, self.export_exclude)
+
+    def get_export_filename(self, model: type[Model]) -> str:
+        name = slugify(model._meta.verbose_name_plural)
+        return f"{name}_{timezone.localdate():%Y%m%d}"
+
+    def export_response(self, export_format: str):
+        queryset = self.get_export_queryset()
+        model = queryset.model
+        columns = self.get_export_columns(model)
+        filename = self.get_export_filename(model)
+        if export_format == "xlsx":
+            return xlsx_export_response(
+                queryset,
+                columns,
+                filename,
+                sheet_title=capfirst(str(model._meta.verbose_name_plural)),
+                chunk_size=self.export_chunk_size,
+            )
+        return csv_export_response(
+            queryset, columns, filename, chunk_size=self.export_chunk_size
+        )
@@ -1,5 +1,23 @@
-from django.http import HttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+
+from app.core.middleware.profiling_middleware import profile_store
+from app.core.Utilities.db_pool import pool_stats
 
 
 def health_check(request):
     return HttpResponse("OK")
+
+
+@staff_member_required
+def profiling_stats(request):
+    """Rolling per-view latency and query percentiles for this worker process."""
+    if request.method == "POST" and request.POST.get("reset"):
+        profile_store.clear()
+    return JsonResponse({"views": profile_store.snapshot()})
+
+
+@staff_member_required
+def database_stats(request):
+    """Background worker pool load and database connections for this worker process."""
+    return JsonResponse(pool_stats())
@@ -32,7 +32,7 @@ class ImageResize:
         img.thumbnail(size)
 
         thumb_io = BytesIO()
-        img.save(thumb_io, "JPEG", quality=100)
+        img.save(thumb_io, "JPEG", quality=85, optimize=True, progressive=True)
 
         import os
 
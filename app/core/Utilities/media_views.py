@@ -3,9 +3,48 @@ import os
 
 from django.conf import settings
 from django.http import Http404, HttpResponseForbidden
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.views.static import serve
 
 from app.Account.models import Account
+from app.core.Utilities.renditions import RENDITION_EXTENSION, RENDITION_SIZES
+
+_RENDITION_SUFFIXES = tuple(
+    f".{size}.{RENDITION_EXTENSION}" for size in RENDITION_SIZES
+)
+
+
+def serve_cached(request, path, document_root=None):
+    """
+    Serve a media file with a strong ETag and Last-Modified.
+
+    Conditional requests are answered with 304 before the file is opened.
+    Renditions are cached by the browser for ``MEDIA_RENDITION_MAX_AGE``;
+    other files are revalidated on every use. Responses are private since
+    most media needs a login.
+    """
+    document_root = document_root or settings.MEDIA_ROOT
+    try:
+        stat = os.stat(safe_join(document_root, path))
+    except (OSError, ValueError) as error:
+        raise Http404("File not found") from error
+
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = serve(request, path, document_root=document_root)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    if path.endswith(_RENDITION_SUFFIXES):
+        patch_cache_control(
+            response, private=True, max_age=settings.MEDIA_RENDITION_MAX_AGE
+        )
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 def protected_media_view(request, path):
@@ -24,7 +63,7 @@ def protected_media_view(request, path):
 
     # no auth directories - publicly accessible
     if directories[0] in ["products", "categories"]:
-        return serve(request, path, document_root=settings.MEDIA_ROOT)
+        return serve_cached(request, path)
 
     # auth directories - require authenticated user
     if not request.user.is_authenticated:
@@ -34,7 +73,7 @@ def protected_media_view(request, path):
 
     # Staff and superusers have access to all files
     if user.is_staff or user.is_superuser:
-        return serve(request, path, document_root=settings.MEDIA_ROOT)
+        return serve_cached(request, path)
 
     # Reports directory - only staff and superusers
     if directories[0] == "reports":
@@ -57,4 +96,4 @@ def protected_media_view(request, path):
             )
 
     # If all checks pass, serve the file
-    return serve(request, path, document_root=settings.MEDIA_ROOT)
+    return serve_cached(request, path)
@@ -0,0 +1,98 @@
+"""Query plan inspection for the ORM's hot query shapes.
+
+``QUERY_SHAPES`` lists the filters and orderings that the big list and
+report views run, as the default managers issue them (soft-deleted rows
+excluded). ``plan_problems`` asks the database how it would execute a
+statement and reports full table scans and sorts that no index serves::
+
+    for shape in QUERY_SHAPES:
+        problems = plan_problems(*shape.queryset().query.sql_with_params())
+
+SQLite (``EXPLAIN QUERY PLAN``) and MySQL (``EXPLAIN``) plans are
+understood; other backends report nothing.
+
+Django renders ``deleted=False`` as ``NOT deleted``, which an index cannot
+seek on, so soft-delete and other boolean flags belong after the columns
+that are filtered by equality or range and sorted on.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.apps import apps
+from django.db import connections
+
+_PLACEHOLDER_DATE = date(2000, 1, 1)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A filter and ordering run against ``model``'s default manager."""
+
+    model: str
+    filters: dict
+    order_by: tuple = field(default=())
+
+    def queryset(self):
+        model = apps.get_model(self.model)
+        return model._default_manager.filter(**self.filters).order_by(*self.order_by)
+
+    def __str__(self):
+        filters = ", ".join(self.filters)
+        ordering = f" order by {', '.join(self.order_by)}" if self.order_by else ""
+        return f"{self.model}({filters}){ordering}"
+
+
+# Values are placeholders: plans depend on the shape, not the values
+QUERY_SHAPES = [
+    QueryShape(
+        "BillOfQuantities.ActualTransaction",
+        {"payment_certificate": 1, "line_item": 1},
+    ),
+    QueryShape(
+        "BillOfQuantities.PaymentCertificate",
+        {"project": 1, "status": "APPROVED"},
+        ("certificate_number",),
+    ),
+    QueryShape("Project.DailyActivityEntry", {"project": 1}, ("date",)),
+    QueryShape("Project.PlannedValue", {"project": 1}, ("period",)),
+    QueryShape(
+        "Ledger.Transaction",
+        {"company": 1, "date__gte": _PLACEHOLDER_DATE},
+        ("date",),
+    ),
+    QueryShape("estimator.BOQItem", {"project": 1, "is_section_header": False}),
+]
+
+
+def explain(sql: str, params=(), using: str = "default") -> list[dict]:
+    """The database's plan for ``sql``, one dict per plan row."""
+    connection = connections[using]
+    prefix = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN "}.get(
+        connection.vendor
+    )
+    if prefix is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+
+
+def plan_problems(sql: str, params=(), using: str = "default") -> list[str]:
+    """Full table scans and unindexed sorts in the plan for ``sql``."""
+    vendor = connections[using].vendor
+    problems = []
+    for row in explain(sql, params, using):
+        if vendor == "sqlite":
+            detail = row["detail"]
+            if detail.startswith("SCAN ") and "CONSTANT ROW" not in detail:
+                problems.append(f"full scan: {detail[5:]}")
+            elif detail.startswith("USE TEMP B-TREE FOR ORDER BY"):
+                problems.append("sort without index")
+        elif vendor == "mysql":
+            if row["type"] == "ALL":
+                problems.append(f"full scan: {row['table']}")
+            if "Using filesort" in (row["Extra"] or ""):
+                problems.append(f"sort without index: {row['table']}")
+    return problems
@@ -0,0 +1,181 @@
+"""Reduced-size renditions of uploaded images.
+
+Each image registered in ``RENDITION_FIELDS`` gets a ``thumb`` and a
+``preview`` rendition, stored next to the original as
+``<name>.<size>.webp`` (JPEG when Pillow lacks WebP support). They are
+generated after the upload's transaction commits, on the background worker
+pool, and templates fall back to the original until they exist::
+
+    {% load template_extras %}
+    <img src="{{ log.photo|rendition:'thumb' }}">
+"""
+
+import logging
+import os
+from functools import partial
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from app.core.Utilities.db_pool import run_in_background
+
+logger = logging.getLogger(__name__)
+
+# Rendition name -> bounding box; the aspect ratio is kept
+RENDITION_SIZES = {
+    "thumb": (320, 320),
+    "preview": (1600, 1600),
+}
+RENDITION_FORMAT, RENDITION_EXTENSION = (
+    ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+)
+RENDITION_QUALITY = 80
+
+# (model label, image field) pairs that get renditions on upload
+RENDITION_FIELDS = [
+    ("SiteManagement.PhotoLog", "photo"),
+    ("BillOfQuantities.PaymentCertificatePhoto", "image"),
+]
+
+
+def rendition_name(name: str, size: str) -> str:
+    """Storage name of the ``size`` rendition of the file ``name``."""
+    root, _ = os.path.splitext(name)
+    return f"{root}.{size}.{RENDITION_EXTENSION}"
+
+
+def rendition_url(fieldfile, size: str) -> str:
+    """URL of the ``size`` rendition, or of the original until it exists."""
+    if not fieldfile:
+        return ""
+    name = rendition_name(fieldfile.name, size)
+    if fieldfile.storage.exists(name):
+        return fieldfile.storage.url(name)
+    return fieldfile.url
+
+
+def generate_renditions(storage: Storage, name: str) -> list[str]:
+    """Write every rendition of the image ``name``, replacing old ones.
+
+    Returns the rendition names written; files Pillow cannot read are
+    logged and skipped.
+    """
+    largest = max(RENDITION_SIZES.values())
+    try:
+        with storage.open(name, "rb") as file:
+            image = Image.open(file)
+            # Let the JPEG decoder downscale while reading
+            image.draft("RGB", largest)
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Could not read image %s for renditions", name)
+        return []
+
+    if RENDITION_FORMAT == "JPEG" or image.mode not in ("RGB", "RGBA"):
+        keep_alpha = RENDITION_FORMAT == "WEBP" and image.has_transparency_data
+        image = image.convert("RGBA" if keep_alpha else "RGB")
+
+    written = []
+    for size, box in RENDITION_SIZES.items():
+        rendition = image.copy()
+        rendition.thumbnail(box, Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        rendition.save(
+            buffer, RENDITION_FORMAT, quality=RENDITION_QUALITY, optimize=True
+        )
+        target = rendition_name(name, size)
+        if storage.exists(target):
+            storage.delete(target)
+        written.append(storage.save(target, ContentFile(buffer.getvalue())))
+    return written
+
+
+def delete_renditions(storage: Storage, name: str) -> None:
+    """Remove the renditions of ``name`` from ``storage``."""
+    for size in RENDITION_SIZES:
+        target = rendition_name(name, size)
+        if storage.exists(target):
+            storage.delete(target)
+
+
+def schedule_renditions(fieldfile) -> None:
+    """Generate renditions of ``fieldfile`` once the transaction commits.
+
+    They are generated on the background worker pool, or inline with
+    ``MEDIA_RENDITIONS_ASYNC`` off.
+    """
+    storage, name = fieldfile.storage, fieldfile.name
+
+    def start():
+        if not settings.MEDIA_RENDITIONS_ASYNC:
+            generate_renditions(storage, name)
+            return
+        run_in_background(generate_renditions, storage, name)
+
+    transaction.on_commit(start)
+
+
+def _renditions_on_save(sender, instance, field_name: str, **kwargs) -> None:
+    fieldfile = getattr(instance, field_name)
+    # Only new uploads: an existing thumbnail means this file was processed
+    if fieldfile and not fieldfile.storage.exists(
+        rendition_name(fieldfile.name, "thumb")
+    ):
+        schedule_renditions(fieldfile)
+
+
+def _renditions_on_replace(sender, instance, field_name: str, **kwargs) -> None:
+    if instance.pk is None:
+        return
+    old_name = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values_list(field_name, flat=True)
+        .first()
+    )
+    fieldfile = getattr(instance, field_name)
+    if old_name and old_name != fieldfile.name:
+        storage = fieldfile.storage
+        transaction.on_commit(lambda: delete_renditions(storage, old_name))
+
+
+def _renditions_on_delete(sender, instance, field_name: str, **kwargs) -> None:
+    fieldfile = getattr(instance, field_name)
+    if fieldfile:
+        storage, name = fieldfile.storage, fieldfile.name
+        transaction.on_commit(lambda: delete_renditions(storage, name))
+
+
+def connect_rendition_signals() -> None:
+    """Maintain renditions for every field in ``RENDITION_FIELDS``.
+
+    Renditions are generated for new uploads and deleted with the row, or
+    when its file is replaced.
+    """
+    for label, field_name in RENDITION_FIELDS:
+        model = apps.get_model(label)
+        uid = f"renditions:{label}.{field_name}"
+        pre_save.connect(
+            partial(_renditions_on_replace, field_name=field_name),
+            sender=model,
+            weak=False,
+            dispatch_uid=uid,
+        )
+        post_save.connect(
+            partial(_renditions_on_save, field_name=field_name),
+            sender=model,
+            weak=False,
+            dispatch_uid=uid,
+        )
+        post_delete.connect(
+            partial(_renditions_on_delete, field_name=field_name),
+            sender=model,
+            weak=False,
+            dispatch_uid=uid,
+        )
@@ -0,0 +1,351 @@
+"""Indexed, typo-tolerant description search.
+
+Descriptions of the models in ``SEARCH_FIELDS`` are split into normalised
+words stored as ``SearchTerm`` rows, kept up to date on save. ``search``
+narrows a queryset of one of those models to the rows matching a query,
+ranked by how well they match::
+
+    line_items = search(project.line_items.all(), "reinforcing stel")
+
+Each query word matches indexed words that are equal to it, start with it
+or are similar to it by trigram similarity, so near-misses and partial
+words are still found without scanning the model's table. Similar words
+are looked up through their trigrams, stored as ``SearchTrigram`` rows,
+rather than by comparing the query with every indexed word.
+
+Item codes and numbers ("A", "12", "3.1") are matched as substrings. A
+query the index finds nothing for falls back to a plain ``icontains``
+match of the whole query, so infixes of words are still found.
+"""
+
+import math
+import re
+import unicodedata
+from functools import partial, reduce
+from operator import and_, or_
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import (
+    Case,
+    Count,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+
+from app.core.models import SearchTerm, SearchTrigram
+
+# Model label -> text fields indexed for search
+SEARCH_FIELDS = {
+    "BillOfQuantities.LineItem": ("description",),
+    "estimator.BOQItem": ("description",),
+    "estimator.SystemItemLibraryEntry": ("description",),
+    "estimator.ContractorItemLibraryEntry": ("description",),
+    "estimator.ProjectItemLibraryEntry": ("description",),
+}
+
+TERM_MAX_LENGTH = 64
+STOP_WORDS = frozenset(
+    {"a", "an", "and", "as", "at", "by", "for", "in", "of", "on", "or", "the", "to"}
+)
+# Minimum trigram similarity for a word to count as a fuzzy match
+SIMILARITY_THRESHOLD = 0.5
+PREFIX_MIN_LENGTH = 3
+PREFIX_WEIGHT = 0.8
+# Upper bounds on the index lookups of one query word
+MAX_TERMS_PER_WORD = 20
+MAX_FUZZY_CANDIDATES = 100
+
+_CODE_PUNCTUATION = ".,;:!?()[]{}\"'"
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+
+def normalize(text: str) -> str:
+    """Lower-case ``text`` and strip accents."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> list[str]:
+    """Distinct search words of ``text``, in order, without stop words.
+
+    Plurals are folded onto the singular ("bricks" -> "brick").
+    """
+    words = []
+    for word in _WORD_RE.findall(normalize(text)):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        word = word[:TERM_MAX_LENGTH]
+        if word not in words:
+            words.append(word)
+    return words
+
+
+def trigrams(word: str) -> set[str]:
+    """Trigrams of ``word`` padded as pg_trgm does ("  w", " wo", ...)."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Trigram similarity of two words, from 0 (nothing shared) to 1."""
+    ta, tb = trigrams(a), trigrams(b)
+    return len(ta & tb) / len(ta | tb)
+
+
+def object_terms(instance, fields) -> list[str]:
+    """Distinct search words of ``instance``'s ``fields``."""
+    words = []
+    for field in fields:
+        for word in tokenize(getattr(instance, field, "")):
+            if word not in words:
+                words.append(word)
+    return words
+
+
+def index_objects(objects) -> None:
+    """(Re)index ``objects``, all instances of one searchable model."""
+    objects = list(objects)
+    if not objects:
+        return
+    model = type(objects[0])
+    fields = SEARCH_FIELDS[model._meta.label]
+    content_type = ContentType.objects.get_for_model(model)
+    SearchTerm.objects.filter(
+        content_type=content_type, object_id__in=[obj.pk for obj in objects]
+    ).delete()
+    rows = [
+        SearchTerm(content_type=content_type, object_id=obj.pk, term=term)
+        for obj in objects
+        for term in object_terms(obj, fields)
+    ]
+    SearchTerm.objects.bulk_create(rows, batch_size=1000)
+    _index_trigrams(content_type, {row.term for row in rows})
+
+
+def _index_trigrams(content_type, terms) -> None:
+    """Add the trigrams of the ``terms`` that fuzzy matching does not know yet."""
+    terms = {term for term in terms if term.isalpha()}
+    if not terms:
+        return
+    known = set(
+        SearchTrigram.objects.filter(content_type=content_type, term__in=terms)
+        .values_list("term", flat=True)
+        .distinct()
+    )
+    SearchTrigram.objects.bulk_create(
+        [
+            SearchTrigram(content_type=content_type, trigram=trigram, term=term)
+            for term in sorted(terms - known)
+            for trigram in sorted(trigrams(term))
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_index(model, batch_size: int = 2000) -> int:
+    """Reindex every row of ``model``; returns the number of rows indexed.
+
+    Terms of rows that no longer exist, and trigrams of words no row uses
+    any more, are dropped. Use after bulk loads
+    that bypass ``save()``.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    manager = getattr(model, "all_objects", model._default_manager)
+    fields = SEARCH_FIELDS[model._meta.label]
+    SearchTerm.objects.filter(content_type=content_type).exclude(
+        object_id__in=manager.values("pk")
+    ).delete()
+    count = 0
+    batch = []
+    for obj in manager.only("pk", *fields).order_by("pk").iterator(batch_size):
+        batch.append(obj)
+        if len(batch) == batch_size:
+            index_objects(batch)
+            count += len(batch)
+            batch = []
+    index_objects(batch)
+    SearchTrigram.objects.filter(content_type=content_type).exclude(
+        term__in=SearchTerm.objects.filter(content_type=content_type).values("term")
+    ).delete()
+    return count + len(batch)
+
+
+def _index_on_save(sender, instance, update_fields=None, fields=(), **kwargs):
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    index_objects([instance])
+
+
+def connect_search_signals() -> None:
+    """Reindex every model in ``SEARCH_FIELDS`` when a row is saved.
+
+    Terms of deleted rows are left behind rather than slowing down cascade
+    deletes; ``search`` only returns rows of the queryset it is given, and
+    ``rebuild_index`` drops them.
+    """
+    for label, fields in SEARCH_FIELDS.items():
+        post_save.connect(
+            partial(_index_on_save, fields=fields),
+            sender=apps.get_model(label),
+            weak=False,
+            dispatch_uid=f"search_index:{label}",
+        )
+
+
+def expand_query(content_type, words: list[str]) -> dict[str, tuple[int, float]]:
+    """Indexed terms matching each query word, as term -> (word, weight).
+
+    A term equal to the word weighs 1, one starting with it
+    ``PREFIX_WEIGHT`` and one similar to it its trigram similarity. Only
+    the ``MAX_TERMS_PER_WORD`` best terms of each word are kept.
+    """
+    terms = SearchTerm.objects.filter(content_type=content_type)
+    matches = {}
+    for position, word in enumerate(words):
+        if len(word) >= PREFIX_MIN_LENGTH:
+            lookup = {"term__startswith": word}
+        else:
+            lookup = {"term": word}
+        weights = {
+            term: 1.0 if term == word else PREFIX_WEIGHT
+            for term in terms.filter(**lookup)
+            .values_list("term", flat=True)
+            .distinct()
+            .order_by("term")[:MAX_TERMS_PER_WORD]
+        }
+        for term in _similar_terms(content_type, word):
+            weight = similarity(term, word)
+            if weight >= SIMILARITY_THRESHOLD and weight > weights.get(term, 0.0):
+                weights[term] = weight
+        best = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+        for term, weight in best[:MAX_TERMS_PER_WORD]:
+            if weight > matches.get(term, (None, 0.0))[1]:
+                matches[term] = (position, weight)
+    return matches
+
+
+def _similar_terms(content_type, word: str) -> list[str]:
+    """Candidate terms sharing enough trigrams with ``word`` to be similar.
+
+    A term can only reach ``SIMILARITY_THRESHOLD`` if it shares at least
+    that fraction of ``word``'s trigrams, so candidates are found through
+    the trigram table rather than by comparing every indexed word.
+    """
+    if not word.isalpha():
+        return []
+    grams = trigrams(word)
+    return list(
+        SearchTrigram.objects.filter(content_type=content_type, trigram__in=grams)
+        .values("term")
+        .annotate(shared=Count("pk"))
+        .filter(shared__gte=math.ceil(SIMILARITY_THRESHOLD * len(grams)))
+        .order_by("-shared", "term")
+        .values_list("term", flat=True)[:MAX_FUZZY_CANDIDATES]
+    )
+
+
+def _split_query(query: str) -> tuple[list[str], list[str]]:
+    """Words of ``query`` to look up in the index, and code-like ones.
+
+    Short tokens and tokens with digits ("A", "12", "3.1") are item codes
+    or numbers rather than words, and are matched as substrings instead.
+    """
+    words, codes = [], []
+    for token in query.split():
+        token = token.strip(_CODE_PUNCTUATION)
+        if not token or normalize(token) in STOP_WORDS:
+            continue
+        if len(token) < PREFIX_MIN_LENGTH or any(c.isdigit() for c in token):
+            codes.append(token)
+        else:
+            words.append(token)
+    return tokenize(" ".join(words)), codes
+
+
+def _contains(fields, text: str) -> Q:
+    return reduce(or_, (Q(**{f"{field}__icontains": text}) for field in fields))
+
+
+def search(
+    queryset: QuerySet, query: str, require_all: bool = True, rank: bool = True
+) -> QuerySet:
+    """Rows of ``queryset`` whose indexed text matches ``query``.
+
+    With ``require_all`` every query word must match (like chained
+    ``icontains`` filters); otherwise any word will do. Code-like tokens
+    match as substrings of the text. When nothing matches that way, rows
+    containing the whole query are returned, as a plain ``icontains``
+    filter would. With ``rank``
+    rows are annotated with ``search_rank`` and ordered best first;
+    without it the queryset's own ordering is kept. A blank query returns
+    ``queryset`` unchanged.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+    fields = SEARCH_FIELDS[queryset.model._meta.label]
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    words, codes = _split_query(query)
+    matches = expand_query(content_type, words)
+
+    terms = SearchTerm.objects.filter(content_type=content_type, term__in=matches)
+    conditions = [_contains(fields, code) for code in codes]
+    if words:
+        matched = terms.values("object_id").annotate(
+            words=Count(
+                Case(
+                    *(When(term=t, then=Value(p)) for t, (p, _) in matches.items()),
+                    output_field=IntegerField(),
+                ),
+                distinct=True,
+            )
+        )
+        if require_all:
+            matched = matched.filter(words=len(words))
+        conditions.append(Q(pk__in=matched.values("object_id")))
+    matched_rows = None
+    if conditions:
+        matched_rows = queryset.filter(reduce(and_ if require_all else or_, conditions))
+    if matched_rows is None or not matched_rows.exists():
+        # Nothing found through the index (e.g. an infix of a word): match
+        # the whole query as a substring instead
+        queryset = queryset.filter(_contains(fields, query))
+        if rank:
+            queryset = queryset.annotate(search_rank=Value(0.0)).order_by("pk")
+        return queryset
+    queryset = matched_rows
+    if not rank:
+        return queryset
+    if not matches:
+        return queryset.annotate(search_rank=Value(0.0)).order_by("pk")
+
+    score = (
+        terms.filter(object_id=OuterRef("pk"))
+        .values("object_id")
+        .annotate(
+            score=Sum(
+                Case(
+                    *(When(term=t, then=Value(w)) for t, (_, w) in matches.items()),
+                    output_field=FloatField(),
+                )
+            )
+        )
+        .values("score")
+    )
+    return queryset.annotate(
+        search_rank=Coalesce(Subquery(score, output_field=FloatField()), Value(0.0))
+    ).order_by("-search_rank", "pk")
@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from .models import OutboundEmail
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Admin configuration for the outbound email queue."""
+
+    list_display = ("id", "subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "to")
+    ordering = ("-created_at",)
+    readonly_fields = ("created_at", "updated_at", "sent_at", "last_error")
@@ -9,9 +9,17 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """
-        Trigger autodiscovery of quick_create modules across all apps.
+        Trigger autodiscovery of quick_create modules across all apps and
+        connect image rendition, search index and connection tracking signals.
         """
+        from app.core.Utilities.db_pool import connect_pool_signals
+        from app.core.Utilities.renditions import connect_rendition_signals
+        from app.core.Utilities.search import connect_search_signals
+
         self.autodiscover_quick_create()
+        connect_rendition_signals()
+        connect_search_signals()
+        connect_pool_signals()
 
     def autodiscover_quick_create(self):
         """
@@ -0,0 +1,28 @@
+"""Management command to rebuild the description search index."""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from app.core.Utilities.search import SEARCH_FIELDS, rebuild_index
+
+
+class Command(BaseCommand):
+    """Reindex searchable models, e.g. after bulk loads that bypass save()."""
+
+    help = "Rebuild the search index of every searchable model, or of those given"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Model labels to rebuild, e.g. BillOfQuantities.LineItem",
+        )
+
+    def handle(self, *args, **options):
+        labels = options["models"] or list(SEARCH_FIELDS)
+        unknown = set(labels) - set(SEARCH_FIELDS)
+        if unknown:
+            raise CommandError(f"Not searchable: {', '.join(sorted(unknown))}")
+        for label in labels:
+            count = rebuild_index(apps.get_model(label))
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {label} rows"))
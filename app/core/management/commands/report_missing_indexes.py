@@ -0,0 +1,34 @@
+"""Management command to report hot queries that no index serves."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.core.Utilities.query_plans import QUERY_SHAPES, plan_problems
+
+
+class Command(BaseCommand):
+    """Explain each hot query shape and list its full scans and sorts."""
+
+    help = "Report hot query shapes whose plans scan whole tables or sort rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default="default", help="Database alias to explain on"
+        )
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error when any query is missing an index",
+        )
+
+    def handle(self, *args, **options):
+        missing = 0
+        for shape in QUERY_SHAPES:
+            sql, params = shape.queryset().query.sql_with_params()
+            problems = plan_problems(sql, params, options["database"])
+            if problems:
+                missing += 1
+                self.stdout.write(self.style.WARNING(f"{shape}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{shape}: indexed"))
+        if missing and options["fail"]:
+            raise CommandError(f"{missing} query shape(s) missing an index")
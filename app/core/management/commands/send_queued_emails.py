@@ -0,0 +1,27 @@
+"""Management command to deliver queued outbound emails."""
+
+from django.core.management.base import BaseCommand
+
+from app.core.Utilities.email_outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    """Send every due message in the email outbox."""
+
+    help = "Send queued outbound emails that are due for delivery"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Messages sent per SMTP session (default: EMAIL_OUTBOX_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        totals = drain_outbox(batch_size=options.get("batch_size"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {totals['sent']}, retrying {totals['retrying']}, "
+                f"failed {totals['failed']}"
+            )
+        )
@@ -0,0 +1,191 @@
+"""Middleware recording per-request latency and SQL statistics per view."""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Any
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger("app.performance")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised when a view exceeds its configured query budget."""
+
+
+def fingerprint_sql(sql: str) -> str:
+    """Normalise SQL so repeated statements with different literals match."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of ``values`` (which must be non-empty)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` hook counting and timing SQL."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total_time += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def duplicates(self, threshold: int) -> dict[str, int]:
+        """Fingerprints executed at least ``threshold`` times (likely N+1)."""
+        return {sql: n for sql, n in self.fingerprints.items() if n >= threshold}
+
+
+class ProfileStore:
+    """Thread-safe rolling samples per view, bounded by ``samples_per_view``."""
+
+    def __init__(self, samples_per_view: int = 200):
+        self.samples_per_view = samples_per_view
+        self._samples: dict[str, deque] = {}
+        self._duplicates: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        view_name: str,
+        wall_time: float,
+        query_count: int,
+        sql_time: float,
+        duplicates: dict[str, int],
+    ) -> None:
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                samples = deque(maxlen=self.samples_per_view)
+                self._samples[view_name] = samples
+            samples.append((wall_time, query_count, sql_time))
+            if duplicates:
+                self._duplicates[view_name] = duplicates
+
+    def snapshot(self) -> list[dict]:
+        """Per-view percentiles, slowest p95 first."""
+        with self._lock:
+            items = [
+                (view_name, list(samples), dict(self._duplicates.get(view_name, {})))
+                for view_name, samples in self._samples.items()
+            ]
+
+        stats: list[dict[str, Any]] = []
+        for view_name, samples, duplicates in items:
+            wall = [s[0] for s in samples]
+            queries = [s[1] for s in samples]
+            sql = [s[2] for s in samples]
+            stats.append(
+                {
+                    "view": view_name,
+                    "samples": len(samples),
+                    "wall_ms": {
+                        "p50": round(_percentile(wall, 50) * 1000, 2),
+                        "p95": round(_percentile(wall, 95) * 1000, 2),
+                        "p99": round(_percentile(wall, 99) * 1000, 2),
+                        "max": round(max(wall) * 1000, 2),
+                    },
+                    "queries": {
+                        "p50": _percentile(queries, 50),
+                        "p95": _percentile(queries, 95),
+                        "max": max(queries),
+                    },
+                    "sql_ms": {
+                        "p50": round(_percentile(sql, 50) * 1000, 2),
+                        "p95": round(_percentile(sql, 95) * 1000, 2),
+                    },
+                    "duplicate_queries": duplicates,
+                }
+            )
+        stats.sort(key=lambda row: row["wall_ms"]["p95"], reverse=True)
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._duplicates.clear()
+
+
+profile_store = ProfileStore(settings.PROFILING_SAMPLES_PER_VIEW)
+
+
+class RequestProfilingMiddleware:
+    """
+    Time each request and count its SQL, keeping rolling stats per view.
+
+    Slow requests, likely N+1 patterns (the same statement fingerprint run
+    repeatedly) and query budget overruns are logged to ``app.performance``.
+    When ``ENFORCE_QUERY_BUDGETS`` is set (as in the test settings) a view
+    exceeding its ``QUERY_BUDGETS`` entry raises ``QueryBudgetExceededError``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        request_time = time.perf_counter() - start
+
+        response["X-Request-Time"] = f"{request_time:.4f}s"
+
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return response
+        view_name = match.view_name
+
+        duplicates = recorder.duplicates(settings.PROFILING_DUPLICATE_QUERY_THRESHOLD)
+        profile_store.record(
+            view_name, request_time, recorder.count, recorder.total_time, duplicates
+        )
+
+        if request_time > settings.PROFILING_SLOW_REQUEST_SECONDS:
+            logger.warning(
+                "Slow request %s (%s) took %.4fs with %d queries (%.4fs SQL)",
+                request.path,
+                view_name,
+                request_time,
+                recorder.count,
+                recorder.total_time,
+            )
+        for sql, count in duplicates.items():
+            logger.warning(
+                "Repeated query in %s (%d times): %s", view_name, count, sql[:300]
+            )
+
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None and recorder.count > budget:
+            message = (
+                f"{view_name} ran {recorder.count} queries "
+                f"(budget {budget}) for {request.path}"
+            )
+            if settings.ENFORCE_QUERY_BUDGETS:
+                raise QueryBudgetExceededError(message)
+            logger.warning("Query budget exceeded: %s", message)
+
+        return response
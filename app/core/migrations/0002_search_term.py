@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_search_index(apps, schema_editor):
+    """Index the descriptions of existing rows of every searchable model."""
+    from app.core.Utilities.search import SEARCH_FIELDS, object_terms
+
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    SearchTerm = apps.get_model("core", "SearchTerm")
+    for label, fields in SEARCH_FIELDS.items():
+        model = apps.get_model(label)
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label=model._meta.app_label, model=model._meta.model_name
+        )
+        SearchTerm.objects.bulk_create(
+            (
+                SearchTerm(content_type=content_type, object_id=obj.pk, term=term)
+                for obj in model.objects.only("pk", *fields).iterator(2000)
+                for term in object_terms(obj, fields)
+            ),
+            batch_size=1000,
+        )
+
+
+def noop_reverse(apps, schema_editor):
+    """No-op reverse migration."""
+    return
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0001_initial"),
+        ("BillOfQuantities", "0028_forecast_parent"),
+        ("estimator", "0030_boq_profitability_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("term", models.CharField(max_length=64)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Term",
+                "verbose_name_plural": "Search Terms",
+                "indexes": [
+                    models.Index(
+                        fields=["content_type", "term", "object_id"],
+                        name="search_term_lookup_idx",
+                    ),
+                    models.Index(
+                        fields=["content_type", "object_id"],
+                        name="search_term_object_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_search_index, reverse_code=noop_reverse),
+    ]
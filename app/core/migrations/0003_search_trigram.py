@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _trigrams(word):
+    # Frozen copy of app.core.Utilities.search.trigrams
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def build_trigram_index(apps, schema_editor):
+    """Store the trigrams of every word already in the search index."""
+    SearchTerm = apps.get_model("core", "SearchTerm")
+    SearchTrigram = apps.get_model("core", "SearchTrigram")
+    words = (
+        SearchTerm.objects.values_list("content_type_id", "term")
+        .distinct()
+        .order_by("content_type_id", "term")
+    )
+    SearchTrigram.objects.bulk_create(
+        (
+            SearchTrigram(content_type_id=content_type_id, trigram=trigram, term=term)
+            for content_type_id, term in words.iterator(2000)
+            if term.isalpha()
+            for trigram in sorted(_trigrams(term))
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def noop_reverse(apps, schema_editor):
+    """No-op reverse migration."""
+    return
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0002_search_term"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchTrigram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("trigram", models.CharField(max_length=3)),
+                ("term", models.CharField(max_length=64)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Trigram",
+                "verbose_name_plural": "Search Trigrams",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "trigram", "term"),
+                        name="search_trigram_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_trigram_index, reverse_code=noop_reverse),
+    ]
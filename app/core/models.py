@@ -0,0 +1,114 @@
+from django.db import models
+from django.utils import timezone
+
+from app.core.Utilities.models import BaseModel
+
+
+class OutboundEmail(BaseModel):
+    """Rendered email waiting in the outbox for background delivery.
+
+    Attachments are stored as references to files in default storage, so a
+    message can be retried without re-rendering its PDFs.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    to = models.JSONField(default=list, help_text="Recipient email addresses")
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    plain_body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    attachments = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Storage names of files to attach",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time the next delivery attempt may run",
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.subject} ({self.get_status_display()})"  # type: ignore
+
+    class Meta:
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="outbound_email_due_idx",
+            )
+        ]
+
+
+class SearchTerm(models.Model):
+    """One normalised word of a searchable object's text.
+
+    Maintained by ``app.core.Utilities.search`` for the models listed in
+    its ``SEARCH_FIELDS``.
+    """
+
+    content_type = models.ForeignKey(
+        "contenttypes.ContentType", on_delete=models.CASCADE
+    )
+    object_id = models.PositiveBigIntegerField()
+    term = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Search Term"
+        verbose_name_plural = "Search Terms"
+        indexes = [
+            models.Index(
+                fields=["content_type", "term", "object_id"],
+                name="search_term_lookup_idx",
+            ),
+            models.Index(
+                fields=["content_type", "object_id"],
+                name="search_term_object_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.term
+
+
+class SearchTrigram(models.Model):
+    """One trigram of an indexed search word, for finding similar words.
+
+    Maintained alongside ``SearchTerm`` by ``app.core.Utilities.search``.
+    """
+
+    content_type = models.ForeignKey(
+        "contenttypes.ContentType", on_delete=models.CASCADE
+    )
+    trigram = models.CharField(max_length=3)
+    term = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Search Trigram"
+        verbose_name_plural = "Search Trigrams"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "trigram", "term"],
+                name="search_trigram_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.trigram!r} -> {self.term}"
@@ -2,6 +2,7 @@ from django import template
 from django.db.models import QuerySet
 
 from app.Account.models import Account
+from app.core.Utilities.renditions import rendition_url
 from app.Estimator.calculations import format_num
 from app.Project.models import ProjectRole, Role
 
@@ -208,3 +209,9 @@ def qty_filter(value):
     if value is None:
         return "-"
     return format_num(value, with_commas=True) or "-"
+
+
+@register.filter(name="rendition")
+def rendition_filter(fieldfile, size="thumb"):
+    """URL of an image's ``thumb`` or ``preview`` rendition, else the original."""
+    return rendition_url(fieldfile, size)
@@ -0,0 +1,55 @@
+import pytest
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.core.Utilities import db_pool
+from app.core.Utilities.db_pool import pool_stats, run_in_background
+
+
+class TestRunInBackground:
+    def test_runs_inline_when_async_is_off(self):
+        calls = []
+
+        assert run_in_background(calls.append, 1) is None
+        assert calls == [1]
+
+    def test_jobs_run_on_the_bounded_pool(self, settings, monkeypatch):
+        settings.BACKGROUND_TASKS_ASYNC = True
+        settings.BACKGROUND_WORKERS = 2
+        monkeypatch.setattr(db_pool, "_executor", None)
+        before = pool_stats()["workers"]
+
+        def fail():
+            raise ValueError("boom")
+
+        futures = [run_in_background(sum, [i, 1]) for i in range(5)]
+        futures.append(run_in_background(fail))
+        for future in futures:
+            future.result(timeout=10)
+
+        executor = db_pool._executor
+        assert executor._max_workers == 2
+        executor.shutdown()
+        workers = pool_stats()["workers"]
+        assert workers["completed"] - before["completed"] == 5
+        assert workers["failed"] - before["failed"] == 1
+        assert workers["queued"] == workers["running"] == 0
+
+
+@pytest.mark.django_db
+class TestDatabaseStatsView:
+    def test_requires_staff(self, client):
+        client.force_login(AccountFactory())
+        response = client.get(reverse("database_stats"))
+        assert response.status_code == 302
+
+    def test_staff_sees_connection_counts(self, client):
+        client.force_login(AccountFactory(is_staff=True))
+
+        response = client.get(reverse("database_stats"))
+
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["connections"]["open"] >= 1
+        assert stats["connections"]["opened"] >= stats["connections"]["open"]
+        assert stats["workers"]["size"] == 4
@@ -0,0 +1,139 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import override_settings
+from django.utils import timezone
+
+from app.core.models import OutboundEmail
+from app.core.Utilities import email_outbox
+from app.core.Utilities.django_email_service import EmailConnectionManager
+from app.core.Utilities.email_outbox import (
+    drain_outbox,
+    queue_email,
+    start_outbox_worker,
+)
+
+
+@pytest.fixture(autouse=True)
+def use_email(settings):
+    settings.USE_EMAIL = True
+    mail.outbox.clear()
+
+
+@pytest.mark.django_db
+class TestQueueEmail:
+    def test_disabled_email_is_not_queued(self, settings):
+        settings.USE_EMAIL = False
+        assert queue_email(to="a@example.com", subject="Hi") is None
+        assert not OutboundEmail.objects.exists()
+
+    def test_queued_message_is_sent_after_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            message = queue_email(
+                to="a@example.com", subject="Welcome", html_body="<p>Hello</p>"
+            )
+            assert not mail.outbox
+
+        message.refresh_from_db()
+        assert message.status == OutboundEmail.Status.SENT
+        assert message.attempts == 1
+        assert mail.outbox[0].to == ["a@example.com"]
+        assert mail.outbox[0].alternatives[0][0] == "<p>Hello</p>"
+
+    def test_async_flushes_run_on_the_worker_pool(self, settings, monkeypatch):
+        settings.EMAIL_OUTBOX_ASYNC = True
+        jobs = []
+        monkeypatch.setattr(email_outbox, "run_in_background", jobs.append)
+        monkeypatch.setattr(email_outbox, "_flush_scheduled", False)
+        message = queue_email(to="a@example.com", subject="Welcome")
+
+        start_outbox_worker()
+        start_outbox_worker()
+
+        assert jobs == [email_outbox._flush]
+        jobs[0]()
+        message.refresh_from_db()
+        assert message.status == OutboundEmail.Status.SENT
+        assert not email_outbox._flush_scheduled
+
+    def test_in_memory_attachment_is_stored_then_removed(self):
+        message = queue_email(
+            to="a@example.com",
+            subject="Certificate",
+            attachments=[ContentFile(b"%PDF", name="certificate.pdf")],
+        )
+        (stored,) = message.attachments
+        assert default_storage.exists(stored)
+
+        drain_outbox()
+
+        assert mail.outbox[0].attachments[0][:2] == ("certificate.pdf", b"%PDF")
+        assert not default_storage.exists(stored)
+
+
+@pytest.mark.django_db
+class TestDrainOutbox:
+    def test_batch_shares_one_session(self):
+        for n in range(3):
+            queue_email(to=f"user{n}@example.com", subject=f"Message {n}")
+
+        with mock.patch.object(
+            EmailBackend, "open", autospec=True, return_value=True
+        ) as open_session:
+            totals = drain_outbox()
+
+        assert totals == {"sent": 3, "retrying": 0, "failed": 0}
+        assert open_session.call_count == 1
+        assert len(mail.outbox) == 3
+
+    def test_outbox_does_not_share_the_request_connection(self):
+        queue_email(to="a@example.com", subject="Hi")
+
+        with mock.patch.object(
+            EmailConnectionManager, "get_connection", side_effect=AssertionError
+        ):
+            assert drain_outbox()["sent"] == 1
+
+    def test_failures_back_off_then_fail(self, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 60
+        message = queue_email(to="a@example.com", subject="Hi")
+
+        with mock.patch.object(
+            EmailBackend, "send_messages", side_effect=SMTPException("down")
+        ):
+            assert drain_outbox() == {"sent": 0, "retrying": 1, "failed": 0}
+            message.refresh_from_db()
+            assert message.status == OutboundEmail.Status.PENDING
+            assert message.next_attempt_at > timezone.now() + timedelta(seconds=50)
+            assert "down" in message.last_error
+
+            # Not due yet, so nothing is claimed
+            assert drain_outbox()["retrying"] == 0
+
+            OutboundEmail.objects.filter(pk=message.pk).update(
+                next_attempt_at=timezone.now()
+            )
+            assert drain_outbox()["failed"] == 1
+
+        message.refresh_from_db()
+        assert message.status == OutboundEmail.Status.FAILED
+        assert message.attempts == 2
+
+    @override_settings(EMAIL_OUTBOX_CLAIM_TIMEOUT=60)
+    def test_stale_sending_messages_are_reclaimed(self):
+        message = queue_email(to="a@example.com", subject="Hi")
+        OutboundEmail.objects.filter(pk=message.pk).update(
+            status=OutboundEmail.Status.SENDING,
+            updated_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        assert drain_outbox()["sent"] == 1
@@ -103,3 +103,31 @@ class TestMediaServing:
             content_disp,
         )
         assert match is not None
+
+    def test_conditional_requests_and_cache_headers(self, client, settings, tmp_path):
+        """Media is served with validators and answers revalidation with 304."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        logo_dir = tmp_path / "project_logos"
+        logo_dir.mkdir(parents=True)
+        (logo_dir / "logo.png").write_bytes(b"dummy image data")
+        (logo_dir / "logo.thumb.webp").write_bytes(b"thumb")
+
+        response = client.get("/media/project_logos/logo.png")
+        etag = response["ETag"]
+        assert etag.startswith('"')
+        assert "no-cache" in response["Cache-Control"]
+        assert "Last-Modified" in response
+
+        response = client.get("/media/project_logos/logo.png", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+        response = client.get("/media/project_logos/logo.thumb.webp")
+        assert (
+            f"max-age={settings.MEDIA_RENDITION_MAX_AGE}" in response["Cache-Control"]
+        )
+
+    def test_missing_file_is_404(self, client, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+        assert client.get("/media/project_logos/none.png").status_code == 404
@@ -0,0 +1,43 @@
+"""Tests for the hot query index report."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from app.BillOfQuantities.models import LineItem
+from app.core.Utilities.query_plans import QUERY_SHAPES, QueryShape, plan_problems
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+    @pytest.mark.parametrize("shape", QUERY_SHAPES, ids=str)
+    def test_hot_query_shapes_use_indexes(self, shape):
+        sql, params = shape.queryset().query.sql_with_params()
+
+        assert plan_problems(sql, params) == []
+
+    def test_unindexed_filters_and_sorts_are_reported(self):
+        sql, params = (
+            LineItem.objects.filter(unit_measurement="m")
+            .order_by("total_price")
+            .query.sql_with_params()
+        )
+
+        problems = plan_problems(sql, params)
+
+        assert any(problem.startswith("full scan") for problem in problems)
+        assert "sort without index" in problems
+
+    def test_command_reports_each_shape(self, monkeypatch):
+        out = StringIO()
+        call_command("report_missing_indexes", stdout=out)
+        assert out.getvalue().count("indexed") == len(QUERY_SHAPES)
+
+        monkeypatch.setattr(
+            "app.core.management.commands.report_missing_indexes.QUERY_SHAPES",
+            [QueryShape("BillOfQuantities.LineItem", {"unit_measurement": "m"})],
+        )
+        with pytest.raises(CommandError):
+            call_command("report_missing_indexes", "--fail", stdout=StringIO())
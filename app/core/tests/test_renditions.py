@@ -0,0 +1,102 @@
+"""Tests for image rendition generation."""
+
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from app.core.Utilities.renditions import (
+    RENDITION_SIZES,
+    delete_renditions,
+    generate_renditions,
+    rendition_name,
+    rendition_url,
+)
+from app.Project.tests.factories import ProjectFactory
+from app.SiteManagement.models import PhotoLog
+
+
+def _image_bytes(size=(2400, 1200), mode="RGB", image_format="JPEG") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, "orange").save(buffer, image_format)
+    return buffer.getvalue()
+
+
+class TestGenerateRenditions:
+    def test_renditions_fit_their_bounding_box(self, tmp_path):
+        storage = FileSystemStorage(location=tmp_path)
+        name = storage.save("site_photos/wall.jpg", BytesIO(_image_bytes()))
+
+        written = generate_renditions(storage, name)
+
+        assert written == [rendition_name(name, size) for size in RENDITION_SIZES]
+        for size, (width, _) in RENDITION_SIZES.items():
+            with storage.open(rendition_name(name, size)) as file:
+                image = Image.open(file)
+                assert image.size == (width, width // 2)
+        assert storage.size(written[0]) < storage.size(name)
+
+    def test_transparent_images_and_regeneration(self, tmp_path):
+        storage = FileSystemStorage(location=tmp_path)
+        name = storage.save("logo.png", BytesIO(_image_bytes((50, 50), "RGBA", "PNG")))
+
+        generate_renditions(storage, name)
+        # Regenerating replaces rather than suffixes the rendition
+        assert generate_renditions(storage, name)[0] == rendition_name(name, "thumb")
+
+        delete_renditions(storage, name)
+        assert not storage.exists(rendition_name(name, "thumb"))
+
+    def test_unreadable_file_is_skipped(self, tmp_path):
+        storage = FileSystemStorage(location=tmp_path)
+        name = storage.save("notes.jpg", BytesIO(b"not an image"))
+
+        assert generate_renditions(storage, name) == []
+
+
+@pytest.mark.django_db
+class TestPhotoRenditions:
+    def test_upload_generates_renditions_after_commit(
+        self, settings, tmp_path, django_capture_on_commit_callbacks
+    ):
+        settings.MEDIA_ROOT = str(tmp_path)
+        project = ProjectFactory.create()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            log = PhotoLog.objects.create(
+                project=project,
+                date="2024-05-01",
+                photo_reference="P-1",
+                photo=SimpleUploadedFile("slab.jpg", _image_bytes()),
+                description="Slab pour",
+                location="Block A",
+                taken_by="Site agent",
+            )
+
+        thumb = rendition_name(log.photo.name, "thumb")
+        assert log.photo.storage.exists(thumb)
+        assert rendition_url(log.photo, "thumb") == log.photo.storage.url(thumb)
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            log.save()
+        assert callbacks == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            log.photo = SimpleUploadedFile("slab-2.jpg", _image_bytes())
+            log.save()
+        assert not log.photo.storage.exists(thumb)
+        thumb = rendition_name(log.photo.name, "thumb")
+        assert log.photo.storage.exists(thumb)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            log.delete()
+        assert not log.photo.storage.exists(thumb)
+
+    def test_url_falls_back_to_original(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        log = PhotoLog(photo="site_photos/missing.jpg")
+
+        assert rendition_url(log.photo, "thumb") == log.photo.url
+        assert rendition_url(PhotoLog().photo, "thumb") == ""
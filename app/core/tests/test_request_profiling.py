@@ -0,0 +1,95 @@
+import pytest
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.core.middleware.profiling_middleware import (
+    ProfileStore,
+    QueryBudgetExceededError,
+    QueryRecorder,
+    fingerprint_sql,
+    profile_store,
+)
+
+
+class TestFingerprintSql:
+    def test_literals_are_normalised(self):
+        first = fingerprint_sql("SELECT * FROM t WHERE id = 1 AND name = 'a'")
+        second = fingerprint_sql("SELECT *  FROM t WHERE id = 42 AND name = 'bob'")
+        assert first == second == "SELECT * FROM t WHERE id = ? AND name = ?"
+
+    def test_in_lists_collapse(self):
+        assert fingerprint_sql("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == (
+            "SELECT ? FROM t WHERE id IN (...)"
+        )
+
+
+class TestProfileStore:
+    def test_samples_are_bounded_and_summarised(self):
+        store = ProfileStore(samples_per_view=3)
+        for wall in (0.1, 0.2, 0.3, 0.4):
+            store.record("app:view", wall, 5, 0.01, {})
+
+        (row,) = store.snapshot()
+        assert row["view"] == "app:view"
+        assert row["samples"] == 3
+        assert row["wall_ms"]["p50"] == 300.0
+        assert row["wall_ms"]["max"] == 400.0
+        assert row["queries"]["max"] == 5
+
+    def test_recorder_reports_duplicates(self):
+        recorder = QueryRecorder()
+        for pk in range(3):
+            recorder.fingerprints[
+                fingerprint_sql(f"SELECT * FROM t WHERE id = {pk}")
+            ] += 1
+        assert recorder.duplicates(3) == {"SELECT * FROM t WHERE id = ?": 3}
+        assert recorder.duplicates(4) == {}
+
+
+@pytest.mark.django_db
+class TestRequestProfilingMiddleware:
+    def test_records_resolved_view_and_header(self, client):
+        profile_store.clear()
+        response = client.get(reverse("health_check"))
+
+        assert response.status_code == 200
+        assert response["X-Request-Time"].endswith("s")
+        views = {row["view"]: row for row in profile_store.snapshot()}
+        assert views["health_check"]["samples"] == 1
+
+    def test_query_budget_enforced(self, client, settings):
+        settings.QUERY_BUDGETS = {"home": 0}
+        user = AccountFactory()
+        client.force_login(user)
+
+        with pytest.raises(QueryBudgetExceededError):
+            client.get(reverse("home"))
+
+    def test_query_budget_logged_when_not_enforced(self, client, settings, caplog):
+        settings.QUERY_BUDGETS = {"home": 0}
+        settings.ENFORCE_QUERY_BUDGETS = False
+        user = AccountFactory()
+        client.force_login(user)
+
+        response = client.get(reverse("home"))
+
+        assert response.status_code == 200
+        assert "Query budget exceeded: home" in caplog.text
+
+
+@pytest.mark.django_db
+class TestProfilingStatsView:
+    def test_requires_staff(self, client):
+        client.force_login(AccountFactory())
+        response = client.get(reverse("profiling_stats"))
+        assert response.status_code == 302
+
+    def test_staff_sees_stats(self, client):
+        client.force_login(AccountFactory(is_staff=True))
+        client.get(reverse("health_check"))
+
+        response = client.get(reverse("profiling_stats"))
+
+        assert response.status_code == 200
+        views = [row["view"] for row in response.json()["views"]]
+        assert "health_check" in views
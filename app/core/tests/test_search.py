@@ -0,0 +1,159 @@
+"""Tests for the indexed description search."""
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.Account.tests.factories import AccountFactory
+from app.BillOfQuantities.models import LineItem
+from app.BillOfQuantities.tests.factories import LineItemFactory
+from app.core.models import SearchTerm, SearchTrigram
+from app.core.Utilities import search as search_module
+from app.core.Utilities.search import expand_query, search, similarity, tokenize
+from app.Estimator.factories import BOQItemFactory
+from app.Estimator.models import ProjectItemLibraryEntry, ProjectSpecification
+from app.Estimator.services import autofill_boq_from_library
+from app.Project.tests.factories import ProjectFactory
+
+
+class TestTokenize:
+    def test_words_are_normalised(self):
+        assert tokenize("Supply and fix 12.5mm Bricks, Crème") == [
+            "supply",
+            "fix",
+            "12.5",
+            "mm",
+            "brick",
+            "creme",
+        ]
+
+    def test_similarity(self):
+        assert similarity("concrete", "concrete") == 1
+        assert similarity("concrete", "concreet") >= 0.5
+        assert similarity("concrete", "timber") == 0
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        self.rebar = self._item("High yield reinforcing steel bars")
+        self.mesh = self._item("Reinforcing mesh to slabs")
+        self.concrete = self._item("Concrete to foundations")
+
+    def _item(self, description):
+        return LineItemFactory(project=self.project, description=description)
+
+    def _search(self, query, **kwargs):
+        return list(
+            search(LineItem.objects.filter(project=self.project), query, **kwargs)
+        )
+
+    def test_index_is_kept_up_to_date_on_save(self):
+        self.concrete.description = "Formwork to soffits"
+        self.concrete.save()
+
+        terms = SearchTerm.objects.filter(
+            content_type=ContentType.objects.get_for_model(LineItem),
+            object_id=self.concrete.pk,
+        ).values_list("term", flat=True)
+        assert sorted(terms) == ["formwork", "soffit"]
+
+    def test_typos_and_partial_words_match(self):
+        assert self._search("reinforcng steel") == [self.rebar]
+        assert self._search("concr") == [self.concrete]
+
+    def test_best_matches_rank_first(self):
+        results = self._search("reinforcing bars", require_all=False)
+
+        assert results == [self.rebar, self.mesh]
+        assert results[0].search_rank > results[1].search_rank
+
+    def test_no_matches_and_empty_queries(self):
+        assert self._search("plumbing") == []
+        assert self._search("to") == [self.mesh, self.concrete]
+        assert len(self._search(" ")) == 3
+
+    def test_codes_and_substrings_match_like_icontains(self):
+        bolts = self._item("M12 bolts, type A")
+        clause = self._item("Clause 3.1 excavation")
+
+        assert self._search("12") == [bolts]
+        assert self._search("3.1") == [clause]
+        assert self._search("type A") == [bolts]
+        assert self._search("excavaton 3.1") == [clause]
+        assert self._search("forcing", rank=False) == [self.rebar, self.mesh]
+
+    def test_substring_scan_only_when_the_index_finds_nothing(self):
+        line_items = LineItem.objects.filter(project=self.project)
+
+        indexed = search(line_items, "reinforcing")
+        assert "LIKE" not in str(indexed.query)
+        assert list(indexed) == [self.rebar, self.mesh]
+
+        fallback = search(line_items, "forcing")
+        assert "LIKE" in str(fallback.query)
+        assert list(fallback) == [self.rebar, self.mesh]
+
+    def test_query_expansion_is_bounded(self, monkeypatch):
+        for description in ("Concreting", "Concretor", "Concrete pump"):
+            self._item(description)
+        content_type = ContentType.objects.get_for_model(LineItem)
+        monkeypatch.setattr(search_module, "MAX_TERMS_PER_WORD", 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            matches = expand_query(content_type, ["concret", "pump"])
+
+        assert len(queries) == 4
+        assert sorted(matches) == ["concrete", "concreting", "pump"]
+
+    def test_rebuild_command_reindexes_bulk_loads(self):
+        LineItem.objects.filter(pk=self.concrete.pk).update(description="Brickwork")
+        assert self._search("brickwrk") == []
+
+        call_command("rebuild_search_index", "BillOfQuantities.LineItem", stdout=None)
+
+        assert self._search("brickwrk") == [self.concrete]
+        assert not SearchTrigram.objects.filter(term="foundation").exists()
+
+
+@pytest.mark.django_db
+class TestItemLibrarySearch:
+    def setup_method(self):
+        self.project = ProjectFactory()
+        self.paint = ProjectItemLibraryEntry.objects.create(
+            project=self.project, description="Two coats acrylic paint to walls"
+        )
+        ProjectItemLibraryEntry.objects.create(
+            project=self.project, description="Ceramic floor tiles"
+        )
+
+    def test_library_view_finds_near_matches(self, client):
+        client.force_login(AccountFactory.create())
+
+        response = client.get(
+            reverse("estimator:item_library", kwargs={"project_pk": self.project.pk}),
+            {"q": "acrylc paint"},
+        )
+
+        assert response.status_code == 200
+        assert list(response.context["entries"]) == [self.paint]
+
+    def test_autofill_uses_near_matches(self):
+        self.paint.material_spec = ProjectSpecification.objects.create(
+            project=self.project, name="Acrylic"
+        )
+        self.paint.save()
+        item = BOQItemFactory(
+            project=self.project, description="Acrylic paint (two coats) to walls."
+        )
+
+        result = autofill_boq_from_library(self.project)
+
+        item.refresh_from_db()
+        assert result["filled"] == 1
+        assert item.library_entry == self.paint
+        assert item.specification == self.paint.material_spec
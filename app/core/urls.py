@@ -6,6 +6,11 @@ from django.contrib import admin
 from django.urls import include, path
 
 from app.core.dynamic_quick_create import QuickCreateFormView, QuickCreateSubmitView
+from app.core.Utilities.health_check import (
+    database_stats,
+    health_check,
+    profiling_stats,
+)
 
 from .views import (
     AboutView,
@@ -20,6 +25,9 @@ urlpatterns = (
     [
         path("favicon.ico", favicon_view),
         path("admin/", admin.site.urls),
+        path("health/", health_check, name="health_check"),
+        path("health/profiling/", profiling_stats, name="profiling_stats"),
+        path("health/database/", database_stats, name="database_stats"),
         path("features/", FeaturesView.as_view(), name="features"),
         path("about/", AboutView.as_view(), name="about"),
         path("help/", HelpCenterView.as_view(), name="help_center"),
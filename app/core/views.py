@@ -258,10 +258,10 @@ def serve_media(request, path):
     Only allows authenticated users to access sensitive folders,
     and validates project access for project-specific files.
     """
-    from django.conf import settings
     from django.contrib.auth.views import redirect_to_login
     from django.http import Http404
-    from django.views.static import serve
+
+    from app.core.Utilities.media_views import serve_cached
 
     sensitive_prefixes = (
         "project_documents/",
@@ -296,7 +296,7 @@ def serve_media(request, path):
             except ValueError:
                 pass
 
-    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    response = serve_cached(request, path)
 
     # Intercept downloads of BOQ documents to force correct download filename format
     parts = path.split("/")
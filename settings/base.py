@@ -83,7 +83,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.contrib.sites.middleware.CurrentSiteMiddleware",
     "django.middleware.locale.LocaleMiddleware",
-    "app.core.middleware.timer_middleware.RequestTimerMiddleware",
+    "app.core.middleware.profiling_middleware.RequestProfilingMiddleware",
     "app.core.middleware.demo_expired_middleware.DemoExpiredMiddleware",
 ]
 
@@ -207,6 +207,12 @@ EMAIL_PORT = int(
 )  # Empty env must not override default
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "")
 
+# Outbound email queue (app.core.Utilities.email_outbox)
+EMAIL_OUTBOX_ASYNC = True  # Deliver on the background worker pool after commit
+EMAIL_OUTBOX_BATCH_SIZE = 50  # Messages per SMTP session
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60  # Seconds before the first retry, doubled each time
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 15 * 60  # Reclaim messages stuck in SENDING
 
 CONTACT_EMAIL = os.getenv(
     "CONTACT_EMAIL", ADMIN_EMAIL or DEFAULT_FROM_EMAIL or "support@example.com"
@@ -224,3 +230,31 @@ VAT_RATE = Decimal(os.getenv("VAT_RATE", "0.15"))
 
 # SedgePro Integration Settings
 SEDGEPRO_API_KEY = os.getenv("SEDGEPRO_API_KEY", "test-sedgepro-key")
+
+# Rendered report artifact cache (PDF/CSV exports keyed by project data version)
+REPORT_CACHE_DIR = Path(os.getenv("REPORT_CACHE_DIR", BASE_DIR / "report_cache"))
+REPORT_CACHE_MAX_BYTES = int(
+    os.getenv("REPORT_CACHE_MAX_BYTES") or str(256 * 1024 * 1024)
+)
+
+# Image renditions (app.core.Utilities.renditions)
+MEDIA_RENDITIONS_ASYNC = True  # Generate on the background worker pool after commit
+# Browser cache lifetime for renditions; originals always revalidate
+MEDIA_RENDITION_MAX_AGE = 7 * 24 * 60 * 60
+
+# Background worker pool (app.core.Utilities.db_pool)
+BACKGROUND_TASKS_ASYNC = True  # Run jobs on pool threads rather than inline
+# Worker threads per process, each holding at most one database connection
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS") or "4")
+
+# Request profiling (app.core.middleware.profiling_middleware)
+PROFILING_SLOW_REQUEST_SECONDS = float(
+    os.getenv("PROFILING_SLOW_REQUEST_SECONDS", "0.5")
+)
+PROFILING_SAMPLES_PER_VIEW = int(os.getenv("PROFILING_SAMPLES_PER_VIEW", "200"))
+PROFILING_DUPLICATE_QUERY_THRESHOLD = int(
+    os.getenv("PROFILING_DUPLICATE_QUERY_THRESHOLD", "10")
+)
+# Maximum SQL queries per resolved view name, e.g. {"project:portfolio-dashboard": 50}
+QUERY_BUDGETS: dict[str, int] = {}
+ENFORCE_QUERY_BUDGETS = False
@@ -32,6 +32,14 @@ DATABASES = {
         "USER": DB_USER,
         "PASSWORD": DB_USER_PWD,
         "HOST": DB_HOST,
+        # Reuse each worker thread's connection across requests and jobs
+        # instead of reconnecting every time; checked before reuse so one
+        # dropped by the server is replaced rather than erroring.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE") or "60"),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT") or "10"),
+        },
     }
 }
 
@@ -55,8 +63,19 @@ LOGGING = {
             "filename": os.path.join(BASE_DIR, "logs", "django_errors.log"),  # noqa: F405
             "formatter": "verbose",
         },
+        "performance_file": {
+            "level": "WARNING",
+            "class": "logging.FileHandler",
+            "filename": os.path.join(BASE_DIR, "logs", "performance.log"),  # noqa: F405
+            "formatter": "verbose",
+        },
     },
     "loggers": {
+        "app.performance": {
+            "handlers": ["performance_file"],
+            "level": "WARNING",
+            "propagate": False,
+        },
         "django": {
             "handlers": ["error_file"],
             "level": "ERROR",
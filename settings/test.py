@@ -1,3 +1,6 @@
+import tempfile
+from pathlib import Path
+
 from .base import *  # noqa
 from .base import BASE_DIR
 
@@ -22,3 +25,10 @@ EMAIL_HOST_USER = ""
 EMAIL_HOST_PASSWORD = ""
 EMAIL_PORT = 587
 ADMIN_EMAIL = ""
+EMAIL_OUTBOX_ASYNC = False
+MEDIA_RENDITIONS_ASYNC = False
+BACKGROUND_TASKS_ASYNC = False
+
+REPORT_CACHE_DIR = Path(tempfile.mkdtemp(prefix="report_cache_"))
+
+ENFORCE_QUERY_BUDGETS = True